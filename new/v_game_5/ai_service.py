@@ -4,19 +4,57 @@
 import json
 import re
 import sys
-import threading
 import logging
 import random
+import time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 
 _current_dir = Path(__file__).parent
 if str(_current_dir) not in sys.path:
     sys.path.insert(0, str(_current_dir))
 
 import streamlit as st
-from openai import OpenAI
-from config import KIMI_API_KEY, BASE_URL, MODEL_ID
+from openai import RateLimitError
+from config import (
+    KIMI_API_KEY,
+    BASE_URL,
+    MODEL_ID,
+    AI_MAX_RETRIES,
+    AI_REQUEST_TIMEOUT,
+    AI_CALL_TIMEOUTS,
+    AI_BACKOFF_BASE,
+    AI_BACKOFF_MAX,
+    AI_BREAKER_FAILURE_THRESHOLD,
+    AI_BREAKER_RESET_SECONDS,
+    BOSS_PATCH_MAX_QUIZ,
+    BOSS_VOCAB_QUIZ_COUNT,
+    BOSS_READING_QUIZ_COUNT,
+    AI_RATE_LIMIT_RPM,
+    AI_RATE_LIMIT_TPM,
+    AI_RATE_LIMIT_HEADROOM,
+    AI_RATE_LIMIT_BURST,
+    AI_COMPLETION_TOKEN_ESTIMATE,
+    AI_RATE_LIMIT_DEFAULT_RETRY_AFTER,
+)
+from services.ai_scheduler import (
+    AIJobHandle,
+    JobCancelled,
+    PRIORITY_BOSS,
+    PRIORITY_MEANINGS,
+    PRIORITY_ENRICHMENT,
+    current_job,
+    get_scheduler,
+    payload_hash,
+)
+from services.circuit_breaker import CircuitBreaker, backoff_delay
+from services.client_registry import get_client
+from services.word_coverage import find_missing_words
+from services.ai_metrics import get_metrics
+from services.rate_limiter import RateLimiter, estimate_tokens
+from services.local_quiz import get_local_quiz_engine
+from services.single_flight import SingleFlight
+from services.enrichment import DistractorEnricher
+from services.prompt_builder import build_prompt
 
 
 class CyberMind:
@@ -25,7 +63,21 @@ class CyberMind:
     1. 生成文章 (generate_article)
     2. 生成阅读理解题 (generate_quiz)
     3. 分析单词 (analyze_words)
+    4. 补写缺词段落与题目 (patch_article / patch_quiz)
+    5. 修复不完整的结果 (repair_article / repair_quiz)，只请求缺失部分
+    6. 批量标注词性与易混词 (classify_words)
     """
+
+    # 进程级熔断器：上游持续失败时所有会话直接降级到 Mock
+    breaker = CircuitBreaker(AI_BREAKER_FAILURE_THRESHOLD, AI_BREAKER_RESET_SECONDS)
+    # 进程级请求合并：相同 payload 的并发调用共享一次上游请求
+    inflight = SingleFlight()
+    # 进程级限流：所有会话共享 RPM/TPM 配额，按任务优先级排队
+    limiter = RateLimiter(
+        AI_RATE_LIMIT_RPM * AI_RATE_LIMIT_HEADROOM,
+        AI_RATE_LIMIT_TPM * AI_RATE_LIMIT_HEADROOM,
+        burst=AI_RATE_LIMIT_BURST,
+    )
     
     def __init__(self):
         api_key = ""
@@ -36,54 +88,152 @@ class CyberMind:
         if not api_key:
             api_key = KIMI_API_KEY
 
-        self.client = OpenAI(api_key=api_key, base_url=BASE_URL) if api_key else None
+        # 同一 (BASE_URL, key) 在进程内共享一个带连接池的客户端
+        self.client = get_client(api_key, BASE_URL)
         self._last_error = None
+        self._last_error_kind = None
+        self._used_fallback = False
     
-    def _call(self, system: str, user: str, retries: int = 3) -> dict:
-        """调用 Kimi API，自动处理 JSON 解析和错误重试"""
+    def _call(self, system: str, user: str, retries: int = AI_MAX_RETRIES, call_type: str = None) -> dict:
+        """
+        调用 Kimi API；内容完全相同的并发请求只发一次，其余调用者共享结果（各自一份副本）
+
+        加入者沿用发起者的限流优先级：后台低优先级任务在途时，Boss 请求加入后不会被提速
+        """
+        key = payload_hash("chat", {"model": MODEL_ID, "system": system, "user": user, "call_type": call_type})
+
+        def _leader():
+            result = self._call_upstream(system, user, retries, call_type)
+            return result, self._last_error, self._last_error_kind
+
+        (result, error, error_kind), shared = self.inflight.do(key, _leader)
+        if not shared:
+            return result
+        get_metrics().record_cache_hit(f"inflight.{call_type or 'unknown'}")
+        self._last_error, self._last_error_kind = error, error_kind
+        return result
+
+    def _call_upstream(self, system: str, user: str, retries: int = AI_MAX_RETRIES, call_type: str = None) -> dict:
+        """
+        调用 Kimi API，自动处理 JSON 解析和错误重试
+
+        - 每次请求有独立超时 (AI_CALL_TIMEOUTS[call_type] 或 AI_REQUEST_TIMEOUT)
+        - 重试之间使用带抖动的指数退避
+        - 熔断器开启时不发起网络请求，直接返回 None 由调用方降级
+        - 发请求前经过进程级限流器；429 时暂停所有请求到 Retry-After 之后再重试
+        """
         self._last_error = None
+        self._last_error_kind = None
+        timeout = AI_CALL_TIMEOUTS.get(call_type, AI_REQUEST_TIMEOUT)
+        metrics = get_metrics()
+        started = time.perf_counter()
+        attempts = 0
+        outcome = "failed"
 
-        if not self.client:
-            if not st.session_state.get("_warned_missing_kimi", False):
-                st.warning("KIMI_API_KEY is missing; using Mock generator.")
-                st.session_state._warned_missing_kimi = True
-            return None
-        for attempt in range(retries):
-            try:
-                response = self.client.chat.completions.create(
-                    model=MODEL_ID,
-                    messages=[
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": user}
-                    ],
-                    temperature=1,
-                    response_format={"type": "json_object"}
-                )
-                content = response.choices[0].message.content
+        try:
+            if not self.client:
+                outcome = self._last_error_kind = "no_client"
+                if not st.session_state.get("_warned_missing_kimi", False):
+                    st.warning("KIMI_API_KEY is missing; using Mock generator.")
+                    st.session_state._warned_missing_kimi = True
+                return None
+            job = current_job()
+            priority = job.priority if job is not None else PRIORITY_BOSS
+            estimated_tokens = estimate_tokens(system) + estimate_tokens(user) + AI_COMPLETION_TOKEN_ESTIMATE.get(call_type, 800)
+            for attempt in range(retries):
+                if attempt and self._last_error_kind != "rate_limited":
+                    time.sleep(backoff_delay(attempt - 1, AI_BACKOFF_BASE, AI_BACKOFF_MAX))
+                if not self.breaker.allow_request():
+                    outcome = self._last_error_kind = "breaker_open"
+                    self._last_error = "上游服务熔断中，已降级为 Mock"
+                    return None
+
+                self.limiter.acquire(estimated_tokens, priority, on_wait=self._report_queue_position)
+                if job is not None:
+                    job.queue_position = None
+
+                attempts += 1
+                request_started = time.perf_counter()
+                try:
+                    response = self.client.chat.completions.create(
+                        model=MODEL_ID,
+                        messages=[
+                            {"role": "system", "content": system},
+                            {"role": "user", "content": user}
+                        ],
+                        temperature=1,
+                        response_format={"type": "json_object"},
+                        timeout=timeout,
+                    )
+                except RateLimitError as e:
+                    # 配额问题不代表上游故障：不计入熔断，整体暂停后重试
+                    metrics.record_request(call_type, time.perf_counter() - request_started, "rate_limited")
+                    self.limiter.penalize(self._retry_after(e))
+                    self._last_error_kind = "rate_limited"
+                    self._last_error = f"API 限流: {e}"
+                    continue
+                except Exception as e:
+                    metrics.record_request(call_type, time.perf_counter() - request_started, "error")
+                    self.breaker.record_failure()
+                    self._last_error_kind = "api_error"
+                    self._last_error = f"API 错误: {e}"
+                    continue
+
+                # 上游已正常响应；内容格式问题不计入熔断
+                self.breaker.record_success()
+                usage = getattr(response, "usage", None)
+                self.limiter.reconcile(estimated_tokens, int(getattr(usage, "total_tokens", 0) or 0))
+                content = response.choices[0].message.content or ""
                 
                 if "```" in content:
                     match = re.search(r"```(?:json)?\s*(.*?)\s*```", content, re.DOTALL)
                     if match:
                         content = match.group(1)
                 
-                content = content.strip()
-                return json.loads(content)
-                
-            except json.JSONDecodeError as e:
-                self._last_error = f"JSON 解析失败: {e}"
-                if attempt == retries - 1:
-                    return None
-                    
-            except Exception as e:
-                self._last_error = f"API 错误: {e}"
-                if attempt == retries - 1:
-                    return None
-        
-        return None
+                try:
+                    result = json.loads(content.strip())
+                except json.JSONDecodeError as e:
+                    metrics.record_request(call_type, time.perf_counter() - request_started, "parse_error", usage)
+                    self._last_error_kind = "parse_error"
+                    self._last_error = f"JSON 解析失败: {e}"
+                    continue
+                metrics.record_request(call_type, time.perf_counter() - request_started, "ok", usage)
+                outcome = "ok"
+                self._last_error_kind = None
+                return result
+            
+            return None
+        finally:
+            metrics.record_call(call_type, time.perf_counter() - started, attempts, outcome)
     
+    @staticmethod
+    def _report_queue_position(position: int):
+        """限流排队时把位置写到当前后台任务上，供界面显示"""
+        job = current_job()
+        if job is not None:
+            job.queue_position = position
+
+    @staticmethod
+    def _retry_after(error: Exception) -> float:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return AI_RATE_LIMIT_DEFAULT_RETRY_AFTER
+
     def get_last_error(self) -> str:
         return self._last_error
 
+    def used_fallback(self) -> bool:
+        """最近一次 generate_* 是否降级为 Mock 内容"""
+        return self._used_fallback
+
+    def _mark_fallback(self, call_type: str, reason: str = None):
+        """标记降级并记录原因（无客户端/熔断/API 错误/解析失败/结构无效等）"""
+        self._used_fallback = True
+        get_metrics().record_fallback(call_type, reason or self._last_error_kind or "invalid_payload")
+
     @staticmethod
     def _extract_word_list(words: list) -> list:
         word_list = []
@@ -114,17 +264,7 @@ class CyberMind:
         if not content:
             return None
 
-        missing_words = []
-        lowered_content = content.lower()
-        for word in words_list:
-            token = str(word).strip()
-            if not token:
-                continue
-            lower_token = token.lower()
-            plain_hit = re.search(rf"\b{re.escape(lower_token)}\b", lowered_content) is not None
-            bold_hit = re.search(rf"\*\*{re.escape(lower_token)}\*\*", lowered_content) is not None
-            if not plain_hit and not bold_hit:
-                missing_words.append(token)
+        missing_words = find_missing_words(content, words_list)
 
         return {
             "title": title,
@@ -197,104 +337,165 @@ class CyberMind:
 
     def generate_article(self, words: list, target_word_count: int = 200) -> dict:
         """生成 Boss 文章（新协议）"""
+        self._used_fallback = False
         word_list = self._extract_word_list(words)
         if not word_list:
+            self._mark_fallback("article", "empty_words")
             return MockGenerator.generate_article([])
 
-        prompt = """You are a sci-fi/fantasy novelist and a vocabulary expert.
-**Task**: Create a "Boss Level" short story/article based on the provided list of words.
-
-**Input Words**: {words_list}
-
-**Requirements**:
-1.  **Context**: Create a coherent, engaging story (Cyberpunk, Medieval, or Lovecraftian theme) that naturally incorporates ALL the input words.
-2.  **Length**: 200-300 words.
-3.  **Formatting**: You MUST wrap every input word used in the text with double asterisks, e.g., **serendipity**.
-4.  **Translation**: Provide a full Chinese translation of the story.
-5.  **Summary**: Provide a concise Chinese summary of the story.
-
-**Output Format**:
-Strictly return a valid JSON object:
-{
-    "title": "Title of the story",
-    "content": "The full story text with **highlighted** words...",
-    "translation_cn": "中文全文译文...",
-    "summary_cn": "中文故事大意..."
-}"""
-        raw = self._call(prompt, json.dumps({"words_list": word_list}, ensure_ascii=False))
+        system, user = build_prompt("article", {"words_list": word_list}, call_type="article")
+        raw = self._call(system, user, call_type="article")
         normalized = self.normalize_article_payload(raw, word_list)
+        if normalized and normalized["missing_words"]:
+            normalized = self.repair_article(normalized, word_list)
         if normalized:
             return normalized
+        self._mark_fallback("article")
         return MockGenerator.generate_article(word_list)
 
     def generate_quiz(self, words: list, article_context: str) -> dict:
         """生成 Boss 技能题（新协议）"""
+        self._used_fallback = False
         word_list = self._extract_word_list(words)
         if not word_list:
+            self._mark_fallback("quiz", "empty_words")
             return MockGenerator.generate_quiz([])
 
-        prompt = """You are a Game Level Designer designing a Boss Fight for a vocabulary game.
-**Context**: The player is fighting a Boss represented by the article below.
-**Article**: {article_content}
-**Target Words**: {words_list}
-
-**Task**: Generate 2 types of battle questions (Quizzes).
-
-**Type 1: Weak Point Attack (Vocabulary Cloze)**
-* Select 5 distinct sentences from the article that contain one of the **Target Words**.
-* Replace the target word with "______".
-* Goal: Test if the player recognizes the word's usage context.
-* These are used for the player to deal damage.
-
-**Type 2: Boss Ultimate Move (Reading Comprehension)**
-* Create 3 difficult questions based on the *inference* or *main idea* of the article.
-* These answers should NOT be explicitly found in the text but require understanding.
-* These are "Boss Ultimate Attacks" that hurt the player if answered wrong.
-
-**Output Format**:
-Strictly return a valid JSON object:
-{
-    "vocab_attacks": [
-        {
-            "type": "vocab",
-            "question": "The sentence with ______ blank.",
-            "options": ["Correct Word", "Distractor 1", "Distractor 2", "Distractor 3"],
-            "answer": "Correct Word",
-            "damage_to_boss": 30
-        }
-    ],
-    "boss_ultimates": [
-        {
-            "type": "reading",
-            "question": "A deep reading comprehension question?",
-            "options": ["Correct Inference", "Wrong Inference 1", "Wrong Inference 2", "Wrong Inference 3"],
-            "answer": "Correct Inference",
-            "damage_to_player": 40
-        }
-    ]
-}"""
+        # 本地例句库能出够词汇题时，AI 只负责阅读理解题
+        vocab_target = min(BOSS_VOCAB_QUIZ_COUNT, len(word_list))
+        local_attacks = get_local_quiz_engine().generate_vocab_attacks(word_list, vocab_target)
+        if len(local_attacks) >= vocab_target:
+            reading = self.patch_quiz(word_list, article_context, reading_count=BOSS_READING_QUIZ_COUNT)
+            if reading and reading["boss_ultimates"]:
+                return {"vocab_attacks": local_attacks, "boss_ultimates": reading["boss_ultimates"]}
+            self._mark_fallback("quiz")
+            return {
+                "vocab_attacks": local_attacks,
+                "boss_ultimates": MockGenerator.generate_quiz(word_list)["boss_ultimates"],
+            }
+
         payload = {
             "article_content": article_context or "",
             "words_list": word_list,
+            "vocab_count": vocab_target,
+            "reading_count": BOSS_READING_QUIZ_COUNT,
         }
-        raw = self._call(prompt, json.dumps(payload, ensure_ascii=False))
+        system, user = build_prompt(
+            "quiz", payload, call_type="quiz", context_key="article_content", words=word_list
+        )
+        raw = self._call(system, user, call_type="quiz")
         normalized = self.normalize_quiz_payload(raw)
+        if isinstance(raw, dict):
+            # 上游有响应但题目不足（格式错误被丢弃），只补缺失的题
+            normalized = self.repair_quiz(normalized, word_list, article_context)
         if normalized:
             return normalized
+        self._mark_fallback("quiz")
         return MockGenerator.generate_quiz(word_list)
     
+    def patch_article(self, article: dict, missing_words: list) -> dict:
+        """
+        为已有文章续写一段，覆盖缺失的单词（小请求，代替整篇重新生成）
+
+        Returns:
+            {"content", "translation_cn"} 仅包含新段落；失败返回 None
+        """
+        word_list = self._extract_word_list(missing_words)
+        if not word_list or not isinstance(article, dict):
+            return None
+
+        payload = {
+            "story_title": article.get("title", ""),
+            "story_ending": str(article.get("content", ""))[-600:],
+            "missing_words": word_list,
+        }
+        system, user = build_prompt("patch_article", payload, call_type="patch")
+        raw = self._call(system, user, call_type="patch")
+        if not isinstance(raw, dict):
+            return None
+        content = str(raw.get("content") or "").strip()
+        if not content:
+            return None
+        return {
+            "content": content,
+            "translation_cn": str(raw.get("translation_cn") or "").strip(),
+        }
+
+    def patch_quiz(self, words: list, article_context: str, vocab_count: int = 0, reading_count: int = 0) -> dict:
+        """补充指定数量的题目（只针对缺失部分），失败返回 None"""
+        word_list = self._extract_word_list(words)
+        if vocab_count <= 0 and reading_count <= 0:
+            return None
+
+        payload = {
+            "article_content": article_context or "",
+            "target_words": word_list,
+            "vocab_count": max(0, int(vocab_count)),
+            "reading_count": max(0, int(reading_count)),
+        }
+        system, user = build_prompt(
+            "patch_quiz", payload, call_type="patch", context_key="article_content", words=word_list
+        )
+        raw = self._call(system, user, call_type="patch")
+        return self.normalize_quiz_payload(raw)
+
+    @staticmethod
+    def merge_article_patch(article: dict, patch: dict, words_list: list) -> dict:
+        """把续写段落接到文章末尾，并按完整词表重新检查覆盖情况"""
+        return CyberMind.normalize_article_payload(
+            {
+                **article,
+                "content": f"{article.get('content', '')}\n\n{patch['content']}".strip(),
+                "translation_cn": "\n\n".join(
+                    part for part in (article.get("translation_cn", ""), patch.get("translation_cn", "")) if part
+                ),
+            },
+            words_list,
+        )
+
+    def repair_article(self, article: dict, words_list: list) -> dict:
+        """文章漏掉部分单词时，只为缺失单词续写一段；修复失败则保留原文章"""
+        patch = self.patch_article(article, article.get("missing_words") or [])
+        if not patch:
+            return article
+        return self.merge_article_patch(article, patch, words_list) or article
+
+    def repair_quiz(self, quiz: dict, words_list: list, article_context: str) -> dict:
+        """
+        题目数量不足时只请求差额：词汇题优先覆盖尚未出题的单词
+
+        Returns:
+            合并后的题目；仍然没有任何有效题目时返回 None
+        """
+        quiz = quiz or {"vocab_attacks": [], "boss_ultimates": []}
+        vocab_short = min(BOSS_VOCAB_QUIZ_COUNT, len(words_list)) - len(quiz["vocab_attacks"])
+        reading_short = BOSS_READING_QUIZ_COUNT - len(quiz["boss_ultimates"])
+        if vocab_short > 0 or reading_short > 0:
+            covered = {item["answer"].lower() for item in quiz["vocab_attacks"]}
+            targets = [w for w in words_list if w.lower() not in covered] or words_list
+            patch = self.patch_quiz(targets, article_context, max(0, vocab_short), max(0, reading_short))
+            if patch:
+                quiz = {
+                    "vocab_attacks": quiz["vocab_attacks"] + patch["vocab_attacks"][:max(0, vocab_short)],
+                    "boss_ultimates": quiz["boss_ultimates"] + patch["boss_ultimates"][:max(0, reading_short)],
+                }
+        if not quiz["vocab_attacks"] and not quiz["boss_ultimates"]:
+            return None
+        return quiz
+
+    def classify_words(self, words: list) -> dict:
+        """批量获取词性、中文释义与近义易混词（用于扩充干扰词库）"""
+        word_list = self._extract_word_list(words)
+        if not word_list:
+            return None
+        system, user = build_prompt("classify", {"words": word_list}, call_type="enrich")
+        raw = self._call(system, user, call_type="enrich")
+        return raw if isinstance(raw, dict) else None
+
     def analyze_words(self, words: list) -> dict:
         """分析单词，生成释义"""
-        prompt = """
-你是一个英语教学专家。分析单词并提供：
-1. meaning: 中文释义
-2. root: 词根词缀分析
-3. imagery: 记忆场景联想
-
-返回 JSON:
-{ "words": [ {"word": "...", "meaning": "...", "root": "...", "imagery": "..."} ] }
-"""
-        return self._call(prompt, f"单词列表: {words}")
+        system, user = build_prompt("analyze", {"words": words}, call_type="analyze")
+        return self._call(system, user, call_type="analyze")
 
 
 # ==========================================
@@ -339,8 +540,9 @@ class MockGenerator:
         if not word_list:
             word_list = ["vocabulary", "context", "inference"]
 
-        vocab_attacks = []
-        for i in range(5):
+        # 例句库能覆盖的单词出真实完形题，其余用模板题补足
+        vocab_attacks = get_local_quiz_engine().generate_vocab_attacks(word_list, BOSS_VOCAB_QUIZ_COUNT)
+        for i in range(len(vocab_attacks), BOSS_VOCAB_QUIZ_COUNT):
             token = word_list[i % len(word_list)]
             options = [token, "horizon", "archive", "entropy"]
             random.shuffle(options)
@@ -400,90 +602,148 @@ class MockGenerator:
 
 
 # ==========================================
-# 🚀 后台预加载器 (Elite 战斗时预生成 Boss 文章)
+# 🚀 后台生成任务 (经进程级调度器执行)
 # ==========================================
-class BossPreloader:
+def generate_boss_payload(words: list, job=None) -> dict:
     """
-    在 Elite 战斗时，后台预生成 Boss 文章
-    使用多线程避免阻塞游戏
+    生成 Boss 文章与题目
+
+    Args:
+        words: 本局单词列表
+        job: 调度器任务；被取消时在文章与题目两次请求之间中止
+
+    Returns:
+        {"article", "quizzes", "source"}；source 为 "ai" 或 "mock"（任一部分降级）
     """
-    
-    _executor = ThreadPoolExecutor(max_workers=1)
-    _future = None
-    _result = None
-    _loading = False
-    
-    @classmethod
-    def start_preload(cls, words: list, ai: CyberMind = None):
-        """
-        开始后台预加载
-        
-        Args:
-            words: 当前卡组单词列表
-            ai: CyberMind 实例
-        """
-        if cls._loading:
-            return  # 已在加载中
-        
-        cls._loading = True
-        cls._result = None
-        
-        def _generate():
-            try:
-                _ai = ai or CyberMind()
-                # 生成文章
-                article = _ai.generate_article(words)
-                if not article:
-                    article = MockGenerator.generate_article(words)
-                
-                # 生成题目
-                article_content = article.get("content") or article.get("article_english") or ""
-                quizzes = _ai.generate_quiz(
-                    words, 
-                    article_content
-                )
-                if not quizzes:
-                    quizzes = MockGenerator.generate_quiz(words)
-                
-                cls._result = {
-                    'article': article,
-                    'quizzes': quizzes
-                }
-            except Exception as e:
-                cls._result = {
-                    'article': MockGenerator.generate_article(words),
-                    'quizzes': MockGenerator.generate_quiz(words),
-                    'error': str(e)
-                }
-            finally:
-                cls._loading = False
-        
-        cls._future = cls._executor.submit(_generate)
-    
-    @classmethod
-    def get_result(cls) -> dict:
-        """获取预加载结果。如果还在加载，返回 None"""
-        if cls._loading:
+    try:
+        ai = CyberMind()
+        article = ai.generate_article(words)
+        article_fallback = ai.used_fallback()
+        if job is not None:
+            job.check_cancelled()
+        article_content = article.get("content") if article else ""
+        if article and article_content:
+            quizzes = ai.generate_quiz(words, article_content)
+            return {
+                'article': article,
+                'quizzes': quizzes,
+                'source': "mock" if article_fallback or ai.used_fallback() else "ai",
+            }
+    except JobCancelled:
+        raise
+    except Exception:
+        logging.exception("Boss generation failed")
+        get_metrics().record_fallback("boss", "exception")
+    return {
+        'article': MockGenerator.generate_article(words),
+        'quizzes': MockGenerator.generate_quiz(words),
+        'source': "mock",
+    }
+
+
+def submit_boss_generation(words: list, owner=None, on_result=None) -> AIJobHandle:
+    """
+    提交 Boss 生成任务；相同词集的并发请求共享同一任务
+
+    Args:
+        on_result: 任务完成时在工作线程中回调 (payload)，用于落库；
+            每个提交者（包括加入已有任务的）都会收到，会话提前结束也不会丢失已生成的内容
+    """
+    word_list = sorted(CyberMind._extract_word_list(words), key=str.lower)
+    return get_scheduler().submit(
+        "boss",
+        {"words": word_list},
+        lambda job: generate_boss_payload(word_list, job),
+        priority=PRIORITY_BOSS,
+        owner=owner,
+        on_result=on_result,
+    )
+
+
+def generate_boss_patch(base: dict, words: list, missing_words: list, job=None) -> dict:
+    """
+    基于离线库条目补齐缺失单词：续写一段文章 + 少量词汇题，合并回原内容
+
+    Returns:
+        合并后的 {"article", "quizzes", "source": "ai"}；补丁失败返回 None（调用方继续使用库内容）
+    """
+    try:
+        ai = CyberMind()
+        patch = ai.patch_article(base.get("article") or {}, missing_words)
+        if not patch:
             return None
-        return cls._result
-    
-    @classmethod
-    def is_loading(cls) -> bool:
-        return cls._loading
-    
-    @classmethod
-    def wait_result(cls, timeout: float = 30) -> dict:
-        """等待预加载完成"""
-        if cls._future:
-            try:
-                cls._future.result(timeout=timeout)
-            except Exception:
-                logging.exception("BossPreloader wait_result failed")
-        return cls._result
-    
-    @classmethod
-    def reset(cls):
-        """重置预加载器"""
-        cls._result = None
-        cls._loading = False
-        cls._future = None
+        if job is not None:
+            job.check_cancelled()
+
+        merged_article = CyberMind.merge_article_patch(dict(base.get("article") or {}), patch, words)
+        if not merged_article:
+            return None
+
+        quizzes = dict(base.get("quizzes") or {})
+        quiz_patch = ai.patch_quiz(
+            missing_words,
+            patch["content"],
+            vocab_count=min(len(missing_words), BOSS_PATCH_MAX_QUIZ),
+        )
+        if quiz_patch:
+            # 新词题目排在前面，保证缺失单词会被考到
+            quizzes["vocab_attacks"] = quiz_patch["vocab_attacks"] + list(quizzes.get("vocab_attacks", []))
+        return {"article": merged_article, "quizzes": quizzes, "source": "ai"}
+    except JobCancelled:
+        raise
+    except Exception:
+        logging.exception("Boss patch generation failed")
+    return None
+
+
+def submit_boss_patch(base: dict, words: list, missing_words: list, owner=None, on_result=None) -> AIJobHandle:
+    """
+    提交离线库补丁任务（仅为缺失单词请求少量内容）
+
+    去重键包含被补丁的文章与题目：词集相同但基底不同的会话不会拿到基于别人基底合并的内容
+    """
+    word_list = sorted(CyberMind._extract_word_list(words), key=str.lower)
+    missing_list = sorted(CyberMind._extract_word_list(missing_words), key=str.lower)
+    base_hash = payload_hash("boss_base", {"article": base.get("article"), "quizzes": base.get("quizzes")})
+    return get_scheduler().submit(
+        "boss_patch",
+        {"words": word_list, "missing": missing_list, "base": base_hash},
+        lambda job: generate_boss_patch(base, word_list, missing_list, job),
+        priority=PRIORITY_BOSS,
+        owner=owner,
+        on_result=on_result,
+    )
+
+
+def submit_distractor_enrichment(db, player_id: int) -> AIJobHandle:
+    """
+    提交干扰词库扩充任务（最低优先级，不绑定会话，会话结束也会跑完当前批次）
+
+    有更高优先级任务排队或限流器有人等待时，任务主动结束，下次触发再继续
+    """
+    enricher = DistractorEnricher(
+        db,
+        lambda words: CyberMind().classify_words(words),
+        is_busy=lambda: (
+            get_scheduler().pending_count(max_priority=PRIORITY_MEANINGS) > 0
+            or CyberMind.limiter.queue_length() > 0
+        ),
+    )
+    return get_scheduler().submit(
+        "enrich",
+        {"db": db.db_name, "player": player_id},
+        lambda job: enricher.run(player_id, job),
+        priority=PRIORITY_ENRICHMENT,
+    )
+
+
+def submit_word_analysis(words: list, owner=None) -> AIJobHandle:
+    """提交单词释义分析任务"""
+    word_list = CyberMind._extract_word_list(words)
+    return get_scheduler().submit(
+        "meanings",
+        {"words": word_list},
+        lambda job: CyberMind().analyze_words(word_list),
+        priority=PRIORITY_MEANINGS,
+        owner=owner,
+    )
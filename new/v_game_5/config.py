@@ -5,15 +5,83 @@ import os
 
 # Kimi API 配置
 KIMI_API_KEY = os.getenv("KIMI_API_KEY", "")
-BASE_URL = "https://api.moonshot.cn/v1"
+BASE_URL = os.getenv("KIMI_BASE_URL", "https://api.moonshot.cn/v1")  # 可指向本地假服务 (tests/fake_kimi.py)
 MODEL_ID = "kimi-k2.5"
 
+# AI 后台任务
+AI_WORKER_COUNT = 2     # 进程级 AI 工作线程数（所有会话共享）
+
+# AI 调用容错
+AI_MAX_RETRIES = 3              # 单次调用最大尝试次数
+AI_REQUEST_TIMEOUT = 45.0       # 默认单次请求超时（秒）
+AI_CALL_TIMEOUTS = {            # 按调用类型覆盖超时（秒）
+    "article": 60.0,
+    "quiz": 60.0,
+    "analyze": 30.0,
+    "patch": 30.0,
+    "enrich": 45.0,
+}
+AI_BACKOFF_BASE = 1.0           # 指数退避基数（秒）
+AI_BACKOFF_MAX = 8.0            # 单次退避上限（秒）
+AI_BREAKER_FAILURE_THRESHOLD = 5  # 连续失败多少次后熔断
+AI_BREAKER_RESET_SECONDS = 60.0   # 熔断后多久放行探测请求
+
+# AI 上游配额（进程级限流）
+AI_RATE_LIMIT_RPM = 60            # 每分钟请求数配额，0 表示不限制
+AI_RATE_LIMIT_TPM = 200000        # 每分钟 token 配额，0 表示不限制
+AI_RATE_LIMIT_HEADROOM = 0.9      # 实际只用到配额的比例，留出余量避免 429
+AI_RATE_LIMIT_BURST = 0.2         # 令牌桶容量占每分钟配额的比例（其余匀速补充），限制开局突发
+AI_COMPLETION_TOKEN_ESTIMATE = {  # 预估输出 token（请求前预扣，响应后按 usage 校正）
+    "article": 1500,
+    "quiz": 1200,
+    "analyze": 800,
+    "patch": 500,
+    "enrich": 1500,
+}
+AI_RATE_LIMIT_DEFAULT_RETRY_AFTER = 5.0  # 429 未给出 Retry-After 时的暂停秒数
+AI_PROMPT_CONTEXT_BUDGETS = {  # 提示词中可裁剪上下文（文章原文）的 token 上限
+    "quiz": 600,
+    "patch": 400,
+}
+
+# AI 调用指标
+AI_METRICS_FILE = os.getenv("AI_METRICS_FILE", "ai_metrics.json")  # 相对路径解析到程序目录
+AI_METRICS_FLUSH_SECONDS = 60.0  # 指标文件写入间隔（秒），0 表示不写文件
+
+# AI HTTP 连接池（进程级共享）
+AI_MAX_CONNECTIONS = 16           # 每个客户端最大并发连接
+AI_MAX_KEEPALIVE_CONNECTIONS = 8  # 保持长连接的空闲连接数
+AI_KEEPALIVE_EXPIRY = 60.0        # 空闲连接保留时间（秒）
+
+# Boss 离线内容库
+BOSS_BANK_MIN_OVERLAP = 0.6      # 库内词集至少覆盖本局词池的比例才可复用
+BOSS_BANK_SKIP_OVERLAP = 0.9     # 预生成时已有条目覆盖到该比例则跳过
+BOSS_BANK_VARIANTS = 3           # 每个玩家预测的候选词池数量
+BOSS_BANK_MAX_ENTRIES = 20       # 每个玩家最多保留的库存条目
+BOSS_PATCH_MAX_QUIZ = 5          # 补丁请求最多补充的词汇题数量
+BOSS_REFRESH_MIN_COVERAGE = 0.8  # 牌组变化后 Boss 文章覆盖率低于该值时后台增量补丁
+BOSS_REFRESH_MAX_MISSING = 8     # 单次增量补丁最多补充的单词数
+BOSS_VOCAB_QUIZ_COUNT = 5        # Boss 词汇题（玩家攻击）目标数量
+BOSS_READING_QUIZ_COUNT = 3      # Boss 阅读题（Boss 大招）目标数量
+
+# 干扰词库后台扩充
+ENRICHMENT_BATCH_SIZE = 20       # 每次请求打包的新词数量
+ENRICHMENT_MAX_BATCHES = 5       # 每次触发最多处理的批次数
+
+# 本地完形题引擎
+EXAMPLE_CORPUS_PATH = os.getenv("VOCAB_EXAMPLE_CORPUS", "")  # 用户例句库 (.tsv/.jsonl/.txt)，与内置例句库合并
+
+# 平衡模拟 (simulation.batch_runner)
+SIM_BATCH_WORKERS = 0            # 进程数，0 表示使用全部 CPU 核心
+SIM_BATCH_CHUNK_SIZE = 250       # 每个子进程任务模拟的局数（按种子区间切分）
+
 # 数据库
 DB_NAME = "vocab_spire_v5.db"
 
 # 游戏平衡
 TOTAL_FLOORS = 22  # 总层数 (8小+5精+8事+1Boss = 22)
 INITIAL_GOLD = 50  # 每局初始金币
+RUN_SEED = int(os.environ["VOCAB_RUN_SEED"]) if os.getenv("VOCAB_RUN_SEED") else None  # 固定每局随机种子（复现/基准测试）
 
 # 强制战斗配置
 MANDATORY_NORMAL_COMBATS = 8   # 必须遇到的小怪数量
@@ -3,6 +3,7 @@
 # ==========================================
 import sqlite3
 import json
+import hashlib
 import random
 import logging
 import sys
@@ -20,9 +21,38 @@ from config import (
     DEFAULT_REVIEW_WORDS,
     RED_TO_BLUE_UPGRADE_THRESHOLD,
     BLUE_TO_GOLD_UPGRADE_THRESHOLD,
+    BOSS_BANK_MAX_ENTRIES,
 )
 
 
+def word_set_hash(words: list) -> str:
+    """词集指纹：忽略大小写、顺序与重复"""
+    tokens = set()
+    for item in words or []:
+        word = item.get("word", "") if isinstance(item, dict) else item
+        token = str(word or "").strip().lower()
+        if token:
+            tokens.add(token)
+    return hashlib.sha1("\n".join(sorted(tokens)).encode("utf-8")).hexdigest()
+
+
+def word_progress_after(tier: int, streak: int, correct: bool) -> tuple:
+    """
+    一次答题后的 (tier, consecutive_correct)
+
+    答对累加连击，达到阈值升级（红→蓝、蓝→金）并清零；答错只清零连击，
+    降级由战斗层统一执行。无头模拟器复用同一规则，回放时与数据库一致。
+    """
+    if not correct:
+        return tier, 0
+    streak += 1
+    if tier <= 1 and streak >= RED_TO_BLUE_UPGRADE_THRESHOLD:
+        return 2, 0
+    if tier in (2, 3) and streak >= BLUE_TO_GOLD_UPGRADE_THRESHOLD:
+        return 4, 0
+    return tier, streak
+
+
 class GameDB:
     DEFAULT_DB_FILENAME = "vocab_spire_v5.db"
     """管理玩家金币、已掌握词汇(Deck)、爬塔历史"""
@@ -118,6 +148,48 @@ class GameDB:
                 pos TEXT DEFAULT 'unknown'
             )''')
             
+            # Boss 文章/题目缓存 (按本局 run_uid 与词集指纹索引)
+            c.execute('''CREATE TABLE IF NOT EXISTS boss_content (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_id INTEGER,
+                run_uid TEXT,
+                word_hash TEXT,
+                article TEXT,
+                quizzes TEXT,
+                source TEXT DEFAULT 'ai',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )''')
+            c.execute("CREATE INDEX IF NOT EXISTS idx_boss_content_run ON boss_content(player_id, run_uid)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_boss_content_words ON boss_content(player_id, word_hash)")
+            
+            # Boss 离线内容库 (离峰时段预生成，开局按词集重叠度挑选)
+            c.execute('''CREATE TABLE IF NOT EXISTS boss_content_bank (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_id INTEGER,
+                word_hash TEXT,
+                words TEXT,
+                article TEXT,
+                quizzes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )''')
+            c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_boss_bank_words ON boss_content_bank(player_id, word_hash)")
+            
+            # 玩家动作日志 (只追加，seq = 0 为开局行，option_key 存本局种子)
+            c.execute('''CREATE TABLE IF NOT EXISTS run_actions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_id INTEGER,
+                run_uid TEXT,
+                seq INTEGER,
+                kind TEXT,
+                option_index INTEGER,
+                option_key TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(player_id) REFERENCES players(id)
+            )''')
+            c.execute("CREATE INDEX IF NOT EXISTS idx_run_actions_run ON run_actions(player_id, run_uid, seq)")
+            
             conn.commit()
             self._init_distractor_pool(conn)
     
@@ -353,27 +425,54 @@ class GameDB:
         
         return pool
     
-    def get_initial_deck_from_pool(self, pool: list, red: int = 6, blue: int = 2, gold: int = 1) -> list:
+    def get_likely_game_pool(self, player_id: int, red: int = 25, blue: int = 12, gold: int = 5) -> list:
+        """
+        预测下一局最可能的单词池 (确定性版本的 get_game_pool)
+        红卡: PINNED > GHOST > 错误次数多 > 久未出现；蓝/金卡: 久未出现优先
+        """
+        pool = []
+        with self._get_conn() as conn:
+            c = conn.cursor()
+            c.execute("""SELECT word, meaning, tier, consecutive_correct, priority FROM deck
+                        WHERE player_id = ? AND tier <= 1
+                        ORDER BY priority = 'pinned' DESC, priority = 'ghost' DESC,
+                                 error_count DESC, last_seen_room ASC, id ASC LIMIT ?""",
+                     (player_id, red))
+            pool.extend([dict(row) for row in c.fetchall()])
+            c.execute("""SELECT word, meaning, tier, consecutive_correct, priority FROM deck
+                        WHERE player_id = ? AND tier >= 2 AND tier <= 3
+                        ORDER BY last_seen_room ASC, id ASC LIMIT ?""",
+                     (player_id, blue))
+            pool.extend([dict(row) for row in c.fetchall()])
+            c.execute("""SELECT word, meaning, tier, consecutive_correct, priority FROM deck
+                        WHERE player_id = ? AND tier >= 4
+                        ORDER BY last_seen_room ASC, id ASC LIMIT ?""",
+                     (player_id, gold))
+            pool.extend([dict(row) for row in c.fetchall()])
+        return pool
+    
+    @staticmethod
+    def get_initial_deck_from_pool(pool: list, red: int = 6, blue: int = 2, gold: int = 1, rng=None) -> list:
         """
         从游戏池中抽取初始卡组
         默认: 6红 + 2蓝 + 1金 = 9张
         """
-        import random
+        rng = rng or random
         
         red_cards = [w for w in pool if w.get('tier', 0) <= 1]
         blue_cards = [w for w in pool if 2 <= w.get('tier', 0) <= 3]
         gold_cards = [w for w in pool if w.get('tier', 0) >= 4]
         
         deck = []
-        deck.extend(random.sample(red_cards, min(red, len(red_cards))))
-        deck.extend(random.sample(blue_cards, min(blue, len(blue_cards))))
-        deck.extend(random.sample(gold_cards, min(gold, len(gold_cards))))
+        deck.extend(rng.sample(red_cards, min(red, len(red_cards))))
+        deck.extend(rng.sample(blue_cards, min(blue, len(blue_cards))))
+        deck.extend(rng.sample(gold_cards, min(gold, len(gold_cards))))
         
         # 补足数量
         total_needed = red + blue + gold
         if len(deck) < total_needed:
             remaining = [w for w in pool if w not in deck]
-            random.shuffle(remaining)
+            rng.shuffle(remaining)
             deck.extend(remaining[:total_needed - len(deck)])
         
         return deck
@@ -455,16 +554,7 @@ class GameDB:
             errors = row['error_count'] or 0
             
             if correct:
-                new_streak = streak + 1
-                new_tier = current_tier
-                
-                # 升级判定
-                if current_tier <= 1 and new_streak >= RED_TO_BLUE_UPGRADE_THRESHOLD:
-                    new_tier = 2  # Red -> Blue
-                    new_streak = 0  # 重置连击
-                elif current_tier in [2, 3] and new_streak >= BLUE_TO_GOLD_UPGRADE_THRESHOLD:
-                    new_tier = 4  # Blue -> Gold
-                    new_streak = 0
+                new_tier, new_streak = word_progress_after(current_tier, streak, True)
                 
                 conn.execute("""UPDATE deck SET 
                     tier = ?, consecutive_correct = ?, last_seen_room = ?, priority = 'normal'
@@ -569,6 +659,171 @@ class GameDB:
             else:
                 conn.execute("UPDATE players SET total_runs = total_runs + 1 WHERE id = ?", (player_id,))
     
+    # ==========================================
+    # Boss 内容缓存
+    # ==========================================
+    
+    def save_boss_content(self, player_id: int, run_uid: str, word_hash: str, payload: dict):
+        """保存本局 Boss 文章与题目"""
+        if not isinstance(payload, dict):
+            return
+        with self._get_conn() as conn:
+            conn.execute("""INSERT INTO boss_content
+                (player_id, run_uid, word_hash, article, quizzes, source)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (
+                    player_id,
+                    run_uid,
+                    word_hash,
+                    json.dumps(payload.get("article"), ensure_ascii=False),
+                    json.dumps(payload.get("quizzes"), ensure_ascii=False),
+                    payload.get("source", "ai"),
+                ))
+    
+    def get_boss_content(self, player_id: int, run_uid: str = None, word_hash: str = None) -> Optional[dict]:
+        """
+        读取 Boss 内容
+        优先: 本局 run_uid > 相同词集的 AI 内容
+        """
+        with self._get_conn() as conn:
+            c = conn.cursor()
+            row = None
+            if run_uid:
+                c.execute("""SELECT * FROM boss_content
+                            WHERE player_id = ? AND run_uid = ?
+                            ORDER BY source = 'ai' DESC, id DESC LIMIT 1""",
+                         (player_id, run_uid))
+                row = c.fetchone()
+            if row is None and word_hash:
+                c.execute("""SELECT * FROM boss_content
+                            WHERE player_id = ? AND word_hash = ? AND source = 'ai'
+                            ORDER BY id DESC LIMIT 1""",
+                         (player_id, word_hash))
+                row = c.fetchone()
+            if row is None:
+                return None
+            return {
+                "article": json.loads(row['article']) if row['article'] else None,
+                "quizzes": json.loads(row['quizzes']) if row['quizzes'] else None,
+                "source": row['source'],
+                "run_uid": row['run_uid'],
+                "word_hash": row['word_hash'],
+            }
+    
+    def save_bank_entry(self, player_id: int, words: list, payload: dict):
+        """写入离线内容库；同一词集覆盖旧条目，超出上限时淘汰最旧的"""
+        if not isinstance(payload, dict):
+            return
+        word_list = sorted({str(w).strip() for w in words if str(w).strip()}, key=str.lower)
+        with self._get_conn() as conn:
+            conn.execute("""INSERT OR REPLACE INTO boss_content_bank
+                (player_id, word_hash, words, article, quizzes)
+                VALUES (?, ?, ?, ?, ?)""",
+                (
+                    player_id,
+                    word_set_hash(word_list),
+                    json.dumps(word_list, ensure_ascii=False),
+                    json.dumps(payload.get("article"), ensure_ascii=False),
+                    json.dumps(payload.get("quizzes"), ensure_ascii=False),
+                ))
+            conn.execute("""DELETE FROM boss_content_bank
+                            WHERE player_id = ? AND id NOT IN (
+                                SELECT id FROM boss_content_bank WHERE player_id = ?
+                                ORDER BY id DESC LIMIT ?)""",
+                         (player_id, player_id, BOSS_BANK_MAX_ENTRIES))
+    
+    def find_bank_entry(self, player_id: int, words: list, min_overlap: float = 0.0) -> Optional[dict]:
+        """
+        按词集重叠度挑选离线库条目
+
+        Returns:
+            {"article", "quizzes", "words", "overlap", "missing_words"}；
+            覆盖率低于 min_overlap 时返回 None
+        """
+        targets = {}
+        for word in words or []:
+            token = str(word).strip()
+            if token:
+                targets.setdefault(token.lower(), token)
+        if not targets:
+            return None
+        
+        with self._get_conn() as conn:
+            c = conn.cursor()
+            c.execute("SELECT id, words FROM boss_content_bank WHERE player_id = ?", (player_id,))
+            best_id, best_hits, best_words = None, 0, set()
+            for row in c.fetchall():
+                entry_words = {str(w).lower() for w in json.loads(row['words'] or "[]")}
+                hits = len(entry_words.intersection(targets))
+                if hits > best_hits:
+                    best_id, best_hits, best_words = row['id'], hits, entry_words
+            overlap = best_hits / len(targets)
+            if best_id is None or overlap < min_overlap:
+                return None
+            c.execute("SELECT * FROM boss_content_bank WHERE id = ?", (best_id,))
+            row = c.fetchone()
+        return {
+            "article": json.loads(row['article']) if row['article'] else None,
+            "quizzes": json.loads(row['quizzes']) if row['quizzes'] else None,
+            "words": json.loads(row['words'] or "[]"),
+            "overlap": overlap,
+            "missing_words": [w for key, w in targets.items() if key not in best_words],
+        }
+    
+    # ==========================================
+    # 动作日志
+    # ==========================================
+    
+    def append_run_action(self, player_id: int, run_uid: str, seq: int, kind: str,
+                          index: Optional[int] = None, key: str = ""):
+        """追加一条玩家动作"""
+        with self._get_conn() as conn:
+            conn.execute("""INSERT INTO run_actions
+                (player_id, run_uid, seq, kind, option_index, option_key)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (player_id, run_uid, seq, kind, index, key))
+    
+    def get_action_log(self, player_id: int, run_uid: str) -> Optional[dict]:
+        """
+        读取一局的动作日志
+
+        start 行的 option_key 是日志头部 JSON（旧数据只有种子），boss_quizzes 行是 Boss 题目队列 JSON，
+        两者都不计入动作。
+
+        Returns:
+            {"seed", "run_uid", "words", "boss_quizzes", "actions": [[kind, index, key], ...]}；
+            没有开局行时返回 None
+        """
+        with self._get_conn() as conn:
+            rows = conn.execute("""SELECT seq, kind, option_index, option_key FROM run_actions
+                                   WHERE player_id = ? AND run_uid = ? ORDER BY seq, id""",
+                                (player_id, run_uid)).fetchall()
+        if not rows or rows[0]['kind'] != "start":
+            return None
+        header = rows[0]['option_key'] or ""
+        if header.startswith("{"):
+            header = json.loads(header)
+        else:
+            header = {"seed": int(header) if header else None}
+        boss_quizzes = None
+        actions = []
+        for row in rows[1:]:
+            if row['kind'] == "boss_quizzes":
+                boss_quizzes = json.loads(row['option_key'])
+            else:
+                actions.append([row['kind'], row['option_index'], row['option_key']])
+        return {
+            "seed": header.get("seed"),
+            "run_uid": run_uid,
+            "words": header.get("words"),
+            "boss_quizzes": boss_quizzes,
+            "actions": actions,
+        }
+    
+    def get_player_ids(self) -> list:
+        with self._get_conn() as conn:
+            return [row['id'] for row in conn.execute("SELECT id FROM players ORDER BY id")]
+    
     # ==========================================
     # 兼容旧方法
     # ==========================================
@@ -604,6 +859,34 @@ class GameDB:
                      (correct_meaning, count))
             return [row['meaning'] for row in c.fetchall()]
     
+    def get_distractor_pool(self) -> list:
+        """读取全部干扰词 (word, meaning, pos)，供本地出题引擎按词性分桶"""
+        with self._get_conn() as conn:
+            return [dict(row) for row in conn.execute("SELECT word, meaning, pos FROM distractor_pool")]
+    
+    def get_words_missing_distractors(self, player_id: int, limit: int = 20) -> list:
+        """牌组中还没有进入干扰词库的单词（新加入的优先）"""
+        with self._get_conn() as conn:
+            c = conn.cursor()
+            c.execute("""SELECT d.word, d.meaning FROM deck d
+                        LEFT JOIN distractor_pool p ON LOWER(p.word) = LOWER(d.word)
+                        WHERE d.player_id = ? AND p.id IS NULL
+                        ORDER BY d.id DESC LIMIT ?""",
+                     (player_id, limit))
+            return [dict(row) for row in c.fetchall()]
+    
+    def upsert_distractors(self, rows: list) -> int:
+        """批量写入干扰词 (word, meaning, pos)；已存在的词补全词性与释义"""
+        if not rows:
+            return 0
+        with self._get_conn() as conn:
+            conn.executemany("""INSERT INTO distractor_pool (word, meaning, pos) VALUES (?, ?, ?)
+                ON CONFLICT(word) DO UPDATE SET
+                    pos = CASE WHEN excluded.pos != 'unknown' THEN excluded.pos ELSE distractor_pool.pos END,
+                    meaning = CASE WHEN excluded.meaning != '' THEN excluded.meaning ELSE distractor_pool.meaning END""",
+                rows)
+        return len(rows)
+    
     def add_to_distractor_pool(self, word: str, meaning: str, pos: str = "unknown"):
         if not meaning or meaning == "待学习":
             return
@@ -12,23 +12,39 @@ Major System Upgrade:
 
 import streamlit as st
 import random
-import threading
-import queue
 import sys
+import uuid
 from pathlib import Path
 
 _current_dir = Path(__file__).parent
 if str(_current_dir) not in sys.path:
     sys.path.insert(0, str(_current_dir))
 
-from config import TOTAL_FLOORS, INITIAL_GOLD, KIMI_API_KEY
-from database import GameDB
-from ai_service import CyberMind, MockGenerator
+from config import (
+    TOTAL_FLOORS,
+    INITIAL_GOLD,
+    RUN_SEED,
+    KIMI_API_KEY,
+    BOSS_BANK_MIN_OVERLAP,
+    AI_METRICS_FILE,
+    AI_METRICS_FLUSH_SECONDS,
+)
+from database import GameDB, word_set_hash
+from ai_service import (
+    CyberMind,
+    submit_boss_generation,
+    submit_boss_patch,
+    submit_distractor_enrichment,
+)
 from models import GamePhase, NodeType, Player, WordCard, CardType
-from state_utils import reset_combat_flags
+from state_utils import record_action, reset_combat_flags, start_action_log
 from systems import WordPool, MapSystem
 from systems.run_flow_utils import dump_map_state, restore_map_state
+from systems.run_rng import RunRandom
 from registries import EventRegistry
+from services.ai_metrics import get_metrics
+from services.boss_refresh import BossRefreshPlanner
+from services.local_quiz import get_local_quiz_engine
 from ui.components import render_hud
 from ui.renderers import (
     render_main_menu, render_word_library, render_map_select, 
@@ -47,6 +63,13 @@ def _warn_missing_kimi_key():
         st.session_state._warned_missing_kimi = True
         st.error("⚠️ KIMI_API_KEY 未配置，AI 内容将使用 Mock 生成。")
 
+def _start_metrics_flush():
+    """定期把 AI 调用指标写入本地文件（进程内只启动一次）"""
+    path = Path(AI_METRICS_FILE)
+    if not path.is_absolute():
+        path = _current_dir / path
+    get_metrics().start_periodic_flush(str(path), AI_METRICS_FLUSH_SECONDS)
+
 class GameManager:
     """游戏核心控制器 v5.4"""
     
@@ -56,9 +79,13 @@ class GameManager:
     def _init_session_state(self):
         if 'db' not in st.session_state:
             st.session_state.db = GameDB()
+            # 本地出题引擎按词性取干扰项（进程级，新会话时刷新）
+            get_local_quiz_engine().load_distractors(st.session_state.db.get_distractor_pool())
         
         if 'db_player' not in st.session_state:
             st.session_state.db_player = st.session_state.db.get_or_create_player()
+            # 新会话：补齐上次未完成的干扰词扩充（无 API Key 时第一批即停止）
+            submit_distractor_enrichment(st.session_state.db, st.session_state.db_player['id'])
         
         if 'player' not in st.session_state:
             st.session_state.player = Player(
@@ -80,8 +107,9 @@ class GameManager:
         
         if 'boss_article_cache' not in st.session_state:
             st.session_state.boss_article_cache = None
-        if 'boss_generation_queue' not in st.session_state:
-            st.session_state.boss_generation_queue = queue.Queue()
+
+        if 'session_uid' not in st.session_state:
+            st.session_state.session_uid = uuid.uuid4().hex
 
     def _serialize_card_pool(self, cards: list) -> list:
         serialized = []
@@ -127,6 +155,7 @@ class GameManager:
         player = st.session_state.player
         game_map = st.session_state.get("game_map")
         map_state = dump_map_state(game_map)
+        rng = st.session_state.get("run_rng")
         return {
             "gold": player.gold,
             "hp": player.hp,
@@ -134,23 +163,69 @@ class GameManager:
             "armor": player.armor,
             "relics": list(player.relics),
             "inventory": list(player.inventory),
+            "monkey_paw_used": player.flags.monkey_paw_used,
             "game_word_pool": self._serialize_card_pool(st.session_state.get("game_word_pool", [])),
             "run_gold_upgraded_words": list(st.session_state.get("run_gold_upgraded_words", [])),
             "map_state": map_state,
+            "run_uid": st.session_state.get("run_uid"),
+            "rng": rng.snapshot() if rng is not None else None,
         }
 
-    def _consume_boss_queue(self):
-        q = st.session_state.get("boss_generation_queue")
-        if not q:
+    def _consume_boss_job(self):
+        handle = st.session_state.get("boss_job")
+        if handle is None or not handle.done():
+            return
+        result = handle.result()
+        del st.session_state.boss_job
+        if result:
+            st.session_state.boss_article_cache = result
+            st.session_state.boss_generation_status = 'ready'
+        elif not st.session_state.get("boss_article_cache"):
+            st.session_state.boss_generation_status = 'failed'
+
+    def _refresh_boss_for_deck(self):
+        """
+        牌组变化后（选牌、黑卡清除等）检查 Boss 文章对当前牌组的覆盖率，
+        低于阈值时提交增量补丁，让 Boss 开场即可使用与牌组一致的内容
+        """
+        if st.session_state.get("phase") != GamePhase.MAP_SELECT or "boss_state" in st.session_state:
+            return
+        payload = st.session_state.get("boss_article_cache")
+        player = st.session_state.get("player")
+        if not payload or player is None or st.session_state.get("boss_job") is not None:
+            return
+        planner = st.session_state.get("boss_refresh_planner")
+        if planner is None:
+            planner = st.session_state.boss_refresh_planner = BossRefreshPlanner()
+
+        deck_words = [c.word for c in player.deck]
+        word_hash = word_set_hash(deck_words)
+        if not planner.deck_changed(word_hash):
             return
-        try:
-            while True:
-                result = q.get_nowait()
-                st.session_state.boss_article_cache = result
-                st.session_state.boss_generation_status = 'ready'
-        except queue.Empty:
+        missing = planner.plan(payload, deck_words)
+        if not missing:
             return
 
+        db = st.session_state.db
+        player_id = st.session_state.db_player["id"]
+        run_uid = st.session_state.run_uid
+        # 旧内容保持可用，补丁完成后 _consume_boss_job 替换缓存
+        st.session_state.boss_job_run = run_uid
+        st.session_state.boss_job = submit_boss_patch(
+            payload,
+            deck_words,
+            missing,
+            owner=st.session_state.session_uid,
+            on_result=lambda patched: db.save_boss_content(player_id, run_uid, word_hash, patched),
+        )
+
+    def _cancel_boss_job(self):
+        """放弃本局时释放 Boss 生成任务，避免后台继续调用 API"""
+        handle = st.session_state.get("boss_job")
+        if handle is not None:
+            handle.cancel()
+            del st.session_state.boss_job
+
     
     def start_new_game(self):
         """开始新游戏"""
@@ -168,8 +243,13 @@ class GameManager:
             st.warning("⚠️ 词库不足！请先在单词图书馆添加至少 10 个单词")
             return
         
+        # 本局随机数：种子随存档记录，可复现整局
+        rng = st.session_state.run_rng = RunRandom(RUN_SEED)
+
         # 2. 从池中抽取初始卡组 (6红+2蓝+1金 = 9张)
-        initial_deck = db.get_initial_deck_from_pool(game_pool, INITIAL_DECK_RED, INITIAL_DECK_BLUE, INITIAL_DECK_GOLD)
+        initial_deck = db.get_initial_deck_from_pool(
+            game_pool, INITIAL_DECK_RED, INITIAL_DECK_BLUE, INITIAL_DECK_GOLD, rng=rng
+        )
         
         # 3. 转换为 WordCard
         deck_cards = self._build_cards(initial_deck)
@@ -192,18 +272,18 @@ class GameManager:
         # 注意：这里我们将所有42张卡都作为 candidates
         all_pool_cards = deck_cards + remaining_pool_cards
         st.session_state.full_draft_pool = all_pool_cards
+        st.session_state.run_uid = uuid.uuid4().hex
+        start_action_log(st.session_state.run_uid, rng.run_seed, words=game_pool)
         st.session_state.in_game_streak = {}
         st.session_state.run_gold_upgraded_words = []
         
         # 7. 初始化地图
-        st.session_state.game_map = MapSystem(total_floors=TOTAL_FLOORS)
+        st.session_state.game_map = MapSystem(total_floors=TOTAL_FLOORS, rng=rng)
         st.session_state.game_map.next_options = st.session_state.game_map.generate_next_options()
         
         # 8. Boss生成 (后台)
         st.session_state.boss_article_cache = None
-        st.session_state.boss_generation_queue = queue.Queue()
         all_words_list = [{**w, "word": w['word']} for w in game_pool]
-        st.session_state.boss_generation_status = 'generating'
         self._start_background_boss_generation(all_words_list)
         
         # 清除旧状态
@@ -219,6 +299,9 @@ class GameManager:
             'pending_card_price',
             'shop_card_choices',
             'shop_card_choice_type',
+            'prep_selected_indices',
+            'seen_events',
+            'last_node_type',
         ]:
             if key in st.session_state:
                 del st.session_state[key]
@@ -258,17 +341,20 @@ class GameManager:
             relics=relics,
             current_room=save.get("floor", 0),
         )
+        st.session_state.player.flags.monkey_paw_used = bool(state.get("monkey_paw_used"))
         st.session_state.in_game_streak = {}
+        rng = st.session_state.run_rng = RunRandom.from_snapshot(state.get("rng"))
         
         # 恢复地图
-        st.session_state.game_map = MapSystem(total_floors=TOTAL_FLOORS)
+        st.session_state.game_map = MapSystem(total_floors=TOTAL_FLOORS, rng=rng)
         st.session_state.game_map.floor = save.get('floor', 0)
         restore_map_state(st.session_state.game_map, state.get("map_state"))
         st.session_state.game_map.next_options = st.session_state.game_map.generate_next_options()
         
         st.session_state.word_pool = WordPool(
             new_words=[{"word": c.word, "meaning": c.meaning, "tier": c.tier} for c in deck_cards if c.tier <= 1],
-            review_words=[{"word": c.word, "meaning": c.meaning, "tier": c.tier} for c in deck_cards if c.tier > 1]
+            review_words=[{"word": c.word, "meaning": c.meaning, "tier": c.tier} for c in deck_cards if c.tier > 1],
+            rng=rng,
         )
         
         # v6.0 恢复本局游戏词池 (用于战利品奖励)
@@ -284,6 +370,12 @@ class GameManager:
         for key in ('pending_card_purchase', 'pending_card_price', 'shop_card_choices', 'shop_card_choice_type'):
             if key in st.session_state:
                 del st.session_state[key]
+
+        # 恢复 Boss 内容：优先读库，缺失或为降级内容时后台重新生成
+        st.session_state.run_uid = state.get("run_uid") or uuid.uuid4().hex
+        start_action_log(st.session_state.run_uid, rng.run_seed, restore=True)
+        boss_words = [c.word for c in deck_cards] + [c.word for c in st.session_state.game_word_pool]
+        self._restore_boss_content(boss_words)
         
         st.session_state.phase = GamePhase.MAP_SELECT
         st.rerun()
@@ -324,39 +416,90 @@ class GameManager:
         st.rerun()
     
     def _start_background_boss_generation(self, all_words: list):
-        """在后台线程中生成 Boss 文章"""
+        """
+        准备 Boss 内容，开局关键路径上不做同步生成：
+        1. 相同词集已生成过 → 直接读库
+        2. 离线内容库有足够重叠的条目 → 立即可用，缺失单词提交小补丁任务
+        3. 否则提交完整生成任务到进程级调度器
+        """
+        self._cancel_boss_job()
+        st.session_state.boss_refresh_planner = BossRefreshPlanner()
         word_list = [w['word'] for w in all_words if w.get('word')]
-        result_queue = st.session_state.boss_generation_queue
-
-        def _generate(words: list, out_q: queue.Queue):
-            try:
-                ai = CyberMind()
-                article = ai.generate_article(words)
-                article_content = article.get("content") if article else ""
-                if article and article_content:
-                    quizzes = ai.generate_quiz(words, article_content)
-                    result = {
-                        'article': article,
-                        'quizzes': quizzes
-                    }
-                else:
-                    result = {
-                        'article': MockGenerator.generate_article(words),
-                        'quizzes': MockGenerator.generate_quiz(words)
-                    }
-            except Exception:
-                result = {
-                    'article': MockGenerator.generate_article(words),
-                    'quizzes': MockGenerator.generate_quiz(words)
-                }
-
-            out_q.put(result)
-
-        thread = threading.Thread(target=_generate, args=(word_list, result_queue), daemon=True)
-        thread.start()
+        db = st.session_state.db
+        player_id = st.session_state.db_player["id"]
+        run_uid = st.session_state.run_uid
+        word_hash = word_set_hash(word_list)
+
+        stored = db.get_boss_content(player_id, word_hash=word_hash)
+        if stored and stored.get("source") == "ai":
+            get_metrics().record_cache_hit("boss_content")
+            payload = {"article": stored["article"], "quizzes": stored["quizzes"], "source": "ai"}
+            db.save_boss_content(player_id, run_uid, word_hash, payload)
+            st.session_state.boss_article_cache = payload
+            st.session_state.boss_generation_status = 'ready'
+            return
+
+        def _persist(payload: dict):
+            db.save_boss_content(player_id, run_uid, word_hash, payload)
+
+        banked = db.find_bank_entry(player_id, word_list, BOSS_BANK_MIN_OVERLAP)
+        if banked:
+            get_metrics().record_cache_hit("boss_bank")
+            article = CyberMind.normalize_article_payload(banked["article"], word_list) or banked["article"]
+            payload = {"article": article, "quizzes": banked["quizzes"], "source": "ai"}
+            if banked["missing_words"]:
+                # 未覆盖本局词集：以 bank 来源落库，不会被词集查询当作完整 AI 内容；
+                # 继续游戏时若补丁仍未落库，会重新走一遍本流程
+                _persist({**payload, "source": "bank"})
+            else:
+                _persist(payload)
+            st.session_state.boss_article_cache = payload
+            st.session_state.boss_generation_status = 'ready'
+            if banked["missing_words"]:
+                # 补丁完成后 _consume_boss_job 会替换缓存；失败则继续使用库内容
+                st.session_state.boss_job_run = run_uid
+                st.session_state.boss_job = submit_boss_patch(
+                    payload,
+                    word_list,
+                    banked["missing_words"],
+                    owner=st.session_state.session_uid,
+                    on_result=_persist,
+                )
+            return
+
+        st.session_state.boss_generation_status = 'generating'
+        st.session_state.boss_job_run = run_uid
+        st.session_state.boss_job = submit_boss_generation(
+            word_list,
+            owner=st.session_state.session_uid,
+            on_result=_persist,
+        )
+
+    def _restore_boss_content(self, words: list):
+        """继续游戏时从数据库恢复本局 Boss 内容"""
+        st.session_state.boss_refresh_planner = BossRefreshPlanner()
+        if st.session_state.get("boss_job") is not None and st.session_state.get("boss_job_run") == st.session_state.run_uid:
+            return  # 本局任务仍在生成，结果完成后会落库
+        stored = st.session_state.db.get_boss_content(
+            st.session_state.db_player["id"],
+            run_uid=st.session_state.run_uid,
+        )
+        if stored and stored.get("source") == "ai":
+            get_metrics().record_cache_hit("boss_content")
+            st.session_state.boss_article_cache = {
+                "article": stored["article"],
+                "quizzes": stored["quizzes"],
+                "source": "ai",
+            }
+            st.session_state.boss_generation_status = 'ready'
+            return
+        st.session_state.boss_article_cache = None
+        self._start_background_boss_generation([{"word": w} for w in words])
     
     def enter_node(self, node):
         """进入节点"""
+        options = st.session_state.game_map.next_options
+        record_action("node", next((i for i, n in enumerate(options) if n is node), None), node)
         st.session_state.game_map.current_node = node
         st.session_state.phase = GamePhase.IN_NODE
         
@@ -430,6 +573,7 @@ class GameManager:
         words = [c.word for c in st.session_state.player.deck]
         st.session_state.db.end_run(player_id, floor, victory, words)
         
+        self._cancel_boss_job()
         st.session_state.boss_article_cache = None
         st.session_state.phase = GamePhase.VICTORY if victory else GamePhase.GAME_OVER
         st.rerun()
@@ -445,8 +589,10 @@ class GameManager:
 def render_game():
     """游戏主渲染入口"""
     gm = GameManager()
-    gm._consume_boss_queue()
+    gm._consume_boss_job()
+    gm._refresh_boss_for_deck()
     _warn_missing_kimi_key()
+    _start_metrics_flush()
     phase = st.session_state.phase
     
     # 主菜单和图书馆不显示 HUD
@@ -3,10 +3,10 @@
 # ==========================================
 from __future__ import annotations
 from enum import Enum, IntEnum
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, List, Dict, Any, Optional, Tuple
 import random
-import streamlit as st
+import weakref
 from config import HAND_SIZE, GOLD_CARD_USES
 
 
@@ -124,13 +124,28 @@ CARD_STATS = {
 }
 
 
-@dataclass
+# temp_level -> 局内颜色覆盖的卡牌类型
+_TEMP_LEVEL_TYPES = {
+    "red": CardType.RED_BERSERK,
+    "blue": CardType.BLUE_HYBRID,
+    "gold": CardType.GOLD_SUPPORT,
+    "black": CardType.BLACK_CURSE,
+}
+# 修改这些字段会使缓存的卡牌类型/数值失效
+_CARD_TYPE_FIELDS = frozenset({"tier", "temp_level", "is_blackened"})
+# 修改这些字段会改变抽牌权重（通知所在抽牌堆的采样器）
+_DRAW_WEIGHT_FIELDS = _CARD_TYPE_FIELDS | {"wrong_streak", "priority"}
+
+
+@dataclass(slots=True)
 class WordCard:
-    """单词卡牌"""
+    """单词卡牌（__slots__ + 缓存有效类型与数值，战斗循环最内层对象）"""
+    # 所在抽牌堆采样器的弱引用；放在最前：__init__ 先写入它，之后的字段写入经过 __setattr__ 时总能读到
+    _watcher: Any = field(default=None, init=False, repr=False, compare=False)
     word: str
     meaning: str
     tier: int
-    _card_type: CardType = field(default=None, repr=False)
+    _card_type: CardType = field(default=None, repr=False, compare=False)
     learned: bool = False
     consecutive_correct: int = 0
     priority: str = "normal"
@@ -139,16 +154,30 @@ class WordCard:
     temp_level: str = None     # 局内颜色状态 (red/blue/gold/black)
     is_temporary_buffed: bool = False # 蓝卡回血 5 Buff
     gold_uses_remaining: int = 0  # ????????(??????)
-    
+    _stats: dict = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        """卡牌类型相关字段写入时清空类型缓存；抽牌权重相关字段写入时通知采样器"""
+        object.__setattr__(self, name, value)
+        if name in _DRAW_WEIGHT_FIELDS:
+            if name in _CARD_TYPE_FIELDS:
+                object.__setattr__(self, "_card_type", None)
+            self._notify_watcher()
+
     @property
     def card_type(self) -> CardType:
-        """根据黑化状态或 tier 计算卡牌类型"""
-        if self.is_blackened:
-            return CardType.BLACK_CURSE
-        if self.temp_level:
-            mapping = {"red": CardType.RED_BERSERK, "blue": CardType.BLUE_HYBRID, "gold": CardType.GOLD_SUPPORT, "black": CardType.BLACK_CURSE}
-            return mapping.get(self.temp_level, CardType.from_tier(self.tier))
-        return CardType.from_tier(self.tier)
+        """根据黑化状态或 tier 计算卡牌类型（结果缓存到相关字段变化为止）"""
+        card_type = self._card_type
+        if card_type is None:
+            if self.is_blackened:
+                card_type = CardType.BLACK_CURSE
+            elif self.temp_level:
+                card_type = _TEMP_LEVEL_TYPES.get(self.temp_level) or CardType.from_tier(self.tier)
+            else:
+                card_type = CardType.from_tier(self.tier)
+            object.__setattr__(self, "_card_type", card_type)
+            object.__setattr__(self, "_stats", CARD_STATS.get(card_type, {}))
+        return card_type
     
     @property
     def icon(self) -> str:
@@ -156,7 +185,9 @@ class WordCard:
     
     @property
     def stats(self) -> dict:
-        return CARD_STATS.get(self.card_type, {})
+        if self._card_type is None:
+            self.card_type
+        return self._stats
     
     @property
     def damage(self) -> int:
@@ -178,6 +209,22 @@ class WordCard:
     def buff(self) -> Optional[str]:
         return self.stats.get("buff")
     
+    def _notify_watcher(self):
+        """抽牌权重相关字段变化：通知所在抽牌堆的采样器（弱引用，不在抽牌堆或战斗已结束时为 None）"""
+        ref = self._watcher
+        watcher = ref() if ref is not None else None
+        if watcher is not None:
+            watcher.card_changed(self)
+
+    def __getstate__(self) -> dict:
+        """pickle / deepcopy 不带上采样器引用（战斗结束后即失效）"""
+        return {name: getattr(self, name) for name in _STATE_FIELDS}
+
+    def __setstate__(self, state: dict):
+        object.__setattr__(self, "_watcher", None)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     def to_dict(self) -> dict:
         return {
             "word": self.word,
@@ -190,6 +237,9 @@ class WordCard:
         }
 
 
+_STATE_FIELDS = tuple(f.name for f in fields(WordCard) if f.name != "_watcher")
+
+
 @dataclass
 class Enemy:
     """敌人 v6.0 - 随层数动态增强"""
@@ -211,6 +261,7 @@ class Enemy:
     attack_interval: Optional[int] = None  # Fixed attack interval.
     fixed_attack: Optional[int] = None  # Fixed attack damage.
     fixed_timer: Optional[int] = None  # Initial countdown for fixed attacks.
+    rng: Any = field(default=None, repr=False, compare=False)  # 本局随机数，None 时使用全局 random
 
     def __post_init__(self):
         from config import ENEMY_HP_BASE, ENEMY_HP_ELITE, ENEMY_HP_GROWTH, ENEMY_ATTACK
@@ -236,7 +287,7 @@ class Enemy:
         self.hp = base_hp
         self.max_hp = base_hp
         self.attack = self.base_attack
-        self.action_timer = random.randint(3, 5)
+        self.action_timer = (self.rng or random).randint(3, 5)
         self.current_timer = self.action_timer
         self.turns_elapsed = 0
 
@@ -257,7 +308,7 @@ class Enemy:
 
         self.current_timer -= 1
         if self.current_timer <= 0:
-            self.current_timer = random.randint(3, 5)
+            self.current_timer = (self.rng or random).randint(3, 5)
             self.attack = self.base_attack + max(0, self.turns_elapsed - 3) * 3
             return "attack"
         return "charge"
@@ -276,6 +327,267 @@ class CombatPhase(Enum):
     DEFEAT = "defeat"
 
 
+class CardPile:
+    """
+    牌堆视图：按加入顺序保存卡牌，以卡牌对象 id 为键
+
+    增删与成员判断 O(1)；顺序列表在变更后首次按下标访问/遍历时重建并缓存，
+    渲染层每帧 hand[i] 不再重复拷贝
+    """
+    __slots__ = ("name", "_cards", "_ordered")
+
+    def __init__(self, name: str, cards: Optional[List[WordCard]] = None):
+        self.name = name
+        self._cards: Dict[int, WordCard] = {}
+        self._ordered: Optional[List[WordCard]] = None
+        for card in cards or []:
+            self._cards[id(card)] = card
+
+    def _order(self) -> List[WordCard]:
+        if self._ordered is None:
+            self._ordered = list(self._cards.values())
+        return self._ordered
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._order())
+
+    def __contains__(self, card) -> bool:
+        return id(card) in self._cards
+
+    def __getitem__(self, index):
+        return self._order()[index]
+
+    def __repr__(self) -> str:
+        return f"CardPile({self.name!r}, {[c.word for c in self._cards.values()]!r})"
+
+    def copy(self) -> List[WordCard]:
+        return list(self._order())
+
+    def shuffle(self, rng=random):
+        cards = list(self._cards.values())
+        rng.shuffle(cards)
+        self._cards = {id(card): card for card in cards}
+        self._ordered = None
+
+    def _add(self, card: WordCard):
+        self._cards[id(card)] = card
+        self._ordered = None
+
+    def _discard(self, card: WordCard) -> bool:
+        if self._cards.pop(id(card), None) is None:
+            return False
+        self._ordered = None
+        return True
+
+    def _clear(self):
+        self._cards.clear()
+        self._ordered = None
+
+
+# 抽牌权重（整数，避免树状数组累加的浮点误差）：类型基础权重 ×1.8 连错 ×1.5 幽灵词
+_DRAW_BASE_WEIGHTS = {
+    CardType.RED_BERSERK: 500,
+    CardType.BLUE_HYBRID: 300,
+    CardType.GOLD_SUPPORT: 200,
+}
+
+
+def draw_weight(card: WordCard) -> int:
+    weight = _DRAW_BASE_WEIGHTS.get(card.card_type, 500)
+    if getattr(card, "wrong_streak", 0) > 0:
+        weight = weight * 18 // 10
+    if getattr(card, "priority", "") == "ghost":
+        weight = weight * 15 // 10
+    return weight
+
+
+class WeightedDrawSampler:
+    """
+    抽牌堆加权采样：树状数组 (Fenwick) 按槽位保存权重
+
+    - 加入/移出/权重变化 O(log n)，按权重采样 O(log n)
+    - 按卡牌类型分桶，偏好抽牌直接在桶内等概率选取
+    - 卡牌类型、连错、幽灵标记变化时由 WordCard 回调 card_changed
+    - 卡牌只持有采样器的弱引用：战斗胜利时 end_combat() 主动断开，战斗状态被丢弃后也不会再被回调
+    """
+
+    def __init__(self):
+        self._tree: List[int] = [0]
+        self._weights: List[int] = []
+        self._cards: List[Optional[WordCard]] = []
+        self._types: List[Optional[CardType]] = []
+        self._slot: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._buckets: Dict[CardType, List[WordCard]] = {}
+        self._bucket_pos: Dict[int, int] = {}
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def _tree_add(self, slot: int, delta: int):
+        index = slot + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _grow(self):
+        """容量翻倍后 O(n) 重建树"""
+        capacity = max(8, len(self._cards) * 2)
+        extra = capacity - len(self._cards)
+        self._free.extend(range(capacity - 1, len(self._cards) - 1, -1))
+        self._cards.extend([None] * extra)
+        self._types.extend([None] * extra)
+        self._weights.extend([0] * extra)
+        self._tree = [0] * (capacity + 1)
+        for slot, weight in enumerate(self._weights):
+            index = slot + 1
+            self._tree[index] += weight
+            parent = index + (index & -index)
+            if parent <= capacity:
+                self._tree[parent] += self._tree[index]
+
+    def _bucket_add(self, card: WordCard, card_type: CardType):
+        bucket = self._buckets.setdefault(card_type, [])
+        self._bucket_pos[id(card)] = len(bucket)
+        bucket.append(card)
+
+    def _bucket_remove(self, card: WordCard, card_type: CardType):
+        bucket = self._buckets[card_type]
+        pos = self._bucket_pos.pop(id(card))
+        last = bucket.pop()
+        if last is not card:
+            bucket[pos] = last
+            self._bucket_pos[id(last)] = pos
+
+    def add(self, card: WordCard):
+        if id(card) in self._slot:
+            return
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        weight = draw_weight(card)
+        self._slot[id(card)] = slot
+        self._cards[slot] = card
+        self._types[slot] = card.card_type
+        self._weights[slot] = weight
+        self._tree_add(slot, weight)
+        self.total += weight
+        self._bucket_add(card, card.card_type)
+        object.__setattr__(card, "_watcher", weakref.ref(self))
+
+    def remove(self, card: WordCard) -> bool:
+        slot = self._slot.pop(id(card), None)
+        if slot is None:
+            return False
+        self._tree_add(slot, -self._weights[slot])
+        self.total -= self._weights[slot]
+        self._bucket_remove(card, self._types[slot])
+        self._cards[slot] = None
+        self._types[slot] = None
+        self._weights[slot] = 0
+        self._free.append(slot)
+        if card._watcher is not None and card._watcher() is self:
+            object.__setattr__(card, "_watcher", None)
+        return True
+
+    def card_changed(self, card: WordCard):
+        """卡牌属性变化：O(log n) 更新权重与类型分桶"""
+        slot = self._slot.get(id(card))
+        if slot is None or self._cards[slot] is not card:
+            return
+        weight = draw_weight(card)
+        if weight != self._weights[slot]:
+            self._tree_add(slot, weight - self._weights[slot])
+            self.total += weight - self._weights[slot]
+            self._weights[slot] = weight
+        card_type = card.card_type
+        if card_type != self._types[slot]:
+            self._bucket_remove(card, self._types[slot])
+            self._bucket_add(card, card_type)
+            self._types[slot] = card_type
+
+    def _find(self, target: int) -> int:
+        """返回前缀和首次超过 target 的槽位"""
+        index, step = 0, 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = index + step
+            if nxt < len(self._tree) and self._tree[nxt] <= target:
+                index = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return index
+
+    def sample(self, rng=random) -> Optional[WordCard]:
+        """按权重随机选一张（不移出）"""
+        while self.total > 0:
+            card = self._cards[self._find(rng.randrange(self.total))]
+            # 卡牌同时处于多个战斗的抽牌堆时，其他采样器的权重可能过期：校正后重抽
+            if draw_weight(card) == self._weights[self._slot[id(card)]]:
+                return card
+            self.card_changed(card)
+        return None
+
+    def cards_of_type(self, card_type: CardType) -> List[WordCard]:
+        return self._buckets.get(card_type) or []
+
+    def clear(self):
+        for card in [c for c in self._cards if c is not None]:
+            self.remove(card)
+
+
+class CardPiles:
+    """战斗牌堆管理：卡牌 id -> 所在牌堆 的索引，牌堆间移动 O(1)"""
+
+    PILES = ("draw_pile", "hand", "discard", "exhausted")
+
+    def __init__(self):
+        self._piles: Dict[str, CardPile] = {name: CardPile(name) for name in self.PILES}
+        self._location: Dict[int, str] = {}
+        self.sampler = WeightedDrawSampler()
+
+    def __getitem__(self, name: str) -> CardPile:
+        return self._piles[name]
+
+    def location(self, card: WordCard) -> Optional[str]:
+        return self._location.get(id(card))
+
+    def move(self, card: WordCard, to: str):
+        """把卡牌移到目标牌堆末尾（不在任何牌堆时直接加入）"""
+        self.remove(card)
+        self._piles[to]._add(card)
+        self._location[id(card)] = to
+        if to == "draw_pile":
+            self.sampler.add(card)
+
+    def remove(self, card: WordCard) -> bool:
+        where = self._location.pop(id(card), None)
+        if where is None:
+            return False
+        self._piles[where]._discard(card)
+        if where == "draw_pile":
+            self.sampler.remove(card)
+        return True
+
+    def reset(self, name: str, cards: List[WordCard]):
+        """用给定卡牌替换整个牌堆（卡牌从原牌堆移出）"""
+        for card in self._piles[name].copy():
+            self.remove(card)
+        for card in cards:
+            self.move(card, name)
+
+    def transfer_all(self, source: str, target: str, rng=None):
+        """整堆移动（可先洗牌），如弃牌堆洗回抽牌堆"""
+        cards = self._piles[source].copy()
+        if rng is not None:
+            rng.shuffle(cards)
+        for card in cards:
+            self.move(card, target)
+
+
 @dataclass
 class CardCombatState:
     """卡牌战斗状态 v6.0"""
@@ -283,10 +595,7 @@ class CardCombatState:
     deck: List[WordCard]
     enemy: Enemy = None
     word_pool: List[WordCard] = field(default_factory=list) # 用于干扰项生成
-    hand: List[WordCard] = field(default_factory=list)
-    discard: List[WordCard] = field(default_factory=list)
-    draw_pile: List[WordCard] = field(default_factory=list)
-    exhausted: List[WordCard] = field(default_factory=list)
+    piles: CardPiles = field(default_factory=CardPiles, repr=False)
     hand_size: int = HAND_SIZE
     phase: CombatPhase = CombatPhase.LOADING
     current_card: Optional[WordCard] = None
@@ -304,10 +613,11 @@ class CardCombatState:
     bleed_turns: int = 0
     nunchaku_used: bool = False
     extra_action_only_red: bool = False
+    rng: Any = field(default=None, repr=False, compare=False)  # 本局随机数，None 时使用全局 random
     
     def __post_init__(self):
         if self.enemy is None:
-            self.enemy = Enemy()
+            self.enemy = Enemy(rng=self.rng)
 
         # ????????
         if self.player:
@@ -320,35 +630,53 @@ class CardCombatState:
                 c.gold_uses_remaining = gold_uses
 
         # ?????? (??)
-        self.draw_pile = self.deck.copy()
-        random.shuffle(self.draw_pile)
+        draw_pile = list(self.deck)
+        (self.rng or random).shuffle(draw_pile)
+        self.piles.reset("draw_pile", draw_pile)
 
         # ????? (?????)
-        self.word_pool = self.deck.copy()
+        self.word_pool = list(self.deck)
+        self.deck = CardPile("deck", self.deck)
 
         # ???????
         self.player.reset_block()
 
+    @property
+    def hand(self) -> CardPile:
+        return self.piles["hand"]
+
+    @property
+    def draw_pile(self) -> CardPile:
+        return self.piles["draw_pile"]
+
+    @property
+    def discard(self) -> CardPile:
+        return self.piles["discard"]
+
+    @property
+    def exhausted(self) -> CardPile:
+        return self.piles["exhausted"]
+
     def ensure_black_in_hand(self) -> bool:
         """若有黑卡，保证至少一张进入手牌"""
         if any(c.card_type == CardType.BLACK_CURSE for c in self.hand):
             return False
-        for c in list(self.draw_pile):
+        for c in self.draw_pile:
             if c.card_type == CardType.BLACK_CURSE:
-                self.draw_pile.remove(c)
-                self.hand.append(c)
+                self.piles.move(c, "hand")
                 return True
         return False
 
     def load_card(self, card: WordCard) -> bool:
         if len(self.hand) >= self.hand_size:
             return False
-        self.hand.append(card)
+        self.piles.move(card, "hand")
         return True
     
     def unload_card(self, card: WordCard):
+        """卸下弹仓中的卡牌，放回抽牌堆"""
         if card in self.hand:
-            self.hand.remove(card)
+            self.piles.move(card, "draw_pile")
     
     def count_by_type(self, card_type: CardType) -> int:
         return sum(1 for c in self.hand if c.card_type == card_type)
@@ -357,20 +685,22 @@ class CardCombatState:
         # 移除红卡限制：只要有 3+ 张卡即可开战
         return len(self.hand) >= 3
     
+    def end_combat(self):
+        """战斗结束：断开抽牌堆卡牌与采样器的关联（之后不再抽牌）"""
+        self.piles.sampler.clear()
+
     def start_battle(self):
         self.phase = CombatPhase.BATTLE
         self.turns = 0
     
     def _remove_from_all_piles(self, card: WordCard):
-        for pile in (self.deck, self.draw_pile, self.discard, self.hand, self.exhausted):
-            while card in pile:
-                pile.remove(card)
+        self.piles.remove(card)
+        self.deck._discard(card)
 
     def play_card(self, card: WordCard) -> bool:
         self.current_card = card
         removed = False
         if card in self.hand:
-            self.hand.remove(card)
             if card.card_type == CardType.GOLD_SUPPORT:
                 if card.gold_uses_remaining > 0:
                     card.gold_uses_remaining -= 1
@@ -378,49 +708,25 @@ class CardCombatState:
                     removed = True
                     self._remove_from_all_piles(card)
                     return removed
-            self.discard.append(card)  # discard after play
+            self.piles.move(card, "discard")  # discard after play
         return removed
     def recycle_discard(self) -> bool:
         """将弃牌堆洗回抽牌堆（杀戮尖塔机制）"""
         if not self.discard:
             return False
-        import random
-        self.draw_pile = self.discard.copy()
-        random.shuffle(self.draw_pile)
-        self.discard.clear()
+        self.piles.transfer_all("discard", "draw_pile", rng=self.rng or random)
         return True
     
     def draw_card(self) -> Optional[WordCard]:
-        """???????????"""
+        """按权重从抽牌堆抽一张（红 50 / 蓝 30 / 金 20，连错 ×1.8，幽灵词 ×1.5）"""
         if not self.draw_pile:
             if not self.recycle_discard():
                 return None
 
-        if self.draw_pile:
-            candidates = self.draw_pile
-            weights = []
-            for c in candidates:
-                if c.card_type == CardType.RED_BERSERK:
-                    base = 50
-                elif c.card_type == CardType.BLUE_HYBRID:
-                    base = 30
-                elif c.card_type == CardType.GOLD_SUPPORT:
-                    base = 20
-                else:
-                    base = 50
-
-                if getattr(c, "wrong_streak", 0) > 0:
-                    base *= 1.8
-                if getattr(c, "priority", "") == "ghost":
-                    base *= 1.5
-
-                weights.append(base)
-
-            selected = random.choices(candidates, weights=weights, k=1)[0]
-            self.draw_pile.remove(selected)
-            self.hand.append(selected)
-            return selected
-        return None
+        selected = self.piles.sampler.sample(self.rng or random)
+        if selected is not None:
+            self.piles.move(selected, "hand")
+        return selected
 
     def draw_with_preference(self, prefer_types: List[CardType], count: int) -> List[WordCard]:
         """Draw cards with preferred types first."""
@@ -431,19 +737,48 @@ class CardCombatState:
                     break
             selected = None
             for t in prefer_types:
-                candidates = [c for c in self.draw_pile if c.card_type == t]
+                candidates = self.piles.sampler.cards_of_type(t)
                 if candidates:
-                    selected = random.choice(candidates)
+                    selected = (self.rng or random).choice(candidates)
                     break
             if selected is None:
                 selected = self.draw_card()
                 if selected is not None:
                     drawn.append(selected)
                 continue
-            self.draw_pile.remove(selected)
-            self.hand.append(selected)
+            self.piles.move(selected, "hand")
             drawn.append(selected)
         return drawn
+
+
+# ==========================================
+# 🚩 局内标记
+# ==========================================
+@dataclass
+class RunFlags:
+    """道具、遗物、诅咒留下的局内标记（纯数据，不依赖 UI）"""
+    item_shield: bool = False           # 护盾：抵消下一次攻击
+    item_damage_reduce: int = 0         # 下一次受到攻击的减伤
+    item_hint: int = 0                  # 剩余提示次数（排除错误选项）
+    greedy_curse: bool = False          # 贪婪之理：受到伤害翻倍
+    player_stunned: bool = False        # 下回合被眩晕
+    end_turn_due_to_item: bool = False  # 使用道具后直接进入敌人回合
+    monkey_paw_used: bool = False       # 猴爪本局已抵御过致命伤害
+
+    COMBAT_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "item_shield",
+        "item_damage_reduce",
+        "item_hint",
+        "greedy_curse",
+        "player_stunned",
+    )
+
+    def reset_combat(self):
+        """清除只在单场战斗内有效的标记"""
+        for name in self.COMBAT_FIELDS:
+            setattr(self, name, type(self).__dataclass_fields__[name].default)
+
+
 @dataclass
 class Player:
     """玩家"""
@@ -462,26 +797,60 @@ class Player:
     deck_limit: int = 9               # 卡组上限
     blue_card_heal_buff: bool = False # 蓝卡回血 Buff (兼容旧代码，新逻辑在卡牌上)
     gold_card_purchased: bool = False # 是否已购买金卡 (兼容旧字段)
-    
+    flags: RunFlags = field(default_factory=RunFlags, repr=False, compare=False)
+
+    # ------------------------------------------
+    # 卡组索引：单词 -> 卡牌列表（同一单词可能有多张牌）
+    # deck 整体赋值时重建索引；增删单张卡必须走 add_card_to_deck / remove_card_from_deck
+    # ------------------------------------------
+    def _get_deck(self) -> List[WordCard]:
+        return self._deck
+
+    def _set_deck(self, cards: List[WordCard]):
+        self._deck = cards
+        self._reindex_deck()
+
+    def _reindex_deck(self):
+        index: Dict[str, List[WordCard]] = {}
+        for card in self._deck:
+            index.setdefault(card.word, []).append(card)
+        self._deck_index = index
+
+    @property
+    def deck_words(self):
+        """卡组中的单词集合（集合视图，成员判断 O(1)）"""
+        return self._deck_index.keys()
+
+    def cards_for_word(self, word: str) -> List[WordCard]:
+        return list(self._deck_index.get(word, ()))
+
+    def set_word_tier(self, word: str, tier: int):
+        """同步卡组中该单词所有卡牌的永久等级（未黑化的卡同时清除局内颜色）"""
+        for card in self._deck_index.get(word, ()):
+            card.tier = tier
+            if not card.is_blackened:
+                card.temp_level = None
+
+    def remove_card_from_deck(self, card: WordCard) -> bool:
+        cards = self._deck_index.get(card.word)
+        if not cards or not any(c is card for c in cards):
+            return False
+        del self._deck[next(i for i, c in enumerate(self._deck) if c is card)]
+        cards[:] = [c for c in cards if c is not card]
+        if not cards:
+            del self._deck_index[card.word]
+        return True
+
     def change_hp(self, amount: int, notify=None):
         def emit(level: str, text: str, icon: str = None):
             if notify:
                 notify(level, text, icon)
-                return
-            if level == "success":
-                st.success(text)
-            elif level == "warning":
-                st.warning(text)
-            elif level == "error":
-                st.error(text)
-            else:
-                st.toast(text, icon=icon)
 
         if "MONKEY_PAW" in self.relics and self.max_hp > 50:
             self.max_hp = 50
             self.hp = min(self.hp, self.max_hp)
         # v6.0 ???????????
-        if amount < 0 and st.session_state.get("_greedy_curse", False):
+        if amount < 0 and self.flags.greedy_curse:
             amount *= 2
             emit("warning", "\u8d2a\u5a6a\u4e4b\u7406\uff1a\u53d7\u5230\u4f24\u5bb3\u7ffb\u500d")
 
@@ -497,8 +866,8 @@ class Player:
                 emit("toast", f"\u62a4\u7532\u5438\u6536 {absorbed}")
 
         if amount < 0 and "MONKEY_PAW" in self.relics:
-            if self.hp + amount <= 0 and not st.session_state.get("_monkey_paw_used", False):
-                st.session_state._monkey_paw_used = True
+            if self.hp + amount <= 0 and not self.flags.monkey_paw_used:
+                self.flags.monkey_paw_used = True
                 self.hp = 1
                 emit("warning", "\u7334\u722a\u62b5\u5fa1\u81f4\u547d\u4f24\u5bb3")
                 return
@@ -518,15 +887,11 @@ class Player:
         self.armor += amount
         if notify:
             notify("toast", f"\u62a4\u7532 +{amount}")
-        else:
-            st.toast(f"\u62a4\u7532 +{amount}")
 
     def add_gold(self, amount: int, notify=None):
         self.gold += amount
         if notify:
             notify("toast", f"\u91d1\u5e01 +{amount}")
-        else:
-            st.toast(f"\u91d1\u5e01 +{amount}")
 
     def is_dead(self) -> bool:
         return self.hp <= 0
@@ -542,7 +907,12 @@ class Player:
         if "UNDYING_CURSE" in self.relics:
             card.is_blackened = True
             card.temp_level = "black"
-        self.deck.append(card)
+        self._deck.append(card)
+        self._deck_index.setdefault(card.word, []).append(card)
+
+
+# deck 仍是 dataclass 字段（构造参数 / repr / 比较），实例上的读写经过属性：只有整体赋值会重建索引
+Player.deck = property(Player._get_deck, Player._set_deck)
 
 
 @dataclass
@@ -584,9 +954,22 @@ class BossState:
 
 @dataclass
 class RunState:
-    """存档状态"""
+    """
+    一局游戏的核心状态（存档 + 战斗引擎读写）
+
+    纯数据对象，不依赖 Streamlit；UI 层用 state_utils.SessionRunState 适配 session_state
+    """
     player: Optional[Player] = None
     floor: int = 0
     total_floors: int = 6
     deck: List[dict] = field(default_factory=list)
     in_progress: bool = False
+    word_pool: List[WordCard] = field(default_factory=list)        # 本局剩余词池
+    in_game_streak: Dict[str, int] = field(default_factory=dict)   # 局内连对次数
+    gold_upgraded_words: List[str] = field(default_factory=list)   # 本局升为金卡的单词
+    black_correct_streak: Dict[str, int] = field(default_factory=dict)
+    rng: Optional[random.Random] = field(default=None, repr=False, compare=False)
+
+    @property
+    def flags(self) -> RunFlags:
+        return self.player.flags
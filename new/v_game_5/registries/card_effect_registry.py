@@ -38,7 +38,7 @@ def _red_heavy_strike(ctx: EffectContext):
     if "FIGHTER_SOUL" in relics and ctx.cs.last_card_type == CardType.BLUE_HYBRID:
         crit_chance = 0.2
         crit_bonus = 3
-        if random.random() < crit_chance:
+        if (ctx.cs.rng or random).random() < crit_chance:
             damage += crit_bonus
             _emit(ctx, "toast", "🥊 暴击！额外伤害 +3", "🥊")
     if "START_BURNING_BLOOD" in relics and ctx.player.hp < 50:
@@ -145,7 +145,7 @@ def _gold_random_effect(ctx: EffectContext):
         if (ctx.enemy.hp / max_hp) > 0.5:
             weights["damage"] += 2
 
-    effect = random.choices(
+    effect = (getattr(ctx.cs, "rng", None) or random).choices(
         ["mult", "draw", "damage"],
         weights=[weights["mult"], weights["draw"], weights["damage"]],
         k=1,
@@ -133,9 +133,9 @@ class EventRegistry:
         return EVENTS.copy()
 
     @staticmethod
-    def get_random() -> tuple:
+    def get_random(rng=None) -> tuple:
         import random
-        event_id = random.choice(list(EVENTS.keys()))
+        event_id = (rng or random).choice(list(EVENTS.keys()))
         return event_id, EVENTS[event_id]
 
     @staticmethod
@@ -288,10 +288,10 @@ class RelicRegistry:
         return {k: v for k, v in RELICS.items() if v.rarity == rarity}
 
     @staticmethod
-    def get_random(rarity: str = None) -> tuple:
+    def get_random(rarity: str = None, rng=None) -> tuple:
         import random
         pool = RELICS if not rarity else {k: v for k, v in RELICS.items() if v.rarity == rarity}
-        relic_id = random.choice(list(pool.keys()))
+        relic_id = (rng or random).choice(list(pool.keys()))
         return relic_id, pool[relic_id]
 
     @staticmethod
@@ -175,13 +175,19 @@ class ShopRegistry:
         return SHOP_ITEMS.copy()
 
     @staticmethod
-    def get_random_selection(count: int = 3) -> Dict[str, ShopItem]:
-        keys = random.sample(list(SHOP_ITEMS.keys()), min(count, len(SHOP_ITEMS)))
+    def get_random_selection(count: int = 3, rng=None) -> Dict[str, ShopItem]:
+        keys = (rng or random).sample(list(SHOP_ITEMS.keys()), min(count, len(SHOP_ITEMS)))
         return {k: SHOP_ITEMS[k] for k in keys}
 
     @staticmethod
-    def get_shop_inventory(total_slots: int = 4, relic_chance: float = 0.2, exclude_relics: Optional[set] = None) -> Dict[str, Any]:
+    def get_shop_inventory(
+        total_slots: int = 4,
+        relic_chance: float = 0.2,
+        exclude_relics: Optional[set] = None,
+        rng=None,
+    ) -> Dict[str, Any]:
         from registries import RelicRegistry
+        rng = rng or random
         exclude_relics = exclude_relics or set()
         low_pool = set(RelicRegistry.get_pool("low"))
         relic_ids = [
@@ -193,7 +199,7 @@ class ShopRegistry:
         inventory = {"relic_slots": [], "other_slots": []}
 
         if relic_ids:
-            picks = random.sample(relic_ids, min(3, len(relic_ids)))
+            picks = rng.sample(relic_ids, min(3, len(relic_ids)))
             inventory["relic_slots"] = [(rid, SHOP_ITEMS[rid]) for rid in picks]
             relic_ids = [rid for rid in relic_ids if rid not in picks]
 
@@ -202,7 +208,7 @@ class ShopRegistry:
             pool = normal_ids
             if not pool:
                 break
-            pick = random.choice(pool)
+            pick = rng.choice(pool)
             inventory["other_slots"].append((pick, SHOP_ITEMS[pick]))
             if pick in normal_ids:
                 normal_ids.remove(pick)
@@ -0,0 +1,68 @@
+# ==========================================
+# Services 包初始化
+# ==========================================
+import sys
+from pathlib import Path
+
+# 添加父目录到路径
+_parent = Path(__file__).parent.parent
+if str(_parent) not in sys.path:
+    sys.path.insert(0, str(_parent))
+
+from services.ai_scheduler import (
+    AIJob,
+    AIJobHandle,
+    AIJobScheduler,
+    JobCancelled,
+    PRIORITY_BOSS,
+    PRIORITY_MEANINGS,
+    PRIORITY_ENRICHMENT,
+    current_job,
+    get_scheduler,
+    payload_hash,
+)
+from services.ai_metrics import AIMetrics, Histogram, get_metrics
+from services.circuit_breaker import CircuitBreaker, backoff_delay
+from services.client_registry import ClientRegistry, get_client
+from services.word_coverage import find_missing_words
+from services.rate_limiter import RateLimiter, TokenBucket, estimate_tokens
+from services.local_quiz import LocalQuizEngine, SentenceCorpus, get_local_quiz_engine
+from services.single_flight import SingleFlight
+from services.enrichment import DistractorEnricher, normalize_pos
+from services.prompt_builder import TEMPLATES, build_prompt, trim_context
+from services.boss_refresh import BossRefreshPlanner, deck_coverage
+
+__all__ = [
+    'AIJob',
+    'AIJobHandle',
+    'AIJobScheduler',
+    'JobCancelled',
+    'PRIORITY_BOSS',
+    'PRIORITY_MEANINGS',
+    'PRIORITY_ENRICHMENT',
+    'current_job',
+    'get_scheduler',
+    'payload_hash',
+    'AIMetrics',
+    'Histogram',
+    'get_metrics',
+    'CircuitBreaker',
+    'backoff_delay',
+    'ClientRegistry',
+    'get_client',
+    'find_missing_words',
+    'RateLimiter',
+    'TokenBucket',
+    'estimate_tokens',
+    'LocalQuizEngine',
+    'SentenceCorpus',
+    'get_local_quiz_engine',
+    'SingleFlight',
+    'DistractorEnricher',
+    'normalize_pos',
+    'TEMPLATES',
+    'build_prompt',
+    'trim_context',
+    'BossRefreshPlanner',
+    'deck_coverage',
+]
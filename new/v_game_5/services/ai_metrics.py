@@ -0,0 +1,175 @@
+# ==========================================
+# 📊 AI 调用指标 - 延迟/Token/重试/降级
+# ==========================================
+"""
+AIMetrics 负责：
+1. 按调用类型记录请求延迟直方图、prompt/completion token、重试次数与结果
+2. 记录缓存命中（复用已生成内容、任务去重等）与降级到 Mock 的原因
+3. 进程内注册表 (get_metrics) + 后台线程定期写入本地 JSON 指标文件
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# 延迟直方图桶上界（秒），最后一个桶收纳所有更慢的请求
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, float("inf"))
+
+
+class Histogram:
+    """固定桶直方图（非线程安全，由 AIMetrics 加锁）"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """按桶上界估算分位数"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return self.max if bound == float("inf") else bound
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "max": round(self.max, 4),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(self.buckets, self.counts)
+            },
+        }
+
+
+class AIMetrics:
+    """线程安全的 AI 指标注册表"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._stop = threading.Event()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._latency = defaultdict(Histogram)      # call_type -> 单次 HTTP 请求延迟
+            self._call_latency = defaultdict(Histogram)  # call_type -> 含重试/退避的总耗时
+            self._counters = defaultdict(int)
+            self._started_at = time.time()
+
+    def _inc(self, key: str, amount: int = 1):
+        self._counters[key] += amount
+
+    # ------------------------------------------
+    # 记录
+    # ------------------------------------------
+    def record_request(self, call_type: str, latency: float, status: str, usage=None):
+        """单次 HTTP 请求：status 为 ok / error / parse_error"""
+        call_type = call_type or "unknown"
+        with self._lock:
+            self._latency[call_type].observe(latency)
+            self._inc(f"requests.{call_type}.{status}")
+            if usage is not None:
+                self._inc(f"tokens.{call_type}.prompt", int(getattr(usage, "prompt_tokens", 0) or 0))
+                self._inc(f"tokens.{call_type}.completion", int(getattr(usage, "completion_tokens", 0) or 0))
+
+    def record_call(self, call_type: str, latency: float, attempts: int, outcome: str):
+        """一次 _call 的整体结果：outcome 为 ok / failed / breaker_open / no_client"""
+        call_type = call_type or "unknown"
+        with self._lock:
+            self._call_latency[call_type].observe(latency)
+            self._inc(f"calls.{call_type}.{outcome}")
+            self._inc(f"retries.{call_type}", max(0, attempts - 1))
+
+    def record_cache_hit(self, name: str):
+        with self._lock:
+            self._inc(f"cache_hits.{name}")
+
+    def record_prompt(self, call_type: str, sent_tokens: int, saved_tokens: int):
+        """提示词体积：实际发送的估算 token 与上下文裁剪节省的 token"""
+        call_type = call_type or "unknown"
+        with self._lock:
+            self._inc(f"prompt_tokens.{call_type}.sent", int(sent_tokens))
+            self._inc(f"prompt_tokens.{call_type}.saved", int(saved_tokens))
+
+    def record_fallback(self, call_type: str, reason: str):
+        with self._lock:
+            self._inc(f"fallbacks.{call_type or 'unknown'}.{reason or 'unknown'}")
+
+    # ------------------------------------------
+    # 导出
+    # ------------------------------------------
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self._started_at,
+                "updated_at": time.time(),
+                "request_latency": {k: h.to_dict() for k, h in self._latency.items()},
+                "call_latency": {k: h.to_dict() for k, h in self._call_latency.items()},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def flush(self, path: str):
+        """原子写入指标文件（先写临时文件再替换）"""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.snapshot(), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def start_periodic_flush(self, path: str, interval: float):
+        """启动后台写文件线程（幂等），进程退出时再写一次"""
+        with self._lock:
+            if self._flusher is not None or interval <= 0:
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_loop, args=(path, interval), name="ai-metrics", daemon=True
+            )
+            self._flusher.start()
+        atexit.register(self._safe_flush, path)
+
+    def _safe_flush(self, path: str):
+        try:
+            self.flush(path)
+        except OSError:
+            pass
+
+    def _flush_loop(self, path: str, interval: float):
+        while not self._stop.wait(interval):
+            self._safe_flush(path)
+
+
+_metrics = AIMetrics()
+
+
+def get_metrics() -> AIMetrics:
+    """进程级指标注册表"""
+    return _metrics
@@ -0,0 +1,287 @@
+# ==========================================
+# 🧵 AI 任务调度器 - 进程级共享
+# ==========================================
+"""
+AIJobScheduler 负责：
+1. 用进程级有界线程池执行所有 AI 后台任务
+2. 按 payload 哈希去重：相同请求只执行一次，多个会话共享同一结果
+3. 按优先级出队：Boss > 释义 > 干扰项扩充
+4. 会话只持有任务句柄；所有持有者都取消后任务不再继续调用 API
+5. 每个提交者可登记自己的 on_result 回调（如按本局落库），共享任务完成后逐个执行
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+_parent = Path(__file__).parent.parent
+if str(_parent) not in sys.path:
+    sys.path.insert(0, str(_parent))
+
+from config import AI_WORKER_COUNT
+from services.ai_metrics import get_metrics
+
+
+# 数值越小越先执行
+PRIORITY_BOSS = 0
+PRIORITY_MEANINGS = 1
+PRIORITY_ENRICHMENT = 2
+
+_local = threading.local()
+
+
+def payload_hash(kind: str, payload: Any) -> str:
+    """任务去重键：任务类型 + 规范化 JSON 的 SHA1"""
+    raw = json.dumps({"kind": kind, "payload": payload}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def current_job() -> Optional["AIJob"]:
+    """返回当前工作线程正在执行的任务（非调度线程返回 None）"""
+    return getattr(_local, "job", None)
+
+
+class JobCancelled(Exception):
+    """任务已被所有持有者取消"""
+
+
+class AIJob:
+    """调度器内部的任务实体，同一 payload 只对应一个"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    CANCELLED = "cancelled"
+
+    def __init__(self, key: str, kind: str, priority: int, fn: Callable[["AIJob"], Any]):
+        self.key = key
+        self.kind = kind
+        self.priority = priority
+        self.state = AIJob.PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.queue_position: Optional[int] = None  # 运行中等待限流时的排队位置
+        self._seq = 0
+        self._fn = fn
+        self._owners: set = set()
+        self._callbacks: list = []
+        self._done = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.state == AIJob.CANCELLED
+
+    def check_cancelled(self):
+        """在多步任务的步骤之间调用，已取消则中止"""
+        if self.cancelled:
+            raise JobCancelled(self.key)
+
+
+class AIJobHandle:
+    """会话持有的任务句柄"""
+
+    def __init__(self, scheduler: "AIJobScheduler", job: AIJob, owner: Any):
+        self._scheduler = scheduler
+        self._job = job
+        self.owner = owner
+
+    @property
+    def kind(self) -> str:
+        return self._job.kind
+
+    @property
+    def key(self) -> str:
+        return self._job.key
+
+    @property
+    def state(self) -> str:
+        return self._job.state
+
+    @property
+    def cancelled(self) -> bool:
+        return self._job.cancelled
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._job.error
+
+    @property
+    def queue_position(self) -> Optional[int]:
+        """预估前方还有多少个请求；未在排队时返回 None"""
+        return self._scheduler.queue_position(self._job)
+
+    def done(self) -> bool:
+        return self._job._done.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """等待任务结束；超时、取消或失败时返回 None"""
+        if not self._job._done.wait(timeout):
+            return None
+        return self._job.result
+
+    def cancel(self):
+        """释放本句柄；没有其他持有者时任务被取消"""
+        self._scheduler._release(self._job, self.owner)
+
+
+class AIJobScheduler:
+    """进程级 AI 任务调度器"""
+
+    def __init__(self, max_workers: int = AI_WORKER_COUNT):
+        self._max_workers = max(1, int(max_workers))
+        self._cond = threading.Condition()
+        self._queue: list = []  # (priority, seq, job)
+        self._jobs: Dict[str, AIJob] = {}  # 未结束的任务，按去重键索引
+        self._seq = itertools.count()
+        self._workers: list = []
+
+    def submit(
+        self,
+        kind: str,
+        payload: Any,
+        fn: Callable[[AIJob], Any],
+        priority: int = PRIORITY_ENRICHMENT,
+        owner: Any = None,
+        on_result: Optional[Callable[[Any], None]] = None,
+    ) -> AIJobHandle:
+        """
+        提交任务
+
+        Args:
+            kind: 任务类型（参与去重）
+            payload: 请求内容（参与去重）
+            fn: 执行函数，接收 AIJob，可调用 job.check_cancelled()
+            priority: PRIORITY_* 常量
+            owner: 持有者标识（通常是会话 id）
+            on_result: 任务产出非 None 结果后在工作线程中回调 (result)；
+                加入已有任务的提交者也会各自收到回调，会话提前结束不影响回调
+        """
+        if owner is None:
+            owner = object()
+        key = payload_hash(kind, payload)
+        with self._cond:
+            job = self._jobs.get(key)
+            if job is None:
+                job = AIJob(key, kind, priority, fn)
+                self._jobs[key] = job
+                self._enqueue(job)
+            else:
+                get_metrics().record_cache_hit(f"job.{kind}")
+                if job.state == AIJob.PENDING and priority < job.priority:
+                    # 提升优先级：重新入队，旧条目出队时会被跳过
+                    job.priority = priority
+                    self._enqueue(job)
+            job._owners.add(owner)
+            if on_result is not None:
+                job._callbacks.append(on_result)
+        return AIJobHandle(self, job, owner)
+
+    def pending_count(self, max_priority: Optional[int] = None) -> int:
+        """排队中的任务数；max_priority 只统计不低于该优先级的任务"""
+        with self._cond:
+            return sum(
+                1 for job in self._jobs.values()
+                if job.state == AIJob.PENDING and (max_priority is None or job.priority <= max_priority)
+            )
+
+    def queue_position(self, job: AIJob) -> Optional[int]:
+        """
+        预估排队位置
+        - 运行中：限流器报告的位置
+        - 排队中：前方的排队任务数 + 正在运行的任务数
+        """
+        with self._cond:
+            if job.state == AIJob.RUNNING:
+                return job.queue_position
+            if job.state != AIJob.PENDING:
+                return None
+            running = sum(1 for other in self._jobs.values() if other.state == AIJob.RUNNING)
+            ahead = sum(
+                1 for other in self._jobs.values()
+                if other.state == AIJob.PENDING and (other.priority, other._seq) < (job.priority, job._seq)
+            )
+            return ahead + running
+
+    def _enqueue(self, job: AIJob):
+        job._seq = next(self._seq)
+        heapq.heappush(self._queue, (job.priority, job._seq, job))
+        if len(self._workers) < self._max_workers:
+            worker = threading.Thread(target=self._worker_loop, name=f"ai-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+        self._cond.notify()
+
+    def _release(self, job: AIJob, owner: Any):
+        with self._cond:
+            job._owners.discard(owner)
+            if job._owners or job._done.is_set():
+                return
+            job.state = AIJob.CANCELLED
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+        job._done.set()
+
+    def _next_job(self) -> AIJob:
+        with self._cond:
+            while True:
+                while not self._queue:
+                    self._cond.wait()
+                priority, _, job = heapq.heappop(self._queue)
+                if job.state != AIJob.PENDING or priority != job.priority:
+                    continue
+                job.state = AIJob.RUNNING
+                return job
+
+    def _worker_loop(self):
+        while True:
+            job = self._next_job()
+            _local.job = job
+            result, error = None, None
+            try:
+                result = job._fn(job)
+            except JobCancelled:
+                pass
+            except Exception as e:
+                logging.exception("AI job failed: %s", job.kind)
+                error = str(e)
+            finally:
+                _local.job = None
+
+            with self._cond:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+                callbacks = []
+                if job.state == AIJob.RUNNING:
+                    job.state = AIJob.DONE
+                    job.result = result
+                    job.error = error
+                    if result is not None:
+                        # 任务已移出去重表，之后不会再有提交者加入
+                        callbacks = list(job._callbacks)
+                job._callbacks = []
+            for callback in callbacks:
+                try:
+                    callback(result)
+                except Exception:
+                    logging.exception("AI job callback failed: %s", job.kind)
+            job._done.set()
+
+
+_scheduler: Optional[AIJobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> AIJobScheduler:
+    """进程级单例（Streamlit 重跑脚本不会重新导入模块）"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = AIJobScheduler()
+    return _scheduler
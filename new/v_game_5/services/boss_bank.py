@@ -0,0 +1,121 @@
+# ==========================================
+# 🏦 Boss 离线内容库 - 离峰预生成
+# ==========================================
+"""
+BossBank 负责：
+1. 预测玩家下一局最可能的单词池（高优先级/幽灵词 + 久未复习的词 + 若干随机抽样）
+2. 批量调用 AI 生成文章与题目，按词集写入 boss_content_bank
+3. 命令行入口，供 cron 等在离峰时段执行：
+
+    python -m services.boss_bank --variants 3 --off-peak 1-6
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import (
+    BOSS_BANK_SKIP_OVERLAP,
+    BOSS_BANK_VARIANTS,
+    GAME_POOL_RED,
+    GAME_POOL_BLUE,
+    GAME_POOL_GOLD,
+)
+from database import GameDB, word_set_hash
+
+
+def predict_pools(db: GameDB, player_id: int, variants: int = BOSS_BANK_VARIANTS) -> list:
+    """
+    预测候选词池 (去重后的单词列表)
+
+    第一个候选是确定性的高优先级池，其余为 get_game_pool 的随机抽样
+    """
+    candidates = [db.get_likely_game_pool(player_id, GAME_POOL_RED, GAME_POOL_BLUE, GAME_POOL_GOLD)]
+    for _ in range(max(0, variants - 1)):
+        candidates.append(db.get_game_pool(player_id, GAME_POOL_RED, GAME_POOL_BLUE, GAME_POOL_GOLD))
+
+    pools = []
+    seen = set()
+    for rows in candidates:
+        words = [row['word'] for row in rows if row.get('word')]
+        if not words:
+            continue
+        key = word_set_hash(words)
+        if key in seen:
+            continue
+        seen.add(key)
+        pools.append(words)
+    return pools
+
+
+def fill_bank(
+    db: GameDB,
+    player_ids: list,
+    variants: int = BOSS_BANK_VARIANTS,
+    generate: Optional[Callable[[list], dict]] = None,
+) -> int:
+    """
+    为每个玩家的候选词池预生成 Boss 内容
+
+    Args:
+        generate: (words) -> {"article", "quizzes", "source"}，默认 ai_service.generate_boss_payload
+
+    Returns:
+        新写入的条目数（Mock 降级的结果不入库）
+    """
+    if generate is None:
+        from ai_service import generate_boss_payload as generate
+
+    created = 0
+    for player_id in player_ids:
+        for words in predict_pools(db, player_id, variants):
+            if db.find_bank_entry(player_id, words, BOSS_BANK_SKIP_OVERLAP):
+                continue
+            try:
+                payload = generate(words)
+            except Exception:
+                logging.exception("Boss bank generation failed for player %s", player_id)
+                continue
+            if not payload or payload.get("source") != "ai":
+                continue
+            db.save_bank_entry(player_id, words, payload)
+            created += 1
+    return created
+
+
+def _in_window(window: str, hour: int) -> bool:
+    """判断小时是否落在 "start-end" 区间内（支持跨零点，如 22-6）"""
+    start, end = (int(part) for part in window.split("-", 1))
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="离线预生成 Boss 文章与题目")
+    parser.add_argument("--db", default=None, help="数据库路径，默认使用 config.DB_NAME")
+    parser.add_argument("--player", type=int, action="append", help="只处理指定玩家，可重复")
+    parser.add_argument("--variants", type=int, default=BOSS_BANK_VARIANTS, help="每个玩家的候选词池数量")
+    parser.add_argument("--off-peak", default=None, help="仅在该小时区间内运行，如 1-6")
+    args = parser.parse_args(argv)
+
+    if args.off_peak and not _in_window(args.off_peak, datetime.now().hour):
+        print(f"[BossBank] 当前不在离峰时段 {args.off_peak}，跳过")
+        return 0
+
+    db = GameDB(args.db)
+    player_ids = args.player or db.get_player_ids()
+    created = fill_bank(db, player_ids, args.variants)
+    print(f"[BossBank] 新增 {created} 条预生成内容")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# ==========================================
+# 🔄 Boss 内容跟随牌组刷新
+# ==========================================
+"""
+BossRefreshPlanner 负责：
+1. 以词集指纹识别牌组变化（选牌、黑卡清除等），牌组不变时不做任何计算
+2. 计算已准备的 Boss 文章对当前牌组的覆盖率
+3. 覆盖率低于阈值时给出需要增量补丁的单词（数量有上限，保证补丁请求足够小）
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import BOSS_REFRESH_MAX_MISSING, BOSS_REFRESH_MIN_COVERAGE
+from services.word_coverage import find_missing_words
+
+
+def _unique_words(words: list) -> list:
+    seen, unique = set(), []
+    for word in words or []:
+        token = str(word or "").strip()
+        if token and token.lower() not in seen:
+            seen.add(token.lower())
+            unique.append(token)
+    return unique
+
+
+def deck_coverage(payload: dict, deck_words: list) -> tuple:
+    """
+    Returns:
+        (覆盖率, 文章中缺失的牌组单词)；牌组为空时覆盖率为 1.0
+    """
+    words = _unique_words(deck_words)
+    if not words:
+        return 1.0, []
+    article = (payload or {}).get("article") or {}
+    content = str(article.get("content") or article.get("article_english") or "")
+    missing = find_missing_words(content, words)
+    return 1 - len(missing) / len(words), missing
+
+
+class BossRefreshPlanner:
+    """牌组变化时判断是否需要为 Boss 内容做增量补丁"""
+
+    def __init__(
+        self,
+        min_coverage: float = BOSS_REFRESH_MIN_COVERAGE,
+        max_missing: int = BOSS_REFRESH_MAX_MISSING,
+    ):
+        self.min_coverage = min_coverage
+        self.max_missing = max_missing
+        self._last_signature: Optional[str] = None
+
+    def deck_changed(self, signature: str) -> bool:
+        """记录最新牌组指纹，返回是否与上次检查不同"""
+        if signature == self._last_signature:
+            return False
+        self._last_signature = signature
+        return True
+
+    def plan(self, payload: dict, deck_words: list) -> list:
+        """
+        Returns:
+            需要补丁的单词（最近加入牌组的优先）；覆盖率达标时返回空列表
+        """
+        coverage, missing = deck_coverage(payload, deck_words)
+        if coverage >= self.min_coverage:
+            return []
+        # 牌组按加入顺序排列，新选的牌在末尾
+        return missing[-self.max_missing:]
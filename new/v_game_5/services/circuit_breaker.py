@@ -0,0 +1,77 @@
+# ==========================================
+# 🔌 熔断器与退避 - 上游故障保护
+# ==========================================
+"""
+CircuitBreaker 负责：
+1. 连续失败达到阈值后熔断，熔断期间直接拒绝请求（调用方降级到 Mock）
+2. 冷却结束后放行一个探测请求，成功则恢复，失败则继续熔断
+"""
+
+import random
+import threading
+import time
+from typing import Callable
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng=random) -> float:
+    """
+    指数退避 + 全抖动
+
+    Args:
+        attempt: 第几次重试 (从 0 开始)
+        base: 首次退避上限（秒）
+        cap: 退避上限（秒）
+    """
+    ceiling = min(cap, base * (2 ** max(0, attempt)))
+    return rng.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """线程安全的三态熔断器 (closed → open → half_open)"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitBreaker.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        """是否允许发起请求；半开状态下同一时间只放行一个探测"""
+        with self._lock:
+            if self._state == CircuitBreaker.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = CircuitBreaker.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == CircuitBreaker.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = CircuitBreaker.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitBreaker.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = CircuitBreaker.OPEN
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
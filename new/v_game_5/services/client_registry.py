@@ -0,0 +1,94 @@
+# ==========================================
+# 🔗 HTTP 客户端注册表 - 进程级连接池复用
+# ==========================================
+"""
+ClientRegistry 负责：
+1. 每个 (base_url, api_key) 只创建一个 OpenAI 客户端
+2. 客户端共享一个有上限、保持长连接的 httpx 连接池
+3. 多会话、多工作线程并发获取时线程安全
+"""
+
+import hashlib
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_parent = Path(__file__).parent.parent
+if str(_parent) not in sys.path:
+    sys.path.insert(0, str(_parent))
+
+from config import (
+    AI_REQUEST_TIMEOUT,
+    AI_MAX_CONNECTIONS,
+    AI_MAX_KEEPALIVE_CONNECTIONS,
+    AI_KEEPALIVE_EXPIRY,
+)
+
+
+def _create_openai_client(api_key: str, base_url: str) -> Any:
+    """默认工厂：带连接池上限与长连接的 OpenAI 客户端"""
+    import httpx
+    from openai import OpenAI, DefaultHttpxClient
+
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=AI_MAX_CONNECTIONS,
+            max_keepalive_connections=AI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=AI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=AI_REQUEST_TIMEOUT,
+    )
+    # 重试由 CyberMind._call 统一控制，关闭 SDK 内置重试
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=AI_REQUEST_TIMEOUT,
+        max_retries=0,
+        http_client=http_client,
+    )
+
+
+class ClientRegistry:
+    """按 (base_url, api_key) 缓存客户端"""
+
+    def __init__(self, factory: Callable[[str, str], Any] = None):
+        self._factory = factory or _create_openai_client
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(api_key: str, base_url: str) -> Tuple[str, str]:
+        # 不在内存索引里保留明文密钥
+        return base_url, hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def get(self, api_key: str, base_url: str) -> Optional[Any]:
+        if not api_key:
+            return None
+        key = self._key(api_key, base_url)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._factory(api_key, base_url)
+                self._clients[key] = client
+        return client
+
+    def close_all(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            close = getattr(client, "close", None)
+            if close:
+                close()
+
+
+_registry = ClientRegistry()
+
+
+def get_client(api_key: str, base_url: str) -> Optional[Any]:
+    """获取进程级共享客户端；未配置密钥时返回 None"""
+    return _registry.get(api_key, base_url)
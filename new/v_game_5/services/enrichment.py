@@ -0,0 +1,115 @@
+# ==========================================
+# 🧪 干扰项扩充 - 后台低优先级批处理
+# ==========================================
+"""
+DistractorEnricher 负责：
+1. 找出牌组中尚未进入 distractor_pool 的新词，按批打包
+2. 一次请求批量获取词性与近义易混词 (confusables)
+3. 用 executemany 批量写回 distractor_pool，并刷新本地出题引擎的词性分桶
+4. 自我节流：有更高优先级任务排队时立即让路，留待下次触发继续
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import ENRICHMENT_BATCH_SIZE, ENRICHMENT_MAX_BATCHES
+from services.ai_scheduler import PRIORITY_MEANINGS, get_scheduler
+from services.local_quiz import get_local_quiz_engine
+
+_POS_ALIASES = {
+    "n": "n", "noun": "n",
+    "v": "v", "verb": "v",
+    "adj": "adj", "adjective": "adj",
+    "adv": "adv", "adverb": "adv",
+}
+
+
+def normalize_pos(pos: str) -> str:
+    key = str(pos or "").strip().lower().rstrip(".")
+    return _POS_ALIASES.get(key, "unknown")
+
+
+def _interactive_work_pending() -> bool:
+    return get_scheduler().pending_count(max_priority=PRIORITY_MEANINGS) > 0
+
+
+class DistractorEnricher:
+    """批量扩充干扰词库"""
+
+    def __init__(
+        self,
+        db,
+        classify: Callable[[list], Optional[dict]],
+        batch_size: int = ENRICHMENT_BATCH_SIZE,
+        max_batches: int = ENRICHMENT_MAX_BATCHES,
+        is_busy: Callable[[], bool] = _interactive_work_pending,
+    ):
+        """
+        Args:
+            classify: (words) -> {"words": [{"word", "meaning", "pos", "confusables": [...]}]}
+            is_busy: 返回 True 时停止本轮扩充，把 API 让给交互请求
+        """
+        self.db = db
+        self.classify = classify
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.is_busy = is_busy
+
+    @staticmethod
+    def build_rows(result: dict, deck_words: list) -> list:
+        """把 AI 返回整理成 (word, meaning, pos) 行；牌组已有释义优先"""
+        deck_meanings = {
+            str(w.get("word", "")).lower(): str(w.get("meaning") or "")
+            for w in deck_words
+        }
+        rows = {}
+
+        def _add(word, meaning, pos):
+            word = str(word or "").strip()
+            meaning = str(meaning or "").strip()
+            if not word or not meaning or meaning == "待学习":
+                return
+            rows.setdefault(word.lower(), (word, meaning, pos))
+
+        for item in (result or {}).get("words") or []:
+            if not isinstance(item, dict):
+                continue
+            pos = normalize_pos(item.get("pos"))
+            word = str(item.get("word") or "").strip()
+            deck_meaning = deck_meanings.get(word.lower(), "")
+            _add(word, deck_meaning if deck_meaning not in ("", "待学习") else item.get("meaning"), pos)
+            for confusable in item.get("confusables") or []:
+                if isinstance(confusable, dict):
+                    _add(confusable.get("word"), confusable.get("meaning"), normalize_pos(confusable.get("pos") or pos))
+        return list(rows.values())
+
+    def run(self, player_id: int, job=None) -> int:
+        """
+        执行若干批扩充
+
+        Returns:
+            写入/更新的干扰词数量
+        """
+        total = 0
+        for _ in range(self.max_batches):
+            if self.is_busy():
+                break
+            if job is not None:
+                job.check_cancelled()
+            deck_words = self.db.get_words_missing_distractors(player_id, self.batch_size)
+            if not deck_words:
+                break
+            rows = self.build_rows(self.classify([w["word"] for w in deck_words]), deck_words)
+            batch = {w["word"].lower() for w in deck_words}
+            if not any(word.lower() in batch for word, _, _ in rows):
+                break  # AI 不可用或没有覆盖本批单词，下次触发再试
+            total += self.db.upsert_distractors(rows)
+            get_local_quiz_engine().load_distractors(
+                {"word": word, "meaning": meaning, "pos": pos} for word, meaning, pos in rows
+            )
+        return total
@@ -0,0 +1,230 @@
+# ==========================================
+# 🧩 本地完形题引擎 - 例句库 + 同词性干扰项
+# ==========================================
+"""
+LocalQuizEngine 负责：
+1. 按词头索引例句库（内置 data/example_sentences.tsv + 用户自定义文件）
+2. 毫秒级生成完形填空题：例句中挖掉目标词
+3. 干扰项优先取 distractor_pool 中同词性的单词，不足时用同批目标词/其他词补齐
+
+支持的例句文件格式：
+- .tsv: 单词<TAB>词性<TAB>例句 或 单词<TAB>例句（# 开头为注释）
+- .jsonl: {"word": ..., "sentence": ..., "pos": ...}
+- 其他: 每行一句，按句中所有单词建立索引
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import EXAMPLE_CORPUS_PATH
+
+BUNDLED_CORPUS_PATH = _parent_dir / "data" / "example_sentences.tsv"
+
+_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z'-]*")
+BLANK = "______"
+
+
+class SentenceCorpus:
+    """例句索引：小写词头 -> 例句列表"""
+
+    def __init__(self):
+        self._index = defaultdict(list)
+        self._pos = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, sentence: str, headword: str = None, pos: str = None):
+        sentence = str(sentence or "").strip()
+        if not sentence:
+            return
+        keys = {headword.strip().lower()} if headword else set()
+        keys.update(token.lower() for token in _TOKEN_RE.findall(sentence))
+        for key in keys:
+            if key and sentence not in self._index[key]:
+                self._index[key].append(sentence)
+        if headword and pos:
+            self._pos.setdefault(headword.strip().lower(), (headword.strip(), pos.strip().lower()))
+
+    def load(self, path) -> int:
+        """加载例句文件，返回读取的例句数；文件不存在时返回 0"""
+        path = Path(path)
+        if not path.is_file():
+            return 0
+        count = 0
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if path.suffix == ".jsonl":
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.add(row.get("sentence"), row.get("word"), row.get("pos"))
+                elif path.suffix == ".tsv":
+                    parts = line.split("\t")
+                    if len(parts) >= 3:
+                        self.add(parts[2], parts[0], parts[1])
+                    elif len(parts) == 2:
+                        self.add(parts[1], parts[0])
+                    else:
+                        continue
+                else:
+                    self.add(line)
+                count += 1
+        return count
+
+    def sentences_for(self, word: str) -> list:
+        return self._index.get(str(word or "").strip().lower(), [])
+
+    def pos_of(self, word: str) -> Optional[str]:
+        entry = self._pos.get(str(word or "").strip().lower())
+        return entry[1] if entry else None
+
+    def headwords_by_pos(self) -> dict:
+        buckets = defaultdict(list)
+        for display, pos in self._pos.values():
+            buckets[pos].append(display)
+        return buckets
+
+
+class LocalQuizEngine:
+    """
+    根据例句库生成 Boss 词汇题（与 AI 返回的 vocab_attacks 结构一致）
+
+    词性分桶由干扰词扩充线程写入、由 UI 线程读取：写入持锁，出题时持锁取快照。
+    """
+
+    def __init__(self, corpus: SentenceCorpus, rng: random.Random = None):
+        self.corpus = corpus
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._pos_of = {}
+        self._display = {}
+        self._buckets = defaultdict(list)
+        with self._lock:
+            for pos, words in corpus.headwords_by_pos().items():
+                for word in words:
+                    self._register(word, pos)
+
+    def _register(self, word: str, pos: str):
+        """调用方需持有 self._lock"""
+        key = word.strip().lower()
+        if not key:
+            return
+        pos = (pos or "unknown").strip().lower()
+        self._display.setdefault(key, word.strip())
+        if key in self._pos_of and self._pos_of[key] != "unknown":
+            return
+        if key in self._pos_of:
+            self._buckets["unknown"].remove(key)
+        self._pos_of[key] = pos
+        self._buckets[pos].append(key)
+
+    def load_distractors(self, rows: Iterable[dict]):
+        """载入 distractor_pool 行 ({"word", "pos"})，按词性分桶"""
+        rows = list(rows or [])
+        with self._lock:
+            for row in rows:
+                word = str(row.get("word") or "").strip()
+                if word:
+                    self._register(word, row.get("pos"))
+
+    def pos_of(self, word: str) -> str:
+        key = str(word).strip().lower()
+        with self._lock:
+            pos = self._pos_of.get(key)
+        return pos or self.corpus.pos_of(key) or "unknown"
+
+    def _blank_sentence(self, sentence: str, word: str) -> Optional[str]:
+        """挖掉原形；句中只有变形（复数、过去式 ...）时返回 None，避免答案是原形而空格要求变形"""
+        pattern = re.compile(rf"\b{re.escape(word)}\b", re.IGNORECASE)
+        blanked, hits = pattern.subn(BLANK, sentence, count=1)
+        return blanked if hits else None
+
+    def _distractors(self, word: str, peers: list, count: int = 3) -> list:
+        key = word.lower()
+        pos = self.pos_of(word)
+        peer_pos = {p.lower(): self.pos_of(p) for p in peers}
+        with self._lock:
+            bucket = list(self._buckets.get(pos, []))
+            known = list(self._pos_of)
+        chosen = []
+
+        def _take(candidates: list):
+            pool = [c for c in candidates if c != key and c not in chosen]
+            self._rng.shuffle(pool)
+            chosen.extend(pool[: count - len(chosen)])
+
+        if pos != "unknown":
+            _take(bucket)
+        if len(chosen) < count:
+            _take([p for p, p_pos in peer_pos.items() if pos == "unknown" or p_pos in (pos, "unknown")])
+        if len(chosen) < count:
+            _take(known + list(peer_pos))
+        with self._lock:
+            return [self._display.get(c, c) for c in chosen]
+
+    def build_cloze(self, word: str, peers: list = None) -> Optional[dict]:
+        """为单词生成一道完形题；例句库中没有该词或干扰项不足时返回 None"""
+        word = str(word or "").strip()
+        sentences = list(self.corpus.sentences_for(word))
+        self._rng.shuffle(sentences)
+        for sentence in sentences:
+            question = self._blank_sentence(sentence, word)
+            if question is None:
+                continue
+            distractors = self._distractors(word, peers or [])
+            if len(distractors) < 2:
+                return None
+            options = [word] + distractors
+            self._rng.shuffle(options)
+            return {
+                "type": "vocab",
+                "question": question,
+                "options": options,
+                "answer": word,
+                "damage_to_boss": 30,
+            }
+        return None
+
+    def generate_vocab_attacks(self, words: list, count: int) -> list:
+        """为尽量多的不同单词各出一道题，最多 count 道"""
+        attacks = []
+        for word in words:
+            if len(attacks) >= count:
+                break
+            item = self.build_cloze(word, peers=words)
+            if item:
+                attacks.append(item)
+        return attacks
+
+
+_engine: Optional[LocalQuizEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_local_quiz_engine() -> LocalQuizEngine:
+    """进程级单例：内置例句库 + EXAMPLE_CORPUS_PATH 指定的用户例句库"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                corpus = SentenceCorpus()
+                corpus.load(BUNDLED_CORPUS_PATH)
+                if EXAMPLE_CORPUS_PATH:
+                    corpus.load(EXAMPLE_CORPUS_PATH)
+                _engine = LocalQuizEngine(corpus)
+    return _engine
@@ -0,0 +1,171 @@
+# ==========================================
+# ✂️ 提示词构建 - 紧凑模板 + 上下文预算
+# ==========================================
+"""
+PromptBuilder 负责：
+1. 统一管理各调用类型的系统提示词；公共规则与 JSON 结构抽成片段复用，去掉长段说明
+2. 估算 token 数，超出预算的上下文（如 Boss 文章）按句抽取：优先保留含目标词的句子
+3. 用户消息使用紧凑 JSON，记录每次请求裁剪上下文节省的 token 数（同一模板下未裁剪负载 - 实际负载，日志 + 指标）
+"""
+
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import AI_PROMPT_CONTEXT_BUDGETS
+from services.ai_metrics import AIMetrics, get_metrics
+from services.rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# 📐 模板片段
+# ==========================================
+_JSON_ONLY = "Return ONLY one valid JSON object in exactly this shape:"
+_BOLD_RULE = "Wrap every target word you use in double asterisks, e.g. **word**."
+_VOCAB_ITEM = (
+    '{"type":"vocab","question":"Sentence with ______.","options":["Answer","D1","D2","D3"],'
+    '"answer":"Answer","damage_to_boss":30}'
+)
+_READING_ITEM = (
+    '{"type":"reading","question":"Inference question?","options":["Correct","W1","W2","W3"],'
+    '"answer":"Correct","damage_to_player":40}'
+)
+_QUIZ_SCHEMA = f'{{"vocab_attacks":[{_VOCAB_ITEM}],"boss_ultimates":[{_READING_ITEM}]}}'
+_QUIZ_RULES = (
+    "vocab_attacks: take a sentence from the text that contains a target word and replace that word with ______ "
+    "(options = the word + 3 plausible distractors).\n"
+    "boss_ultimates: hard inference / main-idea questions whose answers are not stated verbatim."
+)
+
+TEMPLATES = {
+    "article": "\n".join([
+        "You are a novelist writing Boss-level stories for a vocabulary game.",
+        "Input: words_list. Write one coherent 200-300 word story (cyberpunk, medieval or Lovecraftian) "
+        "that naturally uses ALL words.",
+        _BOLD_RULE,
+        "Add a full Chinese translation and a short Chinese summary.",
+        _JSON_ONLY,
+        '{"title":"...","content":"...","translation_cn":"...","summary_cn":"..."}',
+    ]),
+    "quiz": "\n".join([
+        "You design Boss-fight questions for a vocabulary game.",
+        "Input: article_content (may be an excerpt), words_list, vocab_count, reading_count.",
+        _QUIZ_RULES,
+        _JSON_ONLY,
+        _QUIZ_SCHEMA,
+    ]),
+    "patch_quiz": "\n".join([
+        "You add missing Boss-fight questions for a vocabulary game.",
+        "Input: article_content, target_words, vocab_count, reading_count. Generate ONLY the requested counts.",
+        _QUIZ_RULES,
+        _JSON_ONLY,
+        _QUIZ_SCHEMA,
+    ]),
+    "patch_article": "\n".join([
+        "You continue a story for a vocabulary game.",
+        "Input: story_title, story_ending, missing_words. Write ONE 40-80 word paragraph that continues "
+        "the story in the same tone and uses ALL missing_words.",
+        _BOLD_RULE,
+        "Add its Chinese translation.",
+        _JSON_ONLY,
+        '{"content":"...","translation_cn":"..."}',
+    ]),
+    "classify": "\n".join([
+        "You are a lexicographer building multiple-choice distractors.",
+        "Input: words. For EACH word give its most common part of speech (n/v/adj/adv), a short Chinese meaning, "
+        "and 2-3 confusable English words of the SAME part of speech (near-synonyms or look-alikes).",
+        _JSON_ONLY,
+        '{"words":[{"word":"...","pos":"adj","meaning":"中文释义",'
+        '"confusables":[{"word":"...","pos":"adj","meaning":"中文释义"}]}]}',
+    ]),
+    "analyze": "\n".join([
+        "你是英语教学专家。为 words 中每个单词给出：meaning 中文释义、root 词根词缀、imagery 记忆场景联想。",
+        "只返回一个 JSON 对象：",
+        '{"words":[{"word":"...","meaning":"...","root":"...","imagery":"..."}]}',
+    ]),
+}
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?。！？])\s+")
+
+
+# ==========================================
+# ✂️ 上下文裁剪
+# ==========================================
+def trim_context(text: str, words: list, max_tokens: int) -> str:
+    """
+    把上下文压到 max_tokens 以内（抽取式摘要）
+
+    选句顺序：首句 > 含目标词的句子 > 其余句子；输出保持原文顺序
+    """
+    text = str(text or "").strip()
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+
+    sentences = [s for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+    targets = [str(w).strip().lower() for w in words or [] if str(w).strip()]
+
+    def _has_target(sentence: str) -> bool:
+        lowered = sentence.lower()
+        return any(re.search(rf"\b{re.escape(t)}\b", lowered) for t in targets)
+
+    ranked = [0] + [i for i in range(1, len(sentences)) if _has_target(sentences[i])]
+    ranked += [i for i in range(1, len(sentences)) if i not in ranked]
+
+    chosen, used = set(), 0
+    for index in ranked:
+        cost = estimate_tokens(sentences[index])
+        if used + cost > max_tokens:
+            continue
+        chosen.add(index)
+        used += cost
+    if not chosen:
+        # 单句已超预算：按字符截断首句
+        return sentences[0][: max(1, max_tokens * 4)]
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+# ==========================================
+# 🧱 构建
+# ==========================================
+def build_prompt(
+    template: str,
+    payload: dict,
+    call_type: str,
+    context_key: Optional[str] = None,
+    words: Optional[list] = None,
+    metrics: Optional[AIMetrics] = None,
+) -> tuple:
+    """
+    构建 (system, user)
+
+    Args:
+        template: TEMPLATES 的键
+        payload: 用户消息内容
+        call_type: 预算与指标按调用类型统计
+        context_key: payload 中可裁剪的长文本字段
+        words: 裁剪时优先保留包含这些词的句子
+        metrics: 指标注册表，默认进程级 get_metrics()
+    """
+    system = TEMPLATES[template]
+    untrimmed = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    compact = dict(payload)
+    budget = AI_PROMPT_CONTEXT_BUDGETS.get(call_type)
+    if context_key and budget and compact.get(context_key):
+        compact[context_key] = trim_context(compact[context_key], words, budget)
+    user = json.dumps(compact, ensure_ascii=False, separators=(",", ":"))
+
+    sent = estimate_tokens(system) + estimate_tokens(user)
+    saved = max(0, estimate_tokens(untrimmed) - estimate_tokens(user))
+    (metrics or get_metrics()).record_prompt(call_type, sent, saved)
+    if saved:
+        logger.info("[Prompt] %s: %d -> %d tokens (saved %d)", call_type, sent + saved, sent, saved)
+    return system, user
@@ -0,0 +1,145 @@
+# ==========================================
+# 🚦 进程级限流器 - RPM / TPM 令牌桶
+# ==========================================
+"""
+RateLimiter 负责：
+1. 用两个令牌桶同时限制每分钟请求数 (RPM) 与每分钟 token 数 (TPM)
+2. 按优先级排队：队首之外的请求不能取令牌，Boss 生成会抢在后台扩充之前
+3. 向等待者报告排队位置；收到 429 时整体暂停到 Retry-After 之后
+4. 请求完成后按 usage 实际 token 数校正 TPM 桶
+5. 桶容量只占每分钟配额的一部分 (burst)，其余按速率补充：任意 60 秒内放行量不超过配额
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token：ASCII 约 4 字符 1 token，中文等非 ASCII 字符约 1 字 1 token"""
+    text = text or ""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii) // 4 + non_ascii + 1
+
+
+class TokenBucket:
+    """
+    令牌桶（非线程安全，由 RateLimiter 加锁）
+
+    容量 = per_minute * burst，补充速率 = 剩余配额 / 60 秒，
+    满桶起步后一分钟内最多放行 per_minute，不会出现两倍配额的首分钟突发
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float], burst: float = 0.2):
+        burst = min(max(burst, 0.01), 0.99)
+        self.capacity = float(per_minute) * burst
+        self.rate = float(per_minute) * (1.0 - burst) / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """还需等待多久才能取出 amount 个令牌"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float):
+        """取出令牌；允许为负（按实际用量补扣时产生欠账）"""
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RateLimiter:
+    """线程安全的优先级限流器；rpm/tpm <= 0 表示不限制该维度，burst 为桶容量占每分钟配额的比例"""
+
+    def __init__(self, rpm: float, tpm: float, clock: Callable[[], float] = time.monotonic, burst: float = 0.2):
+        self._clock = clock
+        self._rpm = TokenBucket(rpm, clock, burst) if rpm > 0 else None
+        self._tpm = TokenBucket(tpm, clock, burst) if tpm > 0 else None
+        self._cond = threading.Condition()
+        self._waiters: list = []  # [(priority, seq)]
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        wait = max(0.0, self._paused_until - now)
+        if self._rpm is not None:
+            wait = max(wait, self._rpm.wait_time(1, now))
+        if self._tpm is not None:
+            wait = max(wait, self._tpm.wait_time(tokens, now))
+        return wait
+
+    def _position(self, ticket: tuple) -> int:
+        return sum(1 for waiter in self._waiters if waiter < ticket)
+
+    def acquire(
+        self,
+        tokens: int,
+        priority: int,
+        on_wait: Optional[Callable[[int], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        阻塞直到可以发起请求
+
+        Args:
+            tokens: 本次请求预估 token 数
+            priority: 数值越小越优先（与调度器 PRIORITY_* 一致）
+            on_wait: 需要等待时回调排队位置（前方等待者数量，0 表示队首）
+            timeout: 最长等待秒数，超时返回 False
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            self._cond.notify_all()  # 已在等待的调用重新计算排队位置（可能被插队）
+            try:
+                while True:
+                    now = self._clock()
+                    is_head = self._waiters[0] == ticket
+                    wait = self._wait_time(tokens, now) if is_head else None
+                    if wait == 0.0:
+                        if self._rpm is not None:
+                            self._rpm.take(1, now)
+                        if self._tpm is not None:
+                            self._tpm.take(tokens, now)
+                        return True
+                    if on_wait is not None:
+                        on_wait(self._position(ticket))
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def reconcile(self, estimated: int, actual: int):
+        """按响应 usage 校正 TPM：少估的补扣，多估的退还"""
+        if self._tpm is None or not actual:
+            return
+        with self._cond:
+            self._tpm.take(actual - estimated, self._clock())
+            self._cond.notify_all()
+
+    def penalize(self, retry_after: float):
+        """上游返回 429：所有请求暂停到 retry_after 秒之后"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, self._clock() + max(0.0, retry_after))
+            self._cond.notify_all()
+
+    def queue_length(self) -> int:
+        with self._cond:
+            return len(self._waiters)
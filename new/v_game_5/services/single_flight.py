@@ -0,0 +1,72 @@
+# ==========================================
+# 🪢 请求合并 (single-flight)
+# ==========================================
+"""
+SingleFlight 负责：
+1. 同一键的并发调用只执行一次，其余调用者等待并共享结果
+2. 执行结束即移除，之后的调用会重新执行（不是缓存）
+3. 执行抛出异常时，所有等待者收到同一个异常
+4. 有人共享时，每个调用者（含发起者）拿到结果的独立深拷贝，一方修改不会影响另一方
+
+注意：加入者不会提升进行中调用的优先级 —— 高优先级调用加入低优先级的进行中调用时，
+按发起者的优先级排队（限流器的票据在发起时已确定）。
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """线程安全的请求合并器"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlight] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        执行或加入同键的进行中调用
+
+        Returns:
+            (结果, 是否为共享结果)；有加入者时各方拿到的都是独立副本
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                leader = False
+            else:
+                call = _InFlight()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.value), True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        # 出队后 followers 不再变化；有人共享时原对象只留作各方复制的模板
+        return (copy.deepcopy(call.value) if call.followers else call.value), False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,42 @@
+# ==========================================
+# 🔍 单词覆盖检查 - 文章是否用到了全部目标词
+# ==========================================
+"""
+find_missing_words 负责：
+1. 文章只转小写、分词一次，普通单词用集合成员判断 (O(文章长度 + 词数))
+2. 词组/带连字符等非单词字符的目标词，使用按词缓存的预编译正则
+3. 结果与逐词 `\\bword\\b` / `**word**` 正则搜索完全一致
+"""
+
+import re
+from functools import lru_cache
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1024)
+def _phrase_pattern(lower_token: str):
+    escaped = re.escape(lower_token)
+    return re.compile(rf"\b{escaped}\b|\*\*{escaped}\*\*")
+
+
+def find_missing_words(content: str, words: list) -> list:
+    """返回文章中未出现的目标词（保持输入顺序与原始大小写）"""
+    lowered = str(content or "").lower()
+    tokens = None
+    missing = []
+    for word in words or []:
+        token = str(word).strip()
+        if not token:
+            continue
+        lower_token = token.lower()
+        if _WORD_RE.fullmatch(lower_token):
+            # 纯单词字符: \bword\b 命中 ⇔ 文章某个完整 \w+ 片段等于该词
+            if tokens is None:
+                tokens = set(_WORD_RE.findall(lowered))
+            hit = lower_token in tokens
+        else:
+            hit = _phrase_pattern(lower_token).search(lowered) is not None
+        if not hit:
+            missing.append(token)
+    return missing
@@ -0,0 +1,20 @@
+# ==========================================
+# Simulation 包初始化
+# ==========================================
+import sys
+from pathlib import Path
+
+# 添加父目录到路径
+_parent = Path(__file__).parent.parent
+if str(_parent) not in sys.path:
+    sys.path.insert(0, str(_parent))
+
+from simulation.run_simulator import (
+    Decision,
+    RunSimulator,
+    RunSummary,
+    ShopOffer,
+    run_bot,
+    synthetic_word_pool,
+)
+from simulation.policies import BotPolicy, FixedAccuracyPolicy, GreedyPolicy, TierAccuracyPolicy
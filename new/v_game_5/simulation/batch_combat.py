@@ -0,0 +1,536 @@
+# ==========================================
+# 🧮 向量化批量战斗 - N 场独立战斗同步推进
+# ==========================================
+"""
+BatchCombat 负责：
+1. 把 N 场相同初始条件的普通/精英战斗表示为数组（敌人 HP/计时器/攻击力、玩家 HP/护甲、
+   每个牌位的颜色/所在牌堆/连错/连对），用 NumPy 按回合同步推进
+2. 规则逐条对应 CombatEngine / Enemy.tick / CardEffectRegistry / Player.change_hp：
+   加权抽牌、金卡耐久与随机效果、倍率、连错降级/黑化、局内连对升级、黑卡净化、精英眩晕、放血
+3. 只支持 SUPPORTED_RELICS 中的遗物（其余遗物会改变出牌/抽牌流程，交给标量模拟器）
+4. scalar_fight / cross_check 用 RunSimulator 的战斗循环在抽样种子上对照，验证内核与标量引擎一致
+
+出牌策略与 FixedAccuracyPolicy 相同：每次打出手牌中最早抽到的一张，不使用道具，
+每题以给定正确率答对。NumPy 是可选依赖（pip install ".[sim]"），只有调用本模块的函数时才需要。
+升级/降级阈值等规则常量在使用时从 config 与 systems.combat_engine 读取，
+调参（改文件或运行时改模块属性）时与标量引擎保持一致。
+
+用法：
+    spec = FightSpec(deck=(CardType.RED_BERSERK,) * 6 + (CardType.BLUE_HYBRID,) * 3, is_elite=True, level=8)
+    death_rate_curve(spec, [0.5, 0.6, 0.7, 0.8, 0.9])
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+import config
+from config import ENEMY_ATTACK, ENEMY_HP_BASE, ENEMY_HP_ELITE, ENEMY_HP_GROWTH, GOLD_CARD_USES, HAND_SIZE
+from models import CARD_STATS, CardCombatState, CardType, Enemy, Player, WordCard, draw_weight
+from simulation.policies import FixedAccuracyPolicy
+from simulation.run_simulator import RunSimulator
+from systems import combat_engine as rules
+
+DEFAULT_MAX_STEPS = 1000
+
+# 牌位颜色（数组中的取值）与所在牌堆
+COLORS = (CardType.RED_BERSERK, CardType.BLUE_HYBRID, CardType.GOLD_SUPPORT, CardType.BLACK_CURSE)
+RED, BLUE, GOLD, BLACK = range(4)
+DRAW, HAND, DISCARD, GONE = range(4)
+
+SUPPORTED_RELICS = frozenset({
+    # 战斗内生效，内核已实现
+    "WINE", "CURSED_BLOOD", "CURSE_MASK", "UNDYING_CURSE", "MONKEY_PAW", "OLD_ARMOR", "OLD_SHIELD",
+    "BLEEDING_DAGGER", "ORICHALCUM", "DEAD_BRANCH", "BLOOD_CRYSTAL",
+    # 只在战斗之外生效（金币/楼层/营地/战后回血），不影响单场战斗
+    "GOLD_IDOL", "GOLD_CHARM", "BLOOD_VIAL", "BURNING_BLOOD", "PHILOSOPHERS_STONE", "ANCHOR", "FUSION_HAMMER",
+})
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('simulation.batch_combat 需要 numpy：pip install ".[sim]"')
+    return np
+
+
+def _make_card(word: str, color: int) -> WordCard:
+    card = WordCard(word=word, meaning=f"{word}-cn", tier=(0, 2, 4, 0)[color])
+    if color == BLACK:
+        card.is_blackened = True
+        card.temp_level = "black"
+    return card
+
+
+def _draw_weights():
+    """按颜色的抽牌权重（首项无连错，次项有连错），与 models.draw_weight 保持一致"""
+    base, wrong = [], []
+    for color in range(len(COLORS)):
+        card = _make_card("_", color)
+        base.append(draw_weight(card))
+        card.wrong_streak = 1
+        wrong.append(draw_weight(card))
+    return np.array(base, dtype=np.int64), np.array(wrong, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class FightSpec:
+    """一场普通/精英战斗的初始条件（牌组只看颜色）"""
+    deck: Tuple[CardType, ...]
+    hp: int = 100
+    max_hp: int = 100
+    relics: Tuple[str, ...] = ()
+    level: int = 1
+    is_elite: bool = False
+    hand_size: int = HAND_SIZE
+
+    def validate(self):
+        unsupported = sorted(set(self.relics) - SUPPORTED_RELICS)
+        if unsupported:
+            raise ValueError(f"batch combat does not support relics: {unsupported}")
+        if any(card_type not in COLORS for card_type in self.deck):
+            raise ValueError(f"unknown card type in deck: {self.deck}")
+        if "MONKEY_PAW" in self.relics and self.max_hp > 50:
+            raise ValueError("MONKEY_PAW caps max_hp at 50; pass the capped max_hp")
+
+
+@dataclass
+class BatchFightResult:
+    """N 场战斗的结果数组"""
+    won: "np.ndarray"
+    hp: "np.ndarray"
+    turns: "np.ndarray"
+    stalled: "np.ndarray"
+
+    @property
+    def win_rate(self) -> float:
+        return float(self.won.mean()) if self.won.size else 0.0
+
+    @property
+    def death_rate(self) -> float:
+        return float((~self.won & ~self.stalled).mean()) if self.won.size else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "fights": int(self.won.size),
+            "win_rate": round(self.win_rate, 4),
+            "death_rate": round(self.death_rate, 4),
+            "mean_turns": round(float(self.turns.mean()), 2),
+            "mean_hp": round(float(self.hp.mean()), 2),
+        }
+
+
+# ==========================================
+# ⚙️ 内核
+# ==========================================
+class _Kernel:
+    """N 场战斗的数组状态；方法名对应 CombatEngine 中的同名步骤"""
+
+    def __init__(self, spec: FightSpec, accuracy: "np.ndarray", seed: Optional[int]):
+        n, size = accuracy.size, len(spec.deck)
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.acc = accuracy
+        self.relics = frozenset(spec.relics)
+        self.elite = spec.is_elite
+        self.base_weights, self.wrong_weights = _draw_weights()
+        self.stats = {
+            key: np.array([CARD_STATS[t].get(key, 0) for t in COLORS], dtype=np.int64)
+            for key in ("damage", "block", "penalty")
+        }
+
+        # 牌位
+        self.color = np.tile(np.array([COLORS.index(t) for t in spec.deck], dtype=np.int8), (n, 1))
+        self.loc = np.full((n, size), DRAW, dtype=np.int8)
+        self.order = np.zeros((n, size), dtype=np.int64)  # 进入手牌的先后（出牌取最早的一张）
+        self.wrong = np.zeros((n, size), dtype=np.int16)
+        self.streak = np.zeros((n, size), dtype=np.int16)  # in_game_streak
+        self.black_streak = np.zeros((n, size), dtype=np.int16)
+        self.gold_uses = np.where(self.color == GOLD, GOLD_CARD_USES, 0).astype(np.int16)
+        self.seq = 0
+
+        # 玩家
+        self.max_hp = spec.max_hp
+        self.hp = np.full(n, spec.hp, dtype=np.int64)
+        self.armor = np.zeros(n, dtype=np.int64)
+        self.paw_used = np.zeros(n, dtype=bool)
+        self.stunned = np.zeros(n, dtype=bool)
+
+        # 敌人（对应 Enemy.__post_init__ 非固定数值分支）
+        base_hp = (ENEMY_HP_ELITE if spec.is_elite else ENEMY_HP_BASE) + max(0, spec.level - 1) * ENEMY_HP_GROWTH
+        self.enemy_hp = np.full(n, base_hp, dtype=np.int64)
+        self.timer = self.rng.integers(3, 6, n)
+        self.elapsed = np.zeros(n, dtype=np.int64)
+        self.attack = np.full(n, ENEMY_ATTACK, dtype=np.int64)
+
+        # 战斗状态
+        self.mult = np.ones(n, dtype=np.int64)
+        self.red_streak = np.zeros(n, dtype=np.int64)
+        self.blue_streak = np.zeros(n, dtype=np.int64)
+        self.bleed_damage = np.zeros(n, dtype=np.int64)
+        self.bleed_turns = np.zeros(n, dtype=np.int64)
+        self.turns = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+
+    # ------------------------------------------
+    # 玩家数值（Player.change_hp / add_armor）
+    # ------------------------------------------
+    def hurt(self, amount: "np.ndarray"):
+        """amount 为各行受到的伤害（0 表示不受伤）：护甲吸收 → 猴爪免死 → 扣血"""
+        absorbed = np.minimum(self.armor, amount)
+        self.armor -= absorbed
+        amount = amount - absorbed
+        if "MONKEY_PAW" in self.relics:
+            saved = (amount > 0) & (self.hp - amount <= 0) & ~self.paw_used
+            self.paw_used |= saved
+            self.hp[saved] = 1
+            amount = np.where(saved, 0, amount)
+        self.hp = np.maximum(0, self.hp - amount)
+
+    def heal(self, rows: "np.ndarray", amount: int):
+        self.hp[rows] = np.minimum(self.hp[rows] + amount, self.max_hp)
+
+    # ------------------------------------------
+    # 抽牌（CardCombatState.draw_card）
+    # ------------------------------------------
+    def draw(self, mask: "np.ndarray") -> "np.ndarray":
+        """mask 中每行按权重抽一张（抽牌堆空时先洗回弃牌堆），返回抽到牌的行"""
+        drawn = np.zeros(self.n, dtype=bool)
+        rows = np.nonzero(mask)[0]
+        if not rows.size:
+            return drawn
+
+        loc = self.loc[rows]
+        recycle = ~(loc == DRAW).any(1)
+        if recycle.any():
+            loc[recycle[:, None] & (loc == DISCARD)] = DRAW
+            self.loc[rows] = loc
+
+        color = self.color[rows]
+        weights = np.where(self.wrong[rows] > 0, self.wrong_weights[color], self.base_weights[color])
+        cumulative = np.where(loc == DRAW, weights, 0).cumsum(1)
+        total = cumulative[:, -1]
+        roll = self.rng.random(rows.size) * total
+        slot = np.minimum((cumulative <= roll[:, None]).sum(1), loc.shape[1] - 1)
+
+        ok = total > 0
+        rows, slot = rows[ok], slot[ok]
+        self.loc[rows, slot] = HAND
+        self.order[rows, slot] = self.seq
+        self.seq += 1
+        drawn[rows] = True
+        return drawn
+
+    def draw_many(self, count: "np.ndarray"):
+        """每行抽 count 张，某行抽不到牌即停止"""
+        count = count.copy()
+        while (count > 0).any():
+            drawn = self.draw(count > 0)
+            count = np.where(drawn, count - 1, 0)
+
+    # ------------------------------------------
+    # 开战（CombatEngine.start_battle）
+    # ------------------------------------------
+    def start_battle(self, hand_size: int):
+        if "ORICHALCUM" in self.relics:
+            self.armor[self.hp >= self.max_hp] += 10
+        if "OLD_ARMOR" in self.relics:
+            self.armor += 5
+
+        has_black = (self.color == BLACK).any(1)
+        rows = np.nonzero(has_black)[0]
+        if rows.size:
+            slot = (self.color[rows] == BLACK).argmax(1)
+            self.loc[rows, slot] = HAND
+            self.order[rows, slot] = self.seq
+            self.seq += 1
+
+        self.draw_many(np.maximum(0, hand_size - (self.loc == HAND).sum(1)))
+
+    # ------------------------------------------
+    # 敌人回合（resolve_enemy_turn / resolve_stun_turn + Enemy.tick）
+    # ------------------------------------------
+    def enemy_turn(self, mask: "np.ndarray", attack: bool = True):
+        bleeding = mask & (self.bleed_turns > 0) & (self.bleed_damage > 0)
+        self.enemy_hp = np.where(bleeding, np.maximum(0, self.enemy_hp - self.bleed_damage), self.enemy_hp)
+        self.bleed_turns[bleeding] -= 1
+        ticking = mask & ~(bleeding & (self.enemy_hp <= 0))
+
+        self.elapsed[ticking] += 1
+        self.timer[ticking] -= 1
+        fire = ticking & (self.timer <= 0)
+        if fire.any():
+            self.timer = np.where(fire, self.rng.integers(3, 6, self.n), self.timer)
+            self.attack = np.where(fire, ENEMY_ATTACK + np.maximum(0, self.elapsed - 3) * 3, self.attack)
+            if attack:
+                before_hp, before_armor = self.hp.copy(), self.armor.copy()
+                self.hurt(np.where(fire, self.attack, 0))
+                if "OLD_SHIELD" in self.relics:
+                    self.armor[fire & (self.hp == before_hp) & (self.armor < before_armor)] += 10
+        self.turns[mask] += 1
+
+    # ------------------------------------------
+    # 出牌与答题（start_card_play + process_answer）
+    # ------------------------------------------
+    def play(self, mask: "np.ndarray"):
+        rows = np.nonzero(mask)[0]
+        if not rows.size:
+            return
+        key = np.where(self.loc[rows] == HAND, self.order[rows], np.iinfo(np.int64).max)
+        slot = key.argmin(1)
+        color = self.color[rows, slot].astype(np.int64)
+
+        # 金卡耐久耗尽移出本场战斗，其余进入弃牌堆
+        gold = color == GOLD
+        uses = self.gold_uses[rows, slot]
+        uses = np.where(gold & (uses > 0), uses - 1, uses)
+        self.gold_uses[rows, slot] = uses
+        self.loc[rows, slot] = np.where(gold & (uses <= 0), GONE, DISCARD)
+
+        # record_play
+        self.red_streak[rows] = np.where(color == RED, self.red_streak[rows] + 1, 0)
+        self.blue_streak[rows] = np.where(color == BLUE, self.blue_streak[rows] + 1, 0)
+
+        correct = self.rng.random(rows.size) < self.acc[rows]
+        self._resolve_correct(rows[correct], slot[correct], color[correct])
+        self._resolve_wrong(rows[~correct], slot[~correct], color[~correct])
+
+        after = np.zeros(self.n, dtype=bool)
+        after[rows] = True
+        self.enemy_turn(after & (self.hp > 0) & (self.enemy_hp > 0))
+
+    def _resolve_correct(self, rows, slot, color):
+        if not rows.size:
+            return
+        red, blue, gold, black = (color == c for c in range(len(COLORS)))
+        mult = self.mult[rows]
+        boosted = mult > 1
+        active = np.maximum(1, mult)
+
+        damage = self.stats["damage"][color].copy()
+        block = np.where(blue, self.stats["block"][color], 0)
+        if "WINE" in self.relics:
+            damage[red] += 2
+        if "CURSED_BLOOD" in self.relics:
+            damage[black] += 3
+        consume = ~gold & boosted
+        damage = np.where(consume, damage * mult, damage)
+        block = np.where(consume, block * mult, block)
+        new_mult = np.where(consume, 1, mult)
+
+        # 金卡随机效果：倍率 / 抽牌 / 直接伤害（权重随手牌数与手中红卡数变化）
+        hand = self.loc[rows] == HAND
+        red_in_hand = (hand & (self.color[rows] == RED)).sum(1)
+        w_mult = 1 + 2 * (red_in_hand >= 2)
+        w_draw = 1 + 2 * (hand.sum(1) + 1 <= 3)
+        roll = self.rng.random(rows.size) * (w_mult + w_draw + 1)
+        g_mult = gold & (roll < w_mult)
+        g_draw = gold & ~g_mult & (roll < w_mult + w_draw)
+        g_damage = gold & ~g_mult & ~g_draw
+        new_mult = np.where(g_mult, active * 2, new_mult)
+        new_mult = np.where((g_draw | g_damage) & boosted, 1, new_mult)
+        damage = np.where(g_damage, 25 * active, np.where(gold, 0, damage))
+
+        self.enemy_hp[rows] = np.maximum(0, self.enemy_hp[rows] - damage)
+        self.armor[rows] += block
+        self.mult[rows] = new_mult
+        if g_draw.any():
+            count = np.zeros(self.n, dtype=np.int64)
+            count[rows] = np.where(g_draw, 2 * active, 0)
+            self.draw_many(count)
+
+        if "BLOOD_CRYSTAL" in self.relics:
+            self.heal(rows[self.rng.random(rows.size) <= 0.2], 5)
+
+        # 黑卡连对 BLACK_PURGE_STREAK 次净化，移出本场战斗
+        self.black_streak[rows[black], slot[black]] += 1
+        purge = black & (self.black_streak[rows, slot] >= rules.BLACK_PURGE_STREAK)
+        self.loc[rows[purge], slot[purge]] = GONE
+        self.black_streak[rows[purge], slot[purge]] = 0
+
+        self.wrong[rows, slot] = 0
+
+        if "BLEEDING_DAGGER" in self.relics:
+            bleed = red & (self.red_streak[rows] >= 2)
+            self.bleed_damage[rows[bleed]] = (self.red_streak[rows[bleed]] - 1) * 2
+            self.bleed_turns[rows[bleed]] = 2
+        if "OLD_ARMOR" in self.relics:
+            self.armor[rows[blue & (self.blue_streak[rows] >= 2)]] += 5
+
+        # 局内连对升级：红 → 蓝 → 金
+        self.streak[rows, slot] += 1
+        streak = self.streak[rows, slot]
+        to_blue = red & (streak >= config.RED_TO_BLUE_UPGRADE_THRESHOLD)
+        to_gold = blue & (streak >= config.BLUE_TO_GOLD_UPGRADE_THRESHOLD)
+        self.color[rows[to_blue], slot[to_blue]] = BLUE
+        self.color[rows[to_gold], slot[to_gold]] = GOLD
+        self.streak[rows[to_blue | to_gold], slot[to_blue | to_gold]] = 0
+
+    def _resolve_wrong(self, rows, slot, color):
+        if not rows.size:
+            return
+        red, blue, gold, black = (color == c for c in range(len(COLORS)))
+
+        penalty = np.where(red | black, self.stats["penalty"][color], 0)
+        if "UNDYING_CURSE" in self.relics:
+            penalty = penalty * 2
+        if "DEAD_BRANCH" in self.relics:
+            penalty = np.where(self.rng.random(rows.size) < 0.25, 0, penalty)
+        amount = np.zeros(self.n, dtype=np.int64)
+        amount[rows] = penalty
+        self.hurt(amount)
+        if "CURSE_MASK" in self.relics:
+            self.armor[rows[black]] += penalty[black]
+
+        self.black_streak[rows[black], slot[black]] = 0
+
+        # 连错降级 / 黑化（已黑化的卡不计连错）
+        self.wrong[rows[~black], slot[~black]] += 1
+        wrong = self.wrong[rows, slot]
+        to_blue = gold & (wrong >= rules.GOLD_FORGET_WRONG_STREAK)
+        to_red = blue & (wrong >= rules.BLUE_FORGET_WRONG_STREAK)
+        to_black = red & (wrong >= rules.RED_BLACKEN_WRONG_STREAK)
+        self.color[rows[to_blue], slot[to_blue]] = BLUE
+        self.color[rows[to_red], slot[to_red]] = RED
+        self.color[rows[to_black], slot[to_black]] = BLACK
+        changed = to_blue | to_red | to_black
+        self.wrong[rows[changed], slot[changed]] = 0
+
+        if self.elite:
+            self.stunned[rows[self.rng.random(rows.size) < rules.ELITE_STUN_CHANCE]] = True
+        self.streak[rows, slot] = 0
+
+    # ------------------------------------------
+    # 主循环（对应 RunSimulator._battle）
+    # ------------------------------------------
+    def run(self, max_steps: int):
+        for _ in range(max_steps):
+            active = ~self.done
+            if not active.any():
+                break
+            stun = active & self.stunned
+            if stun.any():
+                self.stunned &= ~stun
+                self.enemy_turn(stun, attack=False)
+
+            acting = active & ~stun
+            won = acting & (self.enemy_hp <= 0)
+            self.won |= won
+            self.done |= won
+            acting &= ~won
+
+            empty = acting & ~(self.loc == HAND).any(1)
+            stalemate = np.zeros(self.n, dtype=bool)
+            if empty.any():
+                stalemate = empty & ~self.draw(empty)
+                self.enemy_turn(stalemate)
+            self.play(acting & ~stalemate)
+            self.done |= active & (self.hp <= 0)
+
+        finished = ~self.done & (self.enemy_hp <= 0) & (self.hp > 0)
+        self.won |= finished
+        self.done |= finished
+
+
+def batch_fight(
+    spec: FightSpec,
+    accuracy,
+    fights: Optional[int] = None,
+    seed: Optional[int] = None,
+    max_steps: int = DEFAULT_MAX_STEPS,
+) -> BatchFightResult:
+    """
+    同步推进 N 场战斗
+
+    accuracy 可以是单个正确率（需给出 fights），也可以是每场一个正确率的数组。
+    """
+    _require_numpy()
+    spec.validate()
+    accuracy = np.asarray(accuracy, dtype=float)
+    if accuracy.ndim == 0:
+        if fights is None:
+            raise ValueError("fights is required when accuracy is a scalar")
+        accuracy = np.full(fights, float(accuracy))
+
+    kernel = _Kernel(spec, accuracy, seed)
+    kernel.start_battle(spec.hand_size)
+    kernel.run(max_steps)
+    return BatchFightResult(won=kernel.won, hp=kernel.hp, turns=kernel.turns, stalled=~kernel.done)
+
+
+def death_rate_curve(
+    spec: FightSpec,
+    accuracies: Iterable[float],
+    fights: int = 10000,
+    seed: Optional[int] = None,
+) -> List[Tuple[float, float]]:
+    """死亡率 vs 正确率：所有正确率放进同一批数组一次算完"""
+    _require_numpy()
+    accuracies = list(accuracies)
+    result = batch_fight(spec, np.repeat(accuracies, fights), seed=seed)
+    dead = (~result.won & ~result.stalled).reshape(len(accuracies), fights)
+    return [(acc, float(rate)) for acc, rate in zip(accuracies, dead.mean(1))]
+
+
+# ==========================================
+# 🔍 与标量引擎对照
+# ==========================================
+def scalar_fight(spec: FightSpec, accuracy: float, seed: int) -> Tuple[bool, int, int]:
+    """用 RunSimulator 的战斗循环（CombatEngine）打同一场战斗，返回 (胜利, 剩余 HP, 回合数)"""
+    spec.validate()
+    sim = RunSimulator(seed=seed)
+    deck = [_make_card(f"card{i:02d}", COLORS.index(t)) for i, t in enumerate(spec.deck)]
+    player = Player(hp=spec.hp, max_hp=spec.max_hp, relics=list(spec.relics), deck=deck, hand_size=spec.hand_size)
+    sim.run.player = player
+    enemy = Enemy(level=spec.level, is_elite=spec.is_elite, rng=sim.rng)
+    cs = CardCombatState(player=player, enemy=enemy, deck=player.deck.copy(), rng=sim.rng)
+
+    policy = FixedAccuracyPolicy(accuracy, seed=seed)
+    flow = sim._battle(cs)
+    try:
+        decision = next(flow)
+        while True:
+            decision = flow.send(policy.choose(sim, decision))
+    except StopIteration as stop:
+        won = bool(stop.value)
+    return won, player.hp, cs.turns
+
+
+def cross_check(
+    spec: FightSpec,
+    accuracy: float,
+    samples: int = 300,
+    fights: int = 20000,
+    seed: int = 0,
+) -> Dict[str, dict]:
+    """
+    在 samples 个种子上跑标量引擎，与 fights 场向量化战斗比较胜率、回合数、剩余 HP
+
+    每项给出两边均值与 z 值（差值 / 合并标准误），z 较大说明内核与引擎规则不一致。
+    """
+    _require_numpy()
+    scalar = np.array([scalar_fight(spec, accuracy, seed + i) for i in range(samples)], dtype=float)
+    batch = batch_fight(spec, accuracy, fights, seed=seed)
+    vectorized = np.column_stack([batch.won, batch.hp, batch.turns]).astype(float)
+
+    report = {}
+    for column, name in enumerate(("win_rate", "hp", "turns")):
+        a, b = scalar[:, column], vectorized[:, column]
+        error = np.sqrt(a.var() / a.size + b.var() / b.size)
+        diff = a.mean() - b.mean()
+        report[name] = {
+            "scalar": round(float(a.mean()), 4),
+            "batch": round(float(b.mean()), 4),
+            "z": round(float(abs(diff) / error), 2) if error > 0 else (0.0 if diff == 0 else float("inf")),
+        }
+    return report
@@ -0,0 +1,288 @@
+# ==========================================
+# 🎲 蒙特卡洛平衡批跑 - 多进程按种子区间模拟
+# ==========================================
+"""
+BatchRunner 负责：
+1. 按种子区间切块，用 ProcessPoolExecutor 在所有核心上并行跑 RunSimulator
+2. 子进程只回传 RunSummary（几百字节），按完成顺序流式产出，不 pickle 整局状态
+3. BalanceReport 聚合胜率、死亡层数分布、每层平均 HP 曲线、遗物持有对胜率的影响
+   （遗物胜率差以"获得该遗物那一层仍存活的局"为基线，避免后期遗物只落在存活局的幸存者偏差）
+
+命令行：
+    python -m simulation.batch_runner --runs 100000 --policy greedy --accuracy 0.85 --json report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import SIM_BATCH_CHUNK_SIZE, SIM_BATCH_WORKERS
+from simulation.policies import BotPolicy, FixedAccuracyPolicy, GreedyPolicy, TierAccuracyPolicy
+from simulation.run_simulator import RunSummary, run_bot
+from registries import RELICS
+
+POLICIES = {
+    "fixed": FixedAccuracyPolicy,
+    "tier": TierAccuracyPolicy,
+    "greedy": GreedyPolicy,
+}
+
+
+@dataclass
+class PolicySpec:
+    """可跨进程传递的策略描述：策略类 + 构造参数，每局的策略种子由局种子派生"""
+    policy_cls: type = FixedAccuracyPolicy
+    kwargs: dict = field(default_factory=dict)
+
+    def build(self, seed: int) -> BotPolicy:
+        return self.policy_cls(seed=seed, **self.kwargs)
+
+
+# ==========================================
+# 📈 聚合报告
+# ==========================================
+class BalanceReport:
+    """逐局累加 RunSummary 的聚合统计（可 merge，便于分批汇总）"""
+
+    def __init__(self):
+        self.runs = 0
+        self.wins = 0
+        self.stalled = 0
+        self.boss_reached = 0
+        self.turns = 0
+        self.answers = 0
+        self.correct = 0
+        self.death_floors: Counter = Counter()
+        self.hp_sum: List[int] = []        # 第 i 层结算后 HP 之和
+        self.hp_count: List[int] = []      # 到达第 i 层的局数
+        self.hp_wins: List[int] = []       # 到达第 i 层且最终胜利的局数
+        self.relic_runs: Counter = Counter()
+        self.relic_wins: Counter = Counter()
+        self.relic_gain_floors: Dict[str, Counter] = {}  # 遗物 -> {获得层数: 局数}
+
+    def add(self, summary: RunSummary):
+        self.runs += 1
+        self.wins += summary.victory
+        self.stalled += summary.stalled
+        self.boss_reached += summary.boss_reached
+        self.turns += summary.turns
+        self.answers += summary.answers
+        self.correct += summary.correct
+        if not summary.victory and not summary.stalled:
+            self.death_floors[summary.floor] += 1
+
+        self._extend_floors(len(summary.hp_curve))
+        for index, hp in enumerate(summary.hp_curve):
+            self.hp_sum[index] += hp
+            self.hp_count[index] += 1
+            self.hp_wins[index] += summary.victory
+
+        for relic_id in set(summary.relics):
+            self.relic_runs[relic_id] += 1
+            self.relic_wins[relic_id] += summary.victory
+            floor = summary.relic_floors.get(relic_id, 0)
+            self.relic_gain_floors.setdefault(relic_id, Counter())[floor] += 1
+
+    def _extend_floors(self, floors: int):
+        missing = floors - len(self.hp_sum)
+        if missing > 0:
+            self.hp_sum.extend([0] * missing)
+            self.hp_count.extend([0] * missing)
+            self.hp_wins.extend([0] * missing)
+
+    def merge(self, other: "BalanceReport") -> "BalanceReport":
+        for name in ("runs", "wins", "stalled", "boss_reached", "turns", "answers", "correct"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.death_floors.update(other.death_floors)
+        self._extend_floors(len(other.hp_sum))
+        for index, (total, count, wins) in enumerate(zip(other.hp_sum, other.hp_count, other.hp_wins)):
+            self.hp_sum[index] += total
+            self.hp_count[index] += count
+            self.hp_wins[index] += wins
+        self.relic_runs.update(other.relic_runs)
+        self.relic_wins.update(other.relic_wins)
+        for relic_id, floors in other.relic_gain_floors.items():
+            self.relic_gain_floors.setdefault(relic_id, Counter()).update(floors)
+        return self
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.runs if self.runs else 0.0
+
+    @property
+    def mean_death_floor(self) -> float:
+        deaths = sum(self.death_floors.values())
+        return sum(floor * n for floor, n in self.death_floors.items()) / deaths if deaths else 0.0
+
+    def hp_curve(self) -> List[float]:
+        """每层结算后的平均 HP（只统计到达该层的局）"""
+        return [total / count for total, count in zip(self.hp_sum, self.hp_count)]
+
+    def survival_win_rate(self, floor: int) -> float:
+        """第 floor 层仍存活（已进入该层）的局的胜率；floor = 0 为全部局"""
+        if floor <= 0 or floor > len(self.hp_count):
+            return self.win_rate
+        count = self.hp_count[floor - 1]
+        return self.hp_wins[floor - 1] / count if count else 0.0
+
+    def relic_effects(self) -> Dict[str, dict]:
+        """
+        持有某遗物的局胜率与两种胜率差
+
+        - delta: 相对"获得该遗物那一层仍存活的局"的胜率（按各局获得层数加权），
+          排除后期遗物只落在存活局带来的幸存者偏差
+        - raw_delta: 相对从未持有该遗物的局的胜率差，仅是原始相关性
+        """
+        effects = {}
+        for relic_id, runs in self.relic_runs.items():
+            wins = self.relic_wins[relic_id]
+            others = self.runs - runs
+            other_rate = (self.wins - wins) / others if others else 0.0
+            floors = self.relic_gain_floors.get(relic_id) or Counter({0: runs})
+            baseline = sum(n * self.survival_win_rate(floor) for floor, n in floors.items()) / runs
+            effects[relic_id] = {
+                "runs": runs,
+                "win_rate": wins / runs,
+                "delta": wins / runs - baseline,
+                "raw_delta": wins / runs - other_rate,
+                "mean_gain_floor": sum(floor * n for floor, n in floors.items()) / runs,
+            }
+        return effects
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "wins": self.wins,
+            "win_rate": round(self.win_rate, 4),
+            "stalled": self.stalled,
+            "boss_reach_rate": round(self.boss_reached / self.runs, 4) if self.runs else 0.0,
+            "answer_accuracy": round(self.correct / self.answers, 4) if self.answers else 0.0,
+            "mean_turns": round(self.turns / self.runs, 2) if self.runs else 0.0,
+            "mean_death_floor": round(self.mean_death_floor, 2),
+            "death_floors": dict(sorted(self.death_floors.items())),
+            "hp_curve": [round(hp, 1) for hp in self.hp_curve()],
+            "relics": {
+                relic_id: {key: round(value, 4) for key, value in stats.items()}
+                for relic_id, stats in sorted(self.relic_effects().items())
+            },
+        }
+
+    def format_text(self) -> str:
+        data = self.to_dict()
+        lines = [
+            f"局数 {data['runs']}  胜率 {data['win_rate']:.1%}  到达 Boss {data['boss_reach_rate']:.1%}  "
+            f"答题正确率 {data['answer_accuracy']:.1%}  平均回合 {data['mean_turns']}",
+            f"平均死亡层数 {data['mean_death_floor']}  卡死 {data['stalled']}",
+            "死亡层数: " + "  ".join(f"{floor}:{n}" for floor, n in data["death_floors"].items()),
+            "HP 曲线: " + " ".join(f"{hp:.0f}" for hp in data["hp_curve"]),
+            "遗物 (持有局数 / 胜率 / 胜率差[对比获得层存活局] / 原始相关 / 平均获得层):",
+        ]
+        by_delta = sorted(data["relics"].items(), key=lambda pair: pair[1]["delta"], reverse=True)
+        for relic_id, stats in by_delta:
+            name = RELICS[relic_id].name if relic_id in RELICS else relic_id
+            lines.append(
+                f"  {name:<8} {stats['runs']:>7}  {stats['win_rate']:.1%}  {stats['delta']:+.1%}  "
+                f"{stats['raw_delta']:+.1%}  {stats['mean_gain_floor']:.1f}"
+            )
+        return "\n".join(lines)
+
+
+# ==========================================
+# 🏭 多进程调度
+# ==========================================
+def _run_seed_range(spec: PolicySpec, start: int, stop: int, words: Optional[list] = None) -> List[RunSummary]:
+    """子进程任务：跑完一个种子区间，只回传摘要"""
+    return [run_bot(spec.build(seed), seed=seed, words=words) for seed in range(start, stop)]
+
+
+def _chunks(seeds: range, chunk_size: int) -> Iterator[range]:
+    for start in range(seeds.start, seeds.stop, chunk_size):
+        yield range(start, min(start + chunk_size, seeds.stop))
+
+
+def iter_summaries(
+    spec: PolicySpec,
+    seeds: range,
+    workers: int = SIM_BATCH_WORKERS,
+    chunk_size: int = SIM_BATCH_CHUNK_SIZE,
+    words: Optional[list] = None,
+) -> Iterator[RunSummary]:
+    """
+    按完成顺序流式产出每局摘要
+
+    workers=1 时在当前进程内顺序执行（调试 / 测试用），产出顺序即种子顺序。
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(seeds, chunk_size):
+            yield from _run_seed_range(spec, chunk.start, chunk.stop, words)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_seed_range, spec, chunk.start, chunk.stop, words)
+            for chunk in _chunks(seeds, chunk_size)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def run_batch(
+    spec: PolicySpec,
+    seeds: Iterable[int],
+    workers: int = SIM_BATCH_WORKERS,
+    chunk_size: int = SIM_BATCH_CHUNK_SIZE,
+    words: Optional[list] = None,
+    on_summary=None,
+) -> BalanceReport:
+    """跑完整个种子区间并聚合为报告；on_summary(summary) 可用于进度显示或落盘"""
+    seeds = seeds if isinstance(seeds, range) else range(seeds)
+    report = BalanceReport()
+    for summary in iter_summaries(spec, seeds, workers, chunk_size, words):
+        report.add(summary)
+        if on_summary:
+            on_summary(summary)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="蒙特卡洛平衡批跑")
+    parser.add_argument("--runs", type=int, default=1000, help="模拟局数")
+    parser.add_argument("--seed-start", type=int, default=0, help="起始种子，区间为 [start, start+runs)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="fixed", help="机器人策略")
+    parser.add_argument("--accuracy", type=float, default=None, help="fixed/greedy 策略的答题正确率")
+    parser.add_argument("--workers", type=int, default=SIM_BATCH_WORKERS, help="进程数，0 表示全部核心")
+    parser.add_argument("--chunk-size", type=int, default=SIM_BATCH_CHUNK_SIZE, help="每个任务的局数")
+    parser.add_argument("--json", default=None, help="把报告写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    kwargs = {} if args.accuracy is None or args.policy == "tier" else {"accuracy": args.accuracy}
+    spec = PolicySpec(POLICIES[args.policy], kwargs)
+    started = time.perf_counter()
+    report = run_batch(spec, range(args.seed_start, args.seed_start + args.runs), args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    print(report.format_text())
+    print(f"[BatchRunner] {report.runs} 局，用时 {elapsed:.1f}s")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
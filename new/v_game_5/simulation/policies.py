@@ -0,0 +1,160 @@
+# ==========================================
+# 🧠 机器人策略 - 供无头模拟器做决策
+# ==========================================
+"""
+BotPolicy 负责：
+1. 把 Decision 映射为选项下标：答题类决策按正确率掷骰，其余决策交给 choose_<kind>
+2. 默认决策偏保守：血少去营地、不乱花钱、只探究一次乱葬岗
+3. 子类只需覆盖正确率或个别决策：
+   - FixedAccuracyPolicy: 固定正确率
+   - TierAccuracyPolicy: 按卡牌颜色 / 题型给正确率
+   - GreedyPolicy: 按期望收益贪心出牌、选牌、购物
+"""
+
+import random
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from models import CARD_STATS, CardType, NodeType
+from systems.run_choices import upgrade_options
+
+_NODE_PREFERENCE_LOW_HP = (NodeType.REST, NodeType.SHOP, NodeType.EVENT, NodeType.COMBAT, NodeType.ELITE, NodeType.BOSS)
+
+
+class BotPolicy:
+    """策略基类：正确率 1.0 + 保守的默认决策"""
+
+    low_hp_ratio = 0.4
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+
+    def accuracy(self, decision) -> float:
+        return 1.0
+
+    def choose(self, sim, decision) -> int:
+        if decision.answer is not None:
+            return self._answer(decision)
+        handler = getattr(self, f"choose_{decision.kind}", None)
+        return handler(sim, decision) if handler else 0
+
+    def _answer(self, decision) -> int:
+        if self.rng.random() < self.accuracy(decision):
+            return decision.answer
+        wrong = [i for i in range(len(decision.options)) if i != decision.answer]
+        return self.rng.choice(wrong) if wrong else decision.answer
+
+    def _low_hp(self, sim) -> bool:
+        return sim.player.hp < sim.player.max_hp * self.low_hp_ratio
+
+    # ------------------------------------------
+    # 默认决策
+    # ------------------------------------------
+    def choose_load(self, sim, decision) -> int:
+        return 0  # 依次装入预抽的初始牌组（与 UI 的默认选中一致）
+
+    def choose_starter_relic(self, sim, decision) -> int:
+        return self.rng.randrange(len(decision.options))
+
+    def choose_node(self, sim, decision) -> int:
+        if not self._low_hp(sim):
+            return 0
+        types = [node.type for node in decision.options]
+        return min(range(len(types)), key=lambda i: _NODE_PREFERENCE_LOW_HP.index(types[i]))
+
+    def choose_play(self, sim, decision) -> int:
+        if self._low_hp(sim):
+            for i, option in enumerate(decision.options):
+                if isinstance(option, str):
+                    return i
+        return 0
+
+    def choose_event(self, sim, decision) -> int:
+        return self.rng.randrange(len(decision.options))
+
+    def choose_shop(self, sim, decision) -> int:
+        return len(decision.options) - 1  # 最后一项是离开
+
+    def choose_rest(self, sim, decision) -> int:
+        options = decision.options
+        if upgrade_options(sim.player.deck) and sim.player.hp >= sim.player.max_hp * 0.7:
+            return options.index("upgrade")
+        return options.index("heal")
+
+    def choose_graveyard(self, sim, decision) -> int:
+        return decision.options.index("escape")
+
+
+class FixedAccuracyPolicy(BotPolicy):
+    """所有题目同一正确率"""
+
+    def __init__(self, accuracy: float = 0.8, seed: Optional[int] = None):
+        super().__init__(seed)
+        self.fixed_accuracy = accuracy
+
+    def accuracy(self, decision) -> float:
+        return self.fixed_accuracy
+
+
+class TierAccuracyPolicy(BotPolicy):
+    """按卡牌颜色给正确率（越熟的词越容易答对），阅读题单独给"""
+
+    DEFAULT_TYPE_ACCURACY = {
+        CardType.RED_BERSERK: 0.6,
+        CardType.BLUE_HYBRID: 0.8,
+        CardType.GOLD_SUPPORT: 0.95,
+        CardType.BLACK_CURSE: 0.5,
+    }
+
+    def __init__(
+        self,
+        type_accuracy: Optional[Dict[CardType, float]] = None,
+        reading_accuracy: float = 0.6,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(seed)
+        self.type_accuracy = {**self.DEFAULT_TYPE_ACCURACY, **(type_accuracy or {})}
+        self.reading_accuracy = reading_accuracy
+
+    def accuracy(self, decision) -> float:
+        if decision.quiz_type == "reading" or decision.card is None:
+            return self.reading_accuracy
+        return self.type_accuracy.get(decision.card.card_type, 0.6)
+
+
+class GreedyPolicy(FixedAccuracyPolicy):
+    """按期望收益贪心：出期望伤害最高的牌，选/买最高阶的牌，有钱就买卡"""
+
+    def _card_value(self, card) -> float:
+        stats = CARD_STATS.get(card.card_type, {})
+        acc = self.fixed_accuracy
+        return acc * (stats.get("damage", 0) + stats.get("block", 0) * 0.5) - (1 - acc) * stats.get("penalty", 0)
+
+    def choose_play(self, sim, decision) -> int:
+        if self._low_hp(sim):
+            return super().choose_play(sim, decision)
+        cards = [(i, c) for i, c in enumerate(decision.options) if not isinstance(c, str)]
+        return max(cards, key=lambda pair: self._card_value(pair[1]))[0]
+
+    def _best_card(self, decision) -> int:
+        cards = [(i, c) for i, c in enumerate(decision.options) if c is not None]
+        if not cards:
+            return len(decision.options) - 1
+        return max(cards, key=lambda pair: pair[1].tier)[0]
+
+    def choose_loot(self, sim, decision) -> int:
+        return self._best_card(decision)
+
+    def choose_shop_card(self, sim, decision) -> int:
+        return self._best_card(decision)
+
+    def choose_shop(self, sim, decision) -> int:
+        for i, offer in enumerate(decision.options):
+            if offer is not None and offer.kind in ("card", "relic"):
+                return i
+        return len(decision.options) - 1
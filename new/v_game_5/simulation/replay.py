@@ -0,0 +1,107 @@
+# ==========================================
+# ⏪ 动作回放 - 用种子 + 动作日志逐位复现一局
+# ==========================================
+"""
+Replay 负责：
+1. 用日志里的种子、词池与 Boss 题目重建 RunSimulator，按顺序把每条动作的 index 喂给 step()；
+   模拟器与 UI 的日志（source = sim / ui）都可以回放
+2. 每一步校验决策类型、下标范围与选项指纹，一旦与日志不一致立即抛出 ReplayDivergence
+   （规则改动或日志被篡改时能定位到第几步）
+3. 命令行回放并可选 cProfile，用于离线性能分析与可复现的 Bug 报告
+
+命令行：
+    python -m simulation.replay trace.jsonl [--profile] [--top 25]
+"""
+
+import argparse
+import cProfile
+import pstats
+import sys
+import time
+from pathlib import Path
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from systems.action_log import ActionLog, option_key
+from simulation.run_simulator import DEFAULT_MAX_STEPS, RunSimulator
+
+
+class ReplayDivergence(RuntimeError):
+    """回放与日志不一致"""
+
+    def __init__(self, step: int, expected, actual: str):
+        self.step = step
+        super().__init__(f"step {step}: expected {expected}, got {actual}")
+
+
+def replay(log: ActionLog, words: list = None, max_steps: int = DEFAULT_MAX_STEPS) -> RunSimulator:
+    """
+    逐条回放动作日志，返回跑完的 RunSimulator（summary() / log 可与原局比较）
+
+    words 未传入时使用日志头部记录的词池（没有则为合成词池）。
+    "继续游戏"之后的状态来自存档而不是动作序列，含 continue 动作的日志无法回放；
+    战斗外使用道具（item 动作）模拟器不建模，同样无法回放。
+    """
+    if log.source not in ("sim", "ui"):
+        raise ValueError(f"cannot replay a '{log.source}' action log headlessly")
+    kinds = {kind for kind, _, _ in log.actions}
+    if "continue" in kinds:
+        raise ValueError("cannot replay a run that was continued from a save")
+    if "item" in kinds:
+        raise ValueError("cannot replay a run with out-of-combat item use")
+    if words is None:
+        words = log.words
+    sim = RunSimulator(seed=log.seed, words=words, max_steps=max_steps, boss_quizzes=log.boss_quizzes)
+    for step, (kind, index, key) in enumerate(log.actions):
+        decision = sim.pending
+        if decision is None:
+            raise ReplayDivergence(step, [kind, index, key], "end of run")
+        if decision.kind != kind:
+            raise ReplayDivergence(step, [kind, index, key], f"decision {decision.kind}")
+        if not isinstance(index, int) or not 0 <= index < len(decision.options):
+            raise ReplayDivergence(step, [kind, index, key], f"{len(decision.options)} options")
+        actual = option_key(decision.options[index])
+        if actual != key:
+            raise ReplayDivergence(step, [kind, index, key], f"option {actual!r}")
+        sim.step(index)
+    return sim
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="回放动作日志")
+    parser.add_argument("log", help="ActionLog JSONL 文件")
+    parser.add_argument("--profile", action="store_true", help="用 cProfile 统计回放热点")
+    parser.add_argument("--top", type=int, default=25, help="--profile 时输出的函数数量")
+    args = parser.parse_args(argv)
+
+    log = ActionLog.load(args.log)
+    profiler = cProfile.Profile() if args.profile else None
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        sim = replay(log)
+    except (ReplayDivergence, ValueError) as exc:
+        print(f"[Replay] 无法回放: {exc}")
+        return 1
+    finally:
+        if profiler:
+            profiler.disable()
+    elapsed = time.perf_counter() - started
+
+    summary = sim.summary()
+    result = "胜利" if summary.victory else ("卡死" if summary.stalled else "失败")
+    print(f"[Replay] seed={log.seed} 动作 {len(log)} 条，用时 {elapsed * 1000:.1f}ms")
+    print(f"{result}  第{summary.floor}层  HP {summary.hp}/{summary.max_hp}  金币 {summary.gold}  "
+          f"牌组 {summary.deck_size}  回合 {summary.turns}")
+    if not sim.done:
+        print(f"[Replay] 日志在 {sim.pending.kind} 决策处截止，本局未结束")
+    if profiler:
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,744 @@
+# ==========================================
+# 🤖 无头模拟器 - 不经过 UI 驱动完整一局
+# ==========================================
+"""
+RunSimulator 负责：
+1. 复刻 render_game 的整局流程：爬塔准备（装牌 + 初始遗物）→ 地图 → 战斗/精英/事件/商店/营地 → Boss；
+   规则全部来自 MapSystem、CardCombatState、CombatEngine 与各注册表，不依赖 Streamlit、数据库和 AI
+2. 玩家的每个输入都是一个 Decision（选项列表），调用方用 step(index) 推进 —— 这就是动作 API
+3. run_bot() 让机器人策略一口气跑完一局，返回 RunSummary，用于热点分析与数值平衡
+4. 每次 step() 都追加到 self.log（ActionLog），连同种子即可由 simulation.replay 逐位复现
+
+与 UI 的差异：
+- 未传入 boss_quizzes 时 Boss 题目用牌组单词合成（不请求 AI），文章阶段直接跳过
+- HP 归零时立即结束本局（UI 只在战斗中检查死亡）
+- 战斗僵局（无牌可抽）时直接进入敌人回合，UI 会停在提示上
+- 爬塔准备按"逐张装入"建模（每次从未选中的卡里选一张），UI 是勾选/取消的多选面板，最终牌组相同
+- 单词熟练度只在内存里推进（WordProgress），不写数据库、不记错题；不模拟存档/继续游戏
+- 战斗外使用道具不建模（UI 记为 item 动作，这样的日志无法回放）；首领战停在出牌时用道具建模为
+  play 选项，与 UI 一样不结束回合
+- 只许出红卡的额外行动中既没有红卡也没有可用道具时 UI 无法继续，本局记为 stalled 结束
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import (
+    GAME_POOL_BLUE,
+    GAME_POOL_GOLD,
+    GAME_POOL_RED,
+    INITIAL_DECK_BLUE,
+    INITIAL_DECK_GOLD,
+    INITIAL_DECK_RED,
+    INITIAL_DECK_SIZE,
+    INITIAL_GOLD,
+    TOTAL_FLOORS,
+)
+from database import GameDB, word_progress_after
+from models import BossState, CardCombatState, Enemy, NodeType, Player, RunState, WordCard
+from systems.action_log import ActionLog, option_key
+from systems.combat_engine import CombatEngine
+from registries import EventRegistry, RelicRegistry, ShopRegistry, SHOP_ITEMS
+from systems.run_choices import (
+    ShopOffer,
+    event_choices,
+    forge_options,
+    play_options,
+    rest_options,
+    shop_offers,
+    spell_options,
+    starter_relic_options,
+)
+from systems.map_system import MapSystem
+from systems.node_effects import (
+    apply_event_choice,
+    buy_shop_item,
+    cancel_card_purchase,
+    card_purchase_candidates,
+    explore_graveyard,
+    finish_card_purchase,
+    purify_card,
+    read_mysterious_book,
+    rest_heal,
+    roll_adventurer_loot,
+    smith_blue_cards,
+    start_card_purchase,
+    upgrade_card,
+)
+from systems.run_flow_utils import (
+    CURSED_RELIC_IDS,
+    apply_relic_on_gain,
+    convert_event_node_to_combat,
+)
+from systems.run_rng import RunRandom
+from systems.trigger_bus import TriggerBus, TriggerContext
+
+DEFAULT_MAX_STEPS = 20000
+
+
+class _RunStuck(Exception):
+    """当前决策没有任何可选项（UI 中所有按钮都被禁用）"""
+
+
+def _silent(level: str, text: str, icon: str = None):
+    """模拟时丢弃所有提示"""
+
+
+def _is_cursed_relic(relic_id: str) -> bool:
+    if relic_id in CURSED_RELIC_IDS or "CURSE" in relic_id.upper():
+        return True
+    relic = RelicRegistry.get(relic_id)
+    return bool(relic and "诅咒" in relic.name)
+
+
+def synthetic_word_pool(red: int = GAME_POOL_RED, blue: int = GAME_POOL_BLUE, gold: int = GAME_POOL_GOLD) -> list:
+    """生成与 get_game_pool 同结构的合成词池 (word / meaning / tier)"""
+    pool = []
+    for prefix, tier, count in (("red", 0, red), ("blue", 2, blue), ("gold", 4, gold)):
+        pool.extend({"word": f"{prefix}{i:02d}", "meaning": f"{prefix}-{i}", "tier": tier} for i in range(count))
+    return pool
+
+
+def _build_card(row: dict) -> WordCard:
+    return WordCard(
+        word=row["word"],
+        meaning=row.get("meaning", ""),
+        tier=row.get("tier", 0),
+        priority=row.get("priority", "normal"),
+    )
+
+
+# ==========================================
+# 📮 动作 API
+# ==========================================
+@dataclass
+class Decision:
+    """
+    一个待玩家决定的选择点
+
+    kind: load / starter_relic / node / play / answer / boss_quiz / spell / relic / event /
+          loot / fountain / graveyard / shop / shop_card / rest / upgrade
+    answer: 答题类决策中正确选项的下标，其余决策为 None
+    """
+    kind: str
+    options: List[Any]
+    card: Optional[WordCard] = None
+    answer: Optional[int] = None
+    quiz_type: str = ""
+
+
+@dataclass
+class RunSummary:
+    """一局模拟的结果"""
+    seed: int
+    victory: bool
+    stalled: bool
+    floor: int
+    rooms: int
+    hp: int
+    max_hp: int
+    gold: int
+    deck_size: int
+    relics: List[str] = field(default_factory=list)
+    combats: int = 0
+    elites: int = 0
+    boss_reached: bool = False
+    turns: int = 0
+    answers: int = 0
+    correct: int = 0
+    steps: int = 0
+    hp_curve: List[int] = field(default_factory=list)  # 每层结算后的 HP，下标 = 层数 - 1
+    relic_floors: Dict[str, int] = field(default_factory=dict)  # 遗物 -> 首次获得的层数（开局为 0）
+
+
+class WordProgress:
+    """
+    单词库进度的内存版（tier / 连续答对），代替 GameDB 传给 CombatEngine.process_answer
+
+    以开局词池里的进度为初始值，升级规则与数据库共用 word_progress_after，
+    所以局内"连对升级"与 UI 一致
+    """
+
+    def __init__(self, rows: list):
+        self.rows = {
+            row["word"]: [row.get("tier", 0) or 0, row.get("consecutive_correct", 0) or 0] for row in rows
+        }
+
+    def update_word_progress(self, player_id: int, word: str, correct: bool, current_room: int = 0):
+        row = self.rows.get(word)
+        if row is None:
+            return None
+        tier = row[0]
+        row[:] = word_progress_after(tier, row[1], correct)
+        if correct:
+            return {"upgraded": row[0] > tier, "new_tier": row[0]}
+        return {"upgraded": False, "new_tier": tier, "downgraded": False}
+
+    def set_word_tier(self, player_id: int, word: str, tier: int, current_room: int = 0, priority: str = None) -> bool:
+        row = self.rows.get(word)
+        if row is None:
+            return False
+        row[:] = [tier, 0]
+        return True
+
+
+class RunSimulator:
+    """
+    无头整局模拟
+
+    用法：
+        sim = RunSimulator(seed=42)
+        while not sim.done:
+            sim.step(choose(sim.pending))
+        sim.summary()
+
+    words 为开局词池（get_game_pool 的行）；boss_quizzes 为 Boss 题目队列（UI 的 _build_boss_quiz_queue 结果），
+    未传入时用牌组单词合成。
+    """
+
+    def __init__(
+        self,
+        seed: int = None,
+        words: list = None,
+        max_steps: int = DEFAULT_MAX_STEPS,
+        boss_quizzes: list = None,
+    ):
+        self.rng = RunRandom(seed)
+        self.log = ActionLog(
+            seed=self.rng.run_seed,
+            source="sim",
+            words=list(words) if words is not None else None,
+            boss_quizzes=list(boss_quizzes) if boss_quizzes is not None else None,
+        )
+        self.boss_quizzes = boss_quizzes
+        self.max_steps = max_steps
+        self.steps = 0
+        self.answers = 0
+        self.correct = 0
+        self.turns = 0
+        self.boss_reached = False
+        self.hp_curve = []
+        self.relic_floors = {}
+        self.victory = False
+        self.stalled = False
+        self.seen_events = set()
+        self.last_node_type = None
+        self.forging = False  # 对应 UI 的 rest_phase：锻造中直接休息离开时不会清除，下个营地仍在淬炼面板
+
+        pool = list(words) if words is not None else synthetic_word_pool()
+        self.progress = WordProgress(pool)
+        deck_rows = GameDB.get_initial_deck_from_pool(
+            pool, INITIAL_DECK_RED, INITIAL_DECK_BLUE, INITIAL_DECK_GOLD, rng=self.rng
+        )
+        deck_words = {row["word"] for row in deck_rows}
+        # 与 start_new_game 一致：预抽的初始牌组排在前面，爬塔准备阶段默认选中前 INITIAL_DECK_SIZE 张
+        self.draft_pool = [_build_card(row) for row in deck_rows] + [
+            _build_card(row) for row in pool if row["word"] not in deck_words
+        ]
+        self.run = RunState(
+            player=Player(gold=INITIAL_GOLD, deck=[]),
+            total_floors=TOTAL_FLOORS,
+            in_progress=True,
+            rng=self.rng,
+        )
+        self.game_map = MapSystem(total_floors=TOTAL_FLOORS, rng=self.rng)
+
+        self._flow = self._play_run()
+        self.pending: Optional[Decision] = next(self._flow, None)
+
+    @property
+    def player(self) -> Player:
+        return self.run.player
+
+    @property
+    def done(self) -> bool:
+        return self.pending is None
+
+    def step(self, index: int) -> Optional[Decision]:
+        """选择当前决策的第 index 个选项，返回下一个决策（本局结束时为 None）"""
+        decision = self.pending
+        if decision is None:
+            raise RuntimeError("run is already over")
+        if not 0 <= index < len(decision.options):
+            raise ValueError(f"{decision.kind}: option {index} out of range ({len(decision.options)})")
+        self.log.record(decision.kind, index, option_key(decision.options[index]))
+        self.steps += 1
+        if decision.answer is not None:
+            self.answers += 1
+            self.correct += index == decision.answer
+        if self.steps >= self.max_steps:
+            self.stalled = True
+            self._flow.close()
+            self.pending = None
+            return None
+        try:
+            self.pending = self._flow.send(index)
+        except StopIteration:
+            self.pending = None
+        return self.pending
+
+    def summary(self) -> RunSummary:
+        player = self.player
+        return RunSummary(
+            seed=self.rng.run_seed,
+            victory=self.victory,
+            stalled=self.stalled,
+            floor=self.game_map.floor,
+            rooms=player.current_room,
+            hp=player.hp,
+            max_hp=player.max_hp,
+            gold=player.gold,
+            deck_size=len(player.deck),
+            relics=list(player.relics),
+            combats=self.game_map.normal_combats_completed,
+            elites=self.game_map.elite_combats_completed,
+            boss_reached=self.boss_reached,
+            turns=self.turns,
+            answers=self.answers,
+            correct=self.correct,
+            steps=self.steps,
+            hp_curve=list(self.hp_curve),
+            relic_floors=dict(self.relic_floors),
+        )
+
+    def _ask(self, kind: str, options: list, **extra):
+        index = yield Decision(kind=kind, options=options, **extra)
+        return options[index]
+
+    # ------------------------------------------
+    # 地图主循环（对应 GameManager.enter_node / resolve_node）
+    # ------------------------------------------
+    def _play_run(self):
+        ms = self.game_map
+        ms.next_options = ms.generate_next_options()
+        yield from self._tower_prep()
+        while True:
+            node = yield from self._ask("node", list(ms.next_options))
+            ms.current_node = node
+            try:
+                if node.type == NodeType.BOSS:
+                    yield from self._boss_node()
+                elif node.type in (NodeType.COMBAT, NodeType.ELITE):
+                    yield from self._combat_node()
+                elif node.type == NodeType.EVENT:
+                    yield from self._event_node()
+                elif node.type == NodeType.SHOP:
+                    yield from self._shop_node()
+                elif node.type == NodeType.REST:
+                    yield from self._rest_node()
+            except _RunStuck:
+                self.stalled = True
+                self.run.in_progress = False
+                return
+            self.hp_curve.append(self.player.hp)
+            for relic_id in self.player.relics:
+                self.relic_floors.setdefault(relic_id, len(self.hp_curve))
+            if self.player.is_dead():
+                self.run.in_progress = False
+                return
+
+            self.last_node_type = node.type
+            if node.type in (NodeType.EVENT, NodeType.SHOP, NodeType.REST):
+                ms.non_combat_streak += 1
+            else:
+                ms.non_combat_streak = 0
+            if node.type == NodeType.BOSS:
+                self.victory = True
+                self.run.in_progress = False
+                return
+            ms.next_options = ms.generate_next_options()
+
+    # ------------------------------------------
+    # 爬塔准备（对应 render_tower_prep / complete_tower_prep）
+    # ------------------------------------------
+    def _tower_prep(self):
+        """逐张装入初始牌组（选项为尚未选中的卡，保持词池顺序），再三选一初始遗物"""
+        remaining = list(self.draft_pool)
+        selected = []
+        for _ in range(min(INITIAL_DECK_SIZE, len(remaining))):
+            card = yield from self._ask("load", list(remaining))
+            remaining.remove(card)
+            selected.append(card)
+        order = {id(card): i for i, card in enumerate(self.draft_pool)}
+        self.player.deck = sorted(selected, key=lambda card: order[id(card)])
+        self.run.word_pool = remaining
+
+        starters = starter_relic_options()
+        if starters:
+            relic_id = yield from self._ask("starter_relic", starters)
+            if relic_id not in self.player.relics:
+                self.player.relics.append(relic_id)
+                self.relic_floors[relic_id] = 0
+
+    # ------------------------------------------
+    # 战斗（对应 render_combat / _render_battle_phase）
+    # ------------------------------------------
+    def _use_item(self, item_id: str, ends_turn: bool = True):
+        player = self.player
+        player.inventory.remove(item_id)
+        item = SHOP_ITEMS[item_id]
+        if item.effect == "heal":
+            if "CURSED_BLOOD" not in player.relics:
+                player.change_hp(item.value, notify=_silent)
+        elif item.effect == "shield":
+            player.flags.item_shield = True
+        elif item.effect == "damage_reduce":
+            player.flags.item_damage_reduce = max(player.flags.item_damage_reduce, item.value or 5)
+        elif item.effect == "hint":
+            player.flags.item_hint += 1
+        elif item.effect == "max_hp":
+            player.max_hp += item.value
+            player.hp = min(player.hp + item.value, player.max_hp)
+            if "MONKEY_PAW" in player.relics and player.max_hp > 50:
+                player.max_hp = 50
+                player.hp = min(player.hp, player.max_hp)
+        if ends_turn:
+            player.flags.end_turn_due_to_item = True
+
+    def _choose_play(self, cs: CardCombatState, items_end_turn: bool = True):
+        """出牌（或使用道具）；首领战中道具不结束回合（UI 的 HUD 不把首领战算作战斗中）"""
+        options = play_options(cs, self.player.inventory)
+        if not options:
+            raise _RunStuck("play")
+        choice = yield from self._ask("play", options)
+        if isinstance(choice, str):
+            self._use_item(choice, ends_turn=items_end_turn)
+        else:
+            CombatEngine.start_card_play(cs, self.player, choice, self.run)
+
+    def _answer_card(self, cs: CardCombatState):
+        card = cs.current_card
+        options = CombatEngine.get_quiz_options(cs, self.run)
+        answer = yield from self._ask("answer", options, card=card, answer=options.index(card.word))
+        return CombatEngine.process_answer(
+            cs, self.player, card, answer, self.progress, self.player.id, self.player.current_room, self.run
+        )
+
+    def _battle(self, cs: CardCombatState):
+        """普通/精英战斗循环；返回是否胜利"""
+        player = self.player
+        run = self.run
+        CombatEngine.start_battle(cs, player, run)
+        while True:
+            if player.flags.end_turn_due_to_item:
+                result = CombatEngine.resolve_enemy_turn(cs, player, run)
+            elif player.flags.player_stunned:
+                result = CombatEngine.resolve_stun_turn(cs, player, run)
+            elif CombatEngine.advance_phase_if_victory(cs):
+                self.turns += cs.turns
+                return True
+            elif cs.current_card:
+                result = yield from self._answer_card(cs)
+                if (
+                    result.should_enemy_turn
+                    and not result.should_rerun
+                    and not result.player_dead
+                    and not cs.enemy.is_dead()
+                ):
+                    result = CombatEngine.resolve_enemy_turn(cs, player, run)
+            elif cs.hand or CombatEngine.auto_draw_if_empty(cs, run).should_rerun:
+                yield from self._choose_play(cs)
+                continue
+            else:
+                # 无牌可抽的僵局：直接进入敌人回合
+                result = CombatEngine.resolve_enemy_turn(cs, player, run)
+            if result.player_dead or player.is_dead():
+                self.turns += cs.turns
+                return False
+            CombatEngine.advance_phase_if_victory(cs)
+
+    def _combat_node(self, forced_enemy: Enemy = None):
+        player = self.player
+        node = self.game_map.current_node
+        player.flags.reset_combat()
+        if forced_enemy is not None:
+            forced_enemy.is_elite = True
+            enemy = forced_enemy
+        else:
+            enemy = Enemy(level=node.level, is_elite=node.type == NodeType.ELITE, rng=self.rng)
+        cs = CardCombatState(player=player, enemy=enemy, deck=player.deck.copy(), rng=self.rng)
+        won = yield from self._battle(cs)
+        if not won:
+            return
+
+        is_elite = cs.enemy.is_elite
+        self.game_map.record_combat_completed(NodeType.ELITE if is_elite else NodeType.COMBAT)
+        if is_elite:
+            for card in CombatEngine._take_cards_from_pool(self.run, 1, prefer_red_only=True):
+                player.add_card_to_deck(card)
+            pool = [rid for rid in RelicRegistry.get_pool("high") if rid not in player.relics]
+            if pool:
+                relic_id = yield from self._ask("relic", self.rng.sample(pool, min(3, len(pool))) + [None])
+                if relic_id:
+                    player.relics.append(relic_id)
+                    apply_relic_on_gain(player, relic_id)
+
+        gold_reward = 50 if is_elite else 30
+        ctx = TriggerContext(player=player, enemy=cs.enemy, combat_state=cs, data={"gold_reward": gold_reward})
+        TriggerBus.trigger("on_combat_end", ctx)
+        player.add_gold(ctx.data.get("gold_reward", gold_reward), notify=_silent)
+        player.advance_room()
+        player.armor = 0
+
+    # ------------------------------------------
+    # Boss（对应 render_boss）
+    # ------------------------------------------
+    def _boss_quiz_queue(self) -> list:
+        if self.boss_quizzes is not None:
+            return [dict(quiz, options=list(quiz.get("options") or [])) for quiz in self.boss_quizzes]
+        words = [c.word for c in self.player.deck] or ["word"]
+        queue = []
+        for i in range(5):
+            answer = words[i % len(words)]
+            distractors = [w for w in words if w != answer][:3]
+            queue.append({"type": "vocab", "options": [answer] + distractors, "answer": answer})
+        for i in range(3):
+            options = [f"reading-{i}-{k}" for k in range(4)]
+            queue.append({"type": "reading", "options": options, "answer": options[0]})
+        for quiz in queue:
+            self.rng.shuffle(quiz["options"])
+        return queue
+
+    def _boss_quiz(self, bs: BossState, cs: CardCombatState):
+        quiz = bs.active_quiz
+        options, answer = quiz["options"], quiz.get("answer")
+        card = next((c for c in self.player.deck if c.word == answer), None)
+        choice = yield from self._ask(
+            "boss_quiz", options, card=card,
+            answer=options.index(answer) if answer in options else None, quiz_type=quiz.get("type", "vocab"),
+        )
+        if choice == answer:
+            cs.enemy.take_damage(20)
+        else:
+            self.player.change_hp(-15, notify=_silent)
+        bs.quiz_asked += 1
+        bs.active_quiz = None
+        bs.next_quiz_turn += bs.quiz_interval_turns
+
+    def _boss_node(self):
+        player = self.player
+        run = self.run
+        self.boss_reached = True
+        boss_hp = max(120, len(player.deck) * 15)
+        bs = BossState(boss_hp=boss_hp, boss_max_hp=boss_hp, phase="battle")
+        bs.quiz_queue = self._boss_quiz_queue()
+        bs.next_quiz_turn = bs.quiz_interval_turns
+        player.flags.reset_combat()
+        enemy = Enemy(
+            name="语法巨像",
+            level=self.game_map.current_node.level,
+            hp=bs.boss_hp,
+            max_hp=bs.boss_max_hp,
+            attack=bs.boss_attack_max,
+            is_elite=True,
+            is_boss=True,
+            use_fixed_stats=True,
+            fixed_attack=bs.boss_attack_max,
+            fixed_timer=bs.boss_attack_interval,
+            attack_interval=bs.boss_attack_interval,
+            rng=self.rng,
+        )
+        cs = CardCombatState(player=player, enemy=enemy, deck=player.deck.copy(), rng=self.rng)
+        CombatEngine.start_battle(cs, player, run)
+
+        while True:
+            bs.boss_hp = cs.enemy.hp
+            CombatEngine.enforce_boss_death_lock(bs, cs)
+            if cs.enemy.hp <= 0 and bs.quiz_asked >= bs.death_lock_until_quiz_count:
+                break
+            if bs.quiz_asked >= bs.death_lock_until_quiz_count:
+                bs.frenzy_active = True
+
+            enemy_turn = False
+            if player.flags.end_turn_due_to_item or player.flags.player_stunned:
+                player.flags.end_turn_due_to_item = False
+                player.flags.player_stunned = False
+                enemy_turn = True
+            else:
+                if bs.active_quiz is None and cs.turns >= bs.next_quiz_turn \
+                        and bs.quiz_asked < bs.death_lock_until_quiz_count:
+                    if not bs.quiz_queue:
+                        bs.quiz_queue = self._boss_quiz_queue()
+                    while bs.quiz_queue and bs.active_quiz is None:
+                        quiz = bs.quiz_queue.pop(0)
+                        if quiz.get("options"):  # 与 UI 一致：没有选项的题直接跳过
+                            bs.active_quiz = quiz
+                if bs.active_quiz:
+                    yield from self._boss_quiz(bs, cs)
+                elif cs.current_card:
+                    result = yield from self._answer_card(cs)
+                    enemy_turn = result.should_enemy_turn and not result.should_rerun and not result.player_dead
+                elif cs.hand or CombatEngine.auto_draw_if_empty(cs, run).should_rerun:
+                    yield from self._choose_play(cs, items_end_turn=False)
+                else:
+                    enemy_turn = True
+            if enemy_turn and not player.is_dead():
+                CombatEngine.resolve_boss_enemy_turn(cs, player, bs, run)
+            if player.is_dead():
+                self.turns += cs.turns
+                return
+
+        self.turns += cs.turns
+        player.add_gold(100, notify=_silent)
+        player.advance_room()
+
+    # ------------------------------------------
+    # 事件（对应 render_event 及其子阶段）
+    # ------------------------------------------
+    def _pick_event_id(self) -> str:
+        player = self.player
+        all_events = EventRegistry.get_all()
+        available = [eid for eid in all_events if eid not in self.seen_events]
+        if not available:
+            self.seen_events = set()
+            available = list(all_events)
+
+        good = [eid for eid in available if all_events[eid].category == "good"]
+        bad = [eid for eid in available if all_events[eid].category == "bad"]
+        good_weight = 1 + (self.last_node_type in (NodeType.COMBAT, NodeType.ELITE))
+        bad_weight = 1
+        if self.game_map.non_combat_streak >= 2:
+            bad_weight += self.game_map.non_combat_streak - 1
+        if any(_is_cursed_relic(rid) for rid in player.relics):
+            bad_weight += 1
+
+        if good and bad:
+            category = self.rng.choices(["good", "bad"], weights=[good_weight, bad_weight], k=1)[0]
+            return self.rng.choice(good if category == "good" else bad)
+        return self.rng.choice(good or bad or available)
+
+    def _spell(self, card: WordCard):
+        answer = yield from self._ask("spell", spell_options(card), card=card, answer=0)
+        return answer == card.word
+
+    def _event_node(self):
+        player = self.player
+        node = self.game_map.current_node
+        event_id = self._pick_event_id()
+        self.seen_events.add(event_id)
+        event = EventRegistry.get(event_id)
+
+        choice = yield from self._ask("event", event_choices(event, player.gold))
+        subphase = apply_event_choice(player, choice, self.rng, _silent)
+        if subphase == "fill_blank":
+            yield from self._fountain()
+        elif subphase == "adventurer_loot":
+            cards = roll_adventurer_loot(player, self.run.word_pool, self.rng)
+            if cards is None:
+                convert_event_node_to_combat(node, NodeType.COMBAT)
+                yield from self._combat_node()
+                return
+            if cards:
+                card = yield from self._ask("loot", cards)
+                player.add_card_to_deck(card)
+        elif subphase == "book_read":
+            read_mysterious_book(player, self.rng)
+        elif subphase == "graveyard":
+            ghost = yield from self._graveyard()
+            if ghost is not None:
+                node.type = NodeType.ELITE
+                yield from self._combat_node(forced_enemy=ghost)
+                return
+        player.advance_room()
+
+    def _fountain(self):
+        black_cards = [c for c in self.player.deck if c.is_blackened]
+        if not black_cards:
+            return
+        target = black_cards[0]
+        if len(black_cards) > 1:
+            target = yield from self._ask("fountain", black_cards + [None])
+            if target is None:
+                return
+        spelled = yield from self._spell(target)
+        purify_card(target, spelled, _silent)
+
+    def _graveyard(self):
+        """乱葬岗：返回幽灵敌人（触发精英战）或 None（逃跑）"""
+        explore_count = 0
+        while (yield from self._ask("graveyard", ["explore", "escape"])) == "explore":
+            explore_count += 1
+            level = self.game_map.current_node.level
+            ghost = explore_graveyard(self.player, explore_count, level, self.rng, _silent)
+            if ghost is not None:
+                return ghost
+        return None
+
+    # ------------------------------------------
+    # 商店 / 营地（对应 render_shop / render_rest）
+    # ------------------------------------------
+    def _buy_card(self, color: str, price: int):
+        player = self.player
+        start_card_purchase(player, color, price)
+        candidates = card_purchase_candidates(player, color, self.run.word_pool, self.rng)
+        card = None
+        if candidates:
+            card = yield from self._ask("shop_card", candidates + [None])
+        if card is None:
+            cancel_card_purchase(player, color, price)
+            return
+        self.run.word_pool = finish_card_purchase(player, card, self.run.word_pool)
+
+    def _shop_node(self):
+        player = self.player
+        inventory = ShopRegistry.get_shop_inventory(
+            total_slots=4, relic_chance=0.2, exclude_relics=set(player.relics), rng=self.rng
+        )
+        relic_slots = list(inventory.get("relic_slots", []))
+        other_slots = list(inventory.get("other_slots", []))
+        while True:
+            offer = yield from self._ask("shop", shop_offers(player, relic_slots, other_slots) + [None])
+            if offer is None:
+                break
+            if offer.kind == "card":
+                yield from self._buy_card(offer.key, offer.price)
+                continue
+            buy_shop_item(player, offer.key, offer.item, offer.price, _silent)
+            if offer.kind == "relic":
+                relic_slots = [pair for pair in relic_slots if pair[0] != offer.key]
+        player.advance_room()
+
+    def _rest_node(self):
+        """营地菜单与淬炼面板（对应 render_rest / _render_camp_upgrade）"""
+        player = self.player
+        while True:
+            if not self.forging:
+                choice = yield from self._ask("rest", rest_options(player))
+                if choice == "upgrade":
+                    self.forging = True
+                    continue
+            else:
+                choice = yield from self._ask("upgrade", forge_options(player))
+                if choice == "cancel":
+                    self.forging = False
+                    continue
+                if isinstance(choice, WordCard):
+                    if (yield from self._spell(choice)):
+                        upgrade_card(choice, self.run, self.progress, player.id, self.game_map.floor, _silent)
+                        continue
+                    self.forging = False
+                    break
+                if choice is None:
+                    self.forging = False
+                    break
+
+            if choice == "heal":
+                rest_heal(player, _silent)
+            elif choice == "smith":
+                smith_blue_cards(player)
+            break
+        player.advance_room()
+
+def run_bot(policy, seed: int = None, words: list = None, max_steps: int = DEFAULT_MAX_STEPS) -> RunSummary:
+    """用机器人策略跑完一局"""
+    sim = RunSimulator(seed=seed, words=words, max_steps=max_steps)
+    decision = sim.pending
+    while decision is not None:
+        decision = sim.step(policy.choose(sim, decision))
+    return sim.summary()
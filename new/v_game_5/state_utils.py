@@ -1,17 +1,130 @@
-import streamlit as st
+import json
 
+import streamlit as st
 
-COMBAT_FLAGS = [
-    "_item_shield",
-    "_item_damage_reduce",
-    "_item_hint",
-    "_greedy_curse",
-    "_player_stunned",
-]
+from systems.action_log import ActionLog, option_key
 
 
 def reset_combat_flags():
-    """Clear transient combat-related session_state flags."""
-    for key in COMBAT_FLAGS:
-        if key in st.session_state:
-            del st.session_state[key]
+    """Clear transient combat-related run flags on the current player."""
+    player = st.session_state.get("player")
+    if player is not None:
+        player.flags.reset_combat()
+
+
+def notify_ui(level: str, text: str, icon: str = None):
+    """Render a core-layer notification (``notify`` callback) with Streamlit."""
+    if level == "success":
+        st.success(text)
+    elif level == "warning":
+        st.warning(text)
+    elif level == "error":
+        st.error(text)
+    elif level == "info":
+        st.info(text)
+    else:
+        st.toast(text, icon=icon)
+
+
+def start_action_log(run_uid: str, seed: int, words: list = None, restore: bool = False) -> ActionLog:
+    """
+    Attach the run's ``ActionLog`` to the session and write its ``start`` row.
+
+    ``words`` is the run's word pool (``get_game_pool`` rows); it is stored in
+    the log header together with the seed so the run can be replayed headlessly.
+    With ``restore=True`` (continue game) the actions already persisted for
+    ``run_uid`` are loaded instead and a ``continue`` action is appended, so the
+    log keeps growing but is marked as not replayable from the seed alone.
+    """
+    db = st.session_state.get("db")
+    player_id = (st.session_state.get("db_player") or {}).get("id")
+    stored = db.get_action_log(player_id, run_uid) if restore and db is not None else None
+    if stored:
+        log = ActionLog(
+            seed=stored["seed"],
+            run_uid=run_uid,
+            source="ui",
+            words=stored["words"],
+            boss_quizzes=stored["boss_quizzes"],
+            actions=stored["actions"],
+        )
+        st.session_state.action_log = log
+        record_action("continue")
+        return log
+    log = ActionLog(seed=seed, run_uid=run_uid, source="ui", words=words)
+    if db is not None:
+        header = json.dumps(log.header(), ensure_ascii=False, separators=(",", ":"))
+        db.append_run_action(player_id, run_uid, 0, "start", None, header)
+    st.session_state.action_log = log
+    return log
+
+
+def record_boss_quizzes(quizzes: list):
+    """Store the Boss quiz queue (AI content, not derived from the seed) with the run's log."""
+    log = st.session_state.get("action_log")
+    if log is None:
+        return
+    log.boss_quizzes = [dict(quiz) for quiz in quizzes]
+    db = st.session_state.get("db")
+    if db is not None:
+        player_id = (st.session_state.get("db_player") or {}).get("id")
+        payload = json.dumps(log.boss_quizzes, ensure_ascii=False, separators=(",", ":"))
+        db.append_run_action(player_id, log.run_uid, len(log), "boss_quizzes", None, payload)
+
+
+def record_action(kind: str, index: int = None, option=None):
+    """Append one player action to the run's ``ActionLog`` and persist it."""
+    log = st.session_state.get("action_log")
+    if log is None:
+        return
+    key = option_key(option)
+    log.record(kind, index, key)
+    db = st.session_state.get("db")
+    if db is not None:
+        player_id = (st.session_state.get("db_player") or {}).get("id")
+        db.append_run_action(player_id, log.run_uid, len(log), kind, index, key)
+
+
+class SessionRunState:
+    """
+    Adapt ``st.session_state`` to the ``models.RunState`` interface.
+
+    The combat engine only reads and writes RunState attributes, so the UI hands
+    it this adapter while headless callers use a plain RunState.
+    """
+
+    _KEYS = {
+        "word_pool": ("game_word_pool", list),
+        "in_game_streak": ("in_game_streak", dict),
+        "gold_upgraded_words": ("run_gold_upgraded_words", list),
+        "black_correct_streak": ("black_correct_streak", dict),
+    }
+
+    def __init__(self, session_state=None):
+        object.__setattr__(self, "_session", session_state if session_state is not None else st.session_state)
+
+    def __getattr__(self, name):
+        if name not in self._KEYS:
+            raise AttributeError(name)
+        key, factory = self._KEYS[name]
+        value = self._session.get(key)
+        if value is None:
+            value = self._session[key] = factory()
+        return value
+
+    def __setattr__(self, name, value):
+        if name not in self._KEYS:
+            raise AttributeError(name)
+        self._session[self._KEYS[name][0]] = value
+
+    @property
+    def player(self):
+        return self._session.get("player")
+
+    @property
+    def flags(self):
+        return self.player.flags
+
+    @property
+    def rng(self):
+        return self._session.get("run_rng")
@@ -14,6 +14,8 @@ from systems.map_system import MapSystem
 from systems.trigger_bus import TriggerBus, TriggerContext
 from systems.combat_engine import CombatEngine
 from systems.combat_events import CombatEvent, CombatResult
+from systems.run_rng import RunRandom
+from systems.action_log import ActionLog, option_key
 
 __all__ = [
     'WordPool',
@@ -23,4 +25,7 @@ __all__ = [
     'CombatEngine',
     'CombatEvent',
     'CombatResult',
+    'RunRandom',
+    'ActionLog',
+    'option_key',
 ]
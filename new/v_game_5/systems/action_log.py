@@ -0,0 +1,108 @@
+# ==========================================
+# 📝 动作日志 - 只追加的玩家输入记录
+# ==========================================
+"""
+ActionLog 负责：
+1. 按顺序记录玩家的每个输入（选节点、装牌、出牌、答题、商店购买、事件选择 ...）
+   每条动作是紧凑的 [kind, index, key]：index 是所选选项在当时选项列表中的下标，
+   key 是选项的可读指纹，回放时用来校验分歧
+2. 与本局种子、开局词池、Boss 题目一起序列化成 JSONL（首行头部，之后一行一条动作），便于附在 Bug 报告里
+3. 不依赖 Streamlit；UI 与 RunSimulator 共用同一套决策与选项顺序（systems.run_choices），回放见 simulation.replay
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional
+
+ACTION_LOG_VERSION = 1
+
+
+def _dump(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def option_key(option: Any) -> str:
+    """选项的稳定指纹：单词卡取单词、节点取类型、商品取 kind:key、事件选项取文本"""
+    if option is None:
+        return ""
+    if isinstance(option, str):
+        return option
+    word = getattr(option, "word", None)
+    if isinstance(word, str):
+        return word
+    node_type = getattr(option, "type", None)
+    if node_type is not None and hasattr(node_type, "name"):
+        return node_type.name
+    kind, key = getattr(option, "kind", None), getattr(option, "key", None)
+    if kind is not None and key is not None:
+        return f"{kind}:{key}"
+    text = getattr(option, "text", None)
+    if isinstance(text, str):
+        return text
+    return str(option)
+
+
+@dataclass
+class ActionLog:
+    """
+    一局的动作日志
+
+    seed 是 RunRandom.run_seed；words 为 None 表示使用模拟器的合成词池，
+    否则是开局词池（回放时原样传给 RunSimulator）。boss_quizzes 是 Boss 战的题目队列
+    （AI 生成，不在种子里），None 表示模拟器自行合成。
+    """
+    seed: Optional[int] = None
+    run_uid: str = ""
+    source: str = "sim"                 # sim / ui
+    words: Optional[list] = None
+    boss_quizzes: Optional[list] = None
+    actions: List[list] = field(default_factory=list)
+
+    def record(self, kind: str, index: Optional[int] = None, key: str = ""):
+        """追加一条动作"""
+        self.actions.append([kind, index, key])
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def header(self) -> dict:
+        data = {"v": ACTION_LOG_VERSION, "seed": self.seed, "run_uid": self.run_uid, "source": self.source}
+        if self.words is not None:
+            data["words"] = self.words
+        if self.boss_quizzes is not None:
+            data["boss_quizzes"] = self.boss_quizzes
+        return data
+
+    def to_jsonl(self) -> str:
+        lines = [_dump(self.header())] + [_dump(action) for action in self.actions]
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def from_jsonl(cls, text: str) -> "ActionLog":
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("empty action log")
+        header = json.loads(lines[0])
+        if not isinstance(header, dict) or header.get("v") != ACTION_LOG_VERSION:
+            raise ValueError(f"unsupported action log header: {lines[0][:80]}")
+        log = cls(
+            seed=header.get("seed"),
+            run_uid=header.get("run_uid", ""),
+            source=header.get("source", "sim"),
+            words=header.get("words"),
+            boss_quizzes=header.get("boss_quizzes"),
+        )
+        for line in lines[1:]:
+            kind, index, key = json.loads(line)
+            log.record(kind, index, key)
+        return log
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.write_text(self.to_jsonl(), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path) -> "ActionLog":
+        return cls.from_jsonl(Path(path).read_text(encoding="utf-8"))
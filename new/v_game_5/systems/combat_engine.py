@@ -1,12 +1,19 @@
 ﻿# -*- coding: utf-8 -*-
-from typing import Any, Dict, Optional, List
+from typing import Optional, List
 import random
 
-from models import CardType, WordCard, CardCombatState, CombatPhase
+from models import BossState, CardType, WordCard, CardCombatState, CombatPhase, RunState
 from registries import CardEffectRegistry, EffectContext
 from systems.trigger_bus import TriggerBus, TriggerContext
 from systems.combat_events import CombatEvent, CombatResult
 
+# 答题结算规则（simulation.batch_combat 的向量化内核引用同一组常量）
+BLACK_PURGE_STREAK = 5        # 黑卡连对多少次净化移出本局
+GOLD_FORGET_WRONG_STREAK = 1  # 金卡连错多少次降级为蓝卡
+BLUE_FORGET_WRONG_STREAK = 2  # 蓝卡连错多少次降级为红卡
+RED_BLACKEN_WRONG_STREAK = 2  # 红卡连错多少次黑化
+ELITE_STUN_CHANCE = 0.33      # 精英战答错后玩家被眩晕的概率
+
 
 class CombatEngine:
     @staticmethod
@@ -23,11 +30,12 @@ class CombatEngine:
     def advance_phase_if_victory(cs: CardCombatState) -> bool:
         if cs.enemy.is_dead():
             cs.phase = CombatPhase.VICTORY
+            cs.end_combat()
             return True
         return False
 
     @staticmethod
-    def start_battle(cs: CardCombatState, player, session_state: Dict[str, Any]) -> CombatResult:
+    def start_battle(cs: CardCombatState, player, run: RunState) -> CombatResult:
         events = []
         notify = CombatEngine._notify_factory(events)
         cs.start_battle()
@@ -39,7 +47,8 @@ class CombatEngine:
             player.add_armor(5, notify=notify)
         cs.ensure_black_in_hand()
         while len(cs.hand) < cs.hand_size:
-            cs.draw_card()
+            if cs.draw_card() is None:
+                break
         return CombatResult(events=events, should_rerun=True)
 
     @staticmethod
@@ -98,9 +107,9 @@ class CombatEngine:
                 player.add_armor(5, notify=notify)
 
     @staticmethod
-    def _take_cards_from_pool(session_state: Dict[str, Any], count: int, prefer_red_only: bool = False) -> list:
-        pool = session_state.get("game_word_pool") or []
-        deck_words = {c.word for c in session_state.player.deck}
+    def _take_cards_from_pool(run: RunState, count: int, prefer_red_only: bool = False) -> list:
+        pool = run.word_pool or []
+        deck_words = run.player.deck_words
         pool = [c for c in pool if c.word not in deck_words]
         if count <= 0 or not pool:
             return []
@@ -108,12 +117,13 @@ class CombatEngine:
         red_cards = [c for c in pool if c.card_type == CardType.RED_BERSERK]
         other_cards = [c for c in pool if c.card_type != CardType.RED_BERSERK]
         picked = []
+        rng = run.rng or random
 
         for _ in range(count):
             source = red_cards if red_cards else ([] if prefer_red_only else other_cards)
             if not source:
                 break
-            card = random.choice(source)
+            card = rng.choice(source)
             picked.append(card)
             if card in pool:
                 pool.remove(card)
@@ -122,17 +132,17 @@ class CombatEngine:
             if card in other_cards:
                 other_cards.remove(card)
 
-        session_state.game_word_pool = pool
+        run.word_pool = pool
         return picked
 
     @staticmethod
-    def _grant_red_card_from_pool(session_state: Dict[str, Any], events, reason: str = "") -> bool:
-        cards = CombatEngine._take_cards_from_pool(session_state, 1, prefer_red_only=True)
+    def _grant_red_card_from_pool(run: RunState, events, reason: str = "") -> bool:
+        cards = CombatEngine._take_cards_from_pool(run, 1, prefer_red_only=True)
         if not cards:
             CombatEngine._emit(events, "toast", "词池中没有可用红卡")
             return False
         card = cards[0]
-        session_state.player.add_card_to_deck(card)
+        run.player.add_card_to_deck(card)
         msg = f"获得红卡（{reason}）" if reason else "获得红卡"
         CombatEngine._emit(events, "toast", msg, "🟥")
         return True
@@ -141,14 +151,15 @@ class CombatEngine:
     def _set_current_options(cs: CardCombatState, card: WordCard) -> list:
         all_words = [c.word for c in cs.word_pool if c.word != card.word]
         pick_count = min(3, len(all_words))
-        options = random.sample(all_words, pick_count) if pick_count > 0 else []
+        rng = cs.rng or random
+        options = rng.sample(all_words, pick_count) if pick_count > 0 else []
         options.append(card.word)
-        random.shuffle(options)
+        rng.shuffle(options)
         cs.current_options = options
         return options
 
     @staticmethod
-    def auto_draw_if_empty(cs: CardCombatState, session_state: Dict[str, Any]) -> CombatResult:
+    def auto_draw_if_empty(cs: CardCombatState, run: RunState) -> CombatResult:
         events = []
         if cs.current_card or len(cs.hand) > 0:
             return CombatResult(events=events)
@@ -162,15 +173,13 @@ class CombatEngine:
         return CombatResult(events=events, should_rerun=False)
 
     @staticmethod
-    def start_card_play(cs: CardCombatState, player, card: WordCard, session_state: Dict[str, Any]) -> CombatResult:
+    def start_card_play(cs: CardCombatState, player, card: WordCard, run: RunState) -> CombatResult:
         events = []
         removed = cs.play_card(card)
         if removed:
-            CombatEngine._grant_red_card_from_pool(session_state, events, "金卡耐久耗尽")
+            CombatEngine._grant_red_card_from_pool(run, events, "金卡耐久耗尽")
 
         relics = getattr(player, "relics", [])
-        if session_state.get("in_game_streak") is None:
-            session_state.in_game_streak = {}
         if len(cs.hand) == 0:
             if card.card_type == CardType.RED_BERSERK and "START_BURNING_BLOOD" in relics and player.hp < 50:
                 cs.draw_with_preference([CardType.RED_BERSERK], 2)
@@ -185,20 +194,20 @@ class CombatEngine:
         return CombatResult(events=events, should_rerun=True)
 
     @staticmethod
-    def get_quiz_options(cs: CardCombatState, session_state: Dict[str, Any]) -> list:
+    def get_quiz_options(cs: CardCombatState, run: RunState) -> list:
         options = cs.current_options or []
         if not cs.current_card:
             return options
 
-        hint_left = session_state.get("_item_hint", 0)
+        hint_left = run.flags.item_hint
         if hint_left > 0 and options:
             wrong_opts = [o for o in options if o != cs.current_card.word]
             if wrong_opts:
                 remove_count = 2 if len(wrong_opts) >= 2 else 1
-                to_remove = random.sample(wrong_opts, remove_count)
+                to_remove = (cs.rng or random).sample(wrong_opts, remove_count)
                 options = [o for o in options if o not in to_remove]
                 cs.current_options = options
-            session_state._item_hint = max(0, hint_left - 1)
+            run.flags.item_hint = max(0, hint_left - 1)
 
         return options
 
@@ -211,7 +220,7 @@ class CombatEngine:
         db,
         player_id: Optional[int],
         current_room: int,
-        session_state: Dict[str, Any],
+        run: RunState,
     ) -> CombatResult:
         events = []
         notify = CombatEngine._notify_factory(events)
@@ -242,29 +251,20 @@ class CombatEngine:
                     card.tier = new_tier
                     if not card.is_blackened:
                         card.temp_level = None
-                    for c in player.deck:
-                        if c.word == card.word:
-                            c.tier = new_tier
-                            if not c.is_blackened:
-                                c.temp_level = None
+                    player.set_word_tier(card.word, new_tier)
                 if not rewarded_this_answer and old_tier in (2, 3) and new_tier >= 4:
-                    CombatEngine._grant_red_card_from_pool(session_state, events, "蓝升金")
+                    CombatEngine._grant_red_card_from_pool(run, events, "蓝升金")
                     rewarded_this_answer = True
                 if new_tier is not None and new_tier >= 4:
-                    gold_words = session_state.get("run_gold_upgraded_words", [])
+                    gold_words = run.gold_upgraded_words
                     if card.word not in gold_words:
                         gold_words.append(card.word)
-                        session_state.run_gold_upgraded_words = gold_words
 
         def apply_permanent_tier(new_tier: int, level: str, label: str, icon: str):
             card.tier = new_tier
             if not card.is_blackened:
                 card.temp_level = None
-            for c in player.deck:
-                if c.word == card.word:
-                    c.tier = new_tier
-                    if not c.is_blackened:
-                        c.temp_level = None
+            player.set_word_tier(card.word, new_tier)
             if db and player_id:
                 next_priority = "ghost" if level == "warning" else "normal"
                 db.set_word_tier(
@@ -276,10 +276,9 @@ class CombatEngine:
                 )
             CombatEngine._emit(events, level, label, icon)
             if new_tier >= 4:
-                gold_words = session_state.get("run_gold_upgraded_words", [])
+                gold_words = run.gold_upgraded_words
                 if card.word not in gold_words:
                     gold_words.append(card.word)
-                    session_state.run_gold_upgraded_words = gold_words
 
         if correct:
             CombatEngine._emit(events, "success", "✅ 正确！")
@@ -298,26 +297,24 @@ class CombatEngine:
             )
 
             if card.is_blackened or card.card_type == CardType.BLACK_CURSE:
-                black_streak = session_state.get("black_correct_streak", {})
+                black_streak = run.black_correct_streak
                 black_streak[word] = black_streak.get(word, 0) + 1
-                if black_streak[word] >= 5:
-                    if card in player.deck:
-                        player.deck.remove(card)
+                if black_streak[word] >= BLACK_PURGE_STREAK:
+                    player.remove_card_from_deck(card)
                     cs._remove_from_all_piles(card)
                     cs.word_pool = [c for c in cs.word_pool if c.word != word]
-                    CombatEngine._grant_red_card_from_pool(session_state, events, "黑卡净化")
+                    CombatEngine._grant_red_card_from_pool(run, events, "黑卡净化")
                     del black_streak[word]
                     CombatEngine._emit(events, "success", f"✅ 黑卡净化成功，已从本局移除：{word}")
                     cs.current_card = None
                     cs.current_options = None
-                session_state.black_correct_streak = black_streak
 
             card.wrong_streak = 0
 
             CombatEngine.apply_correct_combo_effects(cs, player, cs.enemy, relics, pre_type, events, notify)
 
             from config import RED_TO_BLUE_UPGRADE_THRESHOLD, BLUE_TO_GOLD_UPGRADE_THRESHOLD
-            streak = session_state.get("in_game_streak")
+            streak = run.in_game_streak
             streak[word] = streak.get(word, 0) + 1
             db_upgraded = bool(result and result.get("upgraded"))
 
@@ -329,7 +326,7 @@ class CombatEngine:
                 if not db_upgraded and streak[word] >= BLUE_TO_GOLD_UPGRADE_THRESHOLD:
                     apply_permanent_tier(4, "toast", f"升级为金卡：{word}", "🟨")
                     if not rewarded_this_answer:
-                        CombatEngine._grant_red_card_from_pool(session_state, events, "蓝升金")
+                        CombatEngine._grant_red_card_from_pool(run, events, "蓝升金")
                         rewarded_this_answer = True
                     streak[word] = 0
         else:
@@ -348,31 +345,30 @@ class CombatEngine:
                 CardEffectRegistry.apply_effect(card.card_type.name, effect_ctx, correct=False)
 
             if card.is_blackened or card.card_type == CardType.BLACK_CURSE:
-                black_streak = session_state.get("black_correct_streak", {})
+                black_streak = run.black_correct_streak
                 black_streak[word] = 0
-                session_state.black_correct_streak = black_streak
 
             if not card.is_blackened:
                 card.wrong_streak += 1
 
                 ctype = card.card_type
-                if ctype == CardType.GOLD_SUPPORT and card.wrong_streak >= 1:
+                if ctype == CardType.GOLD_SUPPORT and card.wrong_streak >= GOLD_FORGET_WRONG_STREAK:
                     apply_permanent_tier(2, "warning", "🌟 金卡遗忘，降级为蓝卡", "🟦")
                     card.wrong_streak = 0
-                elif ctype == CardType.BLUE_HYBRID and card.wrong_streak >= 2:
+                elif ctype == CardType.BLUE_HYBRID and card.wrong_streak >= BLUE_FORGET_WRONG_STREAK:
                     apply_permanent_tier(0, "warning", "🌟 蓝卡遗忘，降级为红卡", "🟥")
                     card.wrong_streak = 0
-                elif ctype == CardType.RED_BERSERK and card.wrong_streak >= 2:
+                elif ctype == CardType.RED_BERSERK and card.wrong_streak >= RED_BLACKEN_WRONG_STREAK:
                     card.is_blackened = True
                     card.temp_level = "black"
                     CombatEngine._emit(events, "error", "💥 红卡黑化！变为诅咒卡")
                     card.wrong_streak = 0
 
-            if cs.enemy.is_elite and random.random() < 0.33:
-                session_state._player_stunned = True
+            if cs.enemy.is_elite and (cs.rng or random).random() < ELITE_STUN_CHANCE:
+                run.flags.player_stunned = True
 
-            streak = session_state.get("in_game_streak")
-            if streak is not None and card.word in streak:
+            streak = run.in_game_streak
+            if card.word in streak:
                 streak[card.word] = 0
 
         cs.last_card_type = pre_type
@@ -403,12 +399,11 @@ class CombatEngine:
         )
 
     @staticmethod
-    def resolve_enemy_turn(cs: CardCombatState, player, session_state: Dict[str, Any]) -> CombatResult:
+    def resolve_enemy_turn(cs: CardCombatState, player, run: RunState) -> CombatResult:
         events = []
         notify = CombatEngine._notify_factory(events)
 
-        if session_state.get("_end_turn_due_to_item"):
-            session_state._end_turn_due_to_item = False
+        run.flags.end_turn_due_to_item = False
 
         if cs.bleed_turns > 0 and cs.bleed_damage > 0:
             cs.enemy.take_damage(cs.bleed_damage)
@@ -435,15 +430,15 @@ class CombatEngine:
             )
         if intent == "attack":
             damage = cs.enemy.attack
-            if session_state.get("_item_shield", False):
-                session_state._item_shield = False
+            if run.flags.item_shield:
+                run.flags.item_shield = False
                 damage = 0
                 CombatEngine._emit(events, "toast", "🛡️ 护盾抵消了本次攻击", "🛡️")
             else:
-                reduce = session_state.get("_item_damage_reduce", 0)
+                reduce = run.flags.item_damage_reduce
                 if reduce:
                     damage = max(0, damage - reduce)
-                    session_state._item_damage_reduce = 0
+                    run.flags.item_damage_reduce = 0
 
             if damage > 0:
                 before_hp = player.hp
@@ -473,11 +468,11 @@ class CombatEngine:
         )
 
     @staticmethod
-    def resolve_stun_turn(cs: CardCombatState, player, session_state: Dict[str, Any]) -> CombatResult:
+    def resolve_stun_turn(cs: CardCombatState, player, run: RunState) -> CombatResult:
         events = []
 
-        if session_state.get("_player_stunned"):
-            session_state._player_stunned = False
+        if run.flags.player_stunned:
+            run.flags.player_stunned = False
             CombatEngine._emit(events, "warning", "😵 你被眩晕了，跳过本回合！")
 
         if cs.bleed_turns > 0 and cs.bleed_damage > 0:
@@ -510,3 +505,50 @@ class CombatEngine:
         cs.extra_action_only_red = False
 
         return CombatResult(events=events, enemy_dead=cs.enemy.is_dead(), player_dead=player.is_dead(), should_rerun=True)
+
+    # ------------------------------------------
+    # Boss 战：定时攻击 + 题目死亡锁
+    # ------------------------------------------
+    @staticmethod
+    def enforce_boss_death_lock(bs: BossState, cs: CardCombatState) -> bool:
+        if cs.enemy.hp <= 0 and bs.quiz_asked < bs.death_lock_until_quiz_count:
+            cs.enemy.hp = 1
+            bs.boss_hp = 1
+            bs.death_lock_active = True
+            return True
+        if bs.quiz_asked >= bs.death_lock_until_quiz_count:
+            bs.death_lock_active = False
+        return False
+
+    @staticmethod
+    def resolve_boss_enemy_turn(cs: CardCombatState, player, bs: BossState, run: RunState) -> CombatResult:
+        events = []
+        notify = CombatEngine._notify_factory(events)
+        if cs.bleed_turns > 0 and cs.bleed_damage > 0:
+            cs.enemy.take_damage(cs.bleed_damage)
+            cs.bleed_turns -= 1
+            CombatEngine._emit(events, "toast", f"🩸 放血造成 {cs.bleed_damage} 伤害", "🩸")
+
+        interval = bs.frenzy_attack_interval if bs.frenzy_active else bs.boss_attack_interval
+        interval = max(1, interval)
+        attack_now = ((cs.turns + 1) % interval) == 0
+
+        if attack_now and cs.enemy.hp > 0:
+            low = bs.boss_attack_min + (bs.frenzy_attack_bonus if bs.frenzy_active else 0)
+            high = bs.boss_attack_max + (bs.frenzy_attack_bonus if bs.frenzy_active else 0)
+            damage = (run.rng or random).randint(low, high)
+            player.change_hp(-damage, notify=notify)
+            CombatEngine._emit(events, "warning", f"👹 首领攻击造成 {damage} 伤害")
+
+        cs.current_card = None
+        cs.current_options = None
+        cs.turns += 1
+        bs.turn = cs.turns
+        cs.nunchaku_used = False
+        cs.extra_action_only_red = False
+        return CombatResult(
+            events=events,
+            enemy_dead=cs.enemy.is_dead(),
+            player_dead=player.is_dead(),
+            should_rerun=True,
+        )
@@ -6,9 +6,11 @@ def apply_effects(relic, ctx) -> bool:
     if not effect:
         return False
 
+    rng = getattr(ctx, "rng", None) or getattr(getattr(ctx, "combat_state", None), "rng", None) or random
+
     # Chance gate
     chance = effect.get("chance")
-    if chance is not None and random.random() > float(chance):
+    if chance is not None and rng.random() > float(chance):
         return False
 
     player = ctx.player
@@ -42,7 +44,7 @@ def apply_effects(relic, ctx) -> bool:
         player.hp = min(player.hp, player.max_hp)
 
     if "dodge_chance" in effect:
-        if random.random() < float(effect["dodge_chance"]):
+        if rng.random() < float(effect["dodge_chance"]):
             ctx.data["negate_wrong_penalty"] = True
 
     return True
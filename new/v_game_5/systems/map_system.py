@@ -39,7 +39,8 @@ class MapSystem:
     - 不允许纯事件路线逃课
     """
     
-    def __init__(self, total_floors: int = None):
+    def __init__(self, total_floors: int = None, rng=None):
+        self.rng = rng  # 本局随机数，None 时使用全局 random
         self.floor = 0
         self.total_floors = total_floors or TOTAL_FLOORS
         self.current_node: Optional[Node] = None
@@ -84,7 +85,7 @@ class MapSystem:
 
         # 软限制：连续非战斗越多，非战斗出现概率越低
         utility_chance = max(UTILITY_OFFER_MIN, UTILITY_OFFER_BASE - UTILITY_OFFER_DECAY * self.non_combat_streak)
-        allow_utility = random.random() < utility_chance
+        allow_utility = (self.rng or random).random() < utility_chance
 
         self.floor += 1
         if allow_utility:
@@ -125,7 +126,7 @@ class MapSystem:
         if self.normal_combats_remaining <= 0:
             return NodeType.ELITE
         # 有两种都剩余时用权重
-        return random.choices(
+        return (self.rng or random).choices(
             [NodeType.COMBAT, NodeType.ELITE],
             weights=[0.7, 0.3]
         )[0]
@@ -138,7 +139,7 @@ class MapSystem:
         return [primary]
 
     def _pick_utility_type(self) -> NodeType:
-        return random.choices(
+        return (self.rng or random).choices(
             [NodeType.EVENT, NodeType.REST, NodeType.SHOP],
             weights=[0.6, 0.2, 0.2],
             k=1,
@@ -0,0 +1,294 @@
+# ==========================================
+# 🎲 节点效果 - 事件 / 商店 / 营地的结算
+# ==========================================
+"""
+NodeEffects 负责：
+1. 结算非战斗节点的效果：事件选项及其子阶段（遗忘之泉、勇者之尸、神秘书籍、乱葬岗）、商店购买、营地
+2. render_event / render_shop / render_rest 与 RunSimulator 共用这份结算；随机数都从传入的 rng 按 UI 的顺序抽取，
+   同一种子下两边结果一致
+3. 提示文本通过 notify(level, text, icon) 回调输出（UI 传 notify_ui，模拟器传静默回调），不依赖 Streamlit
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from models import CardType, Enemy
+from registries import RelicRegistry
+from systems.combat_engine import CombatEngine
+from systems.run_choices import SHOP_CARD_CHOICES
+from systems.run_flow_utils import apply_relic_on_gain, rollback_purchase_counts
+
+Notify = Callable[[str, str, Optional[str]], None]
+
+# 需要进入子阶段的事件效果 -> render_event 的子阶段名
+EVENT_SUBPHASES = {
+    "fill_blank_test": "fill_blank",
+    "adventurer_loot": "adventurer_loot",
+    "book_read": "book_read",
+    "graveyard_enter": "graveyard",
+}
+
+CARD_COLOR_TYPES = {
+    "red": CardType.RED_BERSERK,
+    "blue": CardType.BLUE_HYBRID,
+    "gold": CardType.GOLD_SUPPORT,
+}
+
+REST_HEAL = 30
+SMITH_PRICE = 100
+
+
+def gain_relic(player, relic_id: str, notify: Notify) -> None:
+    player.relics.append(relic_id)
+    if apply_relic_on_gain(player, relic_id):
+        notify("warning", "你深深地感到不安")
+
+
+# ==========================================
+# 🎭 事件
+# ==========================================
+def event_bad_chance(player) -> float:
+    """事件坏结果的概率（不死诅咒会提高）"""
+    if "UNDYING_CURSE" not in player.relics:
+        return 0.5
+    relic = RelicRegistry.get("UNDYING_CURSE")
+    effect_data = relic.effect if relic else {}
+    return max(0.5, effect_data.get("bad_event_chance", 0.8))
+
+
+def apply_event_choice(player, choice, rng, notify: Notify) -> Optional[str]:
+    """支付并结算事件选项；需要进入子阶段的效果返回子阶段名（EVENT_SUBPHASES），否则返回 None"""
+    has_cursed_blood = "CURSED_BLOOD" in player.relics
+    has_undying_curse = "UNDYING_CURSE" in player.relics
+    if choice.cost_gold:
+        player.gold -= choice.cost_gold
+
+    effect, value = choice.effect, choice.value
+    if effect in EVENT_SUBPHASES:
+        return EVENT_SUBPHASES[effect]
+
+    if effect == "heal":
+        if has_cursed_blood:
+            notify("warning", "诅咒之血：无法通过事件回血")
+        else:
+            player.change_hp(value, notify=notify)
+    elif effect == "damage":
+        player.change_hp(value * 2 if has_undying_curse and value < 0 else value, notify=notify)
+    elif effect == "gold":
+        if isinstance(value, tuple) and len(value) == 2:
+            value = rng.randint(value[0], value[1])
+        player.add_gold(value, notify=notify)
+    elif effect == "max_hp":
+        player.max_hp += value
+        player.hp = min(player.hp, player.max_hp)
+    elif effect == "full_heal":
+        if has_cursed_blood:
+            notify("warning", "诅咒之血：无法通过事件回血")
+        else:
+            player.hp = player.max_hp
+            notify("success", "💖 生命完全恢复！")
+    elif effect == "relic":
+        if value == "random":
+            player.change_hp(-40 if has_undying_curse else -20, notify=notify)
+            pool = RelicRegistry.get_pool("low") + RelicRegistry.get_pool("high")
+            pool = [rid for rid in pool if rid not in player.relics]
+            if pool:
+                rid = rng.choice(pool)
+                gain_relic(player, rid, notify)
+                notify("toast", f"🎁 获得随机圣遗物: {RelicRegistry.get(rid).name}", "🏆")
+            else:
+                notify("info", "暂无可用圣遗物")
+        else:
+            gain_relic(player, value, notify)
+    elif effect == "trade" and isinstance(value, dict):
+        if "hp" in value:
+            hp_delta = value["hp"]
+            if hp_delta > 0 and has_cursed_blood:
+                notify("warning", "诅咒之血：无法通过事件回血")
+            else:
+                player.change_hp(hp_delta * 2 if has_undying_curse and hp_delta < 0 else hp_delta, notify=notify)
+        if "gold" in value:
+            player.add_gold(value["gold"], notify=notify)
+    elif effect == "item":
+        player.inventory.append(value)
+    elif effect == "risky_treasure":
+        if rng.random() < event_bad_chance(player):
+            player.change_hp(-20, notify=notify)
+            notify("error", "💥 陷阱！你受到了 20 伤害")
+        else:
+            gold = rng.randint(30, 50)
+            player.add_gold(gold, notify=notify)
+            notify("success", f"💰 成功！获得了 {gold} 金币")
+    elif effect == "upgrade_blue_cards":
+        player.blue_card_heal_buff = True
+        notify("success", "⚒️ 铁匠对你的蓝卡进行了加持！")
+    return None
+
+
+def purify_card(card, spelled: bool, notify: Notify) -> None:
+    """遗忘之泉：拼对则黑卡恢复为红卡"""
+    if spelled:
+        card.is_blackened = False
+        card.temp_level = "red"
+        notify("success", f"✨ 奇迹！{card.word} 已恢复为红卡！")
+    else:
+        notify("error", "❌ 失败了，泉水变得浑浊...")
+
+
+def roll_adventurer_loot(player, word_pool: list, rng) -> Optional[list]:
+    """勇者之尸：返回 None 表示尸体站起来（进入战斗），否则为可拿走的 3 张卡（按红>蓝>金加权）"""
+    if rng.random() < event_bad_chance(player):
+        return None
+    if not word_pool:
+        return []
+    weights = [
+        {CardType.RED_BERSERK: 0.6, CardType.BLUE_HYBRID: 0.3}.get(c.card_type, 0.1) for c in word_pool
+    ]
+    return rng.choices(word_pool, weights=weights, k=3)
+
+
+def read_mysterious_book(player, rng) -> str:
+    """神秘书籍：返回 "blackened"（整副牌黑化）/ "resisted"（无事发生）/ "greed"（金币翻倍，受伤翻倍）"""
+    if rng.random() < event_bad_chance(player):
+        if rng.random() < 0.5:
+            for c in player.deck:
+                c.is_blackened = True
+                c.temp_level = "black"
+            return "blackened"
+        return "resisted"
+    player.gold *= 2
+    # 记录贪婪 Buff：change_hp 中受到的伤害翻倍
+    player.flags.greedy_curse = True
+    return "greed"
+
+
+def explore_graveyard(player, explore_count: int, level: int, rng, notify: Notify) -> Optional[Enemy]:
+    """乱葬岗第 explore_count 次探究；幽灵现身时返回幽灵敌人（按精英战处理）"""
+    if rng.random() < min(0.15 + 0.10 * (explore_count - 1), 0.70):
+        notify("error", "👻 幽灵现身！")
+        return Enemy(
+            name="幽灵",
+            level=level,
+            hp=999,
+            max_hp=999,
+            attack=10,
+            is_elite=True,
+            use_fixed_stats=True,
+            fixed_attack=10,
+            fixed_timer=2,
+            attack_interval=2,
+            max_turns=10,
+            rng=rng,
+        )
+
+    roll = rng.random()
+    if roll < 0.05:
+        pool = [rid for rid in RelicRegistry.get_pool("low") if rid not in player.relics]
+        if pool:
+            rid = rng.choice(pool)
+            relic = RelicRegistry.get(rid)
+            gain_relic(player, rid, notify)
+            notify("toast", f"🏆 发现圣遗物：{relic.name if relic else rid}", "🪙")
+        else:
+            notify("info", "暂无可用圣遗物")
+    elif roll < 0.40:
+        gold = rng.randint(15, 20)
+        player.add_gold(gold, notify=notify)
+        notify("toast", f"💰 发现金币：{gold}", "💰")
+    else:
+        notify("info", "什么也没发生。")
+    return None
+
+
+# ==========================================
+# 🏪 商店
+# ==========================================
+def buy_shop_item(player, item_id: str, item, price: int, notify: Notify) -> None:
+    """购买圣遗物或道具（卡牌走 start_card_purchase）"""
+    player.gold -= price
+    if item.consumable:
+        player.inventory.append(item_id)
+        notify("toast", "已放入背包")
+    elif item.effect == "heal":
+        player.change_hp(item.value, notify=notify)
+    elif item.effect == "max_hp":
+        player.max_hp += item.value
+        player.hp = min(player.hp + item.value, player.max_hp)
+        notify("toast", f"最大生命 +{item.value}")
+    elif item.effect == "grant_relic":
+        gain_relic(player, item.value, notify)
+        notify("toast", "获得圣遗物")
+    elif item.effect == "relic":
+        player.relics.append(item.value)
+
+
+def start_card_purchase(player, color: str, price: int) -> None:
+    """先扣款并计入购买次数，选牌时可取消退款（金卡每局限购一次）"""
+    player.gold -= price
+    player.purchase_counts[color] = 1 if color == "gold" else player.purchase_counts.get(color, 0) + 1
+
+
+def card_purchase_candidates(player, color: str, word_pool: list, rng) -> list:
+    """词池中该颜色、不在牌组里的候选卡（打乱后最多 SHOP_CARD_CHOICES 张）"""
+    deck_words = player.deck_words
+    target_type = CARD_COLOR_TYPES[color]
+    candidates = [c for c in word_pool if c.card_type == target_type and c.word not in deck_words]
+    rng.shuffle(candidates)
+    return candidates[:SHOP_CARD_CHOICES]
+
+
+def finish_card_purchase(player, card, word_pool: list) -> list:
+    """把选中的卡加入牌组，返回移除该卡后的词池"""
+    player.add_card_to_deck(card)
+    for i, item in enumerate(word_pool):
+        if item.word == card.word and item.tier == card.tier:
+            return word_pool[:i] + word_pool[i + 1:]
+    return [item for item in word_pool if item.word != card.word]
+
+
+def cancel_card_purchase(player, color: str, refund: int) -> None:
+    if refund > 0:
+        player.gold += refund
+    player.purchase_counts = rollback_purchase_counts(player.purchase_counts, color)
+
+
+# ==========================================
+# 🔥 营地
+# ==========================================
+def rest_heal(player, notify: Notify) -> None:
+    player.change_hp(REST_HEAL, notify=notify)
+
+
+def smith_blue_cards(player) -> int:
+    """铁匠加持：蓝卡答对额外回血；返回获得增益的蓝卡数"""
+    player.gold -= SMITH_PRICE
+    player.blue_card_heal_buff = True
+    count = 0
+    for c in player.deck:
+        if c.card_type == CardType.BLUE_HYBRID:
+            c.is_temporary_buffed = True
+            count += 1
+    return count
+
+
+def upgrade_card(card, run, db, player_id: int, current_room: int, notify: Notify) -> None:
+    """
+    词汇淬炼成功：永久升两阶（红 0 -> 蓝 2 -> 金 4）并写入单词库；蓝升金额外获得一张红卡
+
+    db 为 GameDB 或模拟器的 WordProgress；run 为 RunState 或 UI 的 SessionRunState
+    """
+    old_tier = card.tier
+    card.tier = min(4, card.tier + 2)
+    db.set_word_tier(player_id, card.word, card.tier, current_room, priority="normal")
+    events = []
+    if old_tier in (2, 3) and card.tier >= 4:
+        CombatEngine._grant_red_card_from_pool(run, events, "蓝升金")
+    if card.tier >= 4 and card.word not in run.gold_upgraded_words:
+        run.gold_upgraded_words.append(card.word)
+    for event in events:
+        notify(event.level, event.text, event.icon)
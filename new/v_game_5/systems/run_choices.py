@@ -0,0 +1,127 @@
+# ==========================================
+# 🧭 决策选项 - UI 与无头模拟器共用的选项列表
+# ==========================================
+"""
+RunChoices 负责：
+1. 定义每类玩家决策的选项列表及顺序（出牌、事件、商店、营地、初始遗物 ...）
+2. RunSimulator 用它们生成 Decision.options，UI 用它们把按钮点击换算成同一下标写入动作日志，
+   两边下标一致，UI 记录的日志才能由 simulation.replay 回放
+3. 不依赖 Streamlit
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+
+_parent_dir = Path(__file__).parent.parent
+if str(_parent_dir) not in sys.path:
+    sys.path.insert(0, str(_parent_dir))
+
+from config import SHOP_PRICE_SURCHARGE
+from models import CardType
+from registries import RelicRegistry, ShopRegistry, SHOP_ITEMS
+
+USABLE_ITEM_EFFECTS = {"heal", "shield", "damage_reduce", "hint", "max_hp"}
+UPGRADE_CHOICES = 8
+SHOP_CARD_CHOICES = 6
+
+
+@dataclass
+class ShopOffer:
+    """商店中一件买得起的商品"""
+    kind: str            # relic / item / card
+    key: str             # 商品 id 或卡牌颜色 (red/blue/gold)
+    price: int
+    item: Any = None
+
+
+def index_of(options: list, choice) -> Optional[int]:
+    """choice 在选项列表中的下标（优先按对象身份匹配，同名单词卡不会错位）"""
+    for i, option in enumerate(options):
+        if option is choice:
+            return i
+    for i, option in enumerate(options):
+        if option == choice:
+            return i
+    return None
+
+
+def starter_relic_options() -> List[str]:
+    return [rid for rid in RelicRegistry.get_pool("starter") if RelicRegistry.get(rid)]
+
+
+def playable_cards(cs) -> list:
+    """可出的手牌；只许出红卡的额外行动中只有红卡可出（手里没有红卡时为空，与 UI 禁用全部手牌一致）"""
+    hand = list(cs.hand)
+    if cs.extra_action_only_red:
+        return [c for c in hand if c.card_type == CardType.RED_BERSERK]
+    return hand
+
+
+def usable_items(inventory: list) -> List[str]:
+    """战斗中可用的消耗品（同一道具只列一次，按背包顺序）"""
+    return [
+        item_id for item_id in dict.fromkeys(inventory)
+        if item_id in SHOP_ITEMS and SHOP_ITEMS[item_id].consumable
+        and SHOP_ITEMS[item_id].effect in USABLE_ITEM_EFFECTS
+    ]
+
+
+def play_options(cs, inventory: list) -> list:
+    """出牌决策：可出的手牌 + 可用道具"""
+    return playable_cards(cs) + usable_items(inventory)
+
+
+def event_choices(event, gold: int) -> list:
+    """付得起的事件选项"""
+    return [c for c in event.choices if not c.cost_gold or gold >= c.cost_gold]
+
+
+def spell_options(card) -> list:
+    """拼写测试：下标 0 为拼对，1 为拼错/放弃"""
+    return [card.word, ""]
+
+
+def shop_offers(player, relic_slots: list, other_slots: list) -> list:
+    """买得起的商品：圣遗物、道具、红/蓝/金卡（金卡每局限购一次）；决策选项末尾另加 None 表示离开"""
+    offers = [
+        ShopOffer(kind, item_id, item.price + SHOP_PRICE_SURCHARGE, item)
+        for kind, slots in (("relic", relic_slots), ("item", other_slots))
+        for item_id, item in slots
+    ]
+    for color in ("red", "blue", "gold"):
+        if color == "gold" and player.purchase_counts.get("gold", 0) > 0:
+            continue
+        offers.append(ShopOffer("card", color, ShopRegistry.get_card_price(color, player.purchase_counts.get(color, 0))))
+    return [offer for offer in offers if player.gold >= offer.price]
+
+
+def shop_offer_index(offers: list, kind: str, key: str) -> Optional[int]:
+    return next((i for i, offer in enumerate(offers) if offer.kind == kind and offer.key == key), None)
+
+
+def rest_options(player) -> List[str]:
+    """营地菜单：休息 / 铁匠加持（买得起且未拥有）/ 开始淬炼（总是可选）"""
+    options = ["heal"]
+    if player.gold >= 100 and not player.blue_card_heal_buff:
+        options.append("smith")
+    options.append("upgrade")
+    return options
+
+
+def forge_options(player) -> list:
+    """
+    淬炼面板的决策：可淬炼的卡 + None（结束锻造）+ 仍可点的休息/铁匠按钮；
+    没有可淬炼的卡时末尾另加 "cancel"（返回营地菜单）
+    """
+    upgradable = upgrade_options(player.deck)
+    options = upgradable + [None] + [o for o in rest_options(player) if o != "upgrade"]
+    if not upgradable:
+        options.append("cancel")
+    return options
+
+
+def upgrade_options(deck: list) -> list:
+    """营地可淬炼的卡（未到金卡，最多 UPGRADE_CHOICES 张）"""
+    return [c for c in deck if c.tier < 4][:UPGRADE_CHOICES]
@@ -40,3 +40,19 @@ def rollback_purchase_counts(purchase_counts: Dict[str, int], pending_type: str)
     elif pending_type == "gold":
         updated["gold"] = 0
     return updated
+
+
+CURSED_RELIC_IDS = {"CURSED_BLOOD", "MONKEY_PAW", "UNDYING_CURSE", "CURSE_MASK"}
+
+
+def apply_relic_on_gain(player: Any, relic_id: str) -> bool:
+    """Apply one-off effects of a newly gained relic; returns True for cursed relics."""
+    if relic_id == "UNDYING_CURSE":
+        for c in player.deck:
+            c.is_blackened = True
+            c.temp_level = "black"
+    if relic_id == "MONKEY_PAW":
+        if player.max_hp > 50:
+            player.max_hp = 50
+            player.hp = min(player.hp, player.max_hp)
+    return relic_id in CURSED_RELIC_IDS
@@ -0,0 +1,37 @@
+# ==========================================
+# 🎲 本局随机数 - 可记录种子、可复现
+# ==========================================
+"""
+RunRandom 负责：
+1. 每局一个独立的随机数对象，种子随本局记录（复现 Bug、可比较的基准测试）
+2. 状态可序列化进本局快照，继续游戏时从断点继续同一随机序列
+3. 模型/系统/注册表通过 rng 参数接收它；未传入时回退到全局 random 模块
+"""
+
+import random
+import secrets
+from typing import Optional
+
+
+class RunRandom(random.Random):
+    """带种子记录的 random.Random"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.run_seed = int(seed) if seed is not None else secrets.randbits(48)
+        super().__init__(self.run_seed)
+
+    def snapshot(self) -> dict:
+        """JSON 可序列化的种子与当前状态"""
+        version, internal, gauss_next = self.getstate()
+        return {"seed": self.run_seed, "state": [version, list(internal), gauss_next]}
+
+    @classmethod
+    def from_snapshot(cls, data: Optional[dict]) -> "RunRandom":
+        """从快照恢复；旧存档没有快照时生成新种子"""
+        data = data or {}
+        rng = cls(data.get("seed"))
+        state = data.get("state")
+        if state:
+            version, internal, gauss_next = state
+            rng.setstate((version, tuple(internal), gauss_next))
+        return rng
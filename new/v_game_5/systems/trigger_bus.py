@@ -14,6 +14,7 @@ class TriggerContext:
     combat_state: Optional[Any] = None
     data: Dict[str, Any] = field(default_factory=dict)
     notify: Optional[Callable[[str, str, Optional[str]], None]] = None
+    rng: Optional[Any] = None  # 本局随机数；None 时取 combat_state.rng，再回退到全局 random
 
 
 class TriggerBus:
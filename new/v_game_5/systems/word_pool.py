@@ -30,12 +30,14 @@ class WordPool:
     - get_all_encountered(): 获取本局所有战斗过的词 (Boss 用)
     """
     
-    def __init__(self, new_words: List[Dict], review_words: List[Dict]):
+    def __init__(self, new_words: List[Dict], review_words: List[Dict], rng=None):
         """
         Args:
             new_words: 用户输入的新词 [{"word": "xxx", "meaning": "xxx"}, ...]
             review_words: 从 deck 获取的复习词
+            rng: 本局随机数，None 时使用全局 random
         """
+        self.rng = rng or random
         # 转换为内部格式并标记来源
         self.new_words = [
             {**w, "is_review": False} for w in new_words
@@ -49,8 +51,8 @@ class WordPool:
         self._available_review = list(self.review_words)
         
         # 打乱顺序
-        random.shuffle(self._available_new)
-        random.shuffle(self._available_review)
+        self.rng.shuffle(self._available_new)
+        self.rng.shuffle(self._available_review)
         
         # 追踪本局遇到的词 (用于 Boss)
         self.encountered: List[Dict] = []
@@ -78,7 +80,7 @@ class WordPool:
         if not self.review_words:
             return []
         
-        drawn = random.sample(
+        drawn = self.rng.sample(
             self.review_words, 
             min(count, len(self.review_words))
         )
@@ -101,7 +103,7 @@ class WordPool:
         review_count = count - new_count
         
         drawn = self.draw_new(new_count) + self.draw_review(review_count)
-        random.shuffle(drawn)
+        self.rng.shuffle(drawn)
         return drawn
     
     def get_all_encountered(self) -> List[Dict]:
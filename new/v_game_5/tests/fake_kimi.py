@@ -0,0 +1,423 @@
+# ==========================================
+# 🧪 本地假 Kimi 服务 - OpenAI 兼容接口
+# ==========================================
+"""
+FakeKimiServer 负责：
+1. 在本地实现 /v1/chat/completions（含 stream=True 的 SSE 流式返回），无需网络
+2. 可配置延迟分布、HTTP 错误率、畸形 JSON 注入比例
+3. 按提示词类型（文章/题目/补丁/释义）返回能通过 normalize_* 的合法内容
+
+配套工具：
+- point_ai_service_at(server): 让 ai_service 的 BASE_URL/KEY 指向假服务，并使用独立熔断器与限流器
+- run_load(...): 并发压测 CyberMind._call，返回延迟分位与结果统计
+
+命令行：
+    python -m tests.fake_kimi --port 8765 --latency lognormal:0.4,0.6 --error-rate 0.1
+    python -m tests.fake_kimi --load 200 --concurrency 16 --malformed-rate 0.05
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+# ==========================================
+# ⏱️ 延迟分布
+# ==========================================
+def fixed_latency(seconds: float) -> Callable[[random.Random], float]:
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> Callable[[random.Random], float]:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float) -> Callable[[random.Random], float]:
+    """对数正态分布，长尾形态接近真实 LLM 接口"""
+    mu = math.log(max(median, 1e-6))
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """解析 "fixed:0.2" / "uniform:0.1,0.5" / "lognormal:0.4,0.6" """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    builders = {"fixed": fixed_latency, "uniform": uniform_latency, "lognormal": lognormal_latency}
+    if kind not in builders:
+        raise ValueError(f"unknown latency distribution: {kind}")
+    return builders[kind](*values)
+
+
+# ==========================================
+# 📝 默认响应内容
+# ==========================================
+def _user_payload(messages: list) -> dict:
+    for message in reversed(messages or []):
+        if message.get("role") == "user":
+            try:
+                data = json.loads(message.get("content") or "")
+            except (TypeError, ValueError):
+                return {}
+            return data if isinstance(data, dict) else {}
+    return {}
+
+
+def _system_prompt(messages: list) -> str:
+    for message in messages or []:
+        if message.get("role") == "system":
+            return str(message.get("content") or "")
+    return ""
+
+
+def _vocab_item(word: str) -> dict:
+    return {
+        "type": "vocab",
+        "question": f"The signal was ______ in the archive. ({word[:1]}...)",
+        "options": [word, "decoy", "static", "relay"],
+        "answer": word,
+        "damage_to_boss": 30,
+    }
+
+
+def _reading_item(index: int) -> dict:
+    return {
+        "type": "reading",
+        "question": f"What does the narrator infer in part {index + 1}?",
+        "options": ["The tower is alive", "Nothing happened", "It was a dream", "The map is wrong"],
+        "answer": "The tower is alive",
+        "damage_to_player": 40,
+    }
+
+
+def default_responder(messages: list) -> dict:
+    """按提示词识别调用类型，生成结构合法的 JSON 内容"""
+    system = _system_prompt(messages)
+    payload = _user_payload(messages)
+    words = payload.get("words_list") or payload.get("missing_words") or payload.get("target_words") or []
+
+    if "vocab_attacks" in system:
+        vocab_count = payload.get("vocab_count", 5)
+        reading_count = payload.get("reading_count", 3)
+        return {
+            "vocab_attacks": [_vocab_item(w) for w in words[:vocab_count]],
+            "boss_ultimates": [_reading_item(i) for i in range(reading_count)],
+        }
+    if "translation_cn" in system:
+        highlighted = " ".join(f"**{w}**" for w in words)
+        return {
+            "title": "The Static Tower",
+            "content": f"In the humming dark the courier whispered {highlighted} before the gate opened.",
+            "translation_cn": "在嗡鸣的黑暗中，信使在大门开启前低语。",
+            "summary_cn": "信使穿过静电高塔。",
+        }
+    # 释义分析/词性分类等其他调用，返回占位释义
+    return {"words": [{"word": "placeholder", "meaning": "占位", "root": "", "imagery": ""}]}
+
+
+# ==========================================
+# 🖥️ 假服务
+# ==========================================
+@dataclass
+class FakeKimiConfig:
+    latency: Callable[[random.Random], float] = field(default_factory=lambda: fixed_latency(0.0))
+    error_rate: float = 0.0                  # 返回 HTTP 错误的比例
+    error_statuses: tuple = (500, 502, 503, 429)
+    malformed_rate: float = 0.0              # 返回畸形 JSON 内容的比例
+    fenced_rate: float = 0.0                 # 用 ```json 代码块包裹内容的比例
+    retry_after: float = 1.0                 # 429 响应的 Retry-After（秒）
+    stream_chunk_size: int = 24              # 流式返回每个分片的字符数
+    seed: Optional[int] = None
+    responder: Callable[[list], dict] = default_responder
+
+
+class FakeKimiServer:
+    """后台线程运行的 OpenAI 兼容假服务"""
+
+    def __init__(self, config: FakeKimiConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeKimiConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "malformed": 0, "streams": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeKimiServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-kimi", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _roll(self) -> tuple:
+        with self._rng_lock:
+            return (
+                self.config.latency(self._rng),
+                self._rng.random(),
+                self._rng.random(),
+                self._rng.random(),
+                self._rng.choice(self.config.error_statuses),
+            )
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict, headers: dict = None):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": {"message": "invalid request body"}})
+                    return
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+                    return
+                server._handle_completion(self, request)
+
+        return Handler
+
+    def _handle_completion(self, handler, request: dict):
+        cfg = self.config
+        delay, error_roll, malformed_roll, fenced_roll, status = self._roll()
+        self._count("requests")
+        if delay > 0:
+            time.sleep(delay)
+
+        if error_roll < cfg.error_rate:
+            self._count("errors")
+            headers = {"Retry-After": str(cfg.retry_after)} if status == 429 else None
+            handler._send_json(status, {"error": {"message": "injected failure", "type": "server_error"}}, headers)
+            return
+
+        content = json.dumps(cfg.responder(request.get("messages") or []), ensure_ascii=False)
+        if malformed_roll < cfg.malformed_rate:
+            self._count("malformed")
+            content = content[: max(1, len(content) // 2)] + ",,}"
+        elif fenced_roll < cfg.fenced_rate:
+            content = f"```json\n{content}\n```"
+
+        prompt_chars = sum(len(str(m.get("content") or "")) for m in request.get("messages") or [])
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (prompt_chars + len(content)) // 4,
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "fake-kimi")
+
+        if request.get("stream"):
+            self._count("streams")
+            self._stream(handler, completion_id, model, content, usage)
+            return
+
+        handler._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, handler, completion_id: str, model: str, content: str, usage: dict):
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+
+        def _emit(delta: dict, finish_reason=None, extra: dict = None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if extra:
+                chunk.update(extra)
+            handler.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+
+        _emit({"role": "assistant", "content": ""})
+        size = max(1, self.config.stream_chunk_size)
+        for start in range(0, len(content), size):
+            _emit({"content": content[start:start + size]})
+        _emit({}, finish_reason="stop", extra={"usage": usage})
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+# ==========================================
+# 🔗 测试工具
+# ==========================================
+@contextmanager
+def point_ai_service_at(server: FakeKimiServer, api_key: str = "fake-kimi-key", backoff_base: float = 0.0):
+    """
+    让 ai_service 指向假服务
+
+    - 替换模块级 BASE_URL / KIMI_API_KEY
+    - 使用独立熔断器与限流器，避免注入的错误/配额消耗影响其他测试
+    - backoff_base 默认为 0，压测时不等待退避
+    """
+    import ai_service
+    from config import AI_BREAKER_FAILURE_THRESHOLD, AI_BREAKER_RESET_SECONDS, AI_RATE_LIMIT_RPM, AI_RATE_LIMIT_TPM
+    from services.circuit_breaker import CircuitBreaker
+    from services.rate_limiter import RateLimiter
+
+    saved = {
+        "BASE_URL": ai_service.BASE_URL,
+        "KIMI_API_KEY": ai_service.KIMI_API_KEY,
+        "AI_BACKOFF_BASE": ai_service.AI_BACKOFF_BASE,
+    }
+    saved_breaker = ai_service.CyberMind.breaker
+    saved_limiter = ai_service.CyberMind.limiter
+    ai_service.BASE_URL = server.base_url
+    ai_service.KIMI_API_KEY = api_key
+    ai_service.AI_BACKOFF_BASE = backoff_base
+    ai_service.CyberMind.breaker = CircuitBreaker(AI_BREAKER_FAILURE_THRESHOLD, AI_BREAKER_RESET_SECONDS)
+    ai_service.CyberMind.limiter = RateLimiter(AI_RATE_LIMIT_RPM, AI_RATE_LIMIT_TPM)
+    try:
+        yield ai_service
+    finally:
+        for name, value in saved.items():
+            setattr(ai_service, name, value)
+        ai_service.CyberMind.breaker = saved_breaker
+        ai_service.CyberMind.limiter = saved_limiter
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(math.ceil(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_load(total: int = 50, concurrency: int = 8, words: list = None) -> dict:
+    """
+    并发调用 CyberMind.generate_article（需先 point_ai_service_at）
+
+    Returns:
+        {"total", "ok", "fallback", "p50", "p95", "max", "elapsed"}
+    """
+    from ai_service import CyberMind
+
+    words = words or ["ambiguous", "formidable", "meticulous"]
+
+    def _one(_):
+        ai = CyberMind()
+        started = time.perf_counter()
+        ai.generate_article(words)
+        return time.perf_counter() - started, ai.used_fallback()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(_one, range(total)))
+    latencies = [latency for latency, _ in results]
+    fallbacks = sum(1 for _, fallback in results if fallback)
+    return {
+        "total": total,
+        "ok": total - fallbacks,
+        "fallback": fallbacks,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "max": max(latencies) if latencies else 0.0,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="本地假 Kimi 服务 / AI 调用压测")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--fenced-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--load", type=int, default=0, help="压测请求数；0 表示只启动服务")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    config = FakeKimiConfig(
+        latency=parse_latency(args.latency),
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        fenced_rate=args.fenced_rate,
+        seed=args.seed,
+    )
+    port = 0 if args.load else args.port
+    with FakeKimiServer(config, args.host, port) as server:
+        if args.load:
+            with point_ai_service_at(server):
+                report = run_load(args.load, args.concurrency)
+            print(json.dumps({**report, "server": server.stats}, indent=2))
+            return 0
+        print(f"[FakeKimi] listening on {server.base_url}  (export KIMI_BASE_URL={server.base_url})")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import io
+import json
+import tempfile
+import unittest
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+from database import GameDB
+from simulation import GreedyPolicy, RunSimulator, synthetic_word_pool
+from simulation.replay import ReplayDivergence, main, replay
+from systems.action_log import ActionLog
+
+
+# fixtures/ui_run.jsonl 录制结束时界面上的 (层数, HP, 金币, 牌组张数)
+UI_RUN_FINAL = (21, 0, 155, 28)
+
+
+def _play(seed: int, words: list = None) -> RunSimulator:
+    policy = GreedyPolicy(0.85, seed=seed)
+    sim = RunSimulator(seed=seed, words=words)
+    decision = sim.pending
+    while decision is not None:
+        decision = sim.step(policy.choose(sim, decision))
+    return sim
+
+
+class ActionLogCases(unittest.TestCase):
+    def test_jsonl_roundtrip(self):
+        sim = _play(7)
+        text = sim.log.to_jsonl()
+        restored = ActionLog.from_jsonl(text)
+        self.assertEqual(restored, sim.log)
+        self.assertEqual(len(text.splitlines()), len(sim.log) + 1)
+        self.assertEqual(sim.log.actions[0][0], "load")
+        with self.assertRaises(ValueError):
+            ActionLog.from_jsonl("")
+        with self.assertRaises(ValueError):
+            ActionLog.from_jsonl('{"v":99}\n')
+
+    def test_replay_reproduces_run_bit_for_bit(self):
+        for seed in range(4):
+            sim = _play(seed)
+            replayed = replay(ActionLog.from_jsonl(sim.log.to_jsonl()))
+            self.assertTrue(replayed.done)
+            self.assertEqual(replayed.summary(), sim.summary())
+            self.assertEqual(replayed.log.actions, sim.log.actions)
+
+    def test_custom_word_pool_travels_with_the_log(self):
+        words = synthetic_word_pool(red=20, blue=8, gold=4)
+        sim = _play(11, words=words)
+        log = ActionLog.from_jsonl(sim.log.to_jsonl())
+        self.assertEqual(log.words, words)
+        self.assertEqual(replay(log).summary(), sim.summary())
+
+    def test_boss_quizzes_travel_with_the_log(self):
+        quizzes = [
+            {"type": "reading", "question": f"q{i}", "options": ["a", "b", "c", "d"], "answer": "abcd"[i % 4]}
+            for i in range(5)
+        ]
+        sim = RunSimulator(seed=13, boss_quizzes=quizzes)
+        policy = GreedyPolicy(1.0, seed=13)
+        decision = sim.pending
+        asked = []
+        while decision is not None:
+            if decision.kind == "boss_quiz":
+                asked.append(decision.options)
+            decision = sim.step(policy.choose(sim, decision))
+        self.assertTrue(asked)
+        self.assertTrue(all(options == ["a", "b", "c", "d"] for options in asked))
+        log = ActionLog.from_jsonl(sim.log.to_jsonl())
+        self.assertEqual(log.boss_quizzes, quizzes)
+        self.assertEqual(replay(log).summary(), sim.summary())
+
+    def test_ui_recorded_run_replays(self):
+        # 由 Streamlit 界面实际打完一局后从 run_actions 表导出；规则改动导致分歧时需重新录制
+        log = ActionLog.load(FIXTURES / "ui_run.jsonl")
+        self.assertEqual(log.source, "ui")
+        self.assertIsNotNone(log.boss_quizzes)
+        sim = replay(log)
+        self.assertTrue(sim.done)
+        summary = sim.summary()
+        self.assertEqual((summary.floor, summary.hp, summary.gold, summary.deck_size), UI_RUN_FINAL)
+        self.assertIn("boss_quiz", {kind for kind, _, _ in log.actions})
+
+    def test_tampered_log_diverges(self):
+        log = ActionLog.from_jsonl(_play(5).log.to_jsonl())
+        index = next(i for i, action in enumerate(log.actions) if action[0] == "play")
+        log.actions[index][2] = "not-a-card"
+        with self.assertRaises(ReplayDivergence) as ctx:
+            replay(log)
+        self.assertEqual(ctx.exception.step, index)
+        with self.assertRaises(ValueError):
+            replay(ActionLog(seed=1, source="bogus"))
+        for kind in ("continue", "item"):
+            unmodelled = ActionLog(seed=1, source="ui")
+            unmodelled.record(kind)
+            with self.assertRaises(ValueError):
+                replay(unmodelled)
+
+    def test_cli_replays_saved_trace(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _play(3).log.save(Path(tmp) / "trace.jsonl")
+            out = io.StringIO()
+            with redirect_stdout(out):
+                code = main([str(path), "--profile", "--top", "5"])
+        self.assertEqual(code, 0)
+        self.assertIn("seed=3", out.getvalue())
+        self.assertIn("cumulative", out.getvalue())
+
+    def test_database_keeps_append_only_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = GameDB(str(Path(tmp) / "test.db"))
+            player_id = db.get_or_create_player()["id"]
+            self.assertIsNone(db.get_action_log(player_id, "run-a"))
+            words = synthetic_word_pool(red=2, blue=1, gold=1)
+            header = ActionLog(seed=123, run_uid="run-a", source="ui", words=words).header()
+            db.append_run_action(player_id, "run-a", 0, "start", None, json.dumps(header))
+            db.append_run_action(player_id, "run-a", 1, "node", 0, "COMBAT")
+            db.append_run_action(player_id, "run-a", 2, "boss_quizzes", None, json.dumps([{"question": "q"}]))
+            db.append_run_action(player_id, "run-a", 2, "play", 2, "alpha")
+            db.append_run_action(player_id, "run-b", 0, "start", None, "9")
+            stored = db.get_action_log(player_id, "run-a")
+            legacy = db.get_action_log(player_id, "run-b")
+        self.assertEqual(stored["seed"], 123)
+        self.assertEqual(stored["words"], words)
+        self.assertEqual(stored["boss_quizzes"], [{"question": "q"}])
+        self.assertEqual(stored["actions"], [["node", 0, "COMBAT"], ["play", 2, "alpha"]])
+        self.assertEqual((legacy["seed"], legacy["words"], legacy["actions"]), (9, None, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
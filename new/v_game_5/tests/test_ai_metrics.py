@@ -0,0 +1,59 @@
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import AI_MAX_RETRIES
+from services.ai_metrics import AIMetrics, Histogram, get_metrics
+from tests.fake_kimi import FakeKimiConfig, FakeKimiServer, point_ai_service_at
+
+WORDS = ["ambiguous", "formidable"]
+
+
+class AIMetricsCases(unittest.TestCase):
+    def test_histogram_buckets_and_quantiles(self):
+        hist = Histogram((0.5, 1.0, float("inf")))
+        for value in (0.1, 0.2, 0.7, 3.0):
+            hist.observe(value)
+        data = hist.to_dict()
+        self.assertEqual(data["buckets"], {"0.5": 2, "1.0": 1, "+Inf": 1})
+        self.assertEqual(hist.quantile(0.5), 0.5)
+        self.assertEqual(hist.quantile(1.0), 3.0)
+
+    def test_call_records_tokens_retries_and_fallback_reason(self):
+        metrics = get_metrics()
+        before = {
+            key: metrics.counter(key)
+            for key in ("tokens.article.prompt", "calls.article.ok", "retries.article", "fallbacks.article.api_error")
+        }
+        with FakeKimiServer() as server:
+            with point_ai_service_at(server) as ai_service:
+                ai_service.CyberMind().generate_article(WORDS)
+        with FakeKimiServer(FakeKimiConfig(error_rate=1.0, error_statuses=(503,))) as server:
+            with point_ai_service_at(server) as ai_service:
+                ai_service.CyberMind().generate_article(WORDS)
+
+        self.assertGreater(metrics.counter("tokens.article.prompt"), before["tokens.article.prompt"])
+        self.assertEqual(metrics.counter("calls.article.ok"), before["calls.article.ok"] + 1)
+        self.assertEqual(metrics.counter("retries.article"), before["retries.article"] + AI_MAX_RETRIES - 1)
+        self.assertEqual(metrics.counter("fallbacks.article.api_error"), before["fallbacks.article.api_error"] + 1)
+
+    def test_flush_writes_snapshot(self):
+        metrics = AIMetrics()
+        metrics.record_request("quiz", 0.3, "ok")
+        metrics.record_cache_hit("boss_bank")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics" / "ai.json"
+            metrics.flush(str(path))
+            data = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(data["request_latency"]["quiz"]["count"], 1)
+        self.assertEqual(data["counters"]["cache_hits.boss_bank"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
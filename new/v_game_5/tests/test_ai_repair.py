@@ -0,0 +1,69 @@
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.local_quiz import LocalQuizEngine, SentenceCorpus
+from tests.fake_kimi import FakeKimiConfig, FakeKimiServer, default_responder, point_ai_service_at, _system_prompt, _user_payload
+
+WORDS = ["ambiguous", "formidable", "meticulous"]
+
+
+class _ScriptedResponder:
+    """首轮请求返回不完整内容，补丁请求走默认响应"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, messages: list) -> dict:
+        system = _system_prompt(messages)
+        payload = _user_payload(messages)
+        self.requests.append(payload)
+        if "words_list" in payload and "vocab_attacks" not in system:
+            return {"title": "T", "content": "An **ambiguous** omen.", "translation_cn": "含糊的预兆。"}
+        if "words_list" in payload:
+            good = default_responder(messages)
+            return {
+                "vocab_attacks": good["vocab_attacks"][:2] + [{"question": "broken"}],
+                "boss_ultimates": good["boss_ultimates"][:1],
+            }
+        return default_responder(messages)
+
+
+class AIRepairCases(unittest.TestCase):
+    def _run(self, action):
+        responder = _ScriptedResponder()
+        with FakeKimiServer(FakeKimiConfig(responder=responder)) as server:
+            with point_ai_service_at(server) as ai_service:
+                # 空例句库：本地完形题不参与，修复流程只取决于假服务的响应
+                saved_engine = ai_service.get_local_quiz_engine
+                ai_service.get_local_quiz_engine = lambda: LocalQuizEngine(SentenceCorpus())
+                try:
+                    ai = ai_service.CyberMind()
+                    result = action(ai)
+                finally:
+                    ai_service.get_local_quiz_engine = saved_engine
+        return ai, responder, result
+
+    def test_article_patch_covers_only_missing_words(self):
+        ai, responder, article = self._run(lambda ai: ai.generate_article(WORDS))
+        self.assertFalse(ai.used_fallback())
+        self.assertEqual(article["missing_words"], [])
+        self.assertTrue(article["content"].startswith("An **ambiguous** omen."))
+        self.assertEqual(responder.requests[1]["missing_words"], ["formidable", "meticulous"])
+
+    def test_quiz_repair_requests_only_the_shortfall(self):
+        ai, responder, quiz = self._run(lambda ai: ai.generate_quiz(WORDS, "story"))
+        self.assertFalse(ai.used_fallback())
+        patch_request = responder.requests[1]
+        self.assertEqual((patch_request["vocab_count"], patch_request["reading_count"]), (1, 2))
+        self.assertEqual(patch_request["target_words"], ["meticulous"])
+        self.assertEqual(len(quiz["vocab_attacks"]), 3)
+        self.assertEqual(len(quiz["boss_ultimates"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.circuit_breaker import CircuitBreaker, backoff_delay
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerCases(unittest.TestCase):
+    def test_opens_after_threshold_and_probes_after_cooldown(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+
+        for _ in range(3):
+            self.assertTrue(breaker.allow_request())
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        clock.now = 10
+        self.assertTrue(breaker.allow_request())
+        # 半开状态只放行一个探测
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow_request())
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now = 6
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+    def test_backoff_is_jittered_and_capped(self):
+        rng = random.Random(7)
+        delays = [backoff_delay(attempt, 1.0, 8.0, rng) for attempt in range(10)]
+        self.assertTrue(all(0 <= d <= 8.0 for d in delays))
+        self.assertLessEqual(delays[0], 1.0)
+        self.assertLessEqual(delays[1], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.ai_scheduler import (
+    AIJobScheduler,
+    PRIORITY_BOSS,
+    PRIORITY_ENRICHMENT,
+    PRIORITY_MEANINGS,
+)
+
+
+class AIJobSchedulerCases(unittest.TestCase):
+    def _block_worker(self, scheduler):
+        gate = threading.Event()
+        started = threading.Event()
+
+        def _blocker(job):
+            started.set()
+            gate.wait(5)
+            return "blocker"
+
+        handle = scheduler.submit("block", {}, _blocker, priority=PRIORITY_BOSS)
+        self.assertTrue(started.wait(5))
+        return gate, handle
+
+    def test_identical_payloads_run_once(self):
+        scheduler = AIJobScheduler(max_workers=1)
+        gate, _ = self._block_worker(scheduler)
+        calls = []
+
+        def _work(job):
+            calls.append(job.key)
+            return {"ok": True}
+
+        first = scheduler.submit("boss", {"words": ["a", "b"]}, _work, owner="s1")
+        second = scheduler.submit("boss", {"words": ["a", "b"]}, _work, owner="s2")
+        gate.set()
+
+        self.assertEqual(first.result(timeout=5), {"ok": True})
+        self.assertEqual(second.result(timeout=5), {"ok": True})
+        self.assertEqual(len(calls), 1)
+
+    def test_higher_priority_runs_first(self):
+        scheduler = AIJobScheduler(max_workers=1)
+        gate, _ = self._block_worker(scheduler)
+        order = []
+
+        low = scheduler.submit("enrich", {"n": 1}, lambda job: order.append("enrich"), priority=PRIORITY_ENRICHMENT)
+        mid = scheduler.submit("meanings", {"n": 1}, lambda job: order.append("meanings"), priority=PRIORITY_MEANINGS)
+        high = scheduler.submit("boss", {"n": 1}, lambda job: order.append("boss"), priority=PRIORITY_BOSS)
+        gate.set()
+
+        for handle in (low, mid, high):
+            handle.result(timeout=5)
+        self.assertEqual(order, ["boss", "meanings", "enrich"])
+
+    def test_cancel_pending_job_skips_work(self):
+        scheduler = AIJobScheduler(max_workers=1)
+        gate, blocker = self._block_worker(scheduler)
+        calls = []
+
+        handle = scheduler.submit("boss", {"run": 1}, lambda job: calls.append(1), owner="s1")
+        handle.cancel()
+        gate.set()
+        blocker.result(timeout=5)
+
+        self.assertTrue(handle.done())
+        self.assertTrue(handle.cancelled)
+        self.assertIsNone(handle.result(timeout=1))
+        self.assertEqual(calls, [])
+
+    def test_shared_job_survives_single_cancel(self):
+        scheduler = AIJobScheduler(max_workers=1)
+        gate, _ = self._block_worker(scheduler)
+
+        first = scheduler.submit("boss", {"run": 2}, lambda job: "done", owner="s1")
+        second = scheduler.submit("boss", {"run": 2}, lambda job: "done", owner="s2")
+        first.cancel()
+        gate.set()
+
+        self.assertEqual(second.result(timeout=5), "done")
+        self.assertFalse(second.cancelled)
+
+    def test_every_submitter_gets_its_callback(self):
+        scheduler = AIJobScheduler(max_workers=1)
+        gate, _ = self._block_worker(scheduler)
+        saved = []
+
+        first = scheduler.submit("boss", {"run": 3}, lambda job: "done", owner="s1",
+                                 on_result=lambda result: saved.append(("run-a", result)))
+        second = scheduler.submit("boss", {"run": 3}, lambda job: "done", owner="s2",
+                                  on_result=lambda result: saved.append(("run-b", result)))
+        gate.set()
+
+        self.assertEqual(first.result(timeout=5), "done")
+        self.assertEqual(second.result(timeout=5), "done")
+        self.assertEqual(saved, [("run-a", "done"), ("run-b", "done")])
+
+        skipped = scheduler.submit("boss", {"run": 4}, lambda job: None, on_result=saved.append)
+        skipped.result(timeout=5)
+        self.assertEqual(len(saved), 2)
+
+    def test_boss_patch_dedup_includes_base(self):
+        import ai_service
+
+        scheduler = AIJobScheduler(max_workers=1)
+        gate, _ = self._block_worker(scheduler)
+        saved_scheduler, saved_patch = ai_service.get_scheduler, ai_service.generate_boss_patch
+        ai_service.get_scheduler = lambda: scheduler
+        ai_service.generate_boss_patch = lambda base, words, missing, job: {"article": base["article"]}
+        try:
+            words, missing = ["a", "b"], ["b"]
+            first = ai_service.submit_boss_patch({"article": {"content": "x"}, "quizzes": {}}, words, missing)
+            same = ai_service.submit_boss_patch({"article": {"content": "x"}, "quizzes": {}}, words, missing)
+            other = ai_service.submit_boss_patch({"article": {"content": "y"}, "quizzes": {}}, words, missing)
+            gate.set()
+            self.assertEqual(first.key, same.key)
+            self.assertNotEqual(first.key, other.key)
+            self.assertEqual(other.result(timeout=5), {"article": {"content": "y"}})
+        finally:
+            ai_service.get_scheduler, ai_service.generate_boss_patch = saved_scheduler, saved_patch
+
+
+if __name__ == "__main__":
+    unittest.main()
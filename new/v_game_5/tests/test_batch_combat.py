@@ -0,0 +1,84 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models import CardType
+from simulation import batch_combat
+from simulation.batch_combat import FightSpec, batch_fight, cross_check, death_rate_curve
+
+RED, BLUE, GOLD, BLACK = (
+    CardType.RED_BERSERK, CardType.BLUE_HYBRID, CardType.GOLD_SUPPORT, CardType.BLACK_CURSE,
+)
+
+
+class BatchCombatCases(unittest.TestCase):
+    def setUp(self):
+        if batch_combat.np is None:
+            self.skipTest('numpy not installed (pip install ".[sim]")')
+
+    def test_rejects_unsupported_relics(self):
+        with self.assertRaises(ValueError):
+            batch_fight(FightSpec(deck=(RED,) * 6, relics=("NUNCHAKU",)), 0.8, 10)
+        with self.assertRaises(ValueError):
+            batch_fight(FightSpec(deck=(RED,) * 6, relics=("MONKEY_PAW",)), 0.8, 10)
+
+    def test_seeded_batches_are_reproducible(self):
+        spec = FightSpec(deck=(RED,) * 5 + (BLUE,) * 3 + (GOLD,), hp=40, level=6, is_elite=True)
+        first = batch_fight(spec, 0.7, 500, seed=9)
+        second = batch_fight(spec, 0.7, 500, seed=9)
+        self.assertTrue((first.won == second.won).all())
+        self.assertTrue((first.turns == second.turns).all())
+        self.assertFalse(first.stalled.any())
+
+    def test_perfect_and_hopeless_accuracy(self):
+        spec = FightSpec(deck=(RED,) * 6 + (BLUE,) * 2 + (BLACK,), hp=30, level=3)
+        self.assertEqual(batch_fight(spec, 1.0, 300, seed=1).win_rate, 1.0)
+        self.assertEqual(batch_fight(spec, 0.0, 300, seed=1).death_rate, 1.0)
+
+    def test_death_rate_falls_with_accuracy(self):
+        spec = FightSpec(deck=(RED,) * 6 + (BLUE,) * 2 + (GOLD,), hp=40, level=8, is_elite=True)
+        curve = death_rate_curve(spec, [0.4, 0.6, 0.8, 1.0], fights=3000, seed=2)
+        rates = [rate for _, rate in curve]
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        self.assertGreater(rates[0], rates[-1])
+
+    def test_matches_scalar_engine_on_sampled_seeds(self):
+        specs = [
+            FightSpec(deck=(RED,) * 6 + (BLUE,) * 2 + (GOLD,), hp=40, level=8, is_elite=True),
+            FightSpec(deck=(RED,) * 5 + (BLUE,) * 3 + (GOLD,) * 2 + (BLACK,), hp=30, level=5),
+            FightSpec(
+                deck=(RED,) * 6 + (BLUE,) * 3 + (BLACK,) * 2, hp=35, max_hp=50, level=12, is_elite=True,
+                relics=("WINE", "CURSE_MASK", "UNDYING_CURSE", "MONKEY_PAW", "OLD_SHIELD", "OLD_ARMOR"),
+            ),
+            FightSpec(
+                deck=(RED,) * 7 + (BLUE,) * 2 + (GOLD,), hp=25, level=10, is_elite=True,
+                relics=("BLEEDING_DAGGER", "DEAD_BRANCH", "BLOOD_CRYSTAL", "ORICHALCUM", "CURSED_BLOOD"),
+            ),
+        ]
+        for spec in specs:
+            report = cross_check(spec, 0.65, samples=300, fights=20000, seed=5)
+            for metric, stats in report.items():
+                self.assertLess(stats["z"], 4.0, (spec, metric, stats))
+
+    def test_follows_tuned_thresholds(self):
+        import config
+
+        spec = FightSpec(deck=(RED,) * 6 + (BLUE,) * 2 + (GOLD,), hp=40, level=8, is_elite=True)
+        baseline = batch_fight(spec, 0.7, 4000, seed=3).win_rate
+        saved = config.RED_TO_BLUE_UPGRADE_THRESHOLD, config.BLUE_TO_GOLD_UPGRADE_THRESHOLD
+        config.RED_TO_BLUE_UPGRADE_THRESHOLD, config.BLUE_TO_GOLD_UPGRADE_THRESHOLD = 1, 1
+        try:
+            self.assertNotEqual(batch_fight(spec, 0.7, 4000, seed=3).win_rate, baseline)
+            report = cross_check(spec, 0.7, samples=300, fights=10000, seed=3)
+        finally:
+            config.RED_TO_BLUE_UPGRADE_THRESHOLD, config.BLUE_TO_GOLD_UPGRADE_THRESHOLD = saved
+        for metric, stats in report.items():
+            self.assertLess(stats["z"], 4.0, (metric, stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
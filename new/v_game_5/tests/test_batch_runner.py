@@ -0,0 +1,92 @@
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from simulation import FixedAccuracyPolicy, GreedyPolicy, RunSummary
+from simulation.batch_runner import BalanceReport, PolicySpec, iter_summaries, main, run_batch
+
+
+def _summary(seed, victory, floor, hp_curve, relics=(), relic_floors=None):
+    return RunSummary(seed=seed, victory=victory, stalled=False, floor=floor, rooms=floor, hp=hp_curve[-1],
+                      max_hp=100, gold=0, deck_size=9, relics=list(relics), answers=10, correct=8,
+                      hp_curve=list(hp_curve), relic_floors=dict(relic_floors or {}))
+
+
+class BalanceReportCases(unittest.TestCase):
+    def test_aggregates_win_rate_death_floors_hp_and_relics(self):
+        report = BalanceReport()
+        report.add(_summary(0, True, 3, [90, 80, 70], ["BLOOD_VIAL"]))
+        report.add(_summary(1, False, 2, [60, 0], ["BLOOD_VIAL", "MONKEY_PAW"]))
+        report.add(_summary(2, False, 2, [50, 0]))
+        report.add(_summary(3, True, 3, [100, 90, 80]))
+
+        self.assertEqual(report.win_rate, 0.5)
+        self.assertEqual(report.death_floors, {2: 2})
+        self.assertEqual(report.hp_curve(), [75.0, 42.5, 75.0])
+        effects = report.relic_effects()
+        self.assertEqual(effects["BLOOD_VIAL"]["runs"], 2)
+        self.assertAlmostEqual(effects["BLOOD_VIAL"]["delta"], 0.0)
+        self.assertAlmostEqual(effects["MONKEY_PAW"]["raw_delta"], -2 / 3)
+        self.assertAlmostEqual(effects["MONKEY_PAW"]["delta"], -0.5)  # 开局获得：基线为全部局
+        self.assertIn("血之瓶", report.format_text())
+
+    def test_relic_delta_uses_runs_alive_at_the_gain_floor(self):
+        report = BalanceReport()
+        report.add(_summary(0, True, 4, [90, 80, 70, 60], ["GOLD_IDOL"], {"GOLD_IDOL": 3}))
+        report.add(_summary(1, True, 4, [90, 80, 70, 60]))
+        report.add(_summary(2, False, 4, [90, 80, 70, 0], ["GOLD_IDOL"], {"GOLD_IDOL": 3}))
+        report.add(_summary(3, False, 4, [90, 80, 70, 0]))
+        report.add(_summary(4, False, 1, [0]))
+        report.add(_summary(5, False, 1, [0]))
+
+        self.assertEqual(report.survival_win_rate(3), 0.5)
+        effects = report.relic_effects()["GOLD_IDOL"]
+        self.assertAlmostEqual(effects["raw_delta"], 0.25)  # 只落在存活局的幸存者偏差
+        self.assertAlmostEqual(effects["delta"], 0.0)
+        self.assertEqual(effects["mean_gain_floor"], 3)
+
+    def test_merge_matches_single_report(self):
+        summaries = [_summary(i, i % 3 == 0, 2 + i % 2, [80 - i] * (2 + i % 2), ["GOLD_IDOL"] * (i % 2))
+                     for i in range(9)]
+        whole, left, right = BalanceReport(), BalanceReport(), BalanceReport()
+        for s in summaries:
+            whole.add(s)
+        for s in summaries[:4]:
+            left.add(s)
+        for s in summaries[4:]:
+            right.add(s)
+        self.assertEqual(left.merge(right).to_dict(), whole.to_dict())
+
+
+class BatchRunnerCases(unittest.TestCase):
+    def test_process_pool_matches_in_process_run(self):
+        spec = PolicySpec(GreedyPolicy, {"accuracy": 0.9})
+        serial = run_batch(spec, range(10, 22), workers=1, chunk_size=5)
+        parallel = run_batch(spec, range(10, 22), workers=2, chunk_size=5)
+        self.assertEqual(serial.runs, 12)
+        self.assertEqual(parallel.to_dict(), serial.to_dict())
+
+    def test_streams_one_summary_per_seed(self):
+        seeds = sorted(s.seed for s in iter_summaries(PolicySpec(FixedAccuracyPolicy), range(3, 9), workers=2, chunk_size=2))
+        self.assertEqual(seeds, list(range(3, 9)))
+
+    def test_cli_writes_json_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "report.json"
+            with redirect_stdout(io.StringIO()):
+                main(["--runs", "4", "--workers", "1", "--policy", "tier", "--json", str(out)])
+            data = json.loads(out.read_text(encoding="utf-8"))
+        self.assertEqual(data["runs"], 4)
+        self.assertTrue(data["hp_curve"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from database import GameDB
+from services.boss_bank import _in_window, fill_bank, predict_pools
+
+
+def _payload(source="ai"):
+    return {
+        "article": {"title": "T", "content": "text"},
+        "quizzes": {"vocab_attacks": [], "boss_ultimates": []},
+        "source": source,
+    }
+
+
+class BossBankCases(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = GameDB(str(Path(self._tmp.name) / "test.db"))
+        self.player_id = self.db.get_or_create_player()["id"]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_best_overlap_entry_and_missing_words(self):
+        self.db.save_bank_entry(self.player_id, ["alpha", "beta"], _payload())
+        self.db.save_bank_entry(self.player_id, ["alpha", "beta", "gamma"], _payload())
+
+        entry = self.db.find_bank_entry(self.player_id, ["Alpha", "beta", "gamma", "delta"])
+        self.assertEqual(sorted(entry["words"]), ["alpha", "beta", "gamma"])
+        self.assertAlmostEqual(entry["overlap"], 0.75)
+        self.assertEqual(entry["missing_words"], ["delta"])
+
+        self.assertIsNone(self.db.find_bank_entry(self.player_id, ["alpha", "x", "y", "z"], min_overlap=0.5))
+
+    def test_fill_bank_skips_covered_pools_and_mock_results(self):
+        self.db.add_words_batch(self.player_id, [{"word": w, "meaning": "m"} for w in ("alpha", "beta", "gamma")])
+        pools = predict_pools(self.db, self.player_id, variants=2)
+        self.assertTrue(pools)
+
+        self.assertEqual(fill_bank(self.db, [self.player_id], variants=1, generate=lambda words: _payload("mock")), 0)
+
+        calls = []
+
+        def _generate(words):
+            calls.append(words)
+            return _payload()
+
+        self.assertEqual(fill_bank(self.db, [self.player_id], variants=1, generate=_generate), 1)
+        self.assertEqual(fill_bank(self.db, [self.player_id], variants=1, generate=_generate), 0)
+        self.assertEqual(len(calls), 1)
+
+    def test_off_peak_window(self):
+        self.assertTrue(_in_window("1-6", 3))
+        self.assertFalse(_in_window("1-6", 6))
+        self.assertTrue(_in_window("22-6", 23))
+        self.assertFalse(_in_window("22-6", 12))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from database import GameDB, word_set_hash
+
+
+class BossContentStoreCases(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = GameDB(str(Path(self._tmp.name) / "test.db"))
+        self.player_id = self.db.get_or_create_player()["id"]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_word_set_hash_ignores_order_and_case(self):
+        self.assertEqual(word_set_hash(["Alpha", "beta"]), word_set_hash([{"word": "BETA"}, "alpha", "alpha"]))
+        self.assertNotEqual(word_set_hash(["alpha"]), word_set_hash(["alpha", "beta"]))
+
+    def test_roundtrip_by_run_and_by_word_set(self):
+        payload = {
+            "article": {"title": "T", "content": "Some **alpha** text."},
+            "quizzes": {"vocab_attacks": [], "boss_ultimates": []},
+            "source": "ai",
+        }
+        word_hash = word_set_hash(["alpha"])
+        self.db.save_boss_content(self.player_id, "run-1", word_hash, payload)
+
+        by_run = self.db.get_boss_content(self.player_id, run_uid="run-1")
+        self.assertEqual(by_run["article"], payload["article"])
+        self.assertEqual(by_run["source"], "ai")
+
+        by_words = self.db.get_boss_content(self.player_id, run_uid="run-2", word_hash=word_hash)
+        self.assertEqual(by_words["run_uid"], "run-1")
+        self.assertIsNone(self.db.get_boss_content(self.player_id, run_uid="run-2"))
+
+    def test_mock_content_not_shared_across_runs(self):
+        word_hash = word_set_hash(["alpha"])
+        self.db.save_boss_content(self.player_id, "run-1", word_hash, {"article": {}, "quizzes": {}, "source": "mock"})
+        self.assertEqual(self.db.get_boss_content(self.player_id, run_uid="run-1")["source"], "mock")
+        self.assertIsNone(self.db.get_boss_content(self.player_id, word_hash=word_hash))
+
+    def test_partial_bank_content_yields_to_patched_ai_content(self):
+        word_hash = word_set_hash(["alpha", "beta"])
+        self.db.save_boss_content(self.player_id, "run-1", word_hash, {"article": {"title": "bank"}, "quizzes": {}, "source": "bank"})
+        self.assertIsNone(self.db.get_boss_content(self.player_id, run_uid="run-2", word_hash=word_hash))
+        self.assertEqual(self.db.get_boss_content(self.player_id, run_uid="run-1")["source"], "bank")
+
+        self.db.save_boss_content(self.player_id, "run-1", word_hash, {"article": {"title": "patched"}, "quizzes": {}, "source": "ai"})
+        self.assertEqual(self.db.get_boss_content(self.player_id, run_uid="run-1")["article"], {"title": "patched"})
+
+
+if __name__ == "__main__":
+    unittest.main()
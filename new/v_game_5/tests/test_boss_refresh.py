@@ -0,0 +1,41 @@
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from database import word_set_hash
+from services.boss_refresh import BossRefreshPlanner, deck_coverage
+
+PAYLOAD = {
+    "article": {"content": "The **quixotic** knight climbed to the **zenith** of the **obdurate** tower."},
+    "quizzes": {"vocab_attacks": [], "boss_ultimates": []},
+}
+
+
+class BossRefreshCases(unittest.TestCase):
+    def test_coverage_counts_unique_deck_words(self):
+        coverage, missing = deck_coverage(PAYLOAD, ["quixotic", "Zenith", "zenith", "lucid"])
+        self.assertAlmostEqual(coverage, 2 / 3)
+        self.assertEqual(missing, ["lucid"])
+        self.assertEqual(deck_coverage(PAYLOAD, []), (1.0, []))
+
+    def test_plan_only_when_coverage_below_threshold(self):
+        planner = BossRefreshPlanner(min_coverage=0.75, max_missing=2)
+        self.assertEqual(planner.plan(PAYLOAD, ["quixotic", "zenith", "obdurate", "lucid"]), [])
+        # 新选的牌在牌组末尾，补丁优先覆盖它们
+        deck = ["quixotic", "zenith", "lucid", "arcane", "verdant"]
+        self.assertEqual(planner.plan(PAYLOAD, deck), ["arcane", "verdant"])
+
+    def test_deck_changed_tracks_signature(self):
+        planner = BossRefreshPlanner()
+        first = word_set_hash(["quixotic", "zenith"])
+        self.assertTrue(planner.deck_changed(first))
+        self.assertFalse(planner.deck_changed(word_set_hash(["Zenith", "quixotic"])))
+        self.assertTrue(planner.deck_changed(word_set_hash(["quixotic"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models import CardCombatState, CardPiles, CardType, Enemy, Player, WordCard
+
+
+def _deck(count=8, tier=0):
+    return [WordCard(f"word{i}", f"释义{i}", tier=tier) for i in range(count)]
+
+
+class CardPilesCases(unittest.TestCase):
+    def test_move_tracks_single_location_by_identity(self):
+        piles = CardPiles()
+        twin_a, twin_b = WordCard("twin", "双", tier=0), WordCard("twin", "双", tier=0)
+        piles.reset("draw_pile", [twin_a, twin_b])
+
+        piles.move(twin_a, "hand")
+        self.assertEqual(piles.location(twin_a), "hand")
+        self.assertEqual(piles.location(twin_b), "draw_pile")
+        self.assertIn(twin_a, piles["hand"])
+        self.assertNotIn(twin_b, piles["hand"])
+
+        piles.transfer_all("draw_pile", "discard")
+        self.assertEqual(len(piles["draw_pile"]), 0)
+        self.assertTrue(piles.remove(twin_b))
+        self.assertIsNone(piles.location(twin_b))
+        self.assertFalse(piles.remove(twin_b))
+
+    def test_combat_flow_keeps_every_card_in_one_pile(self):
+        random.seed(7)
+        deck = _deck()
+        cs = CardCombatState(player=Player(), deck=deck, enemy=Enemy(use_fixed_stats=True))
+        self.assertEqual(len(cs.draw_pile), len(deck))
+
+        while len(cs.hand) < cs.hand_size:
+            cs.draw_card()
+        for _ in range(3):
+            cs.play_card(cs.hand[0])
+        while cs.draw_pile:
+            cs.draw_card()
+        cs.draw_card()  # 抽空后从弃牌堆洗回
+
+        seen = [c for pile in (cs.draw_pile, cs.hand, cs.discard, cs.exhausted) for c in pile]
+        self.assertEqual(sorted(c.word for c in seen), sorted(c.word for c in deck))
+        self.assertEqual(len({id(c) for c in seen}), len(deck))
+
+    def test_unloaded_card_returns_to_draw_pile(self):
+        deck = _deck()
+        cs = CardCombatState(player=Player(), deck=deck, enemy=Enemy(use_fixed_stats=True))
+        card = cs.draw_pile[0]
+        self.assertTrue(cs.load_card(card))
+        self.assertEqual(len(cs.draw_pile), len(deck) - 1)
+        self.assertIs(cs.hand[0], card)
+
+        cs.unload_card(card)
+        self.assertEqual(len(cs.draw_pile), len(deck))
+        self.assertEqual(cs.piles.location(card), "draw_pile")
+        self.assertEqual(len(cs.hand), 0)
+        self.assertEqual(len(cs.piles.sampler), len(deck))
+
+    def test_spent_gold_card_leaves_all_piles(self):
+        gold = WordCard("aurum", "金", tier=5)
+        cs = CardCombatState(player=Player(), deck=[gold] + _deck(3), enemy=Enemy(use_fixed_stats=True))
+        self.assertEqual(gold.card_type, CardType.GOLD_SUPPORT)
+        cs.load_card(gold)
+        gold.gold_uses_remaining = 1
+
+        self.assertTrue(cs.play_card(gold))
+        self.assertIsNone(cs.piles.location(gold))
+        self.assertNotIn(gold, cs.deck)
+        self.assertEqual(len(cs.deck), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.client_registry import ClientRegistry
+
+
+class ClientRegistryCases(unittest.TestCase):
+    def test_reuses_client_per_url_and_key(self):
+        created = []
+
+        def _factory(api_key, base_url):
+            created.append((api_key, base_url))
+            return object()
+
+        registry = ClientRegistry(factory=_factory)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.get("k1", "http://a/v1")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertIsNot(registry.get("k2", "http://a/v1"), results[0])
+        self.assertIsNot(registry.get("k1", "http://b/v1"), results[0])
+        self.assertIsNone(registry.get("", "http://a/v1"))
+
+    def test_default_factory_builds_pooled_client(self):
+        try:
+            import openai  # noqa: F401
+        except ImportError:
+            self.skipTest("openai not installed")
+        registry = ClientRegistry()
+        client = registry.get("sk-test", "http://127.0.0.1:9/v1")
+        self.assertEqual(client.max_retries, 0)
+        self.assertIs(registry.get("sk-test", "http://127.0.0.1:9/v1"), client)
+        registry.close_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
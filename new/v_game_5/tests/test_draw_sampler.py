@@ -0,0 +1,82 @@
+import copy
+import gc
+import pickle
+import random
+import unittest
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from systems.combat_engine import CombatEngine
+from models import CardCombatState, CardType, Enemy, Player, WeightedDrawSampler, WordCard, draw_weight
+
+
+class WeightedDrawSamplerCases(unittest.TestCase):
+    def test_total_tracks_add_remove_and_card_changes(self):
+        sampler = WeightedDrawSampler()
+        cards = [WordCard(f"w{i}", "m", tier=i % 6) for i in range(20)]  # 跨越扩容
+        for card in cards:
+            sampler.add(card)
+        self.assertEqual(sampler.total, sum(draw_weight(c) for c in cards))
+
+        cards[0].wrong_streak = 2
+        cards[1].priority = "ghost"
+        cards[2].is_blackened = True
+        self.assertEqual(sampler.total, sum(draw_weight(c) for c in cards))
+        self.assertIn(cards[2], sampler.cards_of_type(CardType.BLACK_CURSE))
+
+        for card in cards[::2]:
+            sampler.remove(card)
+        cards[0].wrong_streak = 0  # 已移出，不再通知
+        self.assertEqual(len(sampler), 10)
+        self.assertEqual(sampler.total, sum(draw_weight(c) for c in cards[1::2]))
+        self.assertTrue(all(c.card_type == CardType.RED_BERSERK for c in sampler.cards_of_type(CardType.RED_BERSERK)))
+
+    def test_sample_follows_weights(self):
+        sampler = WeightedDrawSampler()
+        red, gold = WordCard("red", "m", tier=0), WordCard("gold", "m", tier=5)
+        sampler.add(red)
+        sampler.add(gold)
+        gold.priority = "ghost"  # 200 × 1.5 = 300 vs 500
+        rng = random.Random(3)
+        counts = Counter(sampler.sample(rng).word for _ in range(8000))
+        self.assertAlmostEqual(counts["gold"] / 8000, 300 / 800, delta=0.03)
+
+    def test_preference_draw_uses_type_buckets(self):
+        random.seed(5)
+        deck = [WordCard(f"r{i}", "m", tier=0) for i in range(6)] + [WordCard("b", "m", tier=2)]
+        cs = CardCombatState(player=Player(), deck=deck, enemy=Enemy(use_fixed_stats=True))
+        drawn = cs.draw_with_preference([CardType.BLUE_HYBRID], 2)
+        self.assertEqual(drawn[0].word, "b")
+        self.assertEqual(drawn[1].card_type, CardType.RED_BERSERK)
+        self.assertEqual(len(cs.piles.sampler), 5)
+        self.assertEqual(cs.piles.sampler.cards_of_type(CardType.BLUE_HYBRID), [])
+
+    def test_deck_cards_do_not_keep_finished_combat_alive(self):
+        deck = [WordCard(f"r{i}", "m", tier=0) for i in range(6)]
+        cs = CardCombatState(player=Player(), deck=deck, enemy=Enemy(use_fixed_stats=True))
+        sampler = cs.piles.sampler
+        clone = copy.deepcopy(deck[0])
+        self.assertIsNone(clone._watcher)
+        self.assertEqual(pickle.loads(pickle.dumps(deck[0])), deck[0])
+
+        cs.enemy.hp = 0
+        self.assertTrue(CombatEngine.advance_phase_if_victory(cs))
+        self.assertTrue(all(card._watcher is None for card in deck))
+        self.assertEqual(sampler.total, 0)
+
+        other = CardCombatState(player=Player(), deck=deck, enemy=Enemy(use_fixed_stats=True))
+        self.assertIs(deck[0]._watcher(), other.piles.sampler)
+        del other
+        gc.collect()
+        self.assertIsNone(deck[0]._watcher())  # 战斗状态丢弃后卡牌不再持有采样器
+        deck[0].tier = 5
+        self.assertEqual(deck[0].card_type, CardType.GOLD_SUPPORT)
+
+
+if __name__ == "__main__":
+    unittest.main()
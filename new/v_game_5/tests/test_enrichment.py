@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from database import GameDB
+from services.enrichment import DistractorEnricher
+
+
+def _classify(words):
+    return {
+        "words": [
+            {
+                "word": word,
+                "pos": "Adjective",
+                "meaning": f"{word} 释义",
+                "confusables": [{"word": f"{word}-like", "meaning": "相似词"}],
+            }
+            for word in words
+        ]
+    }
+
+
+class DistractorEnrichmentCases(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = GameDB(str(Path(self._tmp.name) / "test.db"))
+        self.player_id = self.db.get_or_create_player()["id"]
+        for word in ("zenith", "quixotic", "obdurate"):
+            self.db.add_word(self.player_id, word, "待学习" if word == "zenith" else f"{word} 牌组释义")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _pool(self):
+        return {row["word"]: row for row in self.db.get_distractor_pool()}
+
+    def test_batches_upsert_words_and_confusables(self):
+        calls = []
+
+        def _tracking(words):
+            calls.append(list(words))
+            return _classify(words)
+
+        enricher = DistractorEnricher(self.db, _tracking, batch_size=2, is_busy=lambda: False)
+        self.assertEqual(enricher.run(self.player_id), 6)
+        self.assertEqual([len(batch) for batch in calls], [2, 1])
+
+        pool = self._pool()
+        self.assertEqual(pool["quixotic"]["meaning"], "quixotic 牌组释义")
+        self.assertEqual(pool["zenith"]["meaning"], "zenith 释义")
+        self.assertEqual(pool["zenith-like"]["pos"], "adj")
+        self.assertEqual(self.db.get_words_missing_distractors(self.player_id), [])
+
+        self.assertEqual(enricher.run(self.player_id), 0)
+        self.assertEqual(len(calls), 2)
+
+    def test_upsert_fills_unknown_pos_of_existing_rows(self):
+        self.db.add_to_distractor_pool("zenith", "顶点")
+        self.db.upsert_distractors([("zenith", "", "n")])
+        self.assertEqual(self._pool()["zenith"]["pos"], "n")
+        self.assertEqual(self._pool()["zenith"]["meaning"], "顶点")
+
+    def test_yields_to_interactive_work_and_failed_ai(self):
+        calls = []
+        busy = DistractorEnricher(self.db, lambda words: calls.append(words), is_busy=lambda: True)
+        self.assertEqual(busy.run(self.player_id), 0)
+        self.assertEqual(calls, [])
+
+        failing = DistractorEnricher(self.db, lambda words: calls.append(words), is_busy=lambda: False)
+        self.assertEqual(failing.run(self.player_id), 0)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import AI_MAX_RETRIES
+from services.client_registry import get_client
+from tests.fake_kimi import FakeKimiConfig, FakeKimiServer, point_ai_service_at, run_load
+
+WORDS = ["ambiguous", "formidable", "meticulous"]
+
+
+class FakeKimiCases(unittest.TestCase):
+    def test_article_round_trip_through_http_client(self):
+        with FakeKimiServer(FakeKimiConfig(fenced_rate=0.5, seed=7)) as server:
+            with point_ai_service_at(server) as ai_service:
+                ai = ai_service.CyberMind()
+                article = ai.generate_article(WORDS)
+                quiz = ai.generate_quiz(WORDS, article["content"])
+        self.assertFalse(ai.used_fallback())
+        self.assertEqual(article["missing_words"], [])
+        self.assertEqual(len(quiz["vocab_attacks"]), len(WORDS))
+        self.assertEqual(server.stats["requests"], 2)
+
+    def test_injected_errors_exhaust_retries_then_fall_back(self):
+        with FakeKimiServer(FakeKimiConfig(error_rate=1.0, error_statuses=(503,))) as server:
+            with point_ai_service_at(server) as ai_service:
+                ai = ai_service.CyberMind()
+                ai.generate_article(WORDS)
+        self.assertTrue(ai.used_fallback())
+        self.assertEqual(server.stats["requests"], AI_MAX_RETRIES)
+
+    def test_malformed_json_reported_as_parse_error(self):
+        with FakeKimiServer(FakeKimiConfig(malformed_rate=1.0)) as server:
+            with point_ai_service_at(server) as ai_service:
+                ai = ai_service.CyberMind()
+                ai.generate_article(WORDS)
+        self.assertTrue(ai.used_fallback())
+        self.assertIn("JSON", ai.get_last_error())
+
+    def test_streaming_chunks_reassemble(self):
+        with FakeKimiServer(FakeKimiConfig(stream_chunk_size=5)) as server:
+            client = get_client("fake-kimi-key", server.base_url)
+            stream = client.chat.completions.create(
+                model="fake",
+                messages=[
+                    {"role": "system", "content": "return translation_cn"},
+                    {"role": "user", "content": json.dumps({"words_list": WORDS})},
+                ],
+                stream=True,
+            )
+            content = "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+        self.assertIn("**formidable**", json.loads(content)["content"])
+        self.assertEqual(server.stats["streams"], 1)
+
+    def test_load_harness_reports_latency(self):
+        with FakeKimiServer(FakeKimiConfig(seed=1)) as server:
+            with point_ai_service_at(server):
+                report = run_load(total=12, concurrency=4, words=WORDS)
+        self.assertEqual(report["ok"], 12)
+        self.assertGreaterEqual(report["p95"], report["p50"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import subprocess
+import sys
+import textwrap
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from systems.combat_engine import CombatEngine
+from models import CardCombatState, CardType, Enemy, Player, RunFlags, RunState, WordCard
+
+
+def _card(word: str, tier: int = 0) -> WordCard:
+    return WordCard(word=word, meaning=f"{word}-cn", tier=tier)
+
+
+class HeadlessCoreCases(unittest.TestCase):
+    def test_core_imports_without_streamlit(self):
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {str(ROOT)!r})
+            sys.modules["streamlit"] = None
+            import systems, registries, models
+            from systems.combat_engine import CombatEngine
+            assert "streamlit" not in {{name.split(".")[0] for name, mod in sys.modules.items() if mod}}
+        """)
+        proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+    def test_change_hp_reads_player_flags(self):
+        player = Player(hp=40, max_hp=40, relics=["MONKEY_PAW"])
+        messages = []
+        notify = lambda level, text, icon=None: messages.append(level)
+
+        player.flags.greedy_curse = True
+        player.change_hp(-10, notify=notify)
+        self.assertEqual(player.hp, 20)
+
+        player.change_hp(-100, notify=notify)
+        self.assertEqual(player.hp, 1)
+        self.assertTrue(player.flags.monkey_paw_used)
+        player.change_hp(-100)
+        self.assertEqual(player.hp, 0)
+
+    def test_reset_combat_keeps_run_scoped_flags(self):
+        flags = RunFlags(item_shield=True, item_hint=2, greedy_curse=True, monkey_paw_used=True)
+        flags.reset_combat()
+        self.assertEqual(flags, RunFlags(monkey_paw_used=True))
+
+    def test_engine_runs_on_plain_run_state(self):
+        deck = [_card(w) for w in ("alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta")]
+        player = Player(hp=100, deck=deck)
+        run = RunState(player=player, word_pool=[_card("omega")])
+        enemy = Enemy(hp=500, attack=10, fixed_timer=1, use_fixed_stats=True)
+        cs = CardCombatState(player=player, deck=deck, enemy=enemy)
+        CombatEngine.start_battle(cs, player, run)
+
+        card = cs.hand[0]
+        CombatEngine.start_card_play(cs, player, card, run)
+        run.flags.item_hint = 1
+        options = CombatEngine.get_quiz_options(cs, run)
+        self.assertIn(card.word, options)
+        self.assertEqual(run.flags.item_hint, 0)
+
+        result = CombatEngine.process_answer(cs, player, card, card.word, None, None, 0, run)
+        self.assertTrue(result.should_enemy_turn)
+        self.assertEqual(run.in_game_streak[card.word], 1)
+
+        run.flags.item_shield = True
+        CombatEngine.resolve_enemy_turn(cs, player, run)
+        self.assertFalse(run.flags.item_shield)
+        self.assertEqual(player.hp, 100)
+
+        cards = CombatEngine._take_cards_from_pool(run, 1)
+        self.assertEqual([c.word for c in cards], ["omega"])
+        self.assertEqual(run.word_pool, [])
+        self.assertEqual(cards[0].card_type, CardType.RED_BERSERK)
+
+
+if __name__ == "__main__":
+    unittest.main()
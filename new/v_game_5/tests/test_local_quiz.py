@@ -0,0 +1,86 @@
+import random
+import tempfile
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.local_quiz import BLANK, BUNDLED_CORPUS_PATH, LocalQuizEngine, SentenceCorpus
+
+
+class LocalQuizCases(unittest.TestCase):
+    def setUp(self):
+        corpus = SentenceCorpus()
+        corpus.load(BUNDLED_CORPUS_PATH)
+        self.engine = LocalQuizEngine(corpus, rng=random.Random(3))
+
+    def test_cloze_blanks_the_word_and_uses_same_pos_distractors(self):
+        item = self.engine.build_cloze("Deteriorate")
+        self.assertIn(BLANK, item["question"])
+        self.assertNotIn("deteriorate", item["question"].lower())
+        self.assertEqual(item["answer"], "Deteriorate")
+        self.assertEqual(len(item["options"]), 4)
+        # 内置库只有 3 个动词：同词性的先用完，剩下的再从其他词补齐
+        self.assertTrue({"Gratify", "Jeopardize"}.issubset(item["options"]))
+
+    def test_inflected_only_sentences_are_skipped(self):
+        corpus = SentenceCorpus()
+        corpus.add("Her health deteriorated over the winter.", headword="deteriorate", pos="v")
+        engine = LocalQuizEngine(corpus, rng=random.Random(3))
+        engine.load_distractors([{"word": w, "pos": "v"} for w in ("gratify", "jeopardize", "mitigate")])
+        self.assertIsNone(engine.build_cloze("deteriorate"))
+        corpus.add("Without care, old roads deteriorate fast.", headword="deteriorate", pos="v")
+        item = engine.build_cloze("deteriorate")
+        self.assertEqual(item["question"], f"Without care, old roads {BLANK} fast.")
+
+    def test_distractor_pool_rows_extend_pos_buckets(self):
+        self.engine.load_distractors([{"word": "Zenith", "pos": "n"}, {"word": "Apex", "pos": "n"}])
+        item = self.engine.build_cloze("Cacophony")
+        self.assertEqual(sorted(o for o in item["options"] if o != "Cacophony"), ["Apex", "Hierarchy", "Zenith"])
+
+    def test_user_corpus_formats_and_unknown_words(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl = Path(tmp) / "user.jsonl"
+            jsonl.write_text('{"word": "zenith", "pos": "n", "sentence": "The empire reached its zenith."}\n', encoding="utf-8")
+            text = Path(tmp) / "plain.txt"
+            text.write_text("A quixotic plan rarely survives the winter.\n", encoding="utf-8")
+            corpus = SentenceCorpus()
+            self.assertEqual(corpus.load(jsonl) + corpus.load(text), 2)
+        engine = LocalQuizEngine(corpus, rng=random.Random(1))
+        attacks = engine.generate_vocab_attacks(["zenith", "quixotic", "absent", "plan"], count=5)
+        self.assertEqual([a["answer"] for a in attacks], ["zenith", "quixotic", "plan"])
+        self.assertIsNone(engine.build_cloze("absent"))
+
+    def test_generates_full_boss_set(self):
+        words = [line.split("\t")[0] for line in BUNDLED_CORPUS_PATH.read_text(encoding="utf-8").splitlines()
+                 if line and not line.startswith("#")]
+        attacks = self.engine.generate_vocab_attacks(words, count=5)
+        self.assertEqual(len(attacks), 5)
+        self.assertTrue(all(BLANK in a["question"] for a in attacks))
+
+    def test_distractors_load_while_building_questions(self):
+        rows = [{"word": f"filler{i}", "pos": ("n", "v", "adj")[i % 3]} for i in range(3000)]
+        errors = []
+
+        def _load():
+            try:
+                for start in range(0, len(rows), 50):
+                    self.engine.load_distractors(rows[start:start + 50])
+            except Exception as exc:
+                errors.append(exc)
+
+        loader = threading.Thread(target=_load)
+        loader.start()
+        while loader.is_alive():
+            self.assertIsNotNone(self.engine.build_cloze("Deteriorate", peers=["Gratify", "Keen"]))
+        loader.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.engine.pos_of("filler2999"), "adj")
+
+
+if __name__ == "__main__":
+    unittest.main()
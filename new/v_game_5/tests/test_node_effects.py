@@ -0,0 +1,78 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models import CardType, Player, RunState, WordCard
+from systems.node_effects import (
+    cancel_card_purchase,
+    card_purchase_candidates,
+    explore_graveyard,
+    finish_card_purchase,
+    start_card_purchase,
+    upgrade_card,
+)
+from systems.run_rng import RunRandom
+
+
+def _silent(level, text, icon=None):
+    pass
+
+
+class _TierLog:
+    """只记录 set_word_tier 调用的单词库替身"""
+
+    def __init__(self):
+        self.calls = []
+
+    def set_word_tier(self, player_id, word, tier, current_room=0, priority=None):
+        self.calls.append((word, tier, priority))
+        return True
+
+
+class NodeEffectsCases(unittest.TestCase):
+    def test_cancelled_card_purchase_is_refunded(self):
+        player = Player(gold=100)
+        start_card_purchase(player, "red", 30)
+        self.assertEqual((player.gold, player.purchase_counts.get("red")), (70, 1))
+        cancel_card_purchase(player, "red", 30)
+        self.assertEqual(player.gold, 100)
+        self.assertFalse(player.purchase_counts.get("red"))
+
+    def test_finished_purchase_takes_one_pool_entry(self):
+        player = Player()
+        pool = [WordCard("alpha", "甲", tier=0), WordCard("alpha", "甲", tier=0), WordCard("beta", "乙", tier=2)]
+        candidates = card_purchase_candidates(player, "red", pool, RunRandom(3))
+        self.assertTrue(all(c.card_type == CardType.RED_BERSERK for c in candidates))
+        rest = finish_card_purchase(player, candidates[0], pool)
+        self.assertEqual([c.word for c in rest], ["alpha", "beta"])
+        self.assertIn("alpha", player.deck_words)
+
+    def test_graveyard_is_seeded(self):
+        def explore(seed):
+            player, rng = Player(), RunRandom(seed)
+            outcomes = []
+            for count in range(1, 6):
+                ghost = explore_graveyard(player, count, 2, rng, _silent)
+                outcomes.append((ghost is not None, player.gold, tuple(player.relics)))
+            return outcomes
+
+        self.assertEqual(explore(11), explore(11))
+
+    def test_blue_to_gold_upgrade_grants_red_card(self):
+        player = Player()
+        run = RunState(player=player, word_pool=[WordCard("gamma", "丙", tier=0)])
+        card = WordCard("delta", "丁", tier=2)
+        db = _TierLog()
+        upgrade_card(card, run, db, player.id, 3, _silent)
+        self.assertEqual(card.tier, 4)
+        self.assertEqual(db.calls, [("delta", 4, "normal")])
+        self.assertEqual(run.gold_upgraded_words, ["delta"])
+        self.assertIn("gamma", player.deck_words)
+
+
+if __name__ == "__main__":
+    unittest.main()
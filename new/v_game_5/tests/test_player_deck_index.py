@@ -0,0 +1,59 @@
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models import CardType, Player, WordCard
+
+
+class PlayerDeckIndexCases(unittest.TestCase):
+    def test_index_follows_construction_assignment_and_add(self):
+        player = Player(deck=[WordCard("zenith", "顶点", tier=0)])
+        self.assertIn("zenith", player.deck_words)
+
+        player.deck = [WordCard("lucid", "清晰的", tier=0)]
+        self.assertNotIn("zenith", player.deck_words)
+
+        player.add_card_to_deck(WordCard("lucid", "清晰的", tier=1))
+        self.assertEqual(len(player.cards_for_word("lucid")), 2)
+        self.assertEqual(player, Player(deck=list(player.deck)))
+
+    def test_plain_field_writes_skip_the_deck_hook(self):
+        self.assertIs(Player.__setattr__, object.__setattr__)
+        player = Player(deck=[WordCard("zenith", "顶点", tier=0)])
+        index = player._deck_index
+        player.hp -= 5
+        player.gold += 10
+        self.assertIs(player._deck_index, index)
+
+    def test_set_word_tier_updates_every_copy(self):
+        first, second = WordCard("zenith", "顶点", tier=0), WordCard("zenith", "顶点", tier=0)
+        second.is_blackened = True
+        second.temp_level = "black"
+        first.temp_level = "blue"
+        player = Player(deck=[first, second, WordCard("lucid", "清晰的", tier=0)])
+
+        player.set_word_tier("zenith", 4)
+
+        self.assertEqual((first.tier, first.temp_level), (4, None))
+        self.assertEqual(first.card_type, CardType.GOLD_SUPPORT)
+        self.assertEqual((second.tier, second.temp_level), (4, "black"))
+        self.assertEqual(player.cards_for_word("lucid")[0].tier, 0)
+
+    def test_remove_by_identity(self):
+        twin_a, twin_b = WordCard("twin", "双", tier=0), WordCard("twin", "双", tier=0)
+        player = Player(deck=[twin_a, twin_b])
+
+        self.assertTrue(player.remove_card_from_deck(twin_b))
+        self.assertIs(player.deck[0], twin_a)
+        self.assertFalse(player.remove_card_from_deck(twin_b))
+        self.assertTrue(player.remove_card_from_deck(twin_a))
+        self.assertEqual(player.deck, [])
+        self.assertNotIn("twin", player.deck_words)
+
+
+if __name__ == "__main__":
+    unittest.main()
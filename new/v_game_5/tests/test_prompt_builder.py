@@ -0,0 +1,79 @@
+import json
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import AI_PROMPT_CONTEXT_BUDGETS
+from services.ai_metrics import AIMetrics
+from services.prompt_builder import TEMPLATES, build_prompt, trim_context
+from services.rate_limiter import estimate_tokens
+
+FILLER = "The neon rain kept falling over the silent district while drones hummed overhead."
+
+
+class PromptBuilderCases(unittest.TestCase):
+    def setUp(self):
+        self.metrics = AIMetrics()
+
+    def test_short_context_is_untouched(self):
+        text = "A short story. It mentions **zenith** once."
+        self.assertEqual(trim_context(text, ["zenith"], 500), text)
+
+    def test_trim_keeps_sentences_with_target_words(self):
+        sentences = [FILLER] * 30
+        sentences[17] = "At the zenith of the tower the courier stopped."
+        sentences[25] = "His obdurate silence unnerved the guards."
+        text = " ".join(sentences)
+
+        trimmed = trim_context(text, ["zenith", "obdurate"], 80)
+
+        self.assertLessEqual(estimate_tokens(trimmed), 80)
+        self.assertIn("zenith", trimmed)
+        self.assertIn("obdurate", trimmed)
+        self.assertTrue(trimmed.startswith(FILLER))
+        self.assertLess(trimmed.index("zenith"), trimmed.index("obdurate"))
+
+    def test_quiz_prompt_is_compact_and_within_budget(self):
+        article = " ".join([FILLER] * 60 + ["The quixotic plan reached its zenith at dawn."])
+        payload = {"article_content": article, "words_list": ["quixotic", "zenith"], "vocab_count": 2}
+
+        system, user = build_prompt("quiz", payload, call_type="quiz", context_key="article_content",
+                                    words=["quixotic", "zenith"], metrics=self.metrics)
+
+        self.assertIs(system, TEMPLATES["quiz"])
+        self.assertIn("vocab_attacks", system)
+        sent = json.loads(user)
+        self.assertNotIn('": ', user)
+        self.assertLessEqual(estimate_tokens(sent["article_content"]), AI_PROMPT_CONTEXT_BUDGETS["quiz"])
+        self.assertIn("quixotic", sent["article_content"])
+        self.assertEqual(sent["words_list"], ["quixotic", "zenith"])
+        self.assertGreater(self.metrics.counter("prompt_tokens.quiz.saved"), 0)
+        self.assertGreater(self.metrics.counter("prompt_tokens.quiz.sent"), 0)
+
+    def test_savings_are_untrimmed_minus_trimmed_payload(self):
+        payload = {"words": ["alpha", "beta"]}
+        system, user = build_prompt("analyze", payload, call_type="analyze", metrics=self.metrics)
+        self.assertEqual(self.metrics.counter("prompt_tokens.analyze.sent"), estimate_tokens(system) + estimate_tokens(user))
+        self.assertEqual(self.metrics.counter("prompt_tokens.analyze.saved"), 0)
+
+        article = " ".join([FILLER] * 60)
+        payload = {"article_content": article, "words_list": ["zenith"]}
+        _, user = build_prompt("quiz", payload, call_type="quiz", context_key="article_content",
+                               words=["zenith"], metrics=self.metrics)
+        untrimmed = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        self.assertEqual(self.metrics.counter("prompt_tokens.quiz.saved"),
+                         estimate_tokens(untrimmed) - estimate_tokens(user))
+
+    def test_templates_share_quiz_schema(self):
+        for name in ("quiz", "patch_quiz"):
+            self.assertIn('"boss_ultimates"', TEMPLATES[name])
+        for name in ("article", "patch_article"):
+            self.assertIn("translation_cn", TEMPLATES[name])
+
+
+if __name__ == "__main__":
+    unittest.main()
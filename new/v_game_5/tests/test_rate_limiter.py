@@ -0,0 +1,93 @@
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import AI_MAX_RETRIES
+from services.ai_scheduler import PRIORITY_BOSS, PRIORITY_ENRICHMENT
+from services.circuit_breaker import CircuitBreaker
+from services.rate_limiter import RateLimiter, estimate_tokens
+from tests.fake_kimi import FakeKimiConfig, FakeKimiServer, point_ai_service_at
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimiterCases(unittest.TestCase):
+    def test_rpm_bucket_refills_over_time(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rpm=60, tpm=0, clock=clock, burst=0.1)
+        for _ in range(6):
+            self.assertTrue(limiter.acquire(10, PRIORITY_BOSS, timeout=0))
+        self.assertFalse(limiter.acquire(10, PRIORITY_BOSS, timeout=0))
+        clock.now += 60 / 54
+        self.assertTrue(limiter.acquire(10, PRIORITY_BOSS, timeout=0))
+
+    def test_first_minute_stays_within_quota(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rpm=60, tpm=0, clock=clock)
+        granted = 0
+        for _ in range(600):
+            granted += limiter.acquire(10, PRIORITY_BOSS, timeout=0)
+            clock.now += 0.1
+        self.assertLessEqual(granted, 60)
+        self.assertGreaterEqual(granted, 59)
+
+    def test_reconcile_charges_actual_usage(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rpm=0, tpm=1000, clock=clock, burst=0.5)
+        self.assertTrue(limiter.acquire(100, PRIORITY_BOSS, timeout=0))
+        limiter.reconcile(estimated=100, actual=400)
+        self.assertFalse(limiter.acquire(200, PRIORITY_BOSS, timeout=0))
+        self.assertTrue(limiter.acquire(100, PRIORITY_BOSS, timeout=0))
+
+    def test_high_priority_lane_preempts_waiting_background_call(self):
+        limiter = RateLimiter(rpm=0, tpm=6000)
+        limiter.acquire(1200, PRIORITY_BOSS)
+        order, positions = [], []
+
+        def _low():
+            limiter.acquire(40, PRIORITY_ENRICHMENT, on_wait=positions.append)
+            order.append("enrich")
+
+        low = threading.Thread(target=_low)
+        low.start()
+        time.sleep(0.1)
+        limiter.acquire(40, PRIORITY_BOSS)
+        order.append("boss")
+        low.join(5)
+
+        self.assertEqual(order, ["boss", "enrich"])
+        self.assertIn(1, positions)
+
+    def test_429_pauses_without_tripping_breaker(self):
+        config = FakeKimiConfig(error_rate=1.0, error_statuses=(429,), retry_after=0.05)
+        with FakeKimiServer(config) as server:
+            with point_ai_service_at(server) as ai_service:
+                ai = ai_service.CyberMind()
+                started = time.perf_counter()
+                ai.generate_article(["ambiguous"])
+                elapsed = time.perf_counter() - started
+                breaker_state = ai_service.CyberMind.breaker.state
+        self.assertTrue(ai.used_fallback())
+        self.assertEqual(server.stats["requests"], AI_MAX_RETRIES)
+        self.assertEqual(breaker_state, CircuitBreaker.CLOSED)
+        self.assertGreaterEqual(elapsed, 0.05 * (AI_MAX_RETRIES - 1))
+
+    def test_estimate_tokens_counts_cjk_per_character(self):
+        self.assertEqual(estimate_tokens("abcdefgh"), 3)
+        self.assertEqual(estimate_tokens("中文释义"), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models import CardCombatState, Enemy, Player, WordCard
+from systems.map_system import MapSystem
+from systems.run_rng import RunRandom
+from registries import ShopRegistry
+
+
+def _combat_trace(seed: int) -> list:
+    rng = RunRandom(seed)
+    deck = [WordCard(f"w{i}", "m", tier=i % 6) for i in range(12)]
+    cs = CardCombatState(player=Player(), deck=deck, enemy=Enemy(level=3, rng=rng), rng=rng)
+    trace = [cs.enemy.action_timer]
+    for _ in range(30):
+        card = cs.draw_card()
+        trace.append(card.word)
+        cs.play_card(card)
+        trace.append(cs.enemy.tick())
+    return trace
+
+
+def _map_trace(rng) -> list:
+    game_map = MapSystem(total_floors=22, rng=rng)
+    return [[n.type.name for n in game_map.generate_next_options()] for _ in range(10)]
+
+
+class RunRandomCases(unittest.TestCase):
+    def test_same_seed_replays_combat_and_map(self):
+        self.assertEqual(_combat_trace(42), _combat_trace(42))
+        self.assertEqual(_map_trace(RunRandom(7)), _map_trace(RunRandom(7)))
+        self.assertEqual(
+            ShopRegistry.get_shop_inventory(rng=RunRandom(3)),
+            ShopRegistry.get_shop_inventory(rng=RunRandom(3)),
+        )
+
+    def test_snapshot_resumes_sequence_through_json(self):
+        rng = RunRandom(99)
+        rng.random()
+        snapshot = json.loads(json.dumps(rng.snapshot()))
+        expected = [rng.random() for _ in range(5)]
+
+        restored = RunRandom.from_snapshot(snapshot)
+        self.assertEqual(restored.run_seed, 99)
+        self.assertEqual([restored.random() for _ in range(5)], expected)
+
+    def test_missing_snapshot_gets_fresh_seed(self):
+        rng = RunRandom.from_snapshot(None)
+        self.assertIsInstance(rng.run_seed, int)
+        self.assertEqual(RunRandom(rng.run_seed).random(), rng.random())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import INITIAL_DECK_SIZE
+from registries import RelicRegistry
+from simulation import (
+    BotPolicy,
+    FixedAccuracyPolicy,
+    GreedyPolicy,
+    RunSimulator,
+    TierAccuracyPolicy,
+    run_bot,
+)
+from simulation.run_simulator import WordProgress, _RunStuck
+from database import GameDB
+from models import CardCombatState, Enemy, WordCard
+
+
+class RunSimulatorCases(unittest.TestCase):
+    def test_runs_finish_for_every_policy(self):
+        for seed in range(5):
+            for policy in (FixedAccuracyPolicy(0.8, seed=seed), TierAccuracyPolicy(seed=seed), GreedyPolicy(0.85, seed=seed)):
+                summary = run_bot(policy, seed=seed)
+                self.assertFalse(summary.stalled, (seed, type(policy).__name__))
+                self.assertTrue(summary.victory or summary.hp == 0)
+                self.assertGreaterEqual(summary.answers, summary.correct)
+
+    def test_same_seed_replays_identically(self):
+        first = run_bot(GreedyPolicy(0.8, seed=3), seed=42)
+        second = run_bot(GreedyPolicy(0.8, seed=3), seed=42)
+        self.assertEqual(first, second)
+        self.assertEqual(first.seed, 42)
+
+    def test_perfect_answers_reach_the_boss(self):
+        for seed in range(5):
+            summary = run_bot(FixedAccuracyPolicy(1.0, seed=seed), seed=seed)
+            self.assertTrue(summary.boss_reached)
+            self.assertEqual(summary.elites, 5)
+        weak = [run_bot(FixedAccuracyPolicy(0.3, seed=s), seed=s) for s in range(5)]
+        self.assertFalse(any(s.victory for s in weak))
+
+    def test_tower_prep_picks_deck_and_starter_relic(self):
+        sim = RunSimulator(seed=4)
+        pool_words = [card.word for card in sim.draft_pool]
+        picks = []
+        while sim.pending.kind == "load":
+            picks.append(sim.pending.options[-1].word)
+            sim.step(len(sim.pending.options) - 1)
+        self.assertEqual(len(picks), INITIAL_DECK_SIZE)
+        self.assertEqual(sim.pending.kind, "starter_relic")
+        self.assertEqual(sim.pending.options, RelicRegistry.get_pool("starter"))
+        sim.step(1)
+        self.assertEqual(sim.pending.kind, "node")
+        self.assertEqual([card.word for card in sim.player.deck], pool_words[-INITIAL_DECK_SIZE:])
+        self.assertEqual([card.word for card in sim.run.word_pool], pool_words[:-INITIAL_DECK_SIZE])
+        self.assertEqual(sim.player.relics, ["PAIN_ARMOR"])
+        self.assertEqual(sim.relic_floors, {"PAIN_ARMOR": 0})
+
+        starters = {run_bot(BotPolicy(seed=s), seed=s).relics[0] for s in range(8)}
+        self.assertEqual(starters, set(RelicRegistry.get_pool("starter")))
+
+    def test_word_progress_matches_database(self):
+        answers = [True, True, True, False, True, True, True, True, True, True]
+        with tempfile.TemporaryDirectory() as tmp:
+            db = GameDB(str(Path(tmp) / "test.db"))
+            player_id = db.get_or_create_player()["id"]
+            db.add_word(player_id, "alpha", "a", tier=0)
+            progress = WordProgress([{"word": "alpha", "tier": 0, "consecutive_correct": 0}])
+            for correct in answers:
+                self.assertEqual(
+                    progress.update_word_progress(player_id, "alpha", correct),
+                    db.update_word_progress(player_id, "alpha", correct),
+                )
+            row = next(w for w in db.get_game_pool(player_id) if w["word"] == "alpha")
+        self.assertEqual(progress.rows["alpha"], [row["tier"], row["consecutive_correct"]])
+        self.assertGreater(row["tier"], 0)
+
+    def test_step_rejects_invalid_index(self):
+        sim = RunSimulator(seed=1)
+        with self.assertRaises(ValueError):
+            sim.step(len(sim.pending.options))
+
+    def _combat(self, sim, hand):
+        cs = CardCombatState(player=sim.player, enemy=Enemy(level=1, rng=sim.rng), deck=[], rng=sim.rng)
+        cs.piles.reset("hand", list(hand))
+        return cs
+
+    def test_boss_items_keep_the_turn(self):
+        for items_end_turn in (True, False):
+            sim = RunSimulator(seed=2)
+            sim.player.inventory = ["POTION_SMALL"]
+            flow = sim._choose_play(self._combat(sim, []), items_end_turn=items_end_turn)
+            decision = next(flow)
+            self.assertEqual(decision.options, ["POTION_SMALL"])
+            with self.assertRaises(StopIteration):
+                flow.send(0)
+            self.assertEqual(sim.player.flags.end_turn_due_to_item, items_end_turn)
+
+    def test_red_only_extra_action_without_red_cards_is_stuck(self):
+        sim = RunSimulator(seed=2)
+        cs = self._combat(sim, [WordCard(word="blue", meaning="b", tier=2)])
+        cs.extra_action_only_red = True
+        with self.assertRaises(_RunStuck):
+            next(sim._choose_play(cs))
+        sim.player.inventory = ["SHIELD"]
+        self.assertEqual(next(sim._choose_play(cs)).options, ["SHIELD"])
+
+    def test_rest_buttons_stay_usable_while_forging(self):
+        sim = RunSimulator(seed=2)
+        sim.player.deck = [WordCard(word="alpha", meaning="a", tier=0)]
+        sim.player.gold = 150
+        flow = sim._rest_node()
+        decision = next(flow)
+        self.assertEqual(decision.options[-1], "upgrade")
+        decision = flow.send(decision.options.index("upgrade"))
+        self.assertEqual(decision.kind, "upgrade")
+        self.assertEqual(decision.options[1:], [None, "heal", "smith"])
+        with self.assertRaises(StopIteration):
+            flow.send(decision.options.index("heal"))
+        # 与 UI 的 rest_phase 一致：锻造中直接休息离开，下个营地仍停在淬炼面板
+        self.assertTrue(sim.forging)
+        sim.player.deck = []
+        decision = next(sim._rest_node())
+        self.assertEqual((decision.kind, decision.options), ("upgrade", [None, "heal", "smith", "cancel"]))
+
+    def test_full_run_is_fast(self):
+        start = time.perf_counter()
+        for seed in range(10):
+            run_bot(FixedAccuracyPolicy(1.0, seed=seed), seed=seed)
+        self.assertLess((time.perf_counter() - start) / 10, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.single_flight import SingleFlight
+from tests.fake_kimi import FakeKimiConfig, FakeKimiServer, fixed_latency, point_ai_service_at
+
+
+class SingleFlightCases(unittest.TestCase):
+    def _run_concurrently(self, flight, key, fn, count=4):
+        results, errors = [], []
+        barrier = threading.Barrier(count)
+
+        def _worker():
+            barrier.wait()
+            try:
+                results.append(flight.do(key, fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight()
+        gate = threading.Event()
+        calls = []
+
+        def _slow():
+            calls.append(1)
+            gate.wait(0.3)
+            return {"ok": True}
+
+        results, errors = self._run_concurrently(flight, "k", _slow)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([shared for _, shared in results].count(False), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+        flight.do("k", _slow)
+        self.assertEqual(len(calls), 2)
+
+    def test_shared_results_are_independent_copies(self):
+        flight = SingleFlight()
+
+        def _slow():
+            threading.Event().wait(0.3)
+            return {"article": {"title": "T"}}
+
+        results, errors = self._run_concurrently(flight, "k", _slow, count=3)
+        self.assertEqual(errors, [])
+        values = [value for value, _ in results]
+        values[0]["article"]["title"] = "mutated"
+        self.assertEqual([v["article"]["title"] for v in values[1:]], ["T", "T"])
+        self.assertEqual(len({id(v) for v in values}), 3)
+
+        alone, shared = flight.do("k", lambda: {"n": 1})
+        self.assertFalse(shared)
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight()
+
+        def _boom():
+            threading.Event().wait(0.2)
+            raise RuntimeError("upstream down")
+
+        results, errors = self._run_concurrently(flight, "k", _boom, count=3)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 3)
+
+    def test_identical_article_requests_hit_upstream_once(self):
+        config = FakeKimiConfig(latency=fixed_latency(0.3))
+        articles = []
+        with FakeKimiServer(config) as server:
+            with point_ai_service_at(server) as ai_service:
+                barrier = threading.Barrier(3)
+
+                def _generate():
+                    barrier.wait()
+                    articles.append(ai_service.CyberMind().generate_article(["zenith", "quixotic"]))
+
+                threads = [threading.Thread(target=_generate) for _ in range(3)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join(10)
+
+        self.assertEqual(server.stats["requests"], 1)
+        self.assertEqual(len(articles), 3)
+        self.assertEqual(articles[0], articles[1])
+        self.assertIsNot(articles[0], articles[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import copy
+import unittest
+import weakref
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from models import CARD_STATS, CardType, WordCard
+
+
+class WordCardCases(unittest.TestCase):
+    def test_cached_type_invalidated_by_tier_temp_level_and_blacken(self):
+        card = WordCard("zenith", "顶点", tier=1)
+        self.assertEqual(card.card_type, CardType.RED_BERSERK)
+        self.assertEqual(card.damage, CARD_STATS[CardType.RED_BERSERK]["damage"])
+
+        card.tier = 5
+        self.assertEqual(card.card_type, CardType.GOLD_SUPPORT)
+        self.assertEqual(card.draw, CARD_STATS[CardType.GOLD_SUPPORT]["draw"])
+
+        card.temp_level = "blue"
+        self.assertEqual(card.card_type, CardType.BLUE_HYBRID)
+        card.temp_level = None
+        self.assertEqual(card.card_type, CardType.GOLD_SUPPORT)
+
+        card.is_blackened = True
+        self.assertEqual(card.card_type, CardType.BLACK_CURSE)
+        self.assertEqual(card.penalty, CARD_STATS[CardType.BLACK_CURSE]["penalty"])
+
+    def test_slots_and_serialization(self):
+        card = WordCard("zenith", "顶点", tier=3, learned=True)
+        card.card_type
+        self.assertFalse(hasattr(card, "__dict__"))
+        self.assertEqual(card.to_dict(), {
+            "word": "zenith",
+            "meaning": "顶点",
+            "tier": 3,
+            "card_type": CardType.from_tier(3).value,
+            "learned": True,
+            "consecutive_correct": 0,
+            "priority": "normal",
+        })
+        clone = copy.deepcopy(card)
+        self.assertEqual(clone, WordCard("zenith", "顶点", tier=3, learned=True))
+        self.assertIn("zenith", repr(card))
+        self.assertNotIn("_stats", repr(card))
+
+    def test_only_draw_weight_fields_notify_the_watcher(self):
+        class _Watcher:
+            def __init__(self):
+                self.changed = []
+
+            def card_changed(self, card):
+                self.changed.append(card.word)
+
+        card = WordCard("zenith", "顶点", tier=0, priority="ghost", wrong_streak=2)
+        self.assertEqual((card.priority, card.wrong_streak), ("ghost", 2))
+        watcher = _Watcher()
+        object.__setattr__(card, "_watcher", weakref.ref(watcher))
+        card.learned = True
+        card.consecutive_correct = 3
+        self.assertEqual(watcher.changed, [])
+        for name, value in (("tier", 2), ("temp_level", "red"), ("is_blackened", True),
+                            ("wrong_streak", 0), ("priority", "normal")):
+            setattr(card, name, value)
+        self.assertEqual(len(watcher.changed), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import random
+import re
+import unittest
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.word_coverage import find_missing_words
+
+
+def _legacy_missing(content: str, words: list) -> list:
+    missing = []
+    lowered = content.lower()
+    for word in words:
+        token = str(word).strip()
+        if not token:
+            continue
+        lower_token = token.lower()
+        plain_hit = re.search(rf"\b{re.escape(lower_token)}\b", lowered) is not None
+        bold_hit = re.search(rf"\*\*{re.escape(lower_token)}\*\*", lowered) is not None
+        if not plain_hit and not bold_hit:
+            missing.append(token)
+    return missing
+
+
+class WordCoverageCases(unittest.TestCase):
+    def test_bold_plain_and_partial_matches(self):
+        content = "The **Ambiguous** signal was formidable; re-entry of C++ code, and meticulously kept."
+        words = ["ambiguous", "Formidable", "meticulous", "re-entry", "c++", "give up", " ", "signal"]
+        self.assertEqual(find_missing_words(content, words), ["meticulous", "c++", "give up"])
+        self.assertEqual(find_missing_words(content, words), _legacy_missing(content, words))
+
+    def test_matches_legacy_regex_on_random_articles(self):
+        rng = random.Random(42)
+        vocab = ["alpha", "beta", "gamma", "well-known", "over time", "naïve", "x2", "c++", "**", "a_b"]
+        separators = [" ", ", ", ". ", "-", "**", "\n", "_", "'"]
+        for _ in range(300):
+            parts = [rng.choice(vocab + ["filler", "alphabet", "betas"]) for _ in range(rng.randint(0, 12))]
+            content = "".join(p + rng.choice(separators) for p in parts)
+            words = rng.sample(vocab, rng.randint(1, len(vocab)))
+            words = [w.upper() if rng.random() < 0.3 else w for w in words]
+            self.assertEqual(find_missing_words(content, words), _legacy_missing(content, words), content)
+
+
+if __name__ == "__main__":
+    unittest.main()
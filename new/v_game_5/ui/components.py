@@ -9,6 +9,8 @@ if str(_parent) not in sys.path:
 import streamlit as st
 import streamlit.components.v1 as components
 from models import WordTier, CardType, WordCard, CARD_STATS, CombatPhase
+from state_utils import notify_ui, record_action
+from systems.run_choices import index_of, play_options
 
 
 def play_audio(text: str):
@@ -39,6 +41,16 @@ def render_hud():
         if in_combat and cs:
             render_combat_status(cs)
         render_backpack_panel(player.relics, player.inventory, in_combat, cs)
+        action_log = st.session_state.get('action_log')
+        if action_log is not None and len(action_log):
+            # 种子 + 动作日志，附在 Bug 报告里
+            st.download_button(
+                "📝 导出动作日志",
+                data=action_log.to_jsonl(),
+                file_name=f"run_{action_log.run_uid[:8]}.jsonl",
+                mime="application/json",
+                use_container_width=True,
+            )
 
     with col_stats:
         with st.container(border=True):
@@ -105,22 +117,29 @@ def render_backpack_panel(relics: list, inventory: list, in_combat: bool, combat
                     else:
                         can_use = item.consumable and item.effect in supported
                     if st.button("使用", key=f"use_item_{item_id}", disabled=not can_use):
+                        # 战斗中（含首领战停在出牌时）用道具与出牌是同一个决策（RunSimulator 的 play 选项）
+                        decision_cs = combat_state if in_combat else _boss_play_decision()
+                        if decision_cs is not None:
+                            options = play_options(decision_cs, st.session_state.player.inventory)
+                            record_action("play", index_of(options, item_id), item_id)
+                        else:
+                            record_action("item", None, item_id)
                         inv = st.session_state.player.inventory
                         if item_id in inv:
                             inv.remove(item_id)
+                        flags = st.session_state.player.flags
                         if item.effect == "heal":
                             if "CURSED_BLOOD" in st.session_state.player.relics:
                                 st.warning("诅咒之血：无法通过道具回血")
                             else:
-                                st.session_state.player.change_hp(item.value)
+                                st.session_state.player.change_hp(item.value, notify=notify_ui)
                         elif item.effect == "shield":
-                            st.session_state._item_shield = True
+                            flags.item_shield = True
                         elif item.effect == "damage_reduce":
-                            current = st.session_state.get("_item_damage_reduce", 0)
                             value = item.value if item.value else 5
-                            st.session_state._item_damage_reduce = max(current, value)
+                            flags.item_damage_reduce = max(flags.item_damage_reduce, value)
                         elif item.effect == "hint":
-                            st.session_state._item_hint = st.session_state.get("_item_hint", 0) + 1
+                            flags.item_hint += 1
                         elif item.effect == "max_hp":
                             st.session_state.player.max_hp += item.value
                             st.session_state.player.hp = min(
@@ -132,10 +151,21 @@ def render_backpack_panel(relics: list, inventory: list, in_combat: bool, combat
                                     st.session_state.player.hp, st.session_state.player.max_hp
                                 )
                         if in_combat:
-                            st.session_state._end_turn_due_to_item = True
+                            flags.end_turn_due_to_item = True
                         st.rerun()
 
 
+def _boss_play_decision():
+    """首领战停在出牌上时返回其战斗状态；首领战不算 in_combat，此时用道具不结束回合"""
+    bs = st.session_state.get('boss_state')
+    cs = st.session_state.get('boss_card_combat')
+    if bs is None or cs is None or bs.phase != "battle":
+        return None
+    if bs.active_quiz is not None or cs.current_card or not cs.hand:
+        return None
+    return cs
+
+
 def render_combat_status(cs):
     """侧边栏战斗状态显示"""
     player = st.session_state.player
@@ -18,33 +18,38 @@ from models import (
     GamePhase, NodeType, Player, BossState, 
     CardType, WordCard, Enemy, CombatPhase, CardCombatState, CARD_STATS
 )
-from state_utils import reset_combat_flags
+from state_utils import SessionRunState, notify_ui, record_action, record_boss_quizzes, reset_combat_flags
 from config import HAND_SIZE, ENEMY_HP_BASE, ENEMY_ATTACK, ENEMY_ACTION_TIMER, UI_PAUSE_EXTRA, SHOP_PRICE_SURCHARGE
 from registries import EventRegistry, ShopRegistry
 from systems.trigger_bus import TriggerBus, TriggerContext
 from systems.combat_engine import CombatEngine
-from systems.combat_events import CombatEvent
-from systems.run_flow_utils import convert_event_node_to_combat, rollback_purchase_counts
-from ai_service import CyberMind, MockGenerator, BossPreloader
+from systems.run_flow_utils import (
+    CURSED_RELIC_IDS, apply_relic_on_gain, convert_event_node_to_combat
+)
+from systems.node_effects import (
+    CARD_COLOR_TYPES, apply_event_choice, buy_shop_item, cancel_card_purchase, card_purchase_candidates,
+    explore_graveyard, finish_card_purchase, purify_card, read_mysterious_book, rest_heal, roll_adventurer_loot,
+    smith_blue_cards, start_card_purchase, upgrade_card
+)
+from systems.run_choices import (
+    event_choices, forge_options, index_of, play_options, rest_options, shop_offer_index, shop_offers,
+    spell_options, starter_relic_options, upgrade_options
+)
+from ai_service import CyberMind, MockGenerator, submit_distractor_enrichment, submit_word_analysis
 from ui.components import (
     play_audio, render_word_card, render_card_slot, render_enemy,
     render_hand, render_learning_popup, render_quiz_test
 )
 
 
+def _run_rng():
+    """本局随机数（未开局或旧会话时回退到全局 random）"""
+    return st.session_state.get("run_rng") or random
+
+
 def render_combat_events(events: list):
     for ev in events:
-        level = getattr(ev, "level", "toast")
-        text = getattr(ev, "text", "")
-        icon = getattr(ev, "icon", None)
-        if level == "success":
-            st.success(text)
-        elif level == "warning":
-            st.warning(text)
-        elif level == "error":
-            st.error(text)
-        else:
-            st.toast(text, icon=icon)
+        notify_ui(getattr(ev, "level", "toast"), getattr(ev, "text", ""), getattr(ev, "icon", None))
 
 
 def _pause(seconds: float):
@@ -135,8 +140,10 @@ def render_word_library(back_callback):
                 
                 # 使用 AI 获取释义
                 with st.spinner("🧠 获取释义..."):
-                    ai = st.session_state.get('ai') or CyberMind()
-                    analysis = ai.analyze_words(words)
+                    job = submit_word_analysis(words, owner=st.session_state.get('session_uid'))
+                    analysis = job.result(timeout=120)
+                    if not job.done():
+                        job.cancel()  # 超时：不再等释义，释放后台任务
                     
                     if analysis and analysis.get('words'):
                         for w in analysis['words']:
@@ -148,6 +155,8 @@ def render_word_library(back_callback):
                             db.add_word(player_id, w, '', tier=0, priority='pinned')
                         st.warning(f"⚠️ 已添加 {len(words)} 个词（无释义）")
                 
+                # 新词进入后台低优先级队列，扩充干扰词库
+                submit_distractor_enrichment(db, player_id)
                 st.rerun()
     
     # 按颜色显示词库
@@ -197,8 +206,6 @@ def render_drafting(complete_callback: Callable):
         if not game_pool:
             st.session_state.draft_candidates = []
         else:
-            import random
-            
             # 按颜色分类
             red_cards = [c for c in game_pool if c.card_type == CardType.RED_BERSERK]
             blue_cards = [c for c in game_pool if c.card_type == CardType.BLUE_HYBRID]
@@ -207,21 +214,21 @@ def render_drafting(complete_callback: Callable):
             candidates = []
             for _ in range(3):
                 # 70% 红, 25% 蓝, 5% 金
-                roll = random.random()
+                roll = _run_rng().random()
                 if roll < 0.70 and red_cards:
-                    card = random.choice(red_cards)
+                    card = _run_rng().choice(red_cards)
                     red_cards.remove(card)
                 elif roll < 0.95 and blue_cards:
-                    card = random.choice(blue_cards)
+                    card = _run_rng().choice(blue_cards)
                     blue_cards.remove(card)
                 elif gold_cards:
-                    card = random.choice(gold_cards)
+                    card = _run_rng().choice(gold_cards)
                     gold_cards.remove(card)
                 elif red_cards:
-                    card = random.choice(red_cards)
+                    card = _run_rng().choice(red_cards)
                     red_cards.remove(card)
                 elif blue_cards:
-                    card = random.choice(blue_cards)
+                    card = _run_rng().choice(blue_cards)
                     blue_cards.remove(card)
                 else:
                     break
@@ -317,19 +324,6 @@ def render_combat(resolve_node_callback: Callable, check_death_callback: Callabl
         node = st.session_state.game_map.current_node
         is_elite = node and node.type.name == "ELITE"
         
-        # 从玩家卡组构建战斗词池，添加轮换机制
-        cards = player.deck.copy() if player.deck else []
-        
-        # 跟踪上一局使用的卡，优先使用未使用过的
-        last_used = st.session_state.get('_last_used_cards', set())
-        unused_cards = [c for c in cards if c.word not in last_used]
-        used_cards = [c for c in cards if c.word in last_used]
-        
-        # 优先放入未使用的卡，然后是使用过的
-        random.shuffle(unused_cards)
-        random.shuffle(used_cards)
-        rotated_pool = unused_cards + used_cards
-        
         # 根据怪物类型设置属性
         from config import ENEMY_HP_ELITE
         forced_enemy = st.session_state.get("forced_enemy")
@@ -341,6 +335,7 @@ def render_combat(resolve_node_callback: Callable, check_death_callback: Callabl
             return Enemy(
                 level=st.session_state.game_map.current_node.level,
                 is_elite=(st.session_state.game_map.current_node.type == NodeType.ELITE),
+                rng=st.session_state.get("run_rng"),
             )
 
         if len(player.deck) > player.deck_limit:
@@ -354,14 +349,16 @@ def render_combat(resolve_node_callback: Callable, check_death_callback: Callabl
                 st.session_state.card_combat = CardCombatState(
                     player=player,
                     enemy=_select_enemy(),
-                    deck=selected_deck
+                    deck=selected_deck,
+                    rng=st.session_state.get("run_rng"),
                 )
         else:
             # 自动全带
             st.session_state.card_combat = CardCombatState(
                 player=player,
                 enemy=_select_enemy(),
-                deck=player.deck.copy()
+                deck=player.deck.copy(),
+                rng=st.session_state.get("run_rng"),
             )
 
         if forced_enemy:
@@ -371,7 +368,7 @@ def render_combat(resolve_node_callback: Callable, check_death_callback: Callabl
     
     # v6.0 直接进入战斗，不再有 Loading 阶段
     if cs.phase == CombatPhase.LOADING:
-        result = CombatEngine.start_battle(cs, player, st.session_state)
+        result = CombatEngine.start_battle(cs, player, SessionRunState())
         render_combat_events(result.events)
         if result.should_rerun:
             st.rerun()
@@ -420,14 +417,10 @@ def _complete_combat_victory(cs: CardCombatState, resolve_node_callback: Callabl
     ctx = TriggerContext(player=player, enemy=cs.enemy, combat_state=cs, data={"gold_reward": gold_reward})
     TriggerBus.trigger("on_combat_end", ctx)
     gold_reward = ctx.data.get("gold_reward", gold_reward)
-    player.add_gold(gold_reward)
+    player.add_gold(gold_reward, notify=notify_ui)
     player.advance_room()
     
-    # 记录本局使用过的卡牌，供下局轮换
     if 'card_combat' in st.session_state:
-        used_words = {c.word for c in st.session_state.card_combat.discard}
-        used_words.update(c.word for c in st.session_state.card_combat.hand if hasattr(c, 'word'))
-        st.session_state._last_used_cards = used_words
         del st.session_state.card_combat
 
     for key in ("combat_victory_rewarded", "reward_cards", "selected_rewards", "combat_recorded"):
@@ -440,20 +433,9 @@ def _complete_combat_victory(cs: CardCombatState, resolve_node_callback: Callabl
     resolve_node_callback()
 
 
-CURSED_RELIC_IDS = {"CURSED_BLOOD", "MONKEY_PAW", "UNDYING_CURSE", "CURSE_MASK"}
-
-
 def _apply_relic_on_gain(player, relic_id: str):
-    if relic_id in CURSED_RELIC_IDS:
+    if apply_relic_on_gain(player, relic_id):
         st.warning("你深深地感到不安")
-    if relic_id == "UNDYING_CURSE":
-        for c in player.deck:
-            c.is_blackened = True
-            c.temp_level = "black"
-    if relic_id == "MONKEY_PAW":
-        if player.max_hp > 50:
-            player.max_hp = 50
-            player.hp = min(player.hp, player.max_hp)
 
 
 def _render_elite_relic_reward(cs: CardCombatState, resolve_node_callback: Callable):
@@ -471,7 +453,7 @@ def _render_elite_relic_reward(cs: CardCombatState, resolve_node_callback: Calla
             _clear_elite_relic_state()
             _complete_combat_victory(cs, resolve_node_callback)
             return
-        st.session_state.elite_relic_choices = random.sample(pool, min(3, len(pool)))
+        st.session_state.elite_relic_choices = _run_rng().sample(pool, min(3, len(pool)))
 
     choices = st.session_state.get('elite_relic_choices', [])
     if not choices:
@@ -490,6 +472,7 @@ def _render_elite_relic_reward(cs: CardCombatState, resolve_node_callback: Calla
                 st.markdown(f"### {relic.icon} {relic.name}")
                 st.caption(relic.description)
                 if st.button("选择", key=f"elite_relic_{rid}"):
+                    record_action("relic", i, rid)
                     player.relics.append(rid)
                     _apply_relic_on_gain(player, rid)
                     st.toast("获得圣遗物")
@@ -498,6 +481,7 @@ def _render_elite_relic_reward(cs: CardCombatState, resolve_node_callback: Calla
                     return
 
     if st.button("跳过", use_container_width=True):
+        record_action("relic", len(choices), None)
         _clear_elite_relic_state()
         _complete_combat_victory(cs, resolve_node_callback)
         return
@@ -512,7 +496,7 @@ def _clear_elite_relic_state():
 
 def _take_cards_from_pool(count: int, prefer_red_only: bool = False) -> list:
     pool = st.session_state.get('game_word_pool') or []
-    deck_words = {c.word for c in st.session_state.player.deck}
+    deck_words = st.session_state.player.deck_words
     pool = [c for c in pool if c.word not in deck_words]
     if count <= 0 or not pool:
         return []
@@ -525,7 +509,7 @@ def _take_cards_from_pool(count: int, prefer_red_only: bool = False) -> list:
         source = red_cards if red_cards else ([] if prefer_red_only else other_cards)
         if not source:
             break
-        card = random.choice(source)
+        card = _run_rng().choice(source)
         picked.append(card)
         if card in pool:
             pool.remove(card)
@@ -538,17 +522,6 @@ def _take_cards_from_pool(count: int, prefer_red_only: bool = False) -> list:
     return picked
 
 
-def _grant_red_card_from_pool(reason: str = "") -> bool:
-    cards = _take_cards_from_pool(1, prefer_red_only=True)
-    if not cards:
-        st.info("词池中没有可用红卡")
-        return False
-    card = cards[0]
-    st.session_state.player.add_card_to_deck(card)
-    st.toast(f"获得红卡（{reason}）") if reason else st.toast("获得红卡")
-    return True
-
-
 def _render_preparation():
     """战前准备：查看卡组并确认出发"""
     st.header("🧭 战前准备")
@@ -652,7 +625,7 @@ def _render_loading_phase(cs: CardCombatState):
             st.warning(f"需要至少 3 张牌（当前 {len(cs.hand)} 张）")
         
         if st.button("⚔️ 开始战斗！", type="primary", disabled=not can_start, use_container_width=True):
-            random.shuffle(cs.hand)
+            cs.hand.shuffle(_run_rng())
             cs.start_battle()
             st.rerun()
 
@@ -661,8 +634,8 @@ def _render_battle_phase(cs: CardCombatState, resolve_node_callback, check_death
     """战斗阶段"""
     player = st.session_state.player
 
-    if st.session_state.get("_end_turn_due_to_item"):
-        result = CombatEngine.resolve_enemy_turn(cs, player, st.session_state)
+    if player.flags.end_turn_due_to_item:
+        result = CombatEngine.resolve_enemy_turn(cs, player, SessionRunState())
         render_combat_events(result.events)
         if result.player_dead and check_death_callback():
             return
@@ -672,8 +645,8 @@ def _render_battle_phase(cs: CardCombatState, resolve_node_callback, check_death
         return
     
     # 检查是否被眩晕
-    if st.session_state.get('_player_stunned'):
-        result = CombatEngine.resolve_stun_turn(cs, player, st.session_state)
+    if player.flags.player_stunned:
+        result = CombatEngine.resolve_stun_turn(cs, player, SessionRunState())
         render_combat_events(result.events)
         if result.player_dead and check_death_callback():
             return
@@ -704,39 +677,46 @@ def _render_battle_phase(cs: CardCombatState, resolve_node_callback, check_death
     
     st.divider()
     if not cs.current_card:
-        draw_result = CombatEngine.auto_draw_if_empty(cs, st.session_state)
+        draw_result = CombatEngine.auto_draw_if_empty(cs, SessionRunState())
         if draw_result.events:
             render_combat_events(draw_result.events)
         if draw_result.should_rerun:
             st.rerun()
             return
 
-        allowed_types = None
-        if cs.extra_action_only_red:
-            allowed_types = {CardType.RED_BERSERK}
-        clicked = render_hand(cs.hand, on_play=True, allowed_types=allowed_types)
-        if clicked is not None:
-            card = cs.hand[clicked]
-            play_result = CombatEngine.start_card_play(cs, player, card, st.session_state)
-            if play_result.events:
-                render_combat_events(play_result.events)
-            if play_result.should_rerun:
-                st.rerun()
-                return
+        _render_play_choice(cs, player)
     else:
         st.caption(f"剩余手牌: {len(cs.hand)} | 弃牌堆: {len(cs.discard)}")
 
 
+def _render_play_choice(cs: CardCombatState, player) -> None:
+    """手牌出牌（普通战斗与首领战共用）"""
+    options = play_options(cs, player.inventory)
+    allowed_types = None
+    if cs.extra_action_only_red:
+        allowed_types = {CardType.RED_BERSERK}
+    clicked = render_hand(cs.hand, on_play=True, allowed_types=allowed_types)
+    if clicked is not None:
+        card = cs.hand[clicked]
+        record_action("play", index_of(options, card), card)
+        play_result = CombatEngine.start_card_play(cs, player, card, SessionRunState())
+        if play_result.events:
+            render_combat_events(play_result.events)
+        if play_result.should_rerun:
+            st.rerun()
+
+
 def _render_card_test(cs: CardCombatState, player, check_death_callback):
     """Card test"""
     card = cs.current_card
-    options = CombatEngine.get_quiz_options(cs, st.session_state)
+    options = CombatEngine.get_quiz_options(cs, SessionRunState())
 
     st.markdown(f"### 🎴 {card.card_type.icon} {card.card_type.name_cn}卡")
 
     answer = render_quiz_test(card, options)
 
     if answer:
+        record_action("answer", options.index(answer) if answer in options else None, answer)
         db = st.session_state.get('db')
         player_id = st.session_state.db_player.get('id')
         current_room = player.current_room
@@ -749,7 +729,7 @@ def _render_card_test(cs: CardCombatState, player, check_death_callback):
             db=db,
             player_id=player_id,
             current_room=current_room,
-            session_state=st.session_state,
+            run=SessionRunState(),
         )
         render_combat_events(result.events)
 
@@ -768,7 +748,7 @@ def _render_card_test(cs: CardCombatState, player, check_death_callback):
                 CombatEngine.advance_phase_if_victory(cs)
                 st.rerun()
                 return
-            turn_result = CombatEngine.resolve_enemy_turn(cs, player, st.session_state)
+            turn_result = CombatEngine.resolve_enemy_turn(cs, player, SessionRunState())
             render_combat_events(turn_result.events)
             if turn_result.player_dead and check_death_callback():
                 return
@@ -809,6 +789,20 @@ def _normalize_boss_quizzes(quizzes: dict, words: list) -> dict:
     return MockGenerator.generate_quiz(words)
 
 
+def _load_stored_boss_payload() -> dict:
+    """会话缓存缺失时（如服务重启后）从数据库读取本局 Boss 内容"""
+    db = st.session_state.get("db")
+    run_uid = st.session_state.get("run_uid")
+    if not db or not run_uid:
+        return None
+    stored = db.get_boss_content(st.session_state.db_player.get("id"), run_uid=run_uid)
+    if not stored:
+        return None
+    payload = {"article": stored["article"], "quizzes": stored["quizzes"], "source": stored["source"]}
+    st.session_state.boss_article_cache = payload
+    return payload
+
+
 def _build_boss_quiz_queue(quizzes: dict) -> list:
     vocab = list((quizzes or {}).get("vocab_attacks", []))
     reading = list((quizzes or {}).get("boss_ultimates", []))
@@ -863,53 +857,17 @@ def _boss_init_combat_state(bs: BossState) -> CardCombatState:
         fixed_attack=bs.boss_attack_max,
         fixed_timer=bs.boss_attack_interval,
         attack_interval=bs.boss_attack_interval,
+        rng=st.session_state.get("run_rng"),
     )
     st.session_state.boss_card_combat = CardCombatState(
         player=player,
         enemy=enemy,
         deck=player.deck.copy(),
+        rng=st.session_state.get("run_rng"),
     )
     return st.session_state.boss_card_combat
 
 
-def _enforce_boss_death_lock(bs: BossState, cs: CardCombatState) -> bool:
-    if cs.enemy.hp <= 0 and bs.quiz_asked < bs.death_lock_until_quiz_count:
-        cs.enemy.hp = 1
-        bs.boss_hp = 1
-        bs.death_lock_active = True
-        return True
-    if bs.quiz_asked >= bs.death_lock_until_quiz_count:
-        bs.death_lock_active = False
-    return False
-
-
-def _resolve_boss_enemy_turn(cs: CardCombatState, player: Player, bs: BossState):
-    events = []
-    if cs.bleed_turns > 0 and cs.bleed_damage > 0:
-        cs.enemy.take_damage(cs.bleed_damage)
-        cs.bleed_turns -= 1
-        events.append(CombatEvent(level="toast", text=f"🩸 放血造成 {cs.bleed_damage} 伤害", icon="🩸"))
-
-    interval = bs.frenzy_attack_interval if bs.frenzy_active else bs.boss_attack_interval
-    interval = max(1, interval)
-    attack_now = ((cs.turns + 1) % interval) == 0
-
-    if attack_now and cs.enemy.hp > 0:
-        low = bs.boss_attack_min + (bs.frenzy_attack_bonus if bs.frenzy_active else 0)
-        high = bs.boss_attack_max + (bs.frenzy_attack_bonus if bs.frenzy_active else 0)
-        damage = random.randint(low, high)
-        player.change_hp(-damage)
-        events.append(CombatEvent(level="warning", text=f"👹 首领攻击造成 {damage} 伤害"))
-
-    cs.current_card = None
-    cs.current_options = None
-    cs.turns += 1
-    bs.turn = cs.turns
-    cs.nunchaku_used = False
-    cs.extra_action_only_red = False
-    return events
-
-
 def _render_boss_skill_interrupt_panel(bs: BossState, cs: CardCombatState, check_death_callback: Callable) -> bool:
     quiz = bs.active_quiz or {}
     quiz_type = str(quiz.get("type", "vocab"))
@@ -1013,6 +971,7 @@ def _render_boss_skill_interrupt_panel(bs: BossState, cs: CardCombatState, check
                 )
 
     if submit:
+        record_action("boss_quiz", index_of(options, choice), choice)
         player = st.session_state.player
         correct = choice == quiz.get("answer")
         if correct:
@@ -1021,7 +980,7 @@ def _render_boss_skill_interrupt_panel(bs: BossState, cs: CardCombatState, check
             st.success(f"首领反噬受到 {damage} 伤害")
         else:
             damage = 15
-            player.change_hp(-damage)
+            player.change_hp(-damage, notify=notify_ui)
             st.error(f"应对失败，你受到 {damage} 伤害")
             if check_death_callback():
                 return True
@@ -1029,7 +988,7 @@ def _render_boss_skill_interrupt_panel(bs: BossState, cs: CardCombatState, check
         bs.quiz_asked += 1
         bs.active_quiz = None
         bs.next_quiz_turn += bs.quiz_interval_turns
-        if _enforce_boss_death_lock(bs, cs):
+        if CombatEngine.enforce_boss_death_lock(bs, cs):
             st.warning("尚未读完其真名，首领强行维持形体！")
 
         if bs.quiz_asked >= bs.death_lock_until_quiz_count and cs.enemy.hp > 0:
@@ -1049,12 +1008,13 @@ def _render_boss_skill_interrupt_panel(bs: BossState, cs: CardCombatState, check
 def _render_boss_card_test(cs: CardCombatState, bs: BossState, check_death_callback: Callable) -> bool:
     player = st.session_state.player
     card = cs.current_card
-    options = CombatEngine.get_quiz_options(cs, st.session_state)
+    options = CombatEngine.get_quiz_options(cs, SessionRunState())
 
     st.markdown(f"### 🎴 {card.card_type.icon} {card.card_type.name_cn}卡")
     answer = render_quiz_test(card, options)
     if not answer:
         return False
+    record_action("answer", options.index(answer) if answer in options else None, answer)
 
     db = st.session_state.get("db")
     player_id = st.session_state.db_player.get("id")
@@ -1067,14 +1027,14 @@ def _render_boss_card_test(cs: CardCombatState, bs: BossState, check_death_callb
         db=db,
         player_id=player_id,
         current_room=current_room,
-        session_state=st.session_state,
+        run=SessionRunState(),
     )
     render_combat_events(result.events)
 
     if result.player_dead and check_death_callback():
         return True
 
-    if result.enemy_dead and _enforce_boss_death_lock(bs, cs):
+    if result.enemy_dead and CombatEngine.enforce_boss_death_lock(bs, cs):
         st.warning("尚未读完其真名，首领强行维持形体！")
 
     if result.should_rerun:
@@ -1082,11 +1042,11 @@ def _render_boss_card_test(cs: CardCombatState, bs: BossState, check_death_callb
         return True
 
     if result.should_enemy_turn:
-        events = _resolve_boss_enemy_turn(cs, player, bs)
+        events = CombatEngine.resolve_boss_enemy_turn(cs, player, bs, SessionRunState()).events
         render_combat_events(events)
         if player.is_dead() and check_death_callback():
             return True
-        if cs.enemy.hp <= 0 and _enforce_boss_death_lock(bs, cs):
+        if cs.enemy.hp <= 0 and CombatEngine.enforce_boss_death_lock(bs, cs):
             st.warning("尚未读完其真名，首领强行维持形体！")
         if cs.enemy.hp <= 0 and bs.quiz_asked >= bs.death_lock_until_quiz_count:
             cs.phase = CombatPhase.VICTORY
@@ -1108,23 +1068,26 @@ def render_boss(resolve_node_callback: Callable, check_death_callback: Callable)
     bs: BossState = st.session_state.boss_state
 
     if bs.phase == "loading":
-        cache = st.session_state.get("boss_article_cache")
-        preloaded = BossPreloader.get_result()
-        payload = cache or preloaded
+        payload = st.session_state.get("boss_article_cache")
+        if not payload and st.session_state.get("boss_generation_status") != "generating":
+            payload = _load_stored_boss_payload()
 
         if payload:
             deck_words = [c.word for c in player.deck]
             bs.article = _normalize_boss_article(payload.get("article"), deck_words)
             bs.quizzes = _normalize_boss_quizzes(payload.get("quizzes"), deck_words)
             bs.quiz_queue = _build_boss_quiz_queue(bs.quizzes)
+            record_boss_quizzes(bs.quiz_queue)
             bs.phase = "article"
-            if preloaded:
-                BossPreloader.reset()
             st.rerun()
             return
 
-        if st.session_state.get("boss_generation_status") == "generating" or BossPreloader.is_loading():
+        if st.session_state.get("boss_generation_status") == "generating":
             st.info("首领正在觉醒，正在准备故事与题目...")
+            boss_job = st.session_state.get("boss_job")
+            position = boss_job.queue_position if boss_job is not None else None
+            if position:
+                st.caption(f"⏳ AI 请求排队中，前方约 {position} 个请求")
             _pause(1)
             st.rerun()
             return
@@ -1133,6 +1096,7 @@ def render_boss(resolve_node_callback: Callable, check_death_callback: Callable)
         bs.article = _normalize_boss_article(None, deck_words)
         bs.quizzes = _normalize_boss_quizzes(None, deck_words)
         bs.quiz_queue = _build_boss_quiz_queue(bs.quizzes)
+        record_boss_quizzes(bs.quiz_queue)
         bs.phase = "article"
         st.rerun()
         return
@@ -1166,7 +1130,7 @@ def render_boss(resolve_node_callback: Callable, check_death_callback: Callable)
     if bs.phase == "battle":
         cs = _boss_init_combat_state(bs)
         if cs.phase == CombatPhase.LOADING:
-            result = CombatEngine.start_battle(cs, player, st.session_state)
+            result = CombatEngine.start_battle(cs, player, SessionRunState())
             render_combat_events(result.events)
             if result.should_rerun:
                 st.rerun()
@@ -1174,7 +1138,7 @@ def render_boss(resolve_node_callback: Callable, check_death_callback: Callable)
 
         bs.boss_hp = cs.enemy.hp
         bs.boss_max_hp = max(bs.boss_max_hp, cs.enemy.max_hp)
-        if cs.enemy.hp <= 0 and _enforce_boss_death_lock(bs, cs):
+        if cs.enemy.hp <= 0 and CombatEngine.enforce_boss_death_lock(bs, cs):
             st.warning("尚未读完其真名，首领强行维持形体！")
         if cs.enemy.hp <= 0 and bs.quiz_asked >= bs.death_lock_until_quiz_count:
             bs.phase = "victory"
@@ -1203,27 +1167,27 @@ def render_boss(resolve_node_callback: Callable, check_death_callback: Callable)
         if bs.frenzy_active:
             st.warning("狂暴阶段：攻击频率提升")
 
-        if st.session_state.get("_end_turn_due_to_item"):
-            st.session_state._end_turn_due_to_item = False
-            events = _resolve_boss_enemy_turn(cs, player, bs)
+        if player.flags.end_turn_due_to_item:
+            player.flags.end_turn_due_to_item = False
+            events = CombatEngine.resolve_boss_enemy_turn(cs, player, bs, SessionRunState()).events
             render_combat_events(events)
             if player.is_dead() and check_death_callback():
                 return
-            if cs.enemy.hp <= 0 and _enforce_boss_death_lock(bs, cs):
+            if cs.enemy.hp <= 0 and CombatEngine.enforce_boss_death_lock(bs, cs):
                 st.warning("尚未读完其真名，首领强行维持形体！")
             if cs.enemy.hp <= 0 and bs.quiz_asked >= bs.death_lock_until_quiz_count:
                 bs.phase = "victory"
             st.rerun()
             return
 
-        if st.session_state.get("_player_stunned"):
-            st.session_state._player_stunned = False
+        if player.flags.player_stunned:
+            player.flags.player_stunned = False
             st.warning("你被眩晕，跳过本回合")
-            events = _resolve_boss_enemy_turn(cs, player, bs)
+            events = CombatEngine.resolve_boss_enemy_turn(cs, player, bs, SessionRunState()).events
             render_combat_events(events)
             if player.is_dead() and check_death_callback():
                 return
-            if cs.enemy.hp <= 0 and _enforce_boss_death_lock(bs, cs):
+            if cs.enemy.hp <= 0 and CombatEngine.enforce_boss_death_lock(bs, cs):
                 st.warning("尚未读完其真名，首领强行维持形体！")
             _pause(0.6)
             st.rerun()
@@ -1249,25 +1213,14 @@ def render_boss(resolve_node_callback: Callable, check_death_callback: Callable)
 
         st.divider()
         if not cs.current_card:
-            draw_result = CombatEngine.auto_draw_if_empty(cs, st.session_state)
+            draw_result = CombatEngine.auto_draw_if_empty(cs, SessionRunState())
             if draw_result.events:
                 render_combat_events(draw_result.events)
             if draw_result.should_rerun:
                 st.rerun()
                 return
 
-            allowed_types = None
-            if cs.extra_action_only_red:
-                allowed_types = {CardType.RED_BERSERK}
-            clicked = render_hand(cs.hand, on_play=True, allowed_types=allowed_types)
-            if clicked is not None:
-                card = cs.hand[clicked]
-                play_result = CombatEngine.start_card_play(cs, player, card, st.session_state)
-                if play_result.events:
-                    render_combat_events(play_result.events)
-                if play_result.should_rerun:
-                    st.rerun()
-                    return
+            _render_play_choice(cs, player)
         else:
             st.caption(f"剩余手牌: {len(cs.hand)} | 弃牌堆: {len(cs.discard)}")
         return
@@ -1296,7 +1249,7 @@ def render_boss(resolve_node_callback: Callable, check_death_callback: Callable)
         else:
             st.caption("本局暂无新掌握的金卡单词")
         if st.button("获取奖励（+100金币）", type="primary"):
-            player.add_gold(100)
+            player.add_gold(100, notify=notify_ui)
             player.advance_room()
             if "boss_card_combat" in st.session_state:
                 del st.session_state.boss_card_combat
@@ -1307,8 +1260,6 @@ def render_event(resolve_node_callback: Callable):
     """事件 v6.0"""
     node = st.session_state.game_map.current_node
     player = st.session_state.player
-    has_cursed_blood = "CURSED_BLOOD" in player.relics
-    has_undying_curse = "UNDYING_CURSE" in player.relics
     
     # 确保事件数据已加载或生成
     if 'event_data' not in node.data:
@@ -1355,17 +1306,17 @@ def render_event(resolve_node_callback: Callable):
                 bad_weight += 1
 
             if good_available and bad_available:
-                category = random.choices(["good", "bad"], weights=[good_weight, bad_weight], k=1)[0]
+                category = _run_rng().choices(["good", "bad"], weights=[good_weight, bad_weight], k=1)[0]
                 pool = good_available if category == "good" else bad_available
-                return random.choice(pool)
+                return _run_rng().choice(pool)
             if good_available:
-                return random.choice(good_available)
+                return _run_rng().choice(good_available)
             if bad_available:
-                return random.choice(bad_available)
+                return _run_rng().choice(bad_available)
 
             st.session_state.seen_events = set()
             available_ids = list(all_events.keys())
-            return random.choice(available_ids)
+            return _run_rng().choice(available_ids)
 
         event_id = _pick_event_id()
         st.session_state.seen_events.add(event_id)
@@ -1398,6 +1349,7 @@ def render_event(resolve_node_callback: Callable):
         st.caption(event_data.flavor_text)
     
     # 渲染选项 (v6.0 匹配 EventRegistry 结构)
+    affordable = event_choices(event_data, player.gold)
     for i, choice in enumerate(event_data.choices):
         with st.container(border=True):
             st.markdown(f"### {choice.text}")
@@ -1408,109 +1360,17 @@ def render_event(resolve_node_callback: Callable):
                 st.warning(f"💰 需要 {choice.cost_gold} 金币")
             
             if st.button("选择这份命运", key=f"evt_btn_{event_id}_{i}", disabled=not can_afford):
-                if choice.cost_gold:
-                    player.gold -= choice.cost_gold
-                
-                # 处理效果
-                effect = choice.effect
-                value = choice.value
-                
-                if effect == "heal":
-                    if has_cursed_blood:
-                        st.warning("诅咒之血：无法通过事件回血")
-                    else:
-                        player.change_hp(value)
-                elif effect == "damage":
-                    dmg = value
-                    if has_undying_curse and dmg < 0:
-                        dmg *= 2
-                    player.change_hp(dmg)
-                elif effect == "gold":
-                    if isinstance(value, tuple) and len(value) == 2:
-                        amt = random.randint(value[0], value[1])
-                        player.add_gold(amt)
-                    else:
-                        player.add_gold(value)
-                elif effect == "max_hp":
-                    player.max_hp += value
-                    player.hp = min(player.hp, player.max_hp)
-                elif effect == "full_heal":
-                    if has_cursed_blood:
-                        st.warning("诅咒之血：无法通过事件回血")
-                    else:
-                        player.hp = player.max_hp
-                        st.success("💖 生命完全恢复！")
-                elif effect == "relic":
-                    if value == "random":
-                        from registries import RelicRegistry
-                        hp_loss = -20
-                        if has_undying_curse:
-                            hp_loss *= 2
-                        player.change_hp(hp_loss)
-                        pool = RelicRegistry.get_pool("low") + RelicRegistry.get_pool("high")
-                        pool = [rid for rid in pool if rid not in player.relics]
-                        if pool:
-                            rid = random.choice(pool)
-                            r = RelicRegistry.get(rid)
-                            player.relics.append(rid)
-                            _apply_relic_on_gain(player, rid)
-                            st.toast(f"🎁 获得随机圣遗物: {r.name}", icon="🏆")
-                        else:
-                            st.info("暂无可用圣遗物")
-                    else:
-                        player.relics.append(value)
-                        _apply_relic_on_gain(player, value)
-                elif effect == "trade":
-                    if isinstance(value, dict):
-                        if "hp" in value:
-                            hp_delta = value["hp"]
-                            if hp_delta > 0 and has_cursed_blood:
-                                st.warning("诅咒之血：无法通过事件回血")
-                            else:
-                                if has_undying_curse and hp_delta < 0:
-                                    hp_delta *= 2
-                                player.change_hp(hp_delta)
-                        if "gold" in value:
-                            player.add_gold(value["gold"])
-                elif effect == "item":
-                    player.inventory.append(value)
-                
-                # v6.0 特殊子阶段效果
-                elif effect == "fill_blank_test":
-                    st.session_state.event_subphase = "fill_blank"
-                    st.rerun()
-                    return
-                elif effect == "adventurer_loot":
-                    st.session_state.event_subphase = "adventurer_loot"
-                    st.rerun()
-                    return
-                elif effect == "book_read":
-                    st.session_state.event_subphase = "book_read"
-                    st.rerun()
-                    return
-                elif effect == "graveyard_enter":
-                    st.session_state.event_subphase = "graveyard"
-                    st.session_state.graveyard_explore_count = 0
+                record_action("event", index_of(affordable, choice), choice)
+                subphase = apply_event_choice(player, choice, _run_rng(), notify_ui)
+                if subphase:
+                    # v6.0 特殊子阶段效果
+                    st.session_state.event_subphase = subphase
+                    if subphase == "graveyard":
+                        st.session_state.graveyard_explore_count = 0
                     st.rerun()
                     return
-                elif effect == "risky_treasure":
-                    bad_chance = 0.5
-                    if has_undying_curse:
-                        from registries import RelicRegistry
-                        relic = RelicRegistry.get("UNDYING_CURSE")
-                        effect_data = relic.effect if relic else {}
-                        bad_chance = max(bad_chance, effect_data.get("bad_event_chance", 0.8))
-                    if random.random() < bad_chance:
-                        player.change_hp(-20)
-                        st.error("💥 陷阱！你受到了 20 伤害")
-                    else:
-                        gold = random.randint(30, 50)
-                        player.add_gold(gold)
-                        st.success(f"💰 成功！获得了 {gold} 金币")
+                if choice.effect == "risky_treasure":
                     _pause(1)
-                elif effect == "upgrade_blue_cards":
-                    player.blue_card_heal_buff = True
-                    st.success("⚒️ 铁匠对你的蓝卡进行了加持！")
                 
                 # 如果没进子阶段，完成事件
                 if st.session_state.get('event_subphase') is None:
@@ -1551,19 +1411,20 @@ def _render_fountain_test(resolve_node_callback):
 
     st.markdown(f"请拼写出对应的单词以恢复卡牌: **{target.meaning}**")
     ans = st.text_input("单词拼写:", key="fountain_input").strip()
+    spell = spell_options(target)
+    # 选卡可以反复更换，提交时才记为一次 fountain 决策
+    target_index = index_of(black_cards, target) if len(black_cards) > 1 else None
     
     col1, col2 = st.columns(2)
     with col1:
         if st.button("确认净化", type="primary"):
-            if ans.lower() == target.word.lower():
-                target.is_blackened = False
-                target.temp_level = "red"
-                st.success(f"✨ 奇迹！{target.word} 已恢复为红卡！")
-                if 'fountain_target' in st.session_state: del st.session_state.fountain_target
-                _pause(1.5)
-            else:
-                st.error("❌ 失败了，泉水变得浑浊...")
-                _pause(1)
+            if 'fountain_target' in st.session_state: del st.session_state.fountain_target
+            spelled = ans.lower() == target.word.lower()
+            if target_index is not None:
+                record_action("fountain", target_index, target)
+            record_action("spell", 0 if spelled else 1, spell[0 if spelled else 1])
+            purify_card(target, spelled, notify_ui)
+            _pause(1.5 if spelled else 1)
             
             st.session_state.event_subphase = None
             player.advance_room()
@@ -1572,6 +1433,9 @@ def _render_fountain_test(resolve_node_callback):
             
     with col2:
         if st.button("放弃并离开"):
+            if target_index is not None:
+                record_action("fountain", target_index, target)
+            record_action("spell", 1, spell[1])
             if 'fountain_target' in st.session_state: del st.session_state.fountain_target
             st.session_state.event_subphase = None
             player.advance_room()
@@ -1584,31 +1448,13 @@ def _render_adventurer_loot(resolve_node_callback):
     st.subheader("🎒 翻找背包")
     
     if 'adv_loot_result' not in st.session_state:
-        # 50% 战斗 / 50% 获得卡牌
-        bad_chance = 0.5
-        if "UNDYING_CURSE" in player.relics:
-            from registries import RelicRegistry
-            relic = RelicRegistry.get("UNDYING_CURSE")
-            effect_data = relic.effect if relic else {}
-            bad_chance = max(bad_chance, effect_data.get("bad_event_chance", 0.8))
-        if random.random() < bad_chance:
+        # 50% 战斗 / 50% 获得卡牌（加权: 红>蓝>金）
+        cards = roll_adventurer_loot(player, st.session_state.get('game_word_pool') or [], _run_rng())
+        if cards is None:
             st.session_state.adv_loot_result = "combat"
         else:
             st.session_state.adv_loot_result = "cards"
-            # 生成 3 张奖励卡 (加权: 红>蓝>金)
-            word_pool = st.session_state.get('game_word_pool') or []
-            weights = []
-            for c in word_pool:
-                if c.card_type == CardType.RED_BERSERK: weights.append(0.6)
-                elif c.card_type == CardType.BLUE_HYBRID: weights.append(0.3)
-                elif c.card_type == CardType.GOLD_SUPPORT: weights.append(0.1)
-                else: weights.append(0.1)
-            
-            # 抽取 3 张
-            if word_pool:
-                st.session_state.adv_cards = random.choices(word_pool, weights=weights, k=3)
-            else:
-                st.session_state.adv_cards = []
+            st.session_state.adv_cards = cards
 
     result = st.session_state.adv_loot_result
     
@@ -1633,6 +1479,7 @@ def _render_adventurer_loot(resolve_node_callback):
                     st.markdown(f"### {card.icon} {card.word}")
                     st.caption(card.meaning)
                     if st.button("拿走", key=f"loot_{i}"):
+                        record_action("loot", i, card)
                         player.add_card_to_deck(card)
                         st.toast(f"获得了 {card.word}!", icon="🎉")
                         del st.session_state.adv_loot_result
@@ -1648,28 +1495,16 @@ def _render_mysterious_book(resolve_node_callback):
     st.markdown("你翻阅书页，命运在暗中掷骰。")
 
     if st.button("翻阅"):
-        bad_chance = 0.5
-        if "UNDYING_CURSE" in player.relics:
-            from registries import RelicRegistry
-            relic = RelicRegistry.get("UNDYING_CURSE")
-            effect_data = relic.effect if relic else {}
-            bad_chance = max(bad_chance, effect_data.get("bad_event_chance", 0.8))
-        if random.random() < bad_chance:
+        outcome = read_mysterious_book(player, _run_rng())
+        if outcome == "greed":
+            st.markdown("### 💰 贪婪之理")
+            st.warning("🤑 财富涌入，但你的灵魂变得脆弱。")
+        else:
             st.markdown("### 💀 诅咒之门")
-            if random.random() < 0.5:
-                for c in player.deck:
-                    c.is_blackened = True
-                    c.temp_level = "black"
+            if outcome == "blackened":
                 st.error("👿 整个卡组被黑暗侵蚀了！")
             else:
                 st.success("🛡️ 你抵挡住了精神攻击，什么也没发生。")
-        else:
-            st.markdown("### 💰 贪婪之理")
-            player.gold *= 2
-            # 记录贪婪 Buff (增加一个受损翻倍的状态)
-            # 后续需要在 change_hp 中检测此状态
-            st.session_state._greedy_curse = True
-            st.warning("🤑 财富涌入，但你的灵魂变得脆弱。")
 
         _pause(1.5)
         st.session_state.event_subphase = None
@@ -1696,57 +1531,26 @@ def _render_graveyard(resolve_node_callback):
     col_a, col_b = st.columns(2)
     with col_a:
         if st.button("探究", key="graveyard_explore", use_container_width=True):
+            record_action("graveyard", 0, "explore")
             explore_count += 1
             st.session_state.graveyard_explore_count = explore_count
-            ghost_chance = min(0.15 + 0.10 * (explore_count - 1), 0.70)
-
-            if random.random() < ghost_chance:
-                st.error("👻 幽灵现身！")
+            node = st.session_state.game_map.current_node
+            ghost = explore_graveyard(player, explore_count, node.level, _run_rng(), notify_ui)
+            if ghost is not None:
                 _pause(0.8)
                 _clear_graveyard_state()
-                st.session_state.game_map.current_node.type = NodeType.ELITE
-                st.session_state.forced_enemy = Enemy(
-                    name="幽灵",
-                    level=st.session_state.game_map.current_node.level,
-                    hp=999,
-                    max_hp=999,
-                    attack=10,
-                    is_elite=True,
-                    use_fixed_stats=True,
-                    fixed_attack=10,
-                    fixed_timer=2,
-                    attack_interval=2,
-                    max_turns=10,
-                )
+                node.type = NodeType.ELITE
+                st.session_state.forced_enemy = ghost
                 st.rerun()
                 return
 
-            roll = random.random()
-            if roll < 0.05:
-                from registries import RelicRegistry
-                pool = [rid for rid in RelicRegistry.get_pool("low") if rid not in player.relics]
-                if pool:
-                    rid = random.choice(pool)
-                    relic = RelicRegistry.get(rid)
-                    player.relics.append(rid)
-                    _apply_relic_on_gain(player, rid)
-                    name = relic.name if relic else rid
-                    st.toast(f"🏆 发现圣遗物：{name}", icon="🪙")
-                else:
-                    st.info("暂无可用圣遗物")
-            elif roll < 0.40:
-                gold = random.randint(15, 20)
-                player.add_gold(gold)
-                st.toast(f"💰 发现金币：{gold}", icon="💰")
-            else:
-                st.info("什么也没发生。")
-
             _pause(0.6)
             st.rerun()
             return
 
     with col_b:
         if st.button("逃跑", key="graveyard_escape", use_container_width=True):
+            record_action("graveyard", 1, "escape")
             _clear_graveyard_state()
             player.advance_room()
             resolve_node_callback()
@@ -1760,10 +1564,7 @@ def _clear_pending_card_purchase_state():
 
 
 def _rollback_pending_card_purchase(player, pending_type: str):
-    refund = int(st.session_state.get("pending_card_price", 0) or 0)
-    if refund > 0:
-        player.gold += refund
-    player.purchase_counts = rollback_purchase_counts(player.purchase_counts, pending_type)
+    cancel_card_purchase(player, pending_type, int(st.session_state.get("pending_card_price", 0) or 0))
     _clear_pending_card_purchase_state()
 
 
@@ -1773,13 +1574,7 @@ def _render_pending_card_purchase() -> bool:
         return False
 
     player = st.session_state.player
-    target_map = {
-        "red": CardType.RED_BERSERK,
-        "blue": CardType.BLUE_HYBRID,
-        "gold": CardType.GOLD_SUPPORT,
-    }
-    target_type = target_map.get(pending)
-    if target_type is None:
+    if pending not in CARD_COLOR_TYPES:
         _clear_pending_card_purchase_state()
         return False
 
@@ -1787,11 +1582,8 @@ def _render_pending_card_purchase() -> bool:
         "shop_card_choices" not in st.session_state
         or st.session_state.get("shop_card_choice_type") != pending
     ):
-        deck_words = {c.word for c in player.deck}
         pool = st.session_state.get("game_word_pool") or []
-        candidates = [c for c in pool if c.card_type == target_type and c.word not in deck_words]
-        random.shuffle(candidates)
-        st.session_state.shop_card_choices = candidates[: min(6, len(candidates))]
+        st.session_state.shop_card_choices = card_purchase_candidates(player, pending, pool, _run_rng())
         st.session_state.shop_card_choice_type = pending
 
     choices = st.session_state.get("shop_card_choices", [])
@@ -1812,24 +1604,16 @@ def _render_pending_card_purchase() -> bool:
                 st.caption(card.meaning)
                 st.caption(f"阶级: {card.tier}")
                 if st.button("购买这张", key=f"pick_shop_card_{pending}_{i}", type="primary", use_container_width=True):
-                    player.add_card_to_deck(card)
+                    record_action("shop_card", i, card)
                     pool = st.session_state.get("game_word_pool") or []
-                    removed = False
-                    next_pool = []
-                    for item in pool:
-                        if not removed and item.word == card.word and item.tier == card.tier:
-                            removed = True
-                            continue
-                        next_pool.append(item)
-                    if not removed:
-                        next_pool = [item for item in pool if item.word != card.word]
-                    st.session_state.game_word_pool = next_pool
+                    st.session_state.game_word_pool = finish_card_purchase(player, card, pool)
                     _clear_pending_card_purchase_state()
                     st.toast(f"已购入 {card.word}", icon="🎴")
                     st.rerun()
                     return True
 
     if st.button("取消购买并退款", key=f"cancel_shop_card_purchase_{pending}", use_container_width=True):
+        record_action("shop_card", len(choices), None)
         _rollback_pending_card_purchase(player, pending)
         st.toast("已取消并退款", icon="↩️")
         st.rerun()
@@ -1853,11 +1637,13 @@ def render_shop(resolve_node_callback: Callable):
             total_slots=4,
             relic_chance=0.2,
             exclude_relics=set(player.relics),
+            rng=_run_rng(),
         )
 
     inventory = st.session_state.shop_items
     relic_slots = inventory.get('relic_slots', [])
     other_slots = inventory.get('other_slots', [])
+    offers = shop_offers(player, relic_slots, other_slots)
 
     if relic_slots:
         st.subheader("圣遗物")
@@ -1872,11 +1658,8 @@ def render_shop(resolve_node_callback: Callable):
 
                     can_buy = player.gold >= price
                     if st.button("购买", key=f"relic_{item_id}", disabled=not can_buy):
-                        player.gold -= price
-                        if item.effect == 'grant_relic':
-                            player.relics.append(item.value)
-                            _apply_relic_on_gain(player, item.value)
-                            st.toast("获得圣遗物")
+                        record_action("shop", shop_offer_index(offers, "relic", item_id), f"relic:{item_id}")
+                        buy_shop_item(player, item_id, item, price, notify_ui)
                         # 买一个少一个，不补充
                         st.session_state.shop_items["relic_slots"] = [
                             pair for pair in relic_slots if pair[0] != item_id
@@ -1898,23 +1681,8 @@ def render_shop(resolve_node_callback: Callable):
 
                     can_buy = player.gold >= price
                     if st.button("购买", key=f"shop_{item_id}", disabled=not can_buy):
-                        player.gold -= price
-                        if item.consumable:
-                            player.inventory.append(item_id)
-                            st.toast("已放入背包")
-                        else:
-                            if item.effect == 'heal':
-                                player.change_hp(item.value)
-                            elif item.effect == 'max_hp':
-                                player.max_hp += item.value
-                                player.hp = min(player.hp + item.value, player.max_hp)
-                                st.toast(f"最大生命 +{item.value}")
-                            elif item.effect == 'grant_relic':
-                                player.relics.append(item.value)
-                                _apply_relic_on_gain(player, item.value)
-                                st.toast("获得圣遗物")
-                            elif item.effect == 'relic':
-                                player.relics.append(item.value)
+                        record_action("shop", shop_offer_index(offers, "item", item_id), f"item:{item_id}")
+                        buy_shop_item(player, item_id, item, price, notify_ui)
                         st.rerun()
 
     st.subheader("卡牌购买")
@@ -1930,8 +1698,8 @@ def render_shop(resolve_node_callback: Callable):
             st.caption(f"价格：{red_price} 金币")
             can_buy_red = player.gold >= red_price
             if st.button(f"购买 ({red_price} 金币)", key="buy_red_card", disabled=not can_buy_red):
-                player.gold -= red_price
-                player.purchase_counts["red"] = red_count + 1
+                record_action("shop", shop_offer_index(offers, "card", "red"), "card:red")
+                start_card_purchase(player, "red", red_price)
                 st.session_state.pending_card_purchase = "red"
                 st.session_state.pending_card_price = red_price
                 if "shop_card_choices" in st.session_state:
@@ -1948,8 +1716,8 @@ def render_shop(resolve_node_callback: Callable):
             st.caption(f"价格：{blue_price} 金币")
             can_buy_blue = player.gold >= blue_price
             if st.button(f"购买 ({blue_price} 金币)", key="buy_blue_card", disabled=not can_buy_blue):
-                player.gold -= blue_price
-                player.purchase_counts["blue"] = blue_count + 1
+                record_action("shop", shop_offer_index(offers, "card", "blue"), "card:blue")
+                start_card_purchase(player, "blue", blue_price)
                 st.session_state.pending_card_purchase = "blue"
                 st.session_state.pending_card_price = blue_price
                 if "shop_card_choices" in st.session_state:
@@ -1966,8 +1734,8 @@ def render_shop(resolve_node_callback: Callable):
             can_buy_gold = player.gold >= gold_price and not player.purchase_counts.get("gold", 0) > 0
             status = "已售罄" if player.purchase_counts.get("gold", 0) > 0 else f"{gold_price} 金币"
             if st.button(f"购买 ({status})", key="buy_gold_card", disabled=not can_buy_gold):
-                player.gold -= gold_price
-                player.purchase_counts["gold"] = 1
+                record_action("shop", shop_offer_index(offers, "card", "gold"), "card:gold")
+                start_card_purchase(player, "gold", gold_price)
                 st.session_state.pending_card_purchase = "gold"
                 st.session_state.pending_card_price = gold_price
                 if "shop_card_choices" in st.session_state:
@@ -1977,6 +1745,7 @@ def render_shop(resolve_node_callback: Callable):
                 st.rerun()
 
     if st.button("离开商店", use_container_width=True):
+        record_action("shop", len(offers), None)
         if 'shop_items' in st.session_state:
             del st.session_state.shop_items
         player.advance_room()
@@ -1986,6 +1755,9 @@ def render_rest(resolve_node_callback: Callable):
     """营地 v6.0"""
     st.header("🔥 铁匠营地")
     player = st.session_state.player
+    forging = st.session_state.get('rest_phase') == 'upgrade'
+    # 锻造中休息/铁匠按钮仍可点，属于淬炼面板的决策
+    kind, options = ("upgrade", forge_options(player)) if forging else ("rest", rest_options(player))
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -1993,7 +1765,8 @@ def render_rest(resolve_node_callback: Callable):
             st.markdown("### 😴 休息")
             st.caption("恢复 30 生命")
             if st.button("选择休息", use_container_width=True):
-                player.change_hp(30)
+                record_action(kind, options.index("heal"), "heal")
+                rest_heal(player, notify_ui)
                 player.advance_room()
                 resolve_node_callback()
                 st.rerun()
@@ -2005,14 +1778,9 @@ def render_rest(resolve_node_callback: Callable):
             can_afford = player.gold >= 100 and not player.blue_card_heal_buff
             btn_text = "已拥有" if player.blue_card_heal_buff else "支付 100金币"
             if st.button(btn_text, disabled=not can_afford, use_container_width=True):
-                player.gold -= 100
-                player.blue_card_heal_buff = True
+                record_action(kind, index_of(options, "smith"), "smith")
+                count = smith_blue_cards(player)
                 st.success("⚒️ 蓝卡已升级！答对时额外回复 5 生命")
-                count = 0
-                for c in player.deck:
-                    if c.card_type == CardType.BLUE_HYBRID:
-                        c.is_temporary_buffed = True
-                        count += 1
                 st.success(f"🔨 强化成功！{count} 张蓝卡获得回血增益")
                 _pause(1.5)
                 player.advance_room()
@@ -2020,13 +1788,14 @@ def render_rest(resolve_node_callback: Callable):
                 st.rerun()
 
     with col3:
-        if st.session_state.get('rest_phase') == 'upgrade':
+        if forging:
             _render_camp_upgrade(resolve_node_callback)
         else:
             with st.container(border=True):
                 st.markdown("### 🆙 词汇淬炼")
                 st.caption("通过拼写测试，永久提升卡牌阶级")
                 if st.button("开始挑战", use_container_width=True):
+                    record_action("rest", options.index("upgrade"), "upgrade")
                     st.session_state.rest_phase = 'upgrade'
                     st.rerun()
 
@@ -2035,7 +1804,10 @@ def _render_camp_upgrade(resolve_node_callback):
     st.subheader("🆙 词汇淬炼")
     player = st.session_state.player
 
+    options = forge_options(player)
+
     if st.button("结束锻造", use_container_width=True):
+        record_action("upgrade", options.index(None), None)
         if 'upgrade_target' in st.session_state:
             del st.session_state.upgrade_target
         st.session_state.rest_phase = None
@@ -2043,11 +1815,12 @@ def _render_camp_upgrade(resolve_node_callback):
         resolve_node_callback()
         st.rerun()
     
-    # 选择要升级的卡牌
-    upgradable = [c for c in player.deck if c.tier < 4] # 金卡无法再升
+    # 选择要升级的卡牌（金卡无法再升）
+    upgradable = upgrade_options(player.deck)
     if not upgradable:
         st.warning("无可升级的卡牌！")
         if st.button("取消"):
+            record_action("upgrade", options.index("cancel"), "cancel")
             st.session_state.rest_phase = None
             st.rerun()
         return
@@ -2055,7 +1828,7 @@ def _render_camp_upgrade(resolve_node_callback):
     if 'upgrade_target' not in st.session_state:
         st.markdown("选择一张卡牌进行挑战（仅显示中文释义，拼写正确即可永久升阶）")
         cols = st.columns(min(4, len(upgradable)))
-        for i, card in enumerate(upgradable[:8]):
+        for i, card in enumerate(upgradable):
             with cols[i % 4]:
                 if st.button(f"{card.meaning}", key=f"up_sel_{i}"):
                     st.session_state.upgrade_target = card
@@ -2066,26 +1839,13 @@ def _render_camp_upgrade(resolve_node_callback):
         ans = st.text_input("拼写:").strip()
         
         if st.button("确认提交", type="primary"):
-            if ans.lower() == card.word.lower():
+            spelled = ans.lower() == card.word.lower()
+            record_action("upgrade", index_of(options, card), card)
+            record_action("spell", 0 if spelled else 1, spell_options(card)[0 if spelled else 1])
+            if spelled:
                 # 永久升阶
-                old_tier = card.tier
-                card.tier = min(4, card.tier + 2) # 红(0)->蓝(2)->金(4)
-                db = st.session_state.db
                 current_room = st.session_state.game_map.floor if st.session_state.get("game_map") else 0
-                db.set_word_tier(
-                    st.session_state.player.id,
-                    card.word,
-                    card.tier,
-                    current_room,
-                    priority="normal",
-                )
-                if old_tier in (2, 3) and card.tier >= 4:
-                    _grant_red_card_from_pool("蓝升金")
-                if card.tier >= 4:
-                    gold_words = st.session_state.get("run_gold_upgraded_words", [])
-                    if card.word not in gold_words:
-                        gold_words.append(card.word)
-                        st.session_state.run_gold_upgraded_words = gold_words
+                upgrade_card(card, SessionRunState(), st.session_state.db, player.id, current_room, notify_ui)
                 st.success(f"🎊 成功！{card.word} 已永久升级！")
                 del st.session_state.upgrade_target
                 _pause(1.0)
@@ -2110,7 +1870,7 @@ def render_tower_prep(complete_callback: Callable):
 
     st.subheader("初始圣遗物（三选一）")
     from registries import RelicRegistry
-    starter_relics = RelicRegistry.get_pool("starter")
+    starter_relics = starter_relic_options()
 
     if "starter_relic_choice" not in st.session_state:
         st.session_state.starter_relic_choice = None
@@ -2190,10 +1950,15 @@ def render_tower_prep(complete_callback: Callable):
     is_valid = (len(selected_indices) == limit) and has_relic_choice
 
     if st.button("✅ 开始爬塔", type="primary", disabled=not is_valid, use_container_width=True):
-        selected_cards = [pool[i] for i in selected_indices]
+        picked = sorted(selected_indices)
+        selected_cards = [pool[i] for i in picked]
         remaining_cards = [pool[i] for i in range(len(pool)) if i not in selected_indices]
 
         chosen = st.session_state.get("starter_relic_choice")
+        # 与 RunSimulator 的逐张装入一致：每次的选项是尚未选中的卡，下标需减去已选中的张数
+        for k, i in enumerate(picked):
+            record_action("load", i - k, pool[i])
+        record_action("starter_relic", index_of(starter_relics, chosen), chosen)
         if chosen and chosen not in st.session_state.player.relics:
             st.session_state.player.relics.append(chosen)
         if "starter_relic_choice" in st.session_state: